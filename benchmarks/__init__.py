@@ -0,0 +1 @@
+"""Performance benchmarks for Taters against a local stand-in joke API."""
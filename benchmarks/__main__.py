@@ -0,0 +1,134 @@
+"""Command line entry point: ``python -m benchmarks``."""
+
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import typer
+
+from benchmarks.mock_server import MockJokeServer, ServerConfig
+from benchmarks.scenarios import SCENARIOS, measure
+from benchmarks.stats import compare
+
+
+def main(
+    scenario: Optional[list[str]] = typer.Option(
+        None,
+        "--scenario",
+        "-s",
+        help=f"Scenario to run, repeatable ({', '.join(SCENARIOS)}; default all)",
+    ),
+    iterations: int = typer.Option(
+        100, "--iterations", "-i", min=1, help="Timed iterations per scenario"
+    ),
+    cli_iterations: int = typer.Option(
+        20, "--cli-iterations", min=1, help="Timed iterations for CLI scenarios"
+    ),
+    latency: float = typer.Option(
+        0.005, "--latency", min=0, help="Server latency per request, in seconds"
+    ),
+    jitter: float = typer.Option(
+        0.0, "--jitter", min=0, help="Extra random latency up to this many seconds"
+    ),
+    error_rate: float = typer.Option(
+        0.0, "--error-rate", min=0, max=1, help="Fraction of requests failing with 500"
+    ),
+    rate_limit_every: int = typer.Option(
+        0, "--rate-limit-every", min=0, help="Answer every Nth request with 429"
+    ),
+    output: Optional[Path] = typer.Option(
+        None, "--output", "-o", help="Write results to this JSON file"
+    ),
+    baseline: Optional[Path] = typer.Option(
+        None, "--baseline", "-b", help="Earlier results to compare against"
+    ),
+    threshold: float = typer.Option(
+        0.10, "--threshold", min=0, help="Relative change counted as a regression"
+    ),
+) -> None:
+    """Benchmark Taters against a local stand-in for icanhazdadjoke.com."""
+    names = scenario or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise typer.BadParameter(f"Unknown scenario: {', '.join(unknown)}")
+
+    config = ServerConfig(
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        rate_limit_every=rate_limit_every,
+    )
+    results: dict[str, Any] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "server": config.to_dict(),
+        "scenarios": {},
+    }
+    with MockJokeServer(config) as server, tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            runs = cli_iterations if name.startswith("cli") else iterations
+            workdir = Path(tmp) / name
+            workdir.mkdir()
+            result = measure(SCENARIOS[name], server.url, runs, workdir)
+            summary = result.to_dict()
+            results["scenarios"][name] = summary
+            typer.echo(_format(name, summary))
+        results["server"]["statuses"] = dict(server.statuses)
+
+    if output is not None:
+        output.write_text(json.dumps(results, indent=2) + "\n")
+        typer.echo(f"📝 Results written to {output}")
+
+    if baseline is not None:
+        previous = json.loads(baseline.read_text())
+        if _server_settings(previous) != _server_settings(results):
+            typer.echo("⚠️  Baseline used different server settings", err=True)
+        regressions = compare(results, previous, threshold)
+        for regression in regressions:
+            typer.echo(f"❌ Regression: {regression}", err=True)
+        if regressions:
+            raise typer.Exit(1)
+        typer.echo(f"✅ No regressions beyond {threshold:.0%} against {baseline}")
+
+
+def _format(name: str, summary: dict[str, Any]) -> str:
+    """Render one scenario summary as a table row."""
+    latency = summary["latency_ms"]
+    memory = summary["peak_memory_kib"]
+    return (
+        f"{name:<10} {summary['jokes_per_second']:>10.1f} jokes/s"
+        f"  p50 {latency['p50']:>8.2f} ms  p99 {latency['p99']:>8.2f} ms"
+        f"  peak {memory if memory is not None else '-':>8} KiB"
+    )
+
+
+def _server_settings(results: dict[str, Any]) -> dict[str, Any]:
+    """Extract the mock server configuration, without its observed statuses."""
+    settings = dict(results.get("server", {}))
+    settings.pop("statuses", None)
+    return settings
+
+
+def _git_commit() -> Optional[str]:
+    """Identify the benchmarked commit, if run from a git checkout."""
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+if __name__ == "__main__":
+    typer.run(main)
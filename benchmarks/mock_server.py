@@ -0,0 +1,172 @@
+"""Local stand-in for icanhazdadjoke.com with injectable latency and failures."""
+
+import asyncio
+import json
+import random
+import math
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass
+from types import TracebackType
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass(frozen=True)
+class ServerConfig:
+    """Behaviour of the mock joke server."""
+
+    latency: float = 0.005
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_every: int = 0
+    retry_after: int = 0
+    search_results: int = 95
+    seed: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the configuration for inclusion in benchmark results.
+
+        Returns:
+            The configuration as a plain dictionary.
+        """
+        return asdict(self)
+
+
+class MockJokeServer:
+    """HTTP/1.1 keep-alive joke server running its own loop in a thread."""
+
+    def __init__(self, config: ServerConfig = ServerConfig()) -> None:
+        """
+        Initialize the mock server.
+
+        Args:
+            config: Latency and failure injection settings.
+        """
+        self.config = config
+        self.statuses: Counter[int] = Counter()
+        self.port = 0
+        self._random = random.Random(config.seed)
+        self._requests = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        """Base URL to point ``TATERS_API_URL`` at."""
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> None:
+        """Start serving on a free local port and wait until it is listening."""
+        self._thread = threading.Thread(
+            target=self._run, name="mock-joke-server", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        """Stop the server and its thread."""
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockJokeServer":
+        """Start the server for the duration of a ``with`` block."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop the server."""
+        self.stop()
+
+    def _run(self) -> None:
+        """Own the event loop for the server's lifetime."""
+        asyncio.run(self._serve())
+
+    async def _serve(self) -> None:
+        """Listen until ``stop`` closes the server."""
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer requests on one connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                await asyncio.sleep(
+                    self.config.latency + self._random.uniform(0, self.config.jitter)
+                )
+                writer.write(self._respond(head))
+                await writer.drain()
+                if b"connection: close" in head.lower():
+                    break
+        finally:
+            writer.close()
+
+    def _respond(self, head: bytes) -> bytes:
+        """Build the next response, injecting failures as configured."""
+        self._requests += 1
+        number = self._requests
+        headers = {"Content-Type": "application/json"}
+        config = self.config
+        if config.rate_limit_every and number % config.rate_limit_every == 0:
+            status, reason = 429, "Too Many Requests"
+            headers["Retry-After"] = str(config.retry_after)
+            body: dict[str, Any] = {"status": 429, "message": "Slow down"}
+        elif self._random.random() < config.error_rate:
+            status, reason = 500, "Internal Server Error"
+            body = {"status": 500, "message": "Injected failure"}
+        else:
+            status, reason = 200, "OK"
+            target = head.split(b" ", 2)[1].decode()
+            if urlsplit(target).path == "/search":
+                body = self._search_page(parse_qs(urlsplit(target).query))
+            else:
+                body = {"id": f"bench-{number}", "joke": f"Benchmark joke #{number}"}
+        self.statuses[status] += 1
+
+        payload = json.dumps(body).encode()
+        headers["Content-Length"] = str(len(payload))
+        lines = [f"HTTP/1.1 {status} {reason}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode() + payload
+
+    def _search_page(self, query: dict[str, list[str]]) -> dict[str, Any]:
+        """Build one page of ``search_results`` synthetic matches for the term."""
+        term = query.get("term", [""])[0]
+        page = int(query.get("page", ["1"])[0])
+        limit = int(query.get("limit", ["20"])[0])
+        total = self.config.search_results
+        first = (page - 1) * limit
+        return {
+            "current_page": page,
+            "limit": limit,
+            "results": [
+                {"id": f"search-{term}-{i}", "joke": f"Benchmark {term} joke #{i}"}
+                for i in range(first, min(first + limit, total))
+            ],
+            "search_term": term,
+            "status": 200,
+            "total_jokes": total,
+            "total_pages": max(1, math.ceil(total / limit)),
+        }
@@ -0,0 +1,197 @@
+"""Benchmark scenarios exercising the repository, the batch path and the CLI."""
+
+import asyncio
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+from typer.testing import CliRunner
+
+from benchmarks.stats import ScenarioResult
+from taters.main import app
+from taters.repositories.dad_joke_repository import DadJokeRepository
+from taters.repositories.http_client import create_http_client
+from taters.repositories.retry_policy import RetryPolicy
+
+Scenario = Callable[[str, int, Path], ScenarioResult]
+
+BATCH_SIZE = 50
+BATCH_CONCURRENCY = 10
+CLI_BATCH_SIZE = 10
+
+
+def single(url: str, iterations: int, workdir: Path) -> ScenarioResult:
+    """
+    Fetch jokes one at a time over one pooled client.
+
+    Args:
+        url: Base URL of the mock server.
+        iterations: Number of sequential fetches.
+        workdir: Scratch directory (unused).
+
+    Returns:
+        Per-fetch latencies.
+    """
+
+    async def run() -> ScenarioResult:
+        async with create_http_client() as client:
+            repository = _repository(client, url)
+            latencies = []
+            jokes = 0
+            started = time.perf_counter()
+            for _ in range(iterations):
+                begin = time.perf_counter()
+                if await repository.fetch_random_joke() is not None:
+                    jokes += 1
+                latencies.append(time.perf_counter() - begin)
+            return ScenarioResult(
+                "single", jokes, time.perf_counter() - started, latencies
+            )
+
+    return asyncio.run(run())
+
+
+def batch(url: str, iterations: int, workdir: Path) -> ScenarioResult:
+    """
+    Fan out concurrent batches of distinct jokes.
+
+    Args:
+        url: Base URL of the mock server.
+        iterations: Number of batches of ``BATCH_SIZE`` jokes.
+        workdir: Scratch directory (unused).
+
+    Returns:
+        Per-batch latencies.
+    """
+
+    async def run() -> ScenarioResult:
+        async with create_http_client() as client:
+            repository = _repository(client, url)
+            latencies = []
+            jokes = 0
+            started = time.perf_counter()
+            for _ in range(iterations):
+                begin = time.perf_counter()
+                async for _joke in repository.get_random_jokes(
+                    BATCH_SIZE, BATCH_CONCURRENCY
+                ):
+                    jokes += 1
+                latencies.append(time.perf_counter() - begin)
+            return ScenarioResult(
+                "batch", jokes, time.perf_counter() - started, latencies
+            )
+
+    return asyncio.run(run())
+
+
+def cli(url: str, iterations: int, workdir: Path) -> ScenarioResult:
+    """
+    Run ``taters dad-joke`` end to end through ``taters.main:app``.
+
+    Args:
+        url: Base URL of the mock server.
+        iterations: Number of CLI invocations.
+        workdir: Cache and runtime directory shared by the invocations.
+
+    Returns:
+        Per-invocation latencies.
+    """
+    return _invoke_cli("cli", ["dad-joke"], url, iterations, workdir)
+
+
+def cli_batch(url: str, iterations: int, workdir: Path) -> ScenarioResult:
+    """
+    Run ``taters dad-joke --count`` end to end through ``taters.main:app``.
+
+    Args:
+        url: Base URL of the mock server.
+        iterations: Number of CLI invocations.
+        workdir: Cache and runtime directory shared by the invocations.
+
+    Returns:
+        Per-invocation latencies.
+    """
+    args = ["dad-joke", "--count", str(CLI_BATCH_SIZE)]
+    return _invoke_cli("cli-batch", args, url, iterations, workdir)
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "single": single,
+    "batch": batch,
+    "cli": cli,
+    "cli-batch": cli_batch,
+}
+
+
+def measure(
+    scenario: Scenario,
+    url: str,
+    iterations: int,
+    workdir: Path,
+    memory_iterations: Optional[int] = None,
+) -> ScenarioResult:
+    """
+    Time a scenario, then rerun it under tracemalloc for peak memory.
+
+    Memory is measured in a separate, shorter pass because tracemalloc slows
+    allocation-heavy code enough to distort latencies.
+
+    Args:
+        scenario: The scenario to run.
+        url: Base URL of the mock server.
+        iterations: Iterations for the timed pass.
+        workdir: Scratch directory for the scenario.
+        memory_iterations: Iterations for the memory pass; skipped if 0.
+
+    Returns:
+        The timed result with ``peak_memory_bytes`` filled in.
+    """
+    result = scenario(url, iterations, workdir)
+    passes = min(iterations, 10) if memory_iterations is None else memory_iterations
+    if passes > 0:
+        tracemalloc.start()
+        try:
+            scenario(url, passes, workdir)
+            result.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def _repository(client: httpx.AsyncClient, url: str) -> DadJokeRepository:
+    """
+    Build a repository for the mock server.
+
+    The client-side rate limiter is left out: it caps throughput at 10 jokes/s
+    by design and would hide everything else.
+    """
+    return DadJokeRepository(
+        client,
+        retry_policy=RetryPolicy(),
+        base_url=url,
+    )
+
+
+def _invoke_cli(
+    name: str, args: list[str], url: str, iterations: int, workdir: Path
+) -> ScenarioResult:
+    """Invoke the CLI repeatedly with the API, cache and socket redirected."""
+    runner = CliRunner()
+    env = {
+        "TATERS_API_URL": url,
+        "XDG_CACHE_HOME": str(workdir / "cache"),
+        "TATERS_SOCKET": str(workdir / "no-daemon.sock"),
+    }
+    latencies = []
+    jokes = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        begin = time.perf_counter()
+        result = runner.invoke(app, args, env=env)
+        latencies.append(time.perf_counter() - begin)
+        if result.exit_code != 0:
+            raise RuntimeError(f"taters {' '.join(args)} failed: {result.output}")
+        jokes += result.stdout.count("🃏")
+    return ScenarioResult(name, jokes, time.perf_counter() - started, latencies)
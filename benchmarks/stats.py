@@ -0,0 +1,92 @@
+"""Summary statistics and regression comparison for benchmark results."""
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements from one benchmark scenario."""
+
+    name: str
+    jokes: int
+    seconds: float
+    latencies: list[float] = field(default_factory=list)
+    peak_memory_bytes: Optional[int] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Summarize the measurements.
+
+        Returns:
+            Throughput, latency percentiles in milliseconds and peak memory.
+        """
+        return {
+            "operations": len(self.latencies),
+            "jokes": self.jokes,
+            "seconds": round(self.seconds, 4),
+            "jokes_per_second": round(self.jokes / self.seconds, 2),
+            "latency_ms": {
+                "p50": round(percentile(self.latencies, 50) * 1000, 3),
+                "p99": round(percentile(self.latencies, 99) * 1000, 3),
+                "mean": round(sum(self.latencies) / len(self.latencies) * 1000, 3),
+            },
+            "peak_memory_kib": (
+                None
+                if self.peak_memory_bytes is None
+                else round(self.peak_memory_bytes / 1024, 1)
+            ),
+        }
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Compute a nearest-rank percentile.
+
+    Args:
+        values: The samples; must not be empty.
+        q: The percentile, from 0 to 100.
+
+    Returns:
+        The smallest sample with at least ``q`` percent of samples at or below it.
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    """
+    Flag scenarios that got slower or hungrier than the baseline.
+
+    Args:
+        current: Results of this run.
+        baseline: Results of an earlier run.
+        threshold: Tolerated relative change, such as 0.1 for 10%.
+
+    Returns:
+        One message per regression; empty if there are none.
+    """
+    regressions = []
+    for name, now in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        checks = [
+            ("jokes/s", now["jokes_per_second"], before["jokes_per_second"], -1),
+            ("p50 ms", now["latency_ms"]["p50"], before["latency_ms"]["p50"], 1),
+            ("p99 ms", now["latency_ms"]["p99"], before["latency_ms"]["p99"], 1),
+            ("peak KiB", now["peak_memory_kib"], before["peak_memory_kib"], 1),
+        ]
+        for metric, value, reference, direction in checks:
+            if value is None or reference is None or reference == 0:
+                continue
+            change = (value - reference) / reference
+            if change * direction > threshold:
+                regressions.append(
+                    f"{name}: {metric} {reference} → {value} ({change:+.1%})"
+                )
+    return regressions
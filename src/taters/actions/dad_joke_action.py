@@ -1,6 +1,9 @@
 """Action for handling dad joke command workflow."""
 
+from typing import AsyncIterator
+
 from taters.services.dad_joke_service import DadJokeService
+from taters.tracing import span
 
 
 class DadJokeAction:
@@ -22,5 +25,32 @@ class DadJokeAction:
         Returns:
             A formatted dad joke ready for CLI output.
         """
-        joke = await self.service.get_joke()
+        with span("action.dad_joke.execute"):
+            joke = await self.service.get_joke()
+            return self._format(joke)
+
+    async def execute_batch(self, count: int, concurrency: int) -> AsyncIterator[str]:
+        """
+        Execute the dad joke action for a batch of distinct jokes.
+
+        Args:
+            count: Number of distinct jokes wanted.
+            concurrency: Maximum number of upstream requests in flight.
+
+        Yields:
+            Formatted dad jokes as soon as each one is available.
+        """
+        async for joke in self.service.get_jokes(count, concurrency):
+            yield self._format(joke)
+
+    def _format(self, joke: str) -> str:
+        """
+        Format a joke for CLI output.
+
+        Args:
+            joke: The raw joke text.
+
+        Returns:
+            The joke with its emoji prefix.
+        """
         return f"🃏 Dad Joke: {joke}"
@@ -0,0 +1,46 @@
+"""Action for handling the dad joke export and import workflow."""
+
+from pathlib import Path
+from typing import BinaryIO
+
+from taters.services.joke_archive_service import JokeArchiveService
+
+
+class DadJokeArchiveAction:
+    """Action for orchestrating corpus export and import."""
+
+    def __init__(self, service: JokeArchiveService) -> None:
+        """
+        Initialize the dad joke archive action.
+
+        Args:
+            service: The joke archive service.
+        """
+        self.service = service
+
+    async def export(self, stream: BinaryIO, format: str) -> str:
+        """
+        Export every joke seen so far.
+
+        Args:
+            stream: Binary output.
+            format: ``"ndjson"`` or ``"binary"``.
+
+        Returns:
+            A summary line for the CLI.
+        """
+        count = await self.service.export(stream, format)
+        return f"📤 Exported {count} jokes ({format})"
+
+    async def import_archive(self, path: Path) -> str:
+        """
+        Import an archive of jokes.
+
+        Args:
+            path: The archive file, in either format.
+
+        Returns:
+            A summary line for the CLI.
+        """
+        result = await self.service.import_archive(path)
+        return f"📥 Imported {result.read} jokes from {path} ({result.added} new)"
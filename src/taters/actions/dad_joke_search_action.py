@@ -0,0 +1,36 @@
+"""Action for handling the dad joke search workflow."""
+
+from taters.services.joke_search_service import JokeSearchService
+from taters.tracing import span
+
+
+class DadJokeSearchAction:
+    """Action for orchestrating the dad joke search workflow."""
+
+    def __init__(self, service: JokeSearchService) -> None:
+        """
+        Initialize the dad joke search action.
+
+        Args:
+            service: The joke search service.
+        """
+        self.service = service
+
+    async def execute(self, term: str, limit: int, refresh: bool = False) -> list[str]:
+        """
+        Execute the dad joke search action.
+
+        Args:
+            term: The search text.
+            limit: Maximum number of jokes to show.
+            refresh: Harvest fresh results from the API first.
+
+        Returns:
+            Formatted lines ready for CLI output: one per joke, or a single
+            "nothing found" line.
+        """
+        with span("action.dad_joke_search.execute"):
+            jokes = await self.service.search(term, limit, refresh)
+            if not jokes:
+                return [f"🤷 No dad jokes found for '{term}'"]
+            return [f"🔎 {joke.joke}" for joke in jokes]
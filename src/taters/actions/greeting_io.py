@@ -0,0 +1,116 @@
+"""Chunked name input and buffered greeting output for bulk ``taters hello``."""
+
+import csv
+import io
+import json
+from typing import BinaryIO, Iterator, Sequence, TextIO
+
+PLAIN = "plain"
+NDJSON = "ndjson"
+CSV = "csv"
+FORMATS = (PLAIN, NDJSON, CSV)
+
+# Names are read in batches of about this many bytes of input.
+READ_CHUNK_SIZE = 1024 * 1024
+# Greetings are encoded and written in chunks of about this many characters.
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def read_name_batches(
+    stream: TextIO, chunk_size: int = READ_CHUNK_SIZE
+) -> Iterator[list[str]]:
+    """
+    Read names, one per line, in batches.
+
+    Args:
+        stream: Text input, such as an open file or ``sys.stdin``.
+        chunk_size: Approximate number of characters read per batch.
+
+    Yields:
+        Lists of names without their line endings, in input order.
+    """
+    while lines := stream.readlines(chunk_size):
+        yield [line.rstrip("\r\n") for line in lines]
+
+
+class GreetingWriter:
+    """
+    Buffers formatted greetings and writes them to a binary stream in chunks.
+
+    Only one chunk of output is held in memory, and the stream receives one
+    large write per chunk instead of one per greeting.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        format: str = PLAIN,
+        buffer_size: int = WRITE_BUFFER_SIZE,
+    ) -> None:
+        """
+        Initialize the writer.
+
+        Args:
+            stream: Binary output, such as an open file or ``sys.stdout.buffer``.
+            format: ``"plain"`` (one greeting per line), ``"ndjson"``
+                (``{"name", "greeting"}`` per line) or ``"csv"`` (with a
+                ``name,greeting`` header).
+            buffer_size: Characters buffered before a write.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown greeting format: {format}")
+        self.stream = stream
+        self.format = format
+        self.buffer_size = buffer_size
+        self.written = 0
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer, lineterminator="\n")
+        if format == CSV:
+            self._csv.writerow(("name", "greeting"))
+
+    def __enter__(self) -> "GreetingWriter":
+        """Return the writer itself."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Write out whatever is still buffered."""
+        self.flush()
+
+    def write(self, names: Sequence[str], greetings: Sequence[str]) -> None:
+        """
+        Add a batch of greetings to the output.
+
+        Args:
+            names: The names greeted, used by the NDJSON and CSV formats.
+            greetings: One greeting per name.
+        """
+        if not greetings:
+            return
+        buffer = self._buffer
+        if self.format == PLAIN:
+            buffer.write("\n".join(greetings))
+            buffer.write("\n")
+        elif self.format == NDJSON:
+            for name, greeting in zip(names, greetings):
+                buffer.write(
+                    json.dumps({"name": name, "greeting": greeting}, ensure_ascii=False)
+                )
+                buffer.write("\n")
+        else:
+            self._csv.writerows(zip(names, greetings))
+        self.written += len(greetings)
+        if buffer.tell() >= self.buffer_size:
+            self._write_buffer()
+
+    def flush(self) -> None:
+        """Write out the buffered greetings and flush the stream."""
+        self._write_buffer()
+        self.stream.flush()
+
+    def _write_buffer(self) -> None:
+        """Encode the buffered text in one write and start a new chunk."""
+        text = self._buffer.getvalue()
+        if text:
+            self.stream.write(text.encode("utf-8"))
+            self._buffer.seek(0)
+            self._buffer.truncate()
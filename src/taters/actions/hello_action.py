@@ -1,6 +1,8 @@
 """Action for handling hello command workflow."""
 
-from typing import Optional
+from typing import Iterable, Optional
+
+from taters.tracing import span
 
 
 class HelloAction:
@@ -20,6 +22,25 @@ class HelloAction:
         Returns:
             A formatted greeting message ready for CLI output.
         """
+        with span("action.hello.execute"):
+            return self._greet(name)
+
+    def execute_batch(self, names: Iterable[str]) -> list[str]:
+        """
+        Execute the hello action for many names at once.
+
+        Args:
+            names: Names to greet, in order; an empty name gets the generic
+                greeting.
+
+        Returns:
+            One greeting per name, formatted as ``execute`` would.
+        """
+        with span("action.hello.execute_batch"):
+            return [self._greet(name) for name in names]
+
+    def _greet(self, name: Optional[str]) -> str:
+        """Format the greeting for one name, or the generic one without it."""
         if name:
             return f"👋 Hello, {name}!"
         else:
@@ -0,0 +1,268 @@
+"""Action running a batch of Taters commands on one event loop."""
+
+import asyncio
+import json
+import shlex
+from typing import Any, AsyncIterator, NamedTuple, Optional, TextIO
+
+from taters.actions.dad_joke_action import DadJokeAction
+from taters.actions.hello_action import HelloAction
+from taters.daemon.protocol import positive_int
+from taters.repositories.dad_joke_repository import DEFAULT_CONCURRENCY
+from taters.tracing import span
+
+DEFAULT_PARALLELISM = 10
+
+
+class CommandError(ValueError):
+    """Raised when a batch line is not a command ``taters run`` understands."""
+
+
+class Command(NamedTuple):
+    """One parsed batch command, shaped like a daemon protocol request."""
+
+    action: str
+    params: dict[str, Any]
+
+
+class CommandResult(NamedTuple):
+    """Output of one batch command."""
+
+    line_number: int
+    command: str
+    results: list[str]
+    error: Optional[str] = None
+
+
+def parse_command(line: str) -> Command:
+    """
+    Parse one batch line.
+
+    A line is either shell-style arguments, as given to ``taters``, such as
+    ``hello "Ada Lovelace"`` or ``dad-joke --count 3``, or a JSON object
+    like a daemon request, such as ``{"action": "hello", "params": {}}``.
+
+    Args:
+        line: The line, without its newline.
+
+    Returns:
+        The command.
+
+    Raises:
+        CommandError: If the line is malformed or names an unknown command.
+    """
+    text = line.strip()
+    if text.startswith("{"):
+        return _parse_json(text)
+    try:
+        words = shlex.split(text)
+    except ValueError as e:
+        raise CommandError(str(e)) from None
+    if words and words[0] == "taters":
+        words = words[1:]
+    if not words:
+        raise CommandError("Empty command")
+    name, arguments = words[0], words[1:]
+    if name == "hello":
+        if len(arguments) > 1:
+            raise CommandError("hello takes at most one NAME")
+        return Command("hello", {"name": arguments[0] if arguments else None})
+    if name == "dad-joke":
+        return Command("dad-joke", _parse_dad_joke_options(arguments))
+    raise CommandError(f"Unknown command: {name}")
+
+
+async def read_lines(stream: TextIO) -> AsyncIterator[str]:
+    """
+    Read lines from a blocking text stream without blocking the loop.
+
+    Each line is read on a worker thread as soon as the previous one is
+    consumed, so commands piped in slowly start as they arrive.
+
+    Args:
+        stream: The stream, such as ``sys.stdin``.
+
+    Yields:
+        Lines without their trailing newline.
+    """
+    while line := await asyncio.to_thread(stream.readline):
+        yield line.rstrip("\r\n")
+
+
+class RunAction:
+    """Action dispatching batch commands to the hello and dad joke actions."""
+
+    def __init__(
+        self,
+        hello_action: HelloAction,
+        dad_joke_action: DadJokeAction,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> None:
+        """
+        Initialize the run action.
+
+        Args:
+            hello_action: Action answering ``hello`` commands.
+            dad_joke_action: Action answering ``dad-joke`` commands.
+            concurrency: Requests in flight for a ``dad-joke --count`` command
+                that does not give ``--concurrency``.
+        """
+        self.hello_action = hello_action
+        self.dad_joke_action = dad_joke_action
+        self.concurrency = concurrency
+
+    async def execute(
+        self,
+        lines: AsyncIterator[str],
+        parallelism: int = DEFAULT_PARALLELISM,
+        ordered: bool = True,
+    ) -> AsyncIterator[CommandResult]:
+        """
+        Run every command read from ``lines``, up to ``parallelism`` at a time.
+
+        Blank lines and lines starting with ``#`` are skipped. Input is only
+        read while fewer than ``parallelism`` commands are outstanding, and
+        in ordered mode a finished command stays outstanding until it is
+        yielded, so memory is bounded however long the input is.
+
+        Args:
+            lines: Command lines, without newlines.
+            parallelism: Maximum number of commands outstanding at once.
+            ordered: Yield results in input order rather than as they finish.
+
+        Yields:
+            One result per command; failed commands carry an error instead
+            of raising.
+        """
+        pending: dict[int, asyncio.Task[CommandResult]] = {}
+        line_number = 0
+        reading: Optional[asyncio.Task[Optional[str]]] = None
+        exhausted = False
+        try:
+            while True:
+                if reading is None and not exhausted and len(pending) < parallelism:
+                    reading = asyncio.create_task(_next_line(lines))
+                if ordered:
+                    ready = list(pending.values())[:1]
+                else:
+                    ready = list(pending.values())
+                waits: list[asyncio.Task[Any]] = [*ready]
+                if reading is not None:
+                    waits.append(reading)
+                if not waits:
+                    return
+                done, _ = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+                if reading in done:
+                    line = reading.result()
+                    reading = None
+                    if line is None:
+                        exhausted = True
+                    else:
+                        line_number += 1
+                        if line.strip() and not line.lstrip().startswith("#"):
+                            pending[line_number] = asyncio.create_task(
+                                self._run(line_number, line)
+                            )
+                for task in ready:
+                    if task in done:
+                        result = task.result()
+                        del pending[result.line_number]
+                        yield result
+        finally:
+            # Reached early when the consumer stops or is cancelled.
+            unfinished: list[asyncio.Task[Any]] = [*pending.values()]
+            if reading is not None:
+                unfinished.append(reading)
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+
+    async def _run(self, line_number: int, line: str) -> CommandResult:
+        """Run one command, capturing its output or error."""
+        with span("action.run.command", line=line_number):
+            try:
+                command = parse_command(line)
+                results = await self._dispatch(command)
+            except Exception as e:
+                return CommandResult(line_number, line, [], str(e))
+            return CommandResult(line_number, line, results)
+
+    async def _dispatch(self, command: Command) -> list[str]:
+        """Send a command to the action that answers it."""
+        params = command.params
+        if command.action == "hello":
+            # Sync actions run on the worker pool so they never stall the loop.
+            greeting = await asyncio.to_thread(
+                self.hello_action.execute, params.get("name")
+            )
+            return [greeting]
+        if command.action == "dad-joke":
+            count = int(params.get("count", 1))
+            if count == 1:
+                return [await self.dad_joke_action.execute()]
+            concurrency = int(params.get("concurrency") or self.concurrency)
+            return [
+                joke
+                async for joke in self.dad_joke_action.execute_batch(count, concurrency)
+            ]
+        raise CommandError(f"Unknown command: {command.action}")
+
+
+async def _next_line(lines: AsyncIterator[str]) -> Optional[str]:
+    """Get the next line, or None at the end of the input."""
+    return await anext(lines, None)
+
+
+def _parse_json(text: str) -> Command:
+    """Parse a JSON command line."""
+    try:
+        request = json.loads(text)
+    except ValueError as e:
+        raise CommandError(f"Malformed JSON command: {e}") from None
+    if not isinstance(request, dict) or not isinstance(request.get("action"), str):
+        raise CommandError("JSON commands need an 'action' string")
+    params = request.get("params", {})
+    if params is None:
+        params = {}
+    if not isinstance(params, dict):
+        raise CommandError("JSON command 'params' must be an object")
+    if request["action"] not in ("hello", "dad-joke"):
+        raise CommandError(f"Unknown command: {request['action']}")
+    if request["action"] == "dad-joke":
+        params = {
+            **params,
+            **{
+                name: _positive_number(f"JSON command '{name}'", params[name])
+                for name in ("count", "concurrency")
+                if params.get(name) is not None
+            },
+        }
+    return Command(request["action"], params)
+
+
+def _parse_dad_joke_options(arguments: list[str]) -> dict[str, Any]:
+    """Parse the ``--count`` and ``--concurrency`` options of ``dad-joke``."""
+    names = {
+        "--count": "count",
+        "-n": "count",
+        "--concurrency": "concurrency",
+        "-c": "concurrency",
+    }
+    params: dict[str, Any] = {}
+    remaining = iter(arguments)
+    for argument in remaining:
+        option, equals, value = argument.partition("=")
+        if option not in names:
+            raise CommandError(f"Unknown dad-joke option: {argument}")
+        if not equals:
+            value = next(remaining, "")
+        params[names[option]] = _positive_number(option, value)
+    return params
+
+
+def _positive_number(name: str, value: Any) -> int:
+    """Check a ``dad-joke`` count or concurrency like the daemon does."""
+    try:
+        return positive_int(name, value)
+    except ValueError as e:
+        raise CommandError(str(e)) from None
@@ -0,0 +1,126 @@
+"""Console entry point answering completion and ``--help`` without the app.
+
+Shell completion and help requests are answered from the manifest in
+``taters.manifest`` while it is current, so a TAB press costs an interpreter
+start and a JSON read instead of importing Typer, Rich and every command.
+Everything else, and any request the manifest cannot answer, runs the Typer
+app in ``taters.main``; a stale manifest is then rebuilt, and a help page the
+app printed is kept for next time.
+"""
+
+import contextlib
+import io
+import os
+import sys
+from typing import TYPE_CHECKING, Optional, TextIO
+
+from taters import manifest
+
+if TYPE_CHECKING:
+    import typer
+
+
+def main() -> None:
+    """Run the taters CLI."""
+    prog_name = os.path.basename(sys.argv[0]) or "taters"
+    args = sys.argv[1:]
+    instruction = os.environ.get(f"_{prog_name}_COMPLETE".replace("-", "_").upper())
+    if not instruction and args[-1:] != [manifest.HELP_OPTION]:
+        _app()(prog_name=prog_name)
+        return
+
+    document = manifest.load()
+    if instruction:
+        if document is not None:
+            answer = manifest.complete(document, instruction, os.environ)
+            if answer is not None:
+                output, code = answer
+                sys.stdout.write(output)
+                sys.exit(code)
+        _complete_with_app(document, prog_name)
+    else:
+        _help(document, prog_name, args)
+
+
+def _complete_with_app(document: Optional[manifest.Manifest], prog_name: str) -> None:
+    """Let the app complete, then rebuild the manifest if it was stale."""
+    app = _app()
+    try:
+        app(prog_name=prog_name)
+    finally:
+        if document is None:
+            manifest.save(_build(app))
+
+
+def _help(
+    document: Optional[manifest.Manifest], prog_name: str, args: list[str]
+) -> None:
+    """Show a recorded help page, or have the app show and record it."""
+    key = None
+    if document is not None:
+        key = manifest.help_key(document, prog_name, args, sys.stdout, os.environ)
+        page = document["help"].get(key) if key is not None else None
+        if page is not None:
+            sys.stdout.write(page)
+            sys.exit(0)
+
+    app = _app()
+    stdout = sys.stdout
+    tee = _Tee(stdout)
+    try:
+        with contextlib.redirect_stdout(tee):
+            app(prog_name=prog_name)
+    except SystemExit as e:
+        if e.code in (None, 0):
+            if document is None:
+                document = _build(app)
+                key = manifest.help_key(document, prog_name, args, stdout, os.environ)
+            if key is not None:
+                manifest.remember_help(document, key, tee.copy.getvalue())
+            manifest.save(document)
+        raise
+
+
+def _app() -> "typer.Typer":
+    """Import the full app."""
+    from taters.main import app
+
+    return app
+
+
+def _build(app: "typer.Typer") -> manifest.Manifest:
+    """Record the app's command tree."""
+    import typer
+
+    return manifest.build(typer.main.get_command(app))
+
+
+class _Tee(io.TextIOBase):
+    """Text stream writing through to another while keeping a copy."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.copy = io.StringIO()
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        """Encoding of the wrapped stream."""
+        return self.stream.encoding
+
+    def write(self, text: str) -> int:
+        """Write to the wrapped stream and the copy."""
+        written = self.stream.write(text)
+        self.copy.write(text)
+        return written
+
+    def flush(self) -> None:
+        """Flush the wrapped stream."""
+        self.stream.flush()
+
+    def isatty(self) -> bool:
+        """Report whether the wrapped stream is a terminal."""
+        return self.stream.isatty()
+
+    def fileno(self) -> int:
+        """Give the wrapped stream's file descriptor."""
+        return self.stream.fileno()
@@ -0,0 +1,230 @@
+"""Async library API for using Taters from inside a running event loop.
+
+::
+
+    async with TatersClient() as taters:
+        joke = await taters.get_joke(timeout=2.0)
+
+One client can be shared by any number of tasks on the loop that started it.
+"""
+
+import asyncio
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Mapping,
+    Optional,
+    TypeVar,
+    cast,
+)
+
+from taters.config import load_config
+from taters.container import Container, shutdown, startup
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.joke_search_index import DEFAULT_SEARCH_LIMIT
+from taters.services.dad_joke_service import DadJokeService
+from taters.services.joke_search_service import JokeSearchService
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+class TatersClient:
+    """Concurrency-safe async facade over the dad joke and search services."""
+
+    def __init__(
+        self,
+        container: Optional[Container] = None,
+        settings: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        timeout: Optional[float] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            container: Container to run; a private one by default. A container
+                passed in should not be started or stopped by anything else.
+            settings: Overrides merged over the config file and environment,
+                shaped like ``taters.config.DEFAULTS``, such as
+                ``{"cache": {"offline": True}}``.
+            timeout: Default deadline in seconds for each call; None waits
+                indefinitely.
+            max_concurrency: Maximum calls running at once; further calls
+                wait their turn, within their deadline.
+        """
+        self.container = container or Container()
+        self.settings = settings
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._jokes: Optional[DadJokeService] = None
+        self._search: Optional[JokeSearchService] = None
+
+    async def __aenter__(self) -> "TatersClient":
+        """Start the client."""
+        await self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Stop the client."""
+        await self.aclose()
+
+    async def start(self) -> None:
+        """Load the configuration and open the container's resources."""
+        if self._jokes is not None:
+            return
+        settings = await asyncio.to_thread(load_config)
+        self.container.config.from_dict(settings)
+        if self.settings is not None:
+            self.container.config.from_dict(
+                {section: dict(values) for section, values in self.settings.items()}
+            )
+        await startup(self.container)
+        try:
+            self._jokes = await self.container.dad_joke_service.async_()
+            self._search = await self.container.joke_search_service.async_()
+        except BaseException:
+            await shutdown(self.container)
+            raise
+
+    async def aclose(self) -> None:
+        """Wait for background work, then close the container's resources."""
+        if self._jokes is None:
+            return
+        self._jokes = self._search = None
+        await shutdown(self.container)
+
+    async def get_joke(self, timeout: Optional[float] = None) -> str:
+        """
+        Get a dad joke.
+
+        Args:
+            timeout: Deadline in seconds; defaults to the client's.
+
+        Returns:
+            The joke text, or a fallback joke if no source has one.
+
+        Raises:
+            TimeoutError: If the deadline passes first.
+        """
+        service = self._started(self._jokes)
+        async with asyncio.timeout_at(self._deadline(timeout)):
+            async with self._semaphore:
+                return await service.get_joke()
+
+    async def stream_jokes(
+        self,
+        count: int,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream distinct dad jokes as they arrive.
+
+        The deadline covers the whole stream; requests still in flight are
+        cancelled when it passes or the consumer stops early.
+
+        Args:
+            count: Number of distinct jokes wanted.
+            concurrency: Maximum requests in flight; defaults to the
+                ``dad_joke.concurrency`` setting.
+            timeout: Deadline in seconds; defaults to the client's.
+
+        Yields:
+            Joke texts in completion order.
+
+        Raises:
+            TimeoutError: If the deadline passes before the stream ends.
+        """
+        service = self._started(self._jokes)
+        limit = concurrency or self.container.config.dad_joke.concurrency()
+        deadline = self._deadline(timeout)
+        async with asyncio.timeout_at(deadline):
+            await self._semaphore.acquire()
+        try:
+            jokes = cast(AsyncGenerator[str, None], service.get_jokes(count, limit))
+            try:
+                while True:
+                    # Only the wait for the next joke is timed, never the
+                    # caller's own work between jokes.
+                    async with asyncio.timeout_at(deadline):
+                        try:
+                            joke = await anext(jokes)
+                        except StopAsyncIteration:
+                            return
+                    yield joke
+            finally:
+                await jokes.aclose()
+        finally:
+            self._semaphore.release()
+
+    async def get_jokes(
+        self,
+        count: int,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> list[str]:
+        """
+        Get a batch of distinct dad jokes.
+
+        Args:
+            count: Number of distinct jokes wanted.
+            concurrency: Maximum requests in flight; defaults to the
+                ``dad_joke.concurrency`` setting.
+            timeout: Deadline in seconds for the whole batch.
+
+        Returns:
+            Joke texts in completion order.
+
+        Raises:
+            TimeoutError: If the deadline passes first.
+        """
+        return [joke async for joke in self.stream_jokes(count, concurrency, timeout)]
+
+    async def search(
+        self,
+        term: str,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        refresh: bool = False,
+        timeout: Optional[float] = None,
+    ) -> list[DadJoke]:
+        """
+        Search jokes seen so far, asking the API when none match.
+
+        Args:
+            term: The search text.
+            limit: Maximum number of jokes to return.
+            refresh: Harvest the API's results before answering.
+            timeout: Deadline in seconds; defaults to the client's.
+
+        Returns:
+            Matching jokes.
+
+        Raises:
+            TimeoutError: If the deadline passes first.
+        """
+        service = self._started(self._search)
+        async with asyncio.timeout_at(self._deadline(timeout)):
+            async with self._semaphore:
+                return await service.search(term, limit, refresh)
+
+    def _deadline(self, timeout: Optional[float]) -> Optional[float]:
+        """Turn a per-call or default timeout into an absolute loop time."""
+        seconds = timeout if timeout is not None else self.timeout
+        if seconds is None:
+            return None
+        return asyncio.get_running_loop().time() + seconds
+
+    def _started(self, service: Optional[T]) -> T:
+        """Return a resolved service, or explain that the client is closed."""
+        if service is None:
+            raise RuntimeError("TatersClient is not started; use 'async with'")
+        return service
@@ -0,0 +1,294 @@
+"""Layered configuration feeding ``Container.config``.
+
+Settings are merged once per process, lowest precedence first, from:
+
+1. the defaults in ``DEFAULTS``;
+2. ``config.toml`` in the XDG config directory, or the file given explicitly;
+3. the ``[profiles.<name>]`` table of that file selected by ``--profile``;
+4. ``TATERS_<SECTION>_<KEY>`` environment variables;
+5. ``--set section.key=value`` options on the command line.
+
+Only commands that build the container load this module, so it adds nothing
+to the startup of ``taters hello``.
+"""
+
+import copy
+import functools
+import os
+import tomllib
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional
+
+from taters import runtime
+from taters.actions.run_action import DEFAULT_PARALLELISM
+from taters.repositories.dad_joke_repository import (
+    API_URL_ENV_VAR,
+    DEFAULT_BASE_URL,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_MAX_BODY_SIZE,
+    DEFAULT_USER_AGENT,
+)
+from taters.repositories import bloom_filter, http_client
+from taters.repositories.corpus_joke_repository import CORPUS_ENV_VAR
+from taters.repositories.dns_cache import DEFAULT_DNS_TTL
+from taters.repositories.joke_cache_repository import (
+    DEFAULT_MAX_ENTRIES,
+    DEFAULT_TTL_SECONDS,
+)
+from taters.repositories.rate_limiter import DEFAULT_BURST, DEFAULT_RATE
+from taters.repositories.retry_policy import RetryPolicy
+from taters.repositories.storage import config_dir
+from taters.services import (
+    circuit_breaker,
+    dad_joke_service,
+    hedged_joke_source,
+    joke_prefetch_pool,
+)
+
+CONFIG_FILENAME = "config.toml"
+ENV_PREFIX = "TATERS_"
+
+DEFAULTS: dict[str, dict[str, Any]] = {
+    "api": {
+        "base_url": DEFAULT_BASE_URL,
+        "user_agent": DEFAULT_USER_AGENT,
+        "timeout": http_client.DEFAULT_TIMEOUT,
+        "max_connections": http_client.DEFAULT_MAX_CONNECTIONS,
+        "max_keepalive_connections": http_client.DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        "keepalive_expiry": http_client.DEFAULT_KEEPALIVE_EXPIRY,
+        "http2": False,
+        "max_body_size": DEFAULT_MAX_BODY_SIZE,
+    },
+    "dns": {"ttl_seconds": DEFAULT_DNS_TTL},
+    "rate_limit": {"rate": DEFAULT_RATE, "burst": DEFAULT_BURST},
+    "retry": {
+        "max_attempts": RetryPolicy.max_attempts,
+        "base_delay": RetryPolicy.base_delay,
+        "max_delay": RetryPolicy.max_delay,
+        "deadline": RetryPolicy.deadline,
+    },
+    "circuit_breaker": {
+        "failure_threshold": circuit_breaker.DEFAULT_FAILURE_THRESHOLD,
+        "reset_timeout": circuit_breaker.DEFAULT_RESET_TIMEOUT,
+    },
+    "cache": {
+        "offline": False,
+        "max_entries": DEFAULT_MAX_ENTRIES,
+        "ttl_seconds": DEFAULT_TTL_SECONDS,
+    },
+    "prefetch": {
+        "capacity": joke_prefetch_pool.DEFAULT_CAPACITY,
+        "low_water_mark": joke_prefetch_pool.DEFAULT_LOW_WATER_MARK,
+        "concurrency": joke_prefetch_pool.DEFAULT_REFILL_CONCURRENCY,
+    },
+    "hedge": {
+        "default_delay": hedged_joke_source.DEFAULT_HEDGE_DELAY,
+        "min_samples": hedged_joke_source.DEFAULT_MIN_SAMPLES,
+        "window": hedged_joke_source.DEFAULT_WINDOW,
+    },
+    "corpus": {"path": ""},
+    "dad_joke": {"concurrency": DEFAULT_CONCURRENCY, "single_flight": False},
+    "seen": {
+        "initial_capacity": bloom_filter.DEFAULT_INITIAL_CAPACITY,
+        "error_rate": bloom_filter.DEFAULT_ERROR_RATE,
+        "max_refetches": dad_joke_service.DEFAULT_MAX_REFETCHES,
+    },
+    "run": {"parallelism": DEFAULT_PARALLELISM},
+    "runtime": {"loop": runtime.AUTO},
+}
+
+# Range checks for numeric settings, as (test, what the test requires).
+Bound = tuple[Callable[[Any], bool], str]
+_POSITIVE: Bound = (lambda value: value > 0, "greater than 0")
+_NON_NEGATIVE: Bound = (lambda value: value >= 0, "at least 0")
+_AT_LEAST_ONE: Bound = (lambda value: value >= 1, "at least 1")
+_FRACTION: Bound = (lambda value: 0 < value < 1, "between 0 and 1")
+
+# Settings missing here take any value of the right type. A 0 that turns a
+# feature off, such as dns.ttl_seconds or prefetch.capacity, is allowed.
+BOUNDS: dict[str, dict[str, Bound]] = {
+    "api": {
+        "timeout": _POSITIVE,
+        "max_connections": _POSITIVE,
+        "max_keepalive_connections": _NON_NEGATIVE,
+        "keepalive_expiry": _NON_NEGATIVE,
+        "max_body_size": _POSITIVE,
+    },
+    "dns": {"ttl_seconds": _NON_NEGATIVE},
+    "rate_limit": {"rate": _POSITIVE, "burst": _AT_LEAST_ONE},
+    "retry": {
+        "max_attempts": _POSITIVE,
+        "base_delay": _NON_NEGATIVE,
+        "max_delay": _NON_NEGATIVE,
+        "deadline": _POSITIVE,
+    },
+    "circuit_breaker": {
+        "failure_threshold": _POSITIVE,
+        "reset_timeout": _NON_NEGATIVE,
+    },
+    "cache": {"max_entries": _NON_NEGATIVE, "ttl_seconds": _NON_NEGATIVE},
+    "prefetch": {
+        "capacity": _NON_NEGATIVE,
+        "low_water_mark": _NON_NEGATIVE,
+        "concurrency": _POSITIVE,
+    },
+    "hedge": {
+        "default_delay": _NON_NEGATIVE,
+        "min_samples": _POSITIVE,
+        "window": _POSITIVE,
+    },
+    "dad_joke": {"concurrency": _POSITIVE},
+    "seen": {
+        "initial_capacity": _POSITIVE,
+        "error_rate": _FRACTION,
+        "max_refetches": _NON_NEGATIVE,
+    },
+    "run": {"parallelism": _POSITIVE},
+}
+
+# Older variables, still honoured, for the knobs they have always set.
+ENV_ALIASES = {API_URL_ENV_VAR: ("api", "base_url"), CORPUS_ENV_VAR: ("corpus", "path")}
+
+_TRUE = frozenset({"1", "true", "yes", "on"})
+_FALSE = frozenset({"0", "false", "no", "off"})
+
+
+class ConfigError(Exception):
+    """Raised when a configuration source has unknown keys or bad values."""
+
+
+def default_config_path() -> Path:
+    """
+    Get the configuration file read when none is given.
+
+    Returns:
+        ``config.toml`` in the XDG config directory.
+    """
+    return config_dir() / CONFIG_FILENAME
+
+
+def load_config(
+    path: Optional[Path] = None,
+    profile: Optional[str] = None,
+    overrides: tuple[str, ...] = (),
+) -> dict[str, dict[str, Any]]:
+    """
+    Merge every configuration source into one nested dict.
+
+    The merge is done once per set of arguments and cached for the life of
+    the process; each caller gets its own copy.
+
+    Args:
+        path: TOML file to read. Defaults to ``default_config_path()``, which
+            may be missing; an explicitly given file must exist.
+        profile: Name of a ``[profiles.<name>]`` table to apply.
+        overrides: ``section.key=value`` strings, applied last.
+
+    Returns:
+        Settings shaped like ``DEFAULTS``, ready for ``Configuration.from_dict``.
+
+    Raises:
+        ConfigError: If a source is unreadable or has unknown keys or bad values.
+    """
+    return copy.deepcopy(_merged(path, profile, overrides))
+
+
+@functools.cache
+def _merged(
+    path: Optional[Path], profile: Optional[str], overrides: tuple[str, ...]
+) -> dict[str, dict[str, Any]]:
+    """Merge the sources described in ``load_config``."""
+    settings = copy.deepcopy(DEFAULTS)
+    document = _read_toml(path)
+    profiles = document.pop("profiles", {})
+    _apply(settings, document, f"{path or default_config_path()}")
+    if profile is not None:
+        if not isinstance(profiles, dict) or profile not in profiles:
+            raise ConfigError(f"Unknown profile '{profile}'")
+        _apply(settings, profiles[profile], f"profile '{profile}'")
+    _apply(settings, _from_environment(os.environ), "environment")
+    _apply(settings, _from_overrides(overrides), "--set")
+    return settings
+
+
+def _read_toml(path: Optional[Path]) -> dict[str, Any]:
+    """Read the configuration file; a missing default file is empty."""
+    target = path or default_config_path()
+    try:
+        with target.open("rb") as document:
+            return tomllib.load(document)
+    except FileNotFoundError:
+        if path is None:
+            return {}
+        raise ConfigError(f"Config file {path} does not exist") from None
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise ConfigError(f"Cannot read {target}: {e}") from e
+
+
+def _from_environment(environ: Mapping[str, str]) -> dict[str, dict[str, Any]]:
+    """Collect ``TATERS_<SECTION>_<KEY>`` variables and the older aliases."""
+    found: dict[str, dict[str, Any]] = {}
+    for name, (section, key) in ENV_ALIASES.items():
+        if environ.get(name):
+            found.setdefault(section, {})[key] = environ[name]
+    for section, keys in DEFAULTS.items():
+        for key in keys:
+            name = f"{ENV_PREFIX}{section}_{key}".upper()
+            if name in environ:
+                found.setdefault(section, {})[key] = environ[name]
+    return found
+
+
+def _from_overrides(overrides: tuple[str, ...]) -> dict[str, dict[str, Any]]:
+    """Parse ``section.key=value`` strings."""
+    found: dict[str, dict[str, Any]] = {}
+    for override in overrides:
+        name, separator, value = override.partition("=")
+        section, dot, key = name.strip().partition(".")
+        if not separator or not dot:
+            raise ConfigError(f"Expected section.key=value, got '{override}'")
+        found.setdefault(section, {})[key] = value.strip()
+    return found
+
+
+def _apply(
+    settings: dict[str, dict[str, Any]], layer: Mapping[str, Any], source: str
+) -> None:
+    """Validate one layer against ``DEFAULTS`` and merge it into ``settings``."""
+    for section, values in layer.items():
+        if section not in DEFAULTS or not isinstance(values, Mapping):
+            raise ConfigError(f"Unknown section '{section}' in {source}")
+        for key, value in values.items():
+            if key not in DEFAULTS[section]:
+                raise ConfigError(f"Unknown setting '{section}.{key}' in {source}")
+            default = DEFAULTS[section][key]
+            try:
+                coerced = _coerce(value, type(default))
+            except (TypeError, ValueError):
+                raise ConfigError(
+                    f"Invalid value {value!r} for '{section}.{key}' in {source}: "
+                    f"expected {type(default).__name__}"
+                ) from None
+            bound = BOUNDS.get(section, {}).get(key)
+            if bound is not None and not bound[0](coerced):
+                raise ConfigError(
+                    f"Invalid value {value!r} for '{section}.{key}' in {source}: "
+                    f"must be {bound[1]}"
+                )
+            settings[section][key] = coerced
+
+
+def _coerce(value: Any, kind: type) -> Any:
+    """Convert a TOML value or a string to the type of its default."""
+    if isinstance(value, str) and kind is not str:
+        text = value.strip().lower()
+        if kind is bool:
+            if text in _TRUE or text in _FALSE:
+                return text in _TRUE
+            raise ValueError(value)
+        return kind(text)
+    if kind is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if type(value) is not kind:
+        raise TypeError(value)
+    return value
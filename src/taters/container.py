@@ -1,26 +1,320 @@
 """Dependency injection container for the Taters CLI application."""
 
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Optional
+
 from dependency_injector import containers, providers
 
+from taters.config import DEFAULTS
+from taters.repositories.dns_cache import init_dns_cache
+from taters.repositories.http_client import init_http_client
 from taters.repositories.dad_joke_repository import DadJokeRepository
+from taters.repositories.rate_limiter import TokenBucket
+from taters.repositories.retry_policy import RetryPolicy
+from taters.repositories.joke_cache_repository import init_joke_cache
+from taters.repositories.cached_dad_joke_repository import CachedDadJokeRepository
+from taters.repositories.corpus_joke_repository import CorpusJokeRepository
+from taters.repositories.joke_pool_repository import init_joke_pool_repository
+from taters.repositories.joke_search_index import init_joke_search_index
+from taters.repositories.seen_joke_repository import init_seen_jokes
+from taters.repositories.circuit_state_repository import (
+    init_circuit_state_repository,
+)
+from taters.services.circuit_breaker import (
+    CircuitBreakerJokeSource,
+    init_circuit_breaker,
+)
 from taters.services.dad_joke_service import DadJokeService
+from taters.services.hedged_joke_source import (
+    HedgedJokeSource,
+    init_latency_tracker,
+)
+from taters.services.joke_prefetch_pool import init_prefetch_pool
+from taters.services.single_flight import SingleFlight
+from taters.services.joke_search_service import JokeSearchService
+from taters.services.joke_archive_service import JokeArchiveService
 from taters.actions.dad_joke_action import DadJokeAction
+from taters.actions.dad_joke_search_action import DadJokeSearchAction
+from taters.actions.dad_joke_archive_action import DadJokeArchiveAction
 from taters.actions.hello_action import HelloAction
+from taters.actions.run_action import RunAction
+from taters.lifecycle import Lifecycle
+from taters.tracing import span
+
+
+def _optional_path(value: str) -> Optional[Path]:
+    """Treat an empty path setting as unset."""
+    return Path(value) if value else None
 
 
 class Container(containers.DeclarativeContainer):
     """Dependency injection container."""
 
-    # Configuration
-    config = providers.Configuration()
+    # Configuration; the CLI merges taters.config.load_config() over DEFAULTS
+    config = providers.Configuration(default=DEFAULTS)
+
+    # Startup and shutdown hooks; the only singleton kept across restarts
+    lifecycle = providers.Singleton(Lifecycle)
+
+    # Resources (opened by init_resources, closed by shutdown_resources)
+    # None when dns.ttl_seconds is 0
+    dns_cache = providers.Resource(
+        init_dns_cache, ttl_seconds=config.dns.ttl_seconds.as_float()
+    )
+
+    http_client = providers.Resource(
+        init_http_client,
+        timeout=config.api.timeout.as_float(),
+        max_connections=config.api.max_connections.as_int(),
+        max_keepalive_connections=config.api.max_keepalive_connections.as_int(),
+        keepalive_expiry=config.api.keepalive_expiry.as_float(),
+        http2=config.api.http2.as_(bool),
+        resolver=dns_cache,
+    )
+
+    joke_cache = providers.Resource(
+        init_joke_cache,
+        max_entries=config.cache.max_entries.as_int(),
+        ttl_seconds=config.cache.ttl_seconds.as_float(),
+    )
+
+    joke_pool_repository = providers.Resource(init_joke_pool_repository)
+
+    circuit_state_repository = providers.Resource(init_circuit_state_repository)
+
+    joke_search_index = providers.Resource(init_joke_search_index)
+
+    # Ids of jokes already shown, saved back on shutdown
+    seen_jokes = providers.Resource(
+        init_seen_jokes,
+        initial_capacity=config.seen.initial_capacity.as_int(),
+        error_rate=config.seen.error_rate.as_float(),
+    )
+
+    # Shared by every repository instance so the total request rate is bounded
+    dad_joke_rate_limiter = providers.Singleton(
+        TokenBucket,
+        rate=config.rate_limit.rate.as_float(),
+        burst=config.rate_limit.burst.as_float(),
+    )
+
+    retry_policy = providers.Singleton(
+        RetryPolicy,
+        max_attempts=config.retry.max_attempts.as_int(),
+        base_delay=config.retry.base_delay.as_float(),
+        max_delay=config.retry.max_delay.as_float(),
+        deadline=config.retry.deadline.as_float(),
+    )
 
     # Repositories (lowest layer)
-    dad_joke_repository = providers.Factory(DadJokeRepository)
+    dad_joke_repository = providers.Singleton(
+        DadJokeRepository,
+        client=http_client,
+        rate_limiter=dad_joke_rate_limiter,
+        retry_policy=retry_policy,
+        base_url=config.api.base_url,
+        search_index=joke_search_index,
+        user_agent=config.api.user_agent,
+        max_body_size=config.api.max_body_size.as_int(),
+    )
+
+    # Services guarding the repositories
+    dad_joke_circuit_breaker = providers.Resource(
+        init_circuit_breaker,
+        store=circuit_state_repository,
+        failure_threshold=config.circuit_breaker.failure_threshold.as_int(),
+        reset_timeout=config.circuit_breaker.reset_timeout.as_float(),
+    )
+
+    guarded_dad_joke_repository = providers.Singleton(
+        CircuitBreakerJokeSource,
+        source=dad_joke_repository,
+        breaker=dad_joke_circuit_breaker,
+    )
+
+    # Sits outside the breaker so an open circuit falls back to cached jokes
+    cached_dad_joke_repository = providers.Singleton(
+        CachedDadJokeRepository,
+        repository=guarded_dad_joke_repository,
+        cache=joke_cache,
+        offline=config.cache.offline.as_(bool),
+    )
+
+    # Writes fetched jokes to the cache but never answers from it
+    live_dad_joke_repository = providers.Singleton(
+        CachedDadJokeRepository,
+        repository=guarded_dad_joke_repository,
+        cache=joke_cache,
+        fallback=False,
+    )
+
+    # Loaded once per process from the corpus.path archive, if set
+    corpus_joke_repository = providers.Singleton(
+        CorpusJokeRepository, path=config.corpus.path.as_(_optional_path)
+    )
+
+    # Saved back on shutdown so one-shot CLI runs learn the API's p95 together
+    dad_joke_latency = providers.Resource(
+        init_latency_tracker,
+        window=config.hedge.window.as_int(),
+        min_samples=config.hedge.min_samples.as_int(),
+        default_delay=config.hedge.default_delay.as_float(),
+    )
+
+    # Races the API against the corpus once it is slower than its p95. The
+    # cache is no backup: it would answer with jokes the user has seen.
+    hedged_dad_joke_repository = providers.Singleton(
+        HedgedJokeSource,
+        sources=providers.List(cached_dad_joke_repository, corpus_joke_repository),
+        latency=dad_joke_latency,
+        seen=seen_jokes,
+    )
 
     # Services (middle layer)
-    dad_joke_service = providers.Factory(DadJokeService, repository=dad_joke_repository)
+    # Refills use the live API alone: hedging or the cache would top the pool
+    # up with seen jokes, so offline the pool is only drawn down
+    prefetch_pool = providers.Resource(
+        init_prefetch_pool,
+        source=live_dad_joke_repository,
+        store=joke_pool_repository,
+        capacity=config.prefetch.capacity.as_int(),
+        low_water_mark=config.prefetch.low_water_mark.as_int(),
+        concurrency=config.prefetch.concurrency.as_int(),
+        offline=config.cache.offline.as_(bool),
+    )
+
+    # Shared by every service instance so concurrent callers can be coalesced
+    dad_joke_single_flight: providers.Singleton[SingleFlight[Optional[str]]] = (
+        providers.Singleton(
+            SingleFlight, enabled=config.dad_joke.single_flight.as_(bool)
+        )
+    )
+
+    dad_joke_service = providers.Singleton(
+        DadJokeService,
+        repository=hedged_dad_joke_repository,
+        prefetch_pool=prefetch_pool,
+        single_flight=dad_joke_single_flight,
+        seen=seen_jokes,
+        max_refetches=config.seen.max_refetches.as_int(),
+    )
+
+    joke_search_service = providers.Singleton(
+        JokeSearchService,
+        repository=dad_joke_repository,
+        index=joke_search_index,
+        offline=config.cache.offline.as_(bool),
+    )
+
+    joke_archive_service = providers.Singleton(
+        JokeArchiveService, index=joke_search_index, cache=joke_cache
+    )
 
     # Actions (top layer)
-    hello_action = providers.Factory(HelloAction)
+    hello_action = providers.Singleton(HelloAction)
+
+    dad_joke_action = providers.Singleton(DadJokeAction, service=dad_joke_service)
+
+    dad_joke_search_action = providers.Singleton(
+        DadJokeSearchAction, service=joke_search_service
+    )
+
+    dad_joke_archive_action = providers.Singleton(
+        DadJokeArchiveAction, service=joke_archive_service
+    )
+
+    run_action = providers.Singleton(
+        RunAction,
+        hello_action=hello_action,
+        dad_joke_action=dad_joke_action,
+        concurrency=config.dad_joke.concurrency.as_int(),
+    )
+
+
+_process_container: Optional[Container] = None
+
+
+def get_container() -> Container:
+    """
+    Get the container shared by everything in this process.
+
+    Returns:
+        The same ``Container`` on every call, created on first use.
+    """
+    global _process_container
+    if _process_container is None:
+        _process_container = Container()
+    return _process_container
+
+
+async def startup(container: Container) -> None:
+    """
+    Initialize the container's resources, then run its startup hooks.
+
+    If a hook fails, the container is shut down again before re-raising.
+
+    Args:
+        container: The container to start.
+    """
+    with span("container.init_resources"):
+        await _maybe_await(container.init_resources())
+    try:
+        await container.lifecycle().run_startup()
+    except BaseException:
+        await _shutdown(container)
+        raise
+
+
+async def shutdown(container: Container) -> None:
+    """
+    Run the container's shutdown hooks, then close its resources.
+
+    Singletons built from the closed resources are discarded, so the same
+    container can be started again.
+
+    Args:
+        container: The container to stop.
+    """
+    with span("container.shutdown_resources"):
+        try:
+            await container.lifecycle().run_shutdown()
+        finally:
+            await _shutdown(container)
+
+
+@asynccontextmanager
+async def lifespan(container: Container) -> AsyncIterator[Container]:
+    """
+    Start the container and shut it down on exit.
+
+    Args:
+        container: The container whose lifecycle should be managed.
+
+    Yields:
+        The same container, with resources such as the HTTP client open.
+    """
+    await startup(container)
+    try:
+        yield container
+    finally:
+        await shutdown(container)
+
+
+async def _shutdown(container: Container) -> None:
+    """Shut the container's resources down, background work first."""
+    # Resource shutdown is not dependency-ordered, so let background refills
+    # and recovery probes finish before the HTTP client and databases they
+    # use are closed. Refills go through the breaker, so they stop first.
+    await _maybe_await(container.prefetch_pool.shutdown())
+    await _maybe_await(container.dad_joke_circuit_breaker.shutdown())
+    await _maybe_await(container.shutdown_resources())
+    for provider in container.traverse(types=[providers.Singleton]):
+        if provider is not container.lifecycle:
+            provider.reset()
+
 
-    dad_joke_action = providers.Factory(DadJokeAction, service=dad_joke_service)
+async def _maybe_await(result: Optional[Awaitable[None]]) -> None:
+    """Await a resource lifecycle call when it produced an awaitable."""
+    if result is not None:
+        await result
@@ -0,0 +1,74 @@
+"""Thin synchronous client for the Taters daemon."""
+
+import socket
+from typing import Any, Iterator, Optional
+
+from taters.daemon.protocol import (
+    DaemonError,
+    DaemonUnavailableError,
+    decode,
+    default_socket_path,
+    encode,
+)
+
+DEFAULT_TIMEOUT = 30.0
+
+
+class DaemonClient:
+    """Client that forwards commands to a running ``taters serve`` daemon."""
+
+    def __init__(
+        self, socket_path: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT
+    ) -> None:
+        """
+        Initialize the daemon client.
+
+        Args:
+            socket_path: Unix socket of the daemon. Defaults to the standard path.
+            timeout: Seconds to wait for each response line.
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def request(
+        self, action: str, params: Optional[dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """
+        Run an action on the daemon and stream its results.
+
+        The connection is opened on first iteration, so ``DaemonUnavailableError``
+        is raised before any result is produced.
+
+        Args:
+            action: Name of the action, e.g. ``"hello"`` or ``"dad-joke"``.
+            params: Action parameters.
+
+        Yields:
+            Each result line produced by the action.
+
+        Raises:
+            DaemonUnavailableError: If no daemon is listening.
+            DaemonError: If the action fails or the daemon disconnects early.
+        """
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self.timeout)
+        try:
+            connection.connect(self.socket_path)
+        except OSError as e:
+            connection.close()
+            raise DaemonUnavailableError(
+                f"No daemon listening on {self.socket_path}"
+            ) from e
+
+        with connection, connection.makefile("rb") as stream:
+            connection.sendall(
+                encode({"id": 1, "action": action, "params": params or {}})
+            )
+            for line in stream:
+                message = decode(line)
+                if "error" in message:
+                    raise DaemonError(str(message["error"]))
+                if message.get("done"):
+                    return
+                yield str(message["result"])
+        raise DaemonError("Daemon closed the connection before finishing")
@@ -0,0 +1,95 @@
+"""Line-delimited JSON protocol spoken over the Taters daemon socket."""
+
+import json
+import os
+import tempfile
+from typing import Any
+
+SOCKET_ENV_VAR = "TATERS_SOCKET"
+
+
+class DaemonError(Exception):
+    """Raised when the daemon reports an error or breaks the protocol."""
+
+
+class DaemonUnavailableError(DaemonError):
+    """Raised when no daemon is listening on the socket."""
+
+
+def default_socket_path() -> str:
+    """
+    Get the Unix socket path the daemon listens on.
+
+    Uses ``$TATERS_SOCKET`` if set, then ``$XDG_RUNTIME_DIR/taters.sock``,
+    falling back to a per-user file in the system temp directory.
+
+    Returns:
+        The socket path.
+    """
+    configured = os.environ.get(SOCKET_ENV_VAR)
+    if configured:
+        return configured
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "taters.sock")
+    return os.path.join(tempfile.gettempdir(), f"taters-{os.getuid()}.sock")
+
+
+def positive_int(name: str, value: Any) -> int:
+    """
+    Check a request's ``count`` or ``concurrency``, given as an int or a string.
+
+    Args:
+        name: How to refer to the value in an error.
+        value: The value as received.
+
+    Returns:
+        The value as an int.
+
+    Raises:
+        ValueError: If ``value`` is not a whole number of at least 1.
+    """
+    try:
+        if isinstance(value, (bool, float)):
+            raise TypeError
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} expects a number, got '{value}'") from None
+    if number < 1:
+        raise ValueError(f"{name} must be at least 1")
+    return number
+
+
+def encode(message: dict[str, Any]) -> bytes:
+    """
+    Encode a message as one protocol line.
+
+    Args:
+        message: The JSON-serializable message.
+
+    Returns:
+        UTF-8 JSON followed by a newline.
+    """
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def decode(line: bytes) -> dict[str, Any]:
+    """
+    Decode one protocol line.
+
+    Args:
+        line: A single line received from the socket.
+
+    Returns:
+        The decoded message.
+
+    Raises:
+        DaemonError: If the line is not a JSON object.
+    """
+    try:
+        message = json.loads(line)
+    except ValueError as e:
+        raise DaemonError(f"Malformed message: {e}") from e
+    if not isinstance(message, dict):
+        raise DaemonError("Malformed message: expected a JSON object")
+    return message
@@ -0,0 +1,153 @@
+"""Long-running daemon serving Taters actions over a Unix socket."""
+
+import asyncio
+import contextlib
+import json
+import os
+import socket
+from typing import Any, AsyncIterator, Callable, Optional
+
+from taters.container import Container
+from taters.daemon.protocol import DaemonError, decode, encode, positive_int
+
+Handler = Callable[[dict[str, Any]], AsyncIterator[str]]
+
+
+class DaemonServer:
+    """Dispatches protocol requests to actions from one long-lived container."""
+
+    def __init__(self, container: Container, socket_path: str) -> None:
+        """
+        Initialize the daemon server.
+
+        Args:
+            container: Container whose resources are already initialized.
+            socket_path: Unix socket path to listen on.
+        """
+        self.container = container
+        self.socket_path = socket_path
+        self._handlers: dict[str, Handler] = {
+            "hello": self._hello,
+            "dad-joke": self._dad_joke,
+            "stats": self._stats,
+        }
+        self._connections: set[asyncio.Task[Any]] = set()
+
+    async def serve(
+        self, stop: asyncio.Event, on_ready: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Accept connections until ``stop`` is set, then remove the socket.
+
+        Connections still open when ``stop`` is set are closed, so an idle
+        client cannot hold up shutdown.
+
+        Args:
+            stop: Event that ends the server when set.
+            on_ready: Called once the socket is accepting connections.
+
+        Raises:
+            DaemonError: If another daemon is already listening on the socket.
+        """
+        self._claim_socket_path()
+        server = await asyncio.start_unix_server(self._accept, path=self.socket_path)
+        try:
+            async with server:
+                if on_ready is not None:
+                    on_ready()
+                await stop.wait()
+                server.close()
+                await self._close_connections()
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+
+    def _accept(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handle a new connection in a task that shutdown can cancel."""
+        task = asyncio.create_task(self._handle_connection(reader, writer))
+        self._connections.add(task)
+        task.add_done_callback(self._connections.discard)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer every request line sent on one client connection."""
+        try:
+            while line := await reader.readline():
+                await self._handle_request(line, writer.write)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _close_connections(self) -> None:
+        """Cancel the handlers of open connections and wait for them to close."""
+        connections = list(self._connections)
+        for task in connections:
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+
+    async def _handle_request(self, line: bytes, write: Callable[[bytes], Any]) -> None:
+        """Run one request and write its result, done or error lines."""
+        request_id: Any = None
+        try:
+            request = decode(line)
+            request_id = request.get("id")
+            handler = self._handlers.get(str(request.get("action")))
+            if handler is None:
+                raise DaemonError(f"Unknown action: {request.get('action')}")
+            params = request.get("params") or {}
+            async for result in handler(params):
+                write(encode({"id": request_id, "result": result}))
+            write(encode({"id": request_id, "done": True}))
+        except Exception as e:
+            write(encode({"id": request_id, "error": str(e)}))
+
+    async def _hello(self, params: dict[str, Any]) -> AsyncIterator[str]:
+        """Run HelloAction."""
+        action = self.container.hello_action()
+        yield action.execute(params.get("name"))
+
+    async def _dad_joke(self, params: dict[str, Any]) -> AsyncIterator[str]:
+        """Run DadJokeAction for one joke or a streamed batch."""
+        count = positive_int("count", params.get("count", 1))
+        concurrency = params.get("concurrency")
+        if concurrency is not None:
+            concurrency = positive_int("concurrency", concurrency)
+        action = await self.container.dad_joke_action.async_()
+        if count == 1:
+            yield await action.execute()
+        else:
+            limit = concurrency or self.container.config.dad_joke.concurrency()
+            async for joke in action.execute_batch(count, limit):
+                yield joke
+
+    async def _stats(self, params: dict[str, Any]) -> AsyncIterator[str]:
+        """Report how many dad joke requests were coalesced."""
+        stats = self.container.dad_joke_single_flight().stats
+        yield json.dumps(
+            {
+                "calls": stats.calls,
+                "upstream_calls": stats.upstream_calls,
+                "coalesced": stats.coalesced,
+            }
+        )
+
+    def _claim_socket_path(self) -> None:
+        """Remove a stale socket file, refusing if a daemon still answers on it."""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise DaemonError(f"A daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
@@ -0,0 +1,64 @@
+"""Startup and shutdown hooks for applications embedding the container."""
+
+from typing import Awaitable, Callable, Optional
+
+Hook = Callable[[], Awaitable[None]]
+
+
+class Lifecycle:
+    """Ordered startup and shutdown hooks, run by ``taters.container.startup``."""
+
+    def __init__(self) -> None:
+        """Initialize an empty lifecycle."""
+        self.running = False
+        self._startup: list[Hook] = []
+        self._shutdown: list[Hook] = []
+
+    def on_startup(self, hook: Hook) -> Hook:
+        """
+        Register a hook run after the container's resources are initialized.
+
+        Args:
+            hook: Coroutine function taking no arguments.
+
+        Returns:
+            The hook, so this can be used as a decorator.
+        """
+        self._startup.append(hook)
+        return hook
+
+    def on_shutdown(self, hook: Hook) -> Hook:
+        """
+        Register a hook run before the container's resources are shut down.
+
+        Args:
+            hook: Coroutine function taking no arguments.
+
+        Returns:
+            The hook, so this can be used as a decorator.
+        """
+        self._shutdown.append(hook)
+        return hook
+
+    async def run_startup(self) -> None:
+        """Run the startup hooks in registration order."""
+        for hook in self._startup:
+            await hook()
+        self.running = True
+
+    async def run_shutdown(self) -> None:
+        """
+        Run the shutdown hooks in reverse registration order.
+
+        Every hook runs even if an earlier one fails; the first error is
+        re-raised afterwards.
+        """
+        self.running = False
+        error: Optional[Exception] = None
+        for hook in reversed(self._shutdown):
+            try:
+                await hook()
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
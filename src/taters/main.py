@@ -1,40 +1,586 @@
 """Main CLI application for Taters."""
 
-import asyncio
-from typing import Optional
+from enum import Enum
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ContextManager,
+    Coroutine,
+    NamedTuple,
+    Optional,
+    TextIO,
+    TypeVar,
+)
 
 import typer
 
-from taters.container import Container
+from taters.plugins import PluginGroup
 
+if TYPE_CHECKING:
+    from taters.actions.hello_action import HelloAction
+    from taters.container import Container
 
-app = typer.Typer(help="🥔 Taters - A Python CLI accelerator")
+T = TypeVar("T")
+
+app = typer.Typer(help="🥔 Taters - A Python CLI accelerator", cls=PluginGroup)
+dad_joke_app = typer.Typer()
+app.add_typer(dad_joke_app, name="dad-joke")
+
+
+class ArchiveFormat(str, Enum):
+    """Formats accepted by ``dad-joke export``."""
+
+    NDJSON = "ndjson"
+    BINARY = "binary"
+
+
+class GreetingFormat(str, Enum):
+    """Formats accepted by ``hello --format``."""
+
+    PLAIN = "plain"
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ConfigOptions(NamedTuple):
+    """Global options selecting the configuration, kept on the root context."""
+
+    path: Optional[Path] = None
+    profile: Optional[str] = None
+    overrides: tuple[str, ...] = ()
+
+
+@app.callback()
+def main_options(
+    ctx: typer.Context,
+    timings: bool = typer.Option(
+        False, "--timings", help="Print a timing breakdown to stderr on exit"
+    ),
+    trace_file: Optional[Path] = typer.Option(
+        None,
+        "--trace-file",
+        envvar="TATERS_TRACE_FILE",
+        help="Append timing spans to this file as JSON lines",
+    ),
+    config: Optional[Path] = typer.Option(
+        None,
+        "--config",
+        envvar="TATERS_CONFIG",
+        dir_okay=False,
+        help="TOML config file (default: $XDG_CONFIG_HOME/taters/config.toml)",
+    ),
+    profile: Optional[str] = typer.Option(
+        None,
+        "--profile",
+        envvar="TATERS_PROFILE",
+        help="Apply the [profiles.NAME] table of the config file",
+    ),
+    overrides: Optional[list[str]] = typer.Option(
+        None,
+        "--set",
+        metavar="SECTION.KEY=VALUE",
+        help="Override one setting; may be repeated",
+    ),
+) -> None:
+    """🥔 Taters - A Python CLI accelerator."""
+    # Only recorded here: the config is read when a command builds the container.
+    ctx.obj = ConfigOptions(config, profile, tuple(overrides or ()))
+    if not timings and trace_file is None:
+        return
+
+    from taters import tracing
+
+    tracer = tracing.enable()
+
+    def report() -> None:
+        tracing.disable()
+        if timings:
+            typer.echo(tracer.summary(), err=True)
+        if trace_file is not None:
+            tracer.write_jsonl(trace_file)
+
+    # Both run when the command finishes, even on errors, in reverse order:
+    # the command span closes before the report is written.
+    ctx.call_on_close(report)
+    ctx.with_resource(tracing.span(f"cli.{ctx.invoked_subcommand}"))
 
 
 @app.command("hello")
-def hello(name: Optional[str] = typer.Argument(None, help="Name to greet")) -> None:
+def hello(
+    name: Optional[str] = typer.Argument(None, help="Name to greet"),
+    from_file: Optional[Path] = typer.Option(
+        None,
+        "--from-file",
+        "-f",
+        dir_okay=False,
+        help="Greet every name in this file, one per line, or - for stdin",
+    ),
+    format: GreetingFormat = typer.Option(
+        GreetingFormat.PLAIN, "--format", help="Output format for --from-file"
+    ),
+) -> None:
     """Say hello to someone."""
-    container = Container()
-    action = container.hello_action()
-    greeting = action.execute(name)
-    typer.echo(greeting)
+    # HelloAction has no dependencies, so it is built without the container;
+    # this keeps dependency_injector and httpx out of `taters hello` startup.
+    from taters.tracing import span
+
+    with span("import.actions"):
+        from taters.actions.hello_action import HelloAction
+
+    action = HelloAction()
+    if from_file is None:
+        greeting = action.execute(name)
+        typer.echo(greeting)
+        return
+
+    if name is not None:
+        typer.echo("❌ Give either NAME or --from-file, not both", err=True)
+        raise typer.Exit(1)
+    _hello_from_file(action, from_file, format.value)
+
+
+def _hello_from_file(action: "HelloAction", path: Path, format: str) -> None:
+    """
+    Greet every name in a file, streaming batches to stdout.
+
+    Args:
+        action: The hello action formatting the greetings.
+        path: File of names, one per line; stdin when ``-``.
+        format: Output format, one of ``taters.actions.greeting_io.FORMATS``.
+    """
+    import sys
 
+    from taters.actions.greeting_io import GreetingWriter, read_name_batches
 
-@app.command("dad-joke")
-def dad_joke() -> None:
+    try:
+        with (
+            _open_input(path) as names,
+            GreetingWriter(sys.stdout.buffer, format) as writer,
+        ):
+            for batch in read_name_batches(names):
+                writer.write(batch, action.execute_batch(batch))
+    except OSError as e:
+        typer.echo(f"❌ Error greeting names: {e}", err=True)
+        raise typer.Exit(1)
+
+
+@dad_joke_app.callback(invoke_without_command=True)
+def dad_joke(
+    ctx: typer.Context,
+    count: int = typer.Option(
+        1, "--count", "-n", min=1, help="Number of distinct jokes to fetch"
+    ),
+    concurrency: Optional[int] = typer.Option(
+        None,
+        "--concurrency",
+        "-c",
+        min=1,
+        help="Maximum requests in flight (default: dad_joke.concurrency)",
+    ),
+    offline: bool = typer.Option(
+        False,
+        "--offline",
+        "--cache-only",
+        help="Answer only from previously fetched jokes in the local cache",
+    ),
+) -> None:
     """Get a random dad joke from the internet."""
+    if ctx.invoked_subcommand is not None:
+        return
+
+    # The daemon shares one container configured when it started, so it cannot
+    # switch to cache-only mode or other settings for a single request; such
+    # requests are served in-process instead.
+    options = ctx.find_root().obj or ConfigOptions()
+    if (
+        not offline
+        and options == ConfigOptions()
+        and _dad_joke_via_daemon(count, concurrency)
+    ):
+        return
+
+    from taters.tracing import span
+
+    with span("import.container"):
+        from taters.container import lifespan
+
+    container = _configured_container(ctx)
+    if offline:
+        container.config.cache.offline.from_value(True)
 
     async def _async_dad_joke() -> None:
-        container = Container()
-        action = container.dad_joke_action()
+        async with lifespan(container):
+            try:
+                with span("container.resolve"):
+                    action = await container.dad_joke_action.async_()
+                if count == 1:
+                    joke = await action.execute()
+                    typer.echo(joke)
+                else:
+                    limit = concurrency or container.config.dad_joke.concurrency()
+                    with span("action.dad_joke.execute_batch", count=count):
+                        async for joke in action.execute_batch(count, limit):
+                            typer.echo(joke)
+            except Exception as e:
+                typer.echo(f"❌ Error getting dad joke: {e}", err=True)
+                raise typer.Exit(1)
+
+    _run_async(container, _async_dad_joke())
+
+
+@dad_joke_app.command("search")
+def dad_joke_search(
+    ctx: typer.Context,
+    words: list[str] = typer.Argument(..., help="Words the jokes must contain"),
+    limit: int = typer.Option(
+        20, "--limit", "-l", min=1, help="Maximum number of jokes to show"
+    ),
+    refresh: bool = typer.Option(
+        False, "--refresh", help="Harvest fresh results from the API first"
+    ),
+    offline: bool = typer.Option(
+        False, "--offline", help="Search only jokes already seen, without the network"
+    ),
+) -> None:
+    """Search jokes seen so far, asking the API when none match."""
+    from taters.tracing import span
+
+    with span("import.container"):
+        from taters.container import lifespan
+
+    term = " ".join(words)
+
+    container = _configured_container(ctx)
+    if offline:
+        container.config.cache.offline.from_value(True)
+
+    async def _async_search() -> None:
+        async with lifespan(container):
+            try:
+                action = await container.dad_joke_search_action.async_()
+                for line in await action.execute(term, limit, refresh):
+                    typer.echo(line)
+            except Exception as e:
+                typer.echo(f"❌ Error searching dad jokes: {e}", err=True)
+                raise typer.Exit(1)
+
+    _run_async(container, _async_search())
+
+
+@dad_joke_app.command("export")
+def dad_joke_export(
+    ctx: typer.Context,
+    path: Path = typer.Argument(
+        ..., help="File to write, or - for stdout", dir_okay=False
+    ),
+    format: ArchiveFormat = typer.Option(
+        ArchiveFormat.NDJSON, "--format", "-f", help="Archive format"
+    ),
+) -> None:
+    """Export every dad joke seen so far."""
+    import sys
+
+    from taters.tracing import span
+
+    with span("import.container"):
+        from taters.container import lifespan
+
+    container = _configured_container(ctx)
+
+    async def _async_export() -> None:
+        async with lifespan(container):
+            try:
+                # The archive stores are synchronous resources, already
+                # initialized by lifespan, so the factory is called directly.
+                action = container.dad_joke_archive_action()
+                if str(path) == "-":
+                    message = await action.export(sys.stdout.buffer, format.value)
+                else:
+                    with path.open("wb") as archive:
+                        message = await action.export(archive, format.value)
+                # The summary goes to stderr so stdout stays a clean archive.
+                typer.echo(message, err=True)
+            except Exception as e:
+                typer.echo(f"❌ Error exporting dad jokes: {e}", err=True)
+                raise typer.Exit(1)
+
+    _run_async(container, _async_export())
+
+
+@dad_joke_app.command("import")
+def dad_joke_import(
+    ctx: typer.Context,
+    path: Path = typer.Argument(
+        ..., help="NDJSON or binary archive", exists=True, dir_okay=False
+    ),
+) -> None:
+    """Import dad jokes from an archive into the local cache and search index."""
+    from taters.tracing import span
+
+    with span("import.container"):
+        from taters.container import lifespan
+
+    container = _configured_container(ctx)
+
+    async def _async_import() -> None:
+        async with lifespan(container):
+            try:
+                action = container.dad_joke_archive_action()
+                typer.echo(await action.import_archive(path))
+            except Exception as e:
+                typer.echo(f"❌ Error importing dad jokes: {e}", err=True)
+                raise typer.Exit(1)
+
+    _run_async(container, _async_import())
+
+
+@app.command("run")
+def run(
+    ctx: typer.Context,
+    path: Optional[Path] = typer.Argument(
+        None, help="File of commands, one per line, or - for stdin", dir_okay=False
+    ),
+    parallelism: Optional[int] = typer.Option(
+        None,
+        "--parallel",
+        "-p",
+        min=1,
+        help="Maximum commands running at once (default: run.parallelism)",
+    ),
+    unordered: bool = typer.Option(
+        False, "--unordered", help="Print results as commands finish, not in order"
+    ),
+    json_output: bool = typer.Option(
+        False, "--json", help="Print one JSON object per command"
+    ),
+    offline: bool = typer.Option(
+        False, "--offline", help="Answer dad jokes only from the local cache"
+    ),
+) -> None:
+    """Run many hello and dad-joke commands, one per line, in one process."""
+    import json
+
+    from taters.tracing import span
+
+    with span("import.container"):
+        from taters.actions.run_action import read_lines
+        from taters.container import lifespan
+
+    container = _configured_container(ctx)
+    if offline:
+        container.config.cache.offline.from_value(True)
+    limit = parallelism or container.config.run.parallelism()
+
+    async def _async_run() -> bool:
+        failed = False
+        async with lifespan(container):
+            action = await container.run_action.async_()
+            with _open_input(path) as commands:
+                results = action.execute(read_lines(commands), limit, not unordered)
+                async for result in results:
+                    failed = failed or result.error is not None
+                    if json_output:
+                        typer.echo(json.dumps(result._asdict(), ensure_ascii=False))
+                        continue
+                    for line in result.results:
+                        typer.echo(line)
+                    if result.error is not None:
+                        typer.echo(
+                            f"❌ Line {result.line_number}: {result.error}", err=True
+                        )
+        return failed
+
+    try:
+        failed = _run_async(container, _async_run())
+    except OSError as e:
+        typer.echo(f"❌ Error reading commands: {e}", err=True)
+        raise typer.Exit(1)
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command("plugins")
+def plugins(
+    ctx: typer.Context,
+    refresh: bool = typer.Option(
+        False,
+        "--refresh",
+        help="Rescan installed distributions for plugins and rebuild the "
+        "completion manifest",
+    ),
+) -> None:
+    """List the commands installed plugins add to taters."""
+    from taters.plugins import discover
+
+    found = discover(refresh=refresh)
+    if refresh:
+        from taters import manifest
+
+        manifest.save(manifest.build(ctx.find_root().command))
+    if not found:
+        typer.echo("No plugins installed.")
+    for spec in found:
+        source = f"{spec.distribution}: " if spec.distribution else ""
+        typer.echo(f"🔌 {spec.name} ({source}{spec.value})")
+
+
+@app.command("serve")
+def serve(
+    ctx: typer.Context,
+    socket_path: Optional[str] = typer.Option(
+        None,
+        "--socket",
+        help="Unix socket to listen on (default: $XDG_RUNTIME_DIR/taters.sock)",
+    ),
+    coalesce: bool = typer.Option(
+        False,
+        "--coalesce",
+        help="Share one upstream request between concurrent dad joke requests",
+    ),
+) -> None:
+    """Run a daemon that keeps connections warm and answers over a Unix socket."""
+    import asyncio
+    import signal
+
+    from taters.container import lifespan
+    from taters.daemon.protocol import DaemonError, default_socket_path
+    from taters.daemon.server import DaemonServer
+
+    container = _configured_container(ctx)
+    if coalesce:
+        container.config.dad_joke.single_flight.from_value(True)
+
+    async def _async_serve() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        signals = (signal.SIGINT, signal.SIGTERM)
+        for signum in signals:
+            loop.add_signal_handler(signum, stop.set)
+
         try:
-            joke = await action.execute()
-            typer.echo(joke)
-        except Exception as e:
-            typer.echo(f"❌ Error getting dad joke: {e}", err=True)
-            raise typer.Exit(1)
+            async with lifespan(container):
+                server = DaemonServer(container, socket_path or default_socket_path())
+                try:
+                    await server.serve(
+                        stop,
+                        on_ready=lambda: typer.echo(
+                            f"🥔 Taters daemon listening on {server.socket_path}"
+                        ),
+                    )
+                except DaemonError as e:
+                    typer.echo(f"❌ {e}", err=True)
+                    raise typer.Exit(1)
+        finally:
+            # The loop is shared, so later commands get the default handlers.
+            for signum in signals:
+                loop.remove_signal_handler(signum)
+
+    _run_async(container, _async_serve())
+
+
+def _configured_container(ctx: typer.Context) -> "Container":
+    """
+    Get the process-wide container with the merged configuration applied.
+
+    Settings are re-applied on every call, so flags such as ``--offline``
+    from an earlier command run in the same process do not carry over.
+
+    Args:
+        ctx: Context of the running command.
+
+    Returns:
+        The container configured from the config file, the environment and
+        the ``--set`` options.
+    """
+    from taters.tracing import span
+
+    with span("import.config"):
+        from taters.config import ConfigError, load_config
+        from taters.container import get_container
+
+    options = ctx.find_root().obj or ConfigOptions()
+    container = get_container()
+    try:
+        with span("config.load"):
+            settings = load_config(options.path, options.profile, options.overrides)
+    except ConfigError as e:
+        typer.echo(f"❌ Invalid configuration: {e}", err=True)
+        raise typer.Exit(1)
+    container.config.from_dict(settings)
+    return container
+
+
+def _run_async(container: "Container", main: Coroutine[Any, Any, T]) -> T:
+    """
+    Run an async command on the process's shared event loop.
+
+    Args:
+        container: The configured container; ``runtime.loop`` picks the loop
+            when the first command creates it.
+        main: The command's coroutine.
+
+    Returns:
+        The coroutine's result.
+    """
+    from taters import runtime
+
+    try:
+        runner = runtime.get_runner(container.config.runtime.loop())
+    except runtime.RuntimeConfigError as e:
+        main.close()
+        typer.echo(f"❌ Invalid configuration: {e}", err=True)
+        raise typer.Exit(1)
+    return runner.run(main)
+
+
+def _open_input(path: Optional[Path]) -> ContextManager[TextIO]:
+    """
+    Open the line-oriented input of ``taters run`` or ``taters hello -f``.
+
+    Args:
+        path: File to read; stdin when None or ``-``.
+
+    Returns:
+        A context manager yielding the text stream. Stdin is left open.
+    """
+    import contextlib
+    import sys
+
+    if path is None or str(path) == "-":
+        return contextlib.nullcontext(sys.stdin)
+    return path.open(encoding="utf-8")
+
+
+def _dad_joke_via_daemon(count: int, concurrency: Optional[int]) -> bool:
+    """
+    Fetch dad jokes through a running daemon, if there is one.
+
+    Args:
+        count: Number of distinct jokes to fetch.
+        concurrency: Maximum requests in flight for batches; the daemon's
+            configured limit when None.
+
+    Returns:
+        True if the daemon answered, False if no daemon is listening.
+    """
+    from taters.daemon.client import DaemonClient
+    from taters.daemon.protocol import DaemonError, DaemonUnavailableError
+    from taters.tracing import span
 
-    asyncio.run(_async_dad_joke())
+    params = {"count": count}
+    if concurrency is not None:
+        params["concurrency"] = concurrency
+    try:
+        with span("daemon.request"):
+            for joke in DaemonClient().request("dad-joke", params):
+                typer.echo(joke)
+    except DaemonUnavailableError:
+        return False
+    except DaemonError as e:
+        typer.echo(f"❌ Error getting dad joke: {e}", err=True)
+        raise typer.Exit(1)
+    return True
 
 
 def main() -> None:
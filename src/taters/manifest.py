@@ -0,0 +1,560 @@
+"""Precomputed command tree and help pages for shell completion and ``--help``.
+
+Shell completion runs ``taters`` on every TAB press, and ``--help`` is
+rendered by Rich; both normally import Typer, Rich and every command before
+printing a line. The manifest, ``cli-manifest.json`` in the cache directory,
+records the command tree with each completion already formatted for every
+shell, plus help pages as they are first shown. The ``taters.cli`` launcher
+answers from it using only the standard library, and falls back to the full
+app for anything the manifest cannot answer exactly, such as file names or a
+plugin's own options.
+
+The manifest is rebuilt when the installed distributions or taters' built-in
+commands change, and by ``taters plugins --refresh``. This module must stay
+free of third-party imports; building the manifest imports Typer lazily.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional, TextIO
+
+MANIFEST_FILENAME = "cli-manifest.json"
+MANIFEST_VERSION = 1
+# Shells Typer completes for, each with its own completion line format.
+SHELLS = ("bash", "zsh", "fish", "powershell", "pwsh")
+# Help requests are recognized by this option alone, for speed; others, such
+# as a command's own help option names, go to the app.
+HELP_OPTION = "--help"
+# Help pages kept, one per command and terminal; the oldest go first.
+MAX_HELP_PAGES = 64
+# Environment read by Rich and Typer when rendering help. A page recorded
+# under different values may be laid out or coloured differently.
+RENDERING_ENV = (
+    "COLUMNS",
+    "LINES",
+    "JUPYTER_COLUMNS",
+    "JUPYTER_LINES",
+    "TERM",
+    "COLORTERM",
+    "NO_COLOR",
+    "FORCE_COLOR",
+    "PY_COLORS",
+    "TTY_COMPATIBLE",
+    "TTY_INTERACTIVE",
+    "TERMINAL_WIDTH",
+    "GITHUB_ACTIONS",
+    "DATABRICKS_RUNTIME_VERSION",
+    "TYPER_USE_RICH",
+    "_TYPER_FORCE_DISABLE_TERMINAL",
+)
+
+Manifest = dict[str, Any]
+Node = dict[str, Any]
+Lines = dict[str, str]
+# Formats a completion value and its help for every shell.
+Formatter = Callable[[str, Optional[str]], Lines]
+
+
+def install_fingerprint() -> list[Any]:
+    """
+    Summarize the import path; it changes when distributions change.
+
+    Returns:
+        The Python version and the modification time of each ``sys.path``
+        directory, which installing or removing a distribution updates.
+    """
+    fingerprint: list[Any] = [sys.version]
+    for entry in sys.path:
+        # The working directory never holds installed distributions.
+        if not entry:
+            continue
+        try:
+            fingerprint.append([entry, os.stat(entry).st_mtime_ns])
+        except OSError:
+            continue
+    return fingerprint
+
+
+def fingerprint() -> list[Any]:
+    """
+    Summarize everything the command tree depends on.
+
+    Returns:
+        The install fingerprint plus the modification time of the module
+        defining the built-in commands, for editable installs.
+    """
+    main_module = Path(__file__).with_name("main.py")
+    try:
+        mtime = os.stat(main_module).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return [*install_fingerprint(), [str(main_module), mtime]]
+
+
+def default_path() -> Path:
+    """
+    Locate the manifest in the cache directory.
+
+    Returns:
+        Path to ``cli-manifest.json``.
+    """
+    from taters.repositories.storage import cache_dir
+
+    return cache_dir() / MANIFEST_FILENAME
+
+
+def load(path: Optional[Path] = None) -> Optional[Manifest]:
+    """
+    Read the manifest if it describes the commands installed now.
+
+    Args:
+        path: Manifest file. Defaults to the one in the cache directory.
+
+    Returns:
+        The manifest, or None if it is missing, unreadable or out of date.
+    """
+    try:
+        with (path or default_path()).open(encoding="utf-8") as file:
+            document = json.load(file)
+        if (
+            document.get("version") != MANIFEST_VERSION
+            or document.get("fingerprint") != fingerprint()
+        ):
+            return None
+        if not isinstance(document["root"], dict):
+            return None
+        if not isinstance(document["help"], dict):
+            return None
+        return dict(document)
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def save(document: Manifest, path: Optional[Path] = None) -> None:
+    """
+    Replace the manifest atomically; a read-only cache just goes unused.
+
+    Args:
+        document: The manifest to write.
+        path: Manifest file. Defaults to the one in the cache directory.
+    """
+    write_json(path or default_path(), document)
+
+
+def write_json(path: Path, document: Any) -> None:
+    """
+    Replace ``path`` with ``document`` as JSON atomically; errors are ignored.
+
+    The document is written to a temporary file beside ``path`` and moved
+    into place, so readers never see a partial file.
+
+    Args:
+        path: File to replace.
+        document: JSON-serializable value to write.
+    """
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        temporary.write_text(json.dumps(document), encoding="utf-8")
+        os.replace(temporary, path)
+    except OSError:
+        temporary.unlink(missing_ok=True)
+
+
+def build(command: Any) -> Manifest:
+    """
+    Record a command tree, without importing plugins.
+
+    Args:
+        command: The Click command for the whole CLI, from
+            ``typer.main.get_command``.
+
+    Returns:
+        A manifest without help pages.
+    """
+    try:
+        # Typer vendors Click from 0.26 on.
+        from typer import _click as click
+        from typer._click import shell_completion
+    except ImportError:  # pragma: no cover
+        import click  # type: ignore[no-redef]
+        from click import shell_completion  # type: ignore[no-redef]
+
+    formatters = {}
+    for shell in SHELLS:
+        completion_class = shell_completion.get_completion_class(shell)
+        if completion_class is not None:
+            formatters[shell] = completion_class(command, {}, "", "")
+
+    def lines(value: str, help: Optional[str] = None) -> Lines:
+        item = shell_completion.CompletionItem(value, help=help)
+        return {
+            shell: formatter.format_completion(item)
+            for shell, formatter in formatters.items()
+        }
+
+    context = click.Context(command, resilient_parsing=True)
+    root = _node(command, context, lines, prefixes="-")
+    return {
+        "version": MANIFEST_VERSION,
+        "fingerprint": fingerprint(),
+        "root": root,
+        "help": {},
+    }
+
+
+def complete(
+    document: Manifest, instruction: str, environ: Mapping[str, str]
+) -> Optional[tuple[str, int]]:
+    """
+    Answer a shell completion request, as Typer would.
+
+    Args:
+        document: A current manifest.
+        instruction: Value of the ``_TATERS_COMPLETE`` variable, such as
+            ``"complete_bash"``.
+        environ: Environment holding the words being completed.
+
+    Returns:
+        The text to print, empty for none, and the exit code; or None if the
+        full app must answer.
+    """
+    action, _, shell = instruction.partition("_")
+    if action != "complete" or shell not in SHELLS:
+        return None
+    request = _completion_args(shell, environ)
+    items = _complete(document["root"], *request) if request is not None else None
+    if items is None or any(shell not in item for item in items):
+        return None
+    found = [item[shell] for item in items]
+
+    if shell == "zsh":
+        if not found:
+            return "_files\n", 0
+        return "_arguments '*: :((" + "\n".join(found) + "))'\n", 0
+    if shell == "fish":
+        fish_action = environ.get("_TYPER_COMPLETE_FISH_ACTION", "")
+        if fish_action == "is-args":
+            # Whether to offer these values rather than file names.
+            return "", 0 if found else 1
+        if fish_action == "get-args" and found:
+            return "\n".join(found) + "\n", 0
+        return "\n", 0
+    return "\n".join(found) + "\n", 0
+
+
+def help_key(
+    document: Manifest,
+    prog_name: str,
+    args: list[str],
+    stream: TextIO,
+    environ: Mapping[str, str],
+) -> Optional[str]:
+    """
+    Identify a ``--help`` request and the terminal it will be shown on.
+
+    Args:
+        document: A current manifest.
+        prog_name: Name the CLI was run as, shown in the usage line.
+        args: Command-line arguments.
+        stream: Where the help will be written.
+        environ: Environment Rich and Typer read when rendering.
+
+    Returns:
+        Key of the page in the manifest, or None if ``args`` are not just
+        command names followed by ``--help``.
+    """
+    if args[-1:] != [HELP_OPTION]:
+        return None
+    node = document["root"]
+    for name in args[:-1]:
+        node = node.get("commands", {}).get(name)
+        if node is None:
+            return None
+    return json.dumps([prog_name, args[:-1], _terminal(stream, environ)])
+
+
+def remember_help(document: Manifest, key: str, page: str) -> None:
+    """
+    Add a rendered help page to the manifest, dropping the oldest if full.
+
+    Args:
+        document: The manifest to update.
+        key: The page's key, from ``help_key``.
+        page: Everything the app printed.
+    """
+    pages = document["help"]
+    pages.pop(key, None)
+    pages[key] = page
+    while len(pages) > MAX_HELP_PAGES:
+        del pages[next(iter(pages))]
+
+
+def _node(command: Any, context: Any, lines: Formatter, prefixes: str) -> Node:
+    """Record a command, its parameters and its subcommands."""
+    try:
+        from typer import _click as click
+    except ImportError:  # pragma: no cover
+        import click  # type: ignore[no-redef]
+    from typer.core import TyperArgument, TyperGroup, TyperOption
+
+    from taters.plugins import LazyPluginCommand
+
+    node: Node = {"hidden": command.hidden}
+    # Plugins are not imported, so only their names are known.
+    if isinstance(command, LazyPluginCommand):
+        node["opaque"] = True
+        return node
+    params = command.get_params(context)
+
+    # Click treats words starting like any option as option names.
+    starts = {opt[0] for p in params if isinstance(p, TyperOption) for opt in p.opts}
+    prefixes = "".join(sorted(set(prefixes) | starts))
+    node["prefixes"] = prefixes
+    options: list[dict[str, Any]] = []
+    arguments: list[dict[str, Any]] = []
+    for param in params:
+        if isinstance(param, TyperOption) and param.nargs == 1:
+            names = [*param.opts, *param.secondary_opts]
+            options.append(
+                {
+                    "name": param.name,
+                    "opts": param.opts,
+                    "names": names,
+                    "value": not (param.is_flag or param.count),
+                    "multiple": param.multiple,
+                    "offered": not param.hidden,
+                    "lines": {name: lines(name, param.help) for name in names},
+                    "choices": _choices(param, context, lines),
+                }
+            )
+        elif isinstance(param, TyperArgument) and param.nargs in (1, -1):
+            arguments.append(
+                {
+                    "name": param.name,
+                    "nargs": param.nargs,
+                    "choices": _choices(param, context, lines),
+                }
+            )
+        else:
+            node["opaque"] = True
+            return node
+    node["options"] = options
+    node["arguments"] = arguments
+
+    if isinstance(command, TyperGroup):
+        if arguments:
+            node["opaque"] = True
+            return node
+        commands: dict[str, Node] = {}
+        for name in command.list_commands(context):
+            subcommand = command.get_command(context, name)
+            if subcommand is None:
+                continue
+            child = click.Context(
+                subcommand, info_name=name, parent=context, resilient_parsing=True
+            )
+            entry = _node(subcommand, child, lines, prefixes)
+            entry["lines"] = lines(name, subcommand.get_short_help_str())
+            commands[name] = entry
+        node["commands"] = commands
+    return node
+
+
+def _choices(param: Any, context: Any, lines: Formatter) -> Optional[dict[str, Any]]:
+    """Record a parameter's fixed completions; None if computed on demand."""
+    try:
+        from typer import _click as click
+    except ImportError:  # pragma: no cover
+        import click  # type: ignore[no-redef]
+
+    if param._custom_shell_complete is not None:
+        return None
+    if type(param.type).shell_complete is click.types.ParamType.shell_complete:
+        return {"case_sensitive": True, "values": []}
+    choices = getattr(param.type, "choices", None)
+    if not isinstance(choices, (list, tuple)):
+        return None
+    values = [str(choice) for choice in choices]
+    offered = [item.value for item in param.type.shell_complete(context, param, "")]
+    if offered != values:
+        return None
+    return {
+        "case_sensitive": bool(getattr(param.type, "case_sensitive", True)),
+        "values": [[value, lines(value, None)] for value in values],
+    }
+
+
+def _completion_args(
+    shell: str, environ: Mapping[str, str]
+) -> Optional[tuple[list[str], str]]:
+    """Read the words before the cursor and the one being typed."""
+    if shell == "bash":
+        words = _split(environ.get("COMP_WORDS", ""))
+        try:
+            cword = int(environ.get("COMP_CWORD", ""))
+        except ValueError:
+            return None
+        return words[1:cword], words[cword] if cword < len(words) else ""
+
+    line = environ.get("_TYPER_COMPLETE_ARGS", "")
+    words = _split(line)
+    if shell in ("powershell", "pwsh"):
+        incomplete = environ.get("_TYPER_COMPLETE_WORD_TO_COMPLETE", "")
+        return (words[1:-1] if incomplete else words[1:]), incomplete
+    args = words[1:]
+    if args and not line.endswith(" "):
+        return args[:-1], args[-1]
+    return args, ""
+
+
+def _split(line: str) -> list[str]:
+    """Split words as the shell would, tolerating an unfinished quote."""
+    import shlex
+
+    lexer = shlex.shlex(line, posix=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    words: list[str] = []
+    try:
+        for word in lexer:
+            words.append(word)
+    except ValueError:
+        words.append(lexer.token)
+    return words
+
+
+def _complete(root: Node, args: list[str], incomplete: str) -> Optional[list[Lines]]:
+    """Find the completions for ``incomplete``, or None if unsure."""
+    resolved = _resolve(root, args)
+    if resolved is None:
+        return None
+    node, given, filled = resolved
+    prefixes = node["prefixes"]
+
+    if incomplete == "=":
+        incomplete = ""
+    elif "=" in incomplete and incomplete[0] in prefixes:
+        name, _, incomplete = incomplete.partition("=")
+        args = [*args, name]
+
+    if incomplete and incomplete[0] in prefixes:
+        return _offer(node, given, incomplete)
+    if args and args[-1][:1] in prefixes:
+        for option in node["options"]:
+            if option["value"] and args[-1] in option["opts"]:
+                return _values(option, incomplete)
+    for argument in node["arguments"]:
+        if argument["nargs"] == -1 or argument["name"] not in filled:
+            return _values(argument, incomplete)
+    return _offer(node, given, incomplete)
+
+
+def _resolve(root: Node, args: list[str]) -> Optional[tuple[Node, set[str], set[str]]]:
+    """
+    Follow ``args`` to the command being completed, as Click parses them.
+
+    Returns:
+        The command and the names of the options and arguments given to it,
+        or None for anything unusual, like ``--``, unknown options or
+        clustered short options.
+    """
+    node = root
+    given: set[str] = set()
+    filled: set[str] = set()
+    position = 0
+    index = 0
+    while index < len(args):
+        if node.get("opaque"):
+            return None
+        token = args[index]
+        index += 1
+        if token == "--":
+            return None
+        if token != "-" and token[0] in node["prefixes"]:
+            name, equals, _ = token.partition("=")
+            if not name.startswith("--"):
+                if equals or len(name) != 2:
+                    return None
+            option = next((o for o in node["options"] if name in o["names"]), None)
+            if option is None:
+                return None
+            if not option["value"] and equals:
+                return None
+            if option["value"] and not equals:
+                index += 1
+            given.add(option["name"])
+        elif "commands" in node:
+            node = node["commands"].get(token)
+            if node is None:
+                return None
+            given, filled, position = set(), set(), 0
+        elif position < len(node["arguments"]):
+            argument = node["arguments"][position]
+            filled.add(argument["name"])
+            if argument["nargs"] != -1:
+                position += 1
+    if node.get("opaque"):
+        return None
+    return node, given, filled
+
+
+def _offer(node: Node, given: set[str], incomplete: str) -> list[Lines]:
+    """List the subcommands and, for an option prefix, the options."""
+    found = [
+        command["lines"]
+        for name, command in node.get("commands", {}).items()
+        if name.startswith(incomplete) and not command["hidden"]
+    ]
+    if incomplete and not incomplete[0].isalnum():
+        for option in node["options"]:
+            if not option["offered"]:
+                continue
+            if not option["multiple"] and option["name"] in given:
+                continue
+            found.extend(
+                option["lines"][name]
+                for name in option["names"]
+                if name.startswith(incomplete)
+            )
+    return found
+
+
+def _values(param: dict[str, Any], incomplete: str) -> Optional[list[Lines]]:
+    """List a parameter's choices starting with ``incomplete``."""
+    choices = param["choices"]
+    if choices is None:
+        return None
+    if choices["case_sensitive"]:
+        return [
+            lines for value, lines in choices["values"] if value.startswith(incomplete)
+        ]
+    incomplete = incomplete.lower()
+    return [
+        lines
+        for value, lines in choices["values"]
+        if value.lower().startswith(incomplete)
+    ]
+
+
+def _terminal(stream: TextIO, environ: Mapping[str, str]) -> list[Any]:
+    """Describe the terminal as Rich sees it when sizing and colouring."""
+    try:
+        isatty = stream.isatty()
+    except (AttributeError, ValueError):
+        isatty = False
+    size = None
+    # Rich takes the size of the first standard stream that is a terminal.
+    for descriptor in (0, 1, 2):
+        try:
+            size = list(os.get_terminal_size(descriptor))
+        except (AttributeError, ValueError, OSError):
+            continue
+        break
+    return [
+        isatty,
+        size,
+        getattr(stream, "encoding", None),
+        [environ.get(name) for name in RENDERING_ENV],
+    ]
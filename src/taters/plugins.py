@@ -0,0 +1,249 @@
+"""Third-party commands discovered through the ``taters.plugins`` entry points.
+
+A distribution adds a command by declaring an entry point, named after the
+command, that resolves to a ``typer.Typer`` app, a command function, or a
+``TatersPlugin`` that also contributes container providers::
+
+    [project.entry-points."taters.plugins"]
+    weather = "taters_weather.cli:plugin"
+
+Scanning installed distributions for entry points is slow, so the result is
+kept in ``plugins.json`` in the cache directory. The index is rebuilt only
+when a directory on ``sys.path`` changes, which is what installing or
+removing a distribution does. Plugin modules are imported only when their
+command runs, or when its help is shown.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Mapping, NamedTuple, Optional, Union
+
+import typer
+from typer.core import TyperCommand, TyperGroup
+
+from taters.manifest import install_fingerprint, write_json
+
+try:
+    # Typer vendors Click from 0.26 on; its groups take the vendored types.
+    from typer import _click as click
+except ImportError:  # pragma: no cover
+    import click  # type: ignore[no-redef]
+
+ENTRY_POINT_GROUP = "taters.plugins"
+INDEX_FILENAME = "plugins.json"
+INDEX_VERSION = 1
+# Help panel listing plugin commands in ``taters --help``.
+PLUGIN_PANEL = "Plugins"
+
+
+class PluginError(Exception):
+    """Raised when a plugin cannot be loaded or clashes with Taters."""
+
+
+class PluginSpec(NamedTuple):
+    """An entry point as recorded in the index, without importing it."""
+
+    name: str
+    value: str
+    distribution: str
+
+
+class TatersPlugin:
+    """Command and container providers contributed by a plugin."""
+
+    def __init__(
+        self,
+        command: Union[typer.Typer, Callable[..., Any]],
+        providers: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        """
+        Initialize the plugin.
+
+        Args:
+            command: A ``typer.Typer`` app, for a command group, or a
+                function, for a single command.
+            providers: ``dependency_injector`` providers to add to the
+                process container by name, such as a plugin's services and
+                repositories. Existing providers cannot be replaced.
+        """
+        self.command = command
+        self.providers = dict(providers or {})
+
+
+def discover(
+    index_path: Optional[Path] = None, refresh: bool = False
+) -> list[PluginSpec]:
+    """
+    List the installed plugins, from the index while it is current.
+
+    Args:
+        index_path: Index file. Defaults to ``plugins.json`` in the cache
+            directory.
+        refresh: Scan the entry points even if the index is current.
+
+    Returns:
+        The plugins, sorted by command name.
+    """
+    path = index_path or _default_index_path()
+    fingerprint = install_fingerprint()
+    if not refresh:
+        cached = _read_index(path, fingerprint)
+        if cached is not None:
+            return cached
+    plugins = _scan()
+    _write_index(path, fingerprint, plugins)
+    return plugins
+
+
+def load_command(spec: PluginSpec) -> click.Command:
+    """
+    Import a plugin and build its command.
+
+    Providers the plugin contributes are added to the process container.
+
+    Args:
+        spec: The plugin to load.
+
+    Returns:
+        The Click command to run under the plugin's name.
+
+    Raises:
+        PluginError: If the plugin cannot be imported, has an unsupported
+            type, or clashes with an existing provider.
+    """
+    from importlib.metadata import EntryPoint
+
+    entry_point = EntryPoint(spec.name, spec.value, ENTRY_POINT_GROUP)
+    try:
+        loaded = entry_point.load()
+    except Exception as e:
+        raise PluginError(f"Cannot load plugin '{spec.name}': {e}") from e
+
+    plugin = loaded if isinstance(loaded, TatersPlugin) else TatersPlugin(loaded)
+    if plugin.providers:
+        _register_providers(spec.name, plugin.providers)
+
+    target = plugin.command
+    if not isinstance(target, typer.Typer):
+        if not callable(target):
+            raise PluginError(
+                f"Plugin '{spec.name}' must be a Typer app, a function or a "
+                f"TatersPlugin, not {type(target).__name__}"
+            )
+        target = typer.Typer()
+        target.command(spec.name)(plugin.command)
+    command = typer.main.get_command(target)
+    command.name = spec.name
+    return command
+
+
+class PluginGroup(TyperGroup):
+    """Command group that also offers the installed plugins' commands."""
+
+    _plugins: Optional[dict[str, PluginSpec]] = None
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        """List the built-in commands, then the plugins not shadowing them."""
+        commands = super().list_commands(ctx)
+        return commands + [name for name in self.plugins() if name not in commands]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Find a built-in command, else a plugin command loaded on use."""
+        command = super().get_command(ctx, cmd_name)
+        if command is not None:
+            return command
+        spec = self.plugins().get(cmd_name)
+        return LazyPluginCommand(spec) if spec is not None else None
+
+    def plugins(self) -> dict[str, PluginSpec]:
+        """Discover the plugins once, when a command is not built in."""
+        if self._plugins is None:
+            self._plugins = {spec.name: spec for spec in discover()}
+        return self._plugins
+
+
+class LazyPluginCommand(TyperCommand):
+    """Stands in for a plugin command until it is actually run."""
+
+    def __init__(self, spec: PluginSpec) -> None:
+        super().__init__(
+            spec.name,
+            short_help=f"Plugin from {spec.distribution or spec.value}",
+            rich_help_panel=PLUGIN_PANEL,
+        )
+        self.spec = spec
+
+    def make_context(
+        self,
+        info_name: Optional[str],
+        args: list[str],
+        parent: Optional[click.Context] = None,
+        **extra: Any,
+    ) -> click.Context:
+        """Load the plugin and parse its arguments with the real command."""
+        try:
+            command = load_command(self.spec)
+        except PluginError as e:
+            typer.echo(f"❌ {e}", err=True)
+            raise typer.Exit(1)
+        return command.make_context(info_name, args, parent, **extra)
+
+
+def _register_providers(name: str, providers: Mapping[str, Any]) -> None:
+    """Add a plugin's providers to the process container."""
+    from taters.container import get_container
+
+    container = get_container()
+    for provider_name, provider in providers.items():
+        if provider_name in container.providers:
+            raise PluginError(
+                f"Plugin '{name}' cannot replace the '{provider_name}' provider"
+            )
+        container.set_provider(provider_name, provider)
+
+
+def _default_index_path() -> Path:
+    """Locate the index in the cache directory."""
+    from taters.repositories.storage import cache_dir
+
+    return cache_dir() / INDEX_FILENAME
+
+
+def _read_index(path: Path, fingerprint: list[Any]) -> Optional[list[PluginSpec]]:
+    """Read the index if it was built for the same ``fingerprint``."""
+    try:
+        with path.open(encoding="utf-8") as index:
+            document = json.load(index)
+        if (
+            document.get("version") != INDEX_VERSION
+            or document.get("fingerprint") != fingerprint
+        ):
+            return None
+        return [PluginSpec(*plugin) for plugin in document["plugins"]]
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def _write_index(path: Path, fingerprint: list[Any], plugins: list[PluginSpec]) -> None:
+    """Replace the index atomically; a read-only cache just goes unused."""
+    document = {
+        "version": INDEX_VERSION,
+        "fingerprint": fingerprint,
+        "plugins": [list(plugin) for plugin in plugins],
+    }
+    write_json(path, document)
+
+
+def _scan() -> list[PluginSpec]:
+    """Read every installed distribution's ``taters.plugins`` entry points."""
+    from importlib.metadata import entry_points
+
+    plugins = {
+        entry_point.name: PluginSpec(
+            entry_point.name,
+            entry_point.value,
+            entry_point.dist.name if entry_point.dist is not None else "",
+        )
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP)
+    }
+    return sorted(plugins.values())
@@ -0,0 +1,154 @@
+"""Bloom filters remembering which joke ids have been shown."""
+
+import hashlib
+import math
+from typing import Iterable, Optional
+
+DEFAULT_INITIAL_CAPACITY = 1024
+DEFAULT_ERROR_RATE = 0.001
+# Each new slice holds twice as many ids at half the false-positive rate, so
+# the rates form a geometric series summing to the configured error rate.
+GROWTH = 2
+TIGHTENING = 0.5
+
+
+def _hash(key: str) -> tuple[int, int]:
+    """Derive the two base hashes every slice builds its bit positions from."""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little")
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter with a false-positive rate bounded at capacity."""
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        bits: Optional[bytearray] = None,
+        count: int = 0,
+    ) -> None:
+        """
+        Initialize the Bloom filter.
+
+        Args:
+            capacity: Number of keys the filter is sized for.
+            error_rate: False-positive rate once ``capacity`` keys are added.
+            bits: Previously saved bit array, for a restored filter.
+            count: Number of keys already in ``bits``.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+        # Set on every add and cleared once persisted, so saves skip old slices.
+        self.dirty = bits is None
+
+    @property
+    def full(self) -> bool:
+        """Whether the filter holds as many keys as it was sized for."""
+        return self.count >= self.capacity
+
+    def add_hash(self, hashes: tuple[int, int]) -> None:
+        """
+        Add a key by its base hashes.
+
+        Args:
+            hashes: The key's ``_hash``, shared across slices.
+        """
+        for position in self._positions(hashes):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+        self.dirty = True
+
+    def contains_hash(self, hashes: tuple[int, int]) -> bool:
+        """
+        Check a key by its base hashes.
+
+        Args:
+            hashes: The key's ``_hash``, shared across slices.
+
+        Returns:
+            False if the key was never added; True if it probably was.
+        """
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(hashes)
+        )
+
+    def _positions(self, hashes: tuple[int, int]) -> Iterable[int]:
+        """Derive the key's bit positions by double hashing."""
+        first, second = hashes
+        second |= 1
+        return ((first + i * second) % self.num_bits for i in range(self.num_hashes))
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows by adding slices as keys are added.
+
+    Memory stays proportional to the number of keys, and the overall
+    false-positive rate stays under ``error_rate`` however many are added.
+    A membership check hashes the key once and probes a fixed number of bits
+    per slice; the slice count grows only logarithmically with the keys.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = DEFAULT_INITIAL_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        slices: Optional[list[BloomFilter]] = None,
+    ) -> None:
+        """
+        Initialize the scalable Bloom filter.
+
+        Args:
+            initial_capacity: Keys held by the first slice.
+            error_rate: Bound on the overall false-positive rate.
+            slices: Previously saved slices, oldest first.
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.slices = slices or []
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether ``key`` was probably added."""
+        if not isinstance(key, str):
+            return False
+        hashes = _hash(key)
+        return any(piece.contains_hash(hashes) for piece in self.slices)
+
+    def __len__(self) -> int:
+        """Count the keys added."""
+        return sum(piece.count for piece in self.slices)
+
+    def add(self, key: str) -> bool:
+        """
+        Add a key.
+
+        Args:
+            key: The key, such as a joke id.
+
+        Returns:
+            True if the key is new, False if it was probably added before.
+        """
+        hashes = _hash(key)
+        if any(piece.contains_hash(hashes) for piece in self.slices):
+            return False
+        if not self.slices or self.slices[-1].full:
+            self.slices.append(self._next_slice())
+        self.slices[-1].add_hash(hashes)
+        return True
+
+    def _next_slice(self) -> BloomFilter:
+        """Create a slice larger and stricter than the last one."""
+        if not self.slices:
+            return BloomFilter(
+                self.initial_capacity, self.error_rate * (1 - TIGHTENING)
+            )
+        last = self.slices[-1]
+        return BloomFilter(last.capacity * GROWTH, last.error_rate * TIGHTENING)
@@ -0,0 +1,93 @@
+"""Caching decorator around the dad joke repository."""
+
+from typing import AsyncIterator, Optional
+
+from taters.repositories.dad_joke_repository import DEFAULT_CONCURRENCY, DadJoke
+from taters.repositories.joke_cache_repository import JokeCacheRepository
+from taters.repositories.joke_source import JokeSource
+from taters.tracing import span
+
+
+class CachedDadJokeRepository:
+    """Joke source that records fetched jokes on disk and serves them back."""
+
+    def __init__(
+        self,
+        repository: JokeSource,
+        cache: JokeCacheRepository,
+        offline: bool = False,
+        fallback: bool = True,
+    ) -> None:
+        """
+        Initialize the cached dad joke repository.
+
+        Args:
+            repository: The upstream repository to fetch jokes from.
+            cache: The persistent joke cache.
+            offline: When True, never contact the upstream repository and
+                answer only from previously cached jokes.
+            fallback: When False, a failed upstream fetch gives None instead
+                of a cached joke, so only fresh jokes are returned.
+        """
+        self.repository = repository
+        self.cache = cache
+        self.offline = offline
+        self.fallback = fallback
+
+    async def get_random_joke(self) -> Optional[str]:
+        """
+        Fetch a random dad joke, from the cache when offline or on failure.
+
+        Returns:
+            The joke text if one is available, None otherwise.
+        """
+        joke = await self.fetch_random_joke()
+        return joke.joke if joke is not None else None
+
+    async def fetch_random_joke(self) -> Optional[DadJoke]:
+        """
+        Fetch a random dad joke with its id.
+
+        Online, a successful upstream fetch is written to the cache and a failed
+        one falls back to a cached joke, unless ``fallback`` is off. Offline,
+        only the cache is consulted.
+
+        Returns:
+            The joke if one is available, None otherwise.
+        """
+        if self.offline:
+            with span("cache.get_random"):
+                return await self.cache.get_random()
+
+        joke = await self.repository.fetch_random_joke()
+        if joke is None:
+            if not self.fallback:
+                return None
+            with span("cache.get_random"):
+                return await self.cache.get_random()
+
+        with span("cache.put"):
+            await self.cache.put(joke)
+        return joke
+
+    async def get_random_jokes(
+        self, count: int, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> AsyncIterator[DadJoke]:
+        """
+        Stream up to ``count`` distinct jokes.
+
+        Args:
+            count: Number of distinct jokes wanted.
+            concurrency: Maximum number of upstream requests in flight.
+
+        Yields:
+            Distinct jokes; cached ones when offline, fresh ones otherwise.
+        """
+        if self.offline:
+            for joke in await self.cache.get_random_many(count):
+                yield joke
+            return
+
+        async for joke in self.repository.get_random_jokes(count, concurrency):
+            await self.cache.put(joke)
+            yield joke
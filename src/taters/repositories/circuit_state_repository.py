@@ -0,0 +1,90 @@
+"""Repository persisting circuit breaker state between CLI runs."""
+
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from taters.repositories.sqlite_repository import SQLiteRepository
+
+
+@dataclass(frozen=True)
+class CircuitState:
+    """Snapshot of a circuit breaker."""
+
+    state: str
+    failures: int
+    opened_at: float
+
+
+class CircuitStateRepository(SQLiteRepository):
+    """Named circuit breaker states stored in SQLite."""
+
+    schema = """
+    CREATE TABLE IF NOT EXISTS circuit_breakers (
+        name TEXT PRIMARY KEY,
+        state TEXT NOT NULL,
+        failures INTEGER NOT NULL,
+        opened_at REAL NOT NULL
+    );
+    """
+
+    async def load(self, name: str) -> Optional[CircuitState]:
+        """
+        Load the last saved state of a circuit breaker.
+
+        Args:
+            name: The circuit breaker's name.
+
+        Returns:
+            The saved state, or None if it was never saved.
+        """
+        return await self._run(lambda connection: self._load(connection, name))
+
+    async def save(self, name: str, state: CircuitState) -> None:
+        """
+        Save the state of a circuit breaker, replacing any previous one.
+
+        Args:
+            name: The circuit breaker's name.
+            state: The state to save.
+        """
+        await self._run(lambda connection: self._save(connection, name, state))
+
+    def _load(
+        self, connection: sqlite3.Connection, name: str
+    ) -> Optional[CircuitState]:
+        """Select the row for ``name``."""
+        row = connection.execute(
+            "SELECT state, failures, opened_at FROM circuit_breakers WHERE name = ?",
+            (name,),
+        ).fetchone()
+        if row is None:
+            return None
+        return CircuitState(state=row[0], failures=row[1], opened_at=row[2])
+
+    def _save(
+        self, connection: sqlite3.Connection, name: str, state: CircuitState
+    ) -> None:
+        """Upsert the row for ``name``."""
+        connection.execute(
+            "INSERT OR REPLACE INTO circuit_breakers "
+            "(name, state, failures, opened_at) VALUES (?, ?, ?, ?)",
+            (name, state.state, state.failures, state.opened_at),
+        )
+
+
+def init_circuit_state_repository(
+    path: Optional[Path] = None,
+) -> Iterator[CircuitStateRepository]:
+    """
+    Provide the circuit breaker state store for the lifetime of the container.
+
+    Yields:
+        The shared ``CircuitStateRepository``.
+    """
+    repository = CircuitStateRepository(path=path)
+    try:
+        yield repository
+    finally:
+        repository.close()
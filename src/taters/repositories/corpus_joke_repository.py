@@ -0,0 +1,83 @@
+"""Repository serving dad jokes from a local archive file."""
+
+import asyncio
+import os
+import random
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.joke_archive import open_archive
+
+CORPUS_ENV_VAR = "TATERS_CORPUS"
+
+
+class CorpusJokeRepository:
+    """Joke source backed by an archive written by ``dad-joke export``."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """
+        Initialize the corpus repository.
+
+        Args:
+            path: NDJSON or binary archive. Defaults to ``$TATERS_CORPUS``;
+                without either the corpus is empty.
+        """
+        configured = os.environ.get(CORPUS_ENV_VAR)
+        self.path = path or (Path(configured) if configured else None)
+        self._jokes: Optional[list[DadJoke]] = None
+        self._lock = asyncio.Lock()
+
+    async def get_random_joke(self) -> Optional[str]:
+        """
+        Pick the text of a random joke from the corpus.
+
+        Returns:
+            The joke text, or None if the corpus is empty or unreadable.
+        """
+        joke = await self.fetch_random_joke()
+        return joke.joke if joke is not None else None
+
+    async def fetch_random_joke(self) -> Optional[DadJoke]:
+        """
+        Pick a random joke from the corpus.
+
+        Returns:
+            A joke, or None if the corpus is empty or unreadable.
+        """
+        jokes = await self._load()
+        return random.choice(jokes) if jokes else None
+
+    async def get_random_jokes(
+        self, count: int, concurrency: int = 1
+    ) -> AsyncIterator[DadJoke]:
+        """
+        Stream up to ``count`` distinct jokes from the corpus.
+
+        Args:
+            count: Number of distinct jokes wanted.
+            concurrency: Ignored; the corpus is in memory once loaded.
+
+        Yields:
+            Distinct jokes in random order.
+        """
+        jokes = await self._load()
+        for joke in random.sample(jokes, min(count, len(jokes))):
+            yield joke
+
+    async def _load(self) -> list[DadJoke]:
+        """Read the archive once, off the event loop."""
+        async with self._lock:
+            if self._jokes is None:
+                self._jokes = await asyncio.to_thread(self._read)
+            return self._jokes
+
+    def _read(self) -> list[DadJoke]:
+        """Decode the whole archive, treating a missing or bad file as empty."""
+        if self.path is None:
+            return []
+        try:
+            with open_archive(self.path) as jokes:
+                return list(jokes)
+        except Exception:
+            return []
@@ -1,18 +1,100 @@
 """Repository for fetching dad jokes from external API."""
 
-from typing import Optional
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Optional,
+    TypeVar,
+    Union,
+)
 import httpx
 
+from taters.repositories.json_stream import JsonObjectStream
+from taters.repositories.rate_limiter import TokenBucket
+from taters.repositories.retry_policy import (
+    NO_RETRY,
+    RETRYABLE_STATUS_CODES,
+    RetryPolicy,
+    parse_retry_after,
+)
+from taters.tracing import httpx_trace_extensions, span
+
+if TYPE_CHECKING:
+    # Imported for annotations only: the index module imports DadJoke from here.
+    from taters.repositories.joke_search_index import JokeSearchIndex
+
+T = TypeVar("T")
+
+API_URL_ENV_VAR = "TATERS_API_URL"
+DEFAULT_BASE_URL = "https://icanhazdadjoke.com"
+DEFAULT_USER_AGENT = "Taters CLI (https://github.com/tristanl-slalom/accelertater)"
+DEFAULT_CONCURRENCY = 10
+MAX_ATTEMPTS_PER_JOKE = 3
+SEARCH_PAGE_SIZE = 30
+# A joke is a few hundred bytes and a search page a few kilobytes.
+DEFAULT_MAX_BODY_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class DadJoke:
+    """A single dad joke as returned by the API."""
+
+    id: str
+    joke: str
+
+
+class ResponseTooLargeError(Exception):
+    """Raised when a response body is larger than the repository accepts."""
+
 
 class DadJokeRepository:
     """Repository for fetching dad jokes from icanhazdadjoke.com API."""
 
-    def __init__(self) -> None:
-        """Initialize the dad joke repository."""
-        self.base_url = "https://icanhazdadjoke.com"
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: RetryPolicy = NO_RETRY,
+        base_url: Optional[str] = None,
+        search_index: Optional["JokeSearchIndex"] = None,
+        user_agent: str = DEFAULT_USER_AGENT,
+        max_body_size: int = DEFAULT_MAX_BODY_SIZE,
+    ) -> None:
+        """
+        Initialize the dad joke repository.
+
+        Args:
+            client: Shared HTTP client whose connection pool is reused across calls.
+            rate_limiter: Optional token bucket shared by every repository that
+                calls the API, keeping the total request rate under the limit.
+            retry_policy: How transient failures (connection errors, 429 and
+                5xx responses) are retried. Defaults to a single attempt.
+            base_url: API endpoint. Defaults to ``$TATERS_API_URL`` if set, so a
+                local stand-in can be used, else icanhazdadjoke.com.
+            search_index: Optional local index that every fetched joke is
+                added to, so searches can be answered without the network.
+            user_agent: ``User-Agent`` header sent with every request.
+            max_body_size: Largest response body read, in decoded bytes;
+                larger responses are abandoned as failures.
+        """
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.base_url = base_url or os.environ.get(API_URL_ENV_VAR, DEFAULT_BASE_URL)
+        self.search_index = search_index
+        self.max_body_size = max_body_size
         self.headers = {
             "Accept": "application/json",
-            "User-Agent": "Taters CLI (https://github.com/tristanl-slalom/accelertater)",
+            "User-Agent": user_agent,
         }
 
     async def get_random_joke(self) -> Optional[str]:
@@ -22,18 +104,332 @@ class DadJokeRepository:
         Returns:
             The joke text if successful, None if failed.
         """
+        joke = await self.fetch_random_joke()
+        return joke.joke if joke is not None else None
+
+    async def fetch_random_joke(self) -> Optional[DadJoke]:
+        """
+        Fetch a random dad joke, including its id, from the API.
+
+        Transient failures are retried according to the retry policy, and the
+        joke is added to the search index.
+
+        Returns:
+            The joke if successful, None if failed.
+        """
+        with span("repository.fetch_random_joke"):
+            data = await self._get_json(self.base_url)
+            if data is None:
+                return None
+            with span("repository.parse"):
+                joke = self._parse_joke(data)
+            if joke is not None:
+                await self._index([joke])
+            return joke
+
+    async def search_jokes(
+        self, term: str, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> AsyncIterator[DadJoke]:
+        """
+        Harvest every result of the paginated search endpoint.
+
+        The first page reveals the page count; the remaining pages are then
+        fetched concurrently. Pages are parsed as they stream in, and each
+        joke is indexed and yielded as soon as it is decoded, so the first
+        results arrive before their page has finished downloading.
+
+        Args:
+            term: The search term.
+            concurrency: Maximum number of page requests in flight.
+
+        Yields:
+            Matching jokes in arrival order.
+        """
+        # Pages push batches of jokes, then their page count (0 if they failed).
+        found: asyncio.Queue[Union[list[DadJoke], int]] = asyncio.Queue()
+        tasks: set[asyncio.Task[None]] = set()
+
+        async def fetch(page: int) -> None:
+            total_pages = 0
+            try:
+                total_pages = await self._search_page(term, page, found.put_nowait) or 0
+            finally:
+                found.put_nowait(total_pages)
+
+        def start(page: int) -> None:
+            task = asyncio.create_task(fetch(page))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        start(1)
+        outstanding = 1
+        next_pages: Optional[Iterator[int]] = None
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.base_url, headers=self.headers, timeout=10.0
+            while outstanding:
+                item = await found.get()
+                if isinstance(item, list):
+                    for joke in item:
+                        yield joke
+                    continue
+                outstanding -= 1
+                if next_pages is None:
+                    next_pages = iter(range(2, item + 1))
+                for page in next_pages:
+                    start(page)
+                    outstanding += 1
+                    if outstanding >= concurrency:
+                        break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _search_page(
+        self, term: str, page: int, on_jokes: Callable[[list[DadJoke]], None]
+    ) -> Optional[int]:
+        """
+        Stream, index and hand out one page of search results.
+
+        If the connection fails part-way through and the request is retried,
+        the jokes already handed out are skipped rather than repeated.
+
+        Args:
+            term: The search term.
+            page: One-based page number.
+            on_jokes: Receives each batch of jokes as it is decoded.
+
+        Returns:
+            The total page count, or None if the page failed.
+        """
+        delivered = 0
+
+        async def consume(response: httpx.Response) -> Optional[int]:
+            nonlocal delivered
+            parser = JsonObjectStream("results")
+            skip = delivered
+            async for chunk in self._iter_body(response):
+                jokes = [
+                    joke
+                    for joke in map(self._parse_joke, parser.feed(chunk))
+                    if joke is not None
+                ]
+                fresh = jokes[skip:]
+                skip = max(skip - len(jokes), 0)
+                if fresh:
+                    await self._index(fresh)
+                    delivered += len(fresh)
+                    on_jokes(fresh)
+            parser.close()
+            if not parser.array_found:
+                return None
+            total_pages = parser.fields.get("total_pages")
+            return total_pages if isinstance(total_pages, int) else 1
+
+        with span("repository.search_page", page=page):
+            params = {"term": term, "page": page, "limit": SEARCH_PAGE_SIZE}
+            return await self._request(f"{self.base_url}/search", consume, params)
+
+    async def _index(self, jokes: list[DadJoke]) -> None:
+        """Add freshly fetched jokes to the search index, if there is one."""
+        if self.search_index is not None and jokes:
+            with span("search_index.add"):
+                await self.search_index.add_many(jokes)
+
+    async def _get_json(
+        self, url: str, params: Optional[dict[str, Any]] = None
+    ) -> Optional[Any]:
+        """
+        GET ``url`` and decode its JSON body, retrying transient failures.
+
+        Args:
+            url: The URL to fetch.
+            params: Optional query parameters.
+
+        Returns:
+            The decoded body, or None if the request failed.
+        """
+
+        async def decode(response: httpx.Response) -> Any:
+            body = b"".join([chunk async for chunk in self._iter_body(response)])
+            return json.loads(body)
+
+        return await self._request(url, decode, params)
+
+    async def _request(
+        self,
+        url: str,
+        consume: Callable[[httpx.Response], Awaitable[Optional[T]]],
+        params: Optional[dict[str, Any]] = None,
+    ) -> Optional[T]:
+        """
+        Stream a GET of ``url`` into ``consume``, retrying transient failures.
+
+        Transient failures are retried with jittered exponential backoff, never
+        earlier than the server's ``Retry-After`` and never past the retry
+        policy's deadline. A connection lost while ``consume`` reads the body
+        is transient too, so ``consume`` may be called more than once.
+
+        Args:
+            url: The URL to fetch.
+            consume: Reads a successful response, which is closed afterwards.
+            params: Optional query parameters.
+
+        Returns:
+            What ``consume`` returned, or None if the request failed.
+        """
+        policy = self.retry_policy
+        deadline = time.monotonic() + policy.deadline
+        for attempt in range(policy.max_attempts):
+            if self.rate_limiter is not None:
+                with span("rate_limiter.acquire"):
+                    remaining = max(0.0, deadline - time.monotonic())
+                    if not await self.rate_limiter.acquire(timeout=remaining):
+                        return None
+            options: dict[str, Any] = {"headers": self.headers}
+            if params is not None:
+                options["params"] = params
+            extensions = httpx_trace_extensions()
+            if extensions is not None:
+                options["extensions"] = extensions
+            try:
+                with span("http.request", attempt=attempt + 1):
+                    async with self.client.stream("GET", url, **options) as response:
+                        response.raise_for_status()
+                        return await consume(response)
+            except httpx.RequestError:
+                delay = policy.backoff(attempt)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRYABLE_STATUS_CODES:
+                    return None
+                delay = self._retry_delay(
+                    e.response, attempt, deadline - time.monotonic()
                 )
-                response.raise_for_status()
-                data = response.json()
-                joke = data.get("joke")
-                return joke if isinstance(joke, str) else None
-        except httpx.RequestError:
-            return None
-        except httpx.HTTPStatusError:
+            except Exception:
+                # Includes ResponseTooLargeError and malformed bodies, which a
+                # retry would only download again.
+                return None
+
+            is_last_attempt = attempt + 1 >= policy.max_attempts
+            if is_last_attempt or time.monotonic() + delay > deadline:
+                return None
+            with span("retry.wait", seconds=delay):
+                await asyncio.sleep(delay)
+        return None
+
+    async def _iter_body(self, response: httpx.Response) -> AsyncIterator[bytes]:
+        """
+        Stream a response body, enforcing ``max_body_size``.
+
+        A ``Content-Length`` over the limit is refused before reading; the
+        decoded bytes are counted as well, which also catches compressed
+        bodies that expand past it.
+
+        Args:
+            response: An open streamed response.
+
+        Yields:
+            Decoded body chunks.
+
+        Raises:
+            ResponseTooLargeError: If the body is over the limit.
+        """
+        limit = self.max_body_size
+        length = response.headers.get("Content-Length", "")
+        if length.isdigit() and int(length) > limit:
+            raise ResponseTooLargeError(f"Response of {length} bytes over {limit}")
+        received = 0
+        async for chunk in response.aiter_bytes():
+            received += len(chunk)
+            if received > limit:
+                raise ResponseTooLargeError(f"Response over {limit} bytes")
+            yield chunk
+
+    async def get_random_jokes(
+        self, count: int, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> AsyncIterator[DadJoke]:
+        """
+        Fetch up to ``count`` distinct random jokes concurrently.
+
+        Jokes are yielded as soon as each request completes. Duplicates (by id)
+        are dropped and re-fetched, with at most ``MAX_ATTEMPTS_PER_JOKE``
+        requests per requested joke so a failing API cannot loop forever.
+
+        Args:
+            count: Number of distinct jokes wanted.
+            concurrency: Maximum number of requests in flight at once.
+
+        Yields:
+            Distinct jokes in completion order.
+        """
+        if count <= 0:
+            return
+
+        seen: set[str] = set()
+        attempts_left = count * MAX_ATTEMPTS_PER_JOKE
+        pending: set[asyncio.Task[Optional[DadJoke]]] = set()
+        try:
+            while len(seen) < count:
+                wanted = min(concurrency, count - len(seen))
+                while attempts_left > 0 and len(pending) < wanted:
+                    attempts_left -= 1
+                    pending.add(asyncio.create_task(self.fetch_random_joke()))
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    joke = task.result()
+                    if joke is not None and joke.id not in seen and len(seen) < count:
+                        seen.add(joke.id)
+                        yield joke
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _retry_delay(
+        self, response: httpx.Response, attempt: int, remaining: float
+    ) -> float:
+        """
+        Work out how long to wait before retrying a failed response.
+
+        A ``Retry-After`` on a 429 also pauses the shared rate limiter, so other
+        callers back off too instead of burning their retries. The pause is
+        capped at what is left of the deadline: a server asking for longer
+        makes this request give up, not stall every later one.
+
+        Args:
+            response: The retryable error response.
+            attempt: Zero-based index of the attempt that just failed.
+            remaining: Seconds left before the retry deadline.
+
+        Returns:
+            Seconds to wait, which may be past the deadline.
+        """
+        delay = self.retry_policy.backoff(attempt)
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is None:
+            return delay
+        if response.status_code == 429 and self.rate_limiter is not None:
+            self.rate_limiter.pause(max(0.0, min(retry_after, remaining)))
+        return max(delay, retry_after)
+
+    def _parse_joke(self, data: Any) -> Optional[DadJoke]:
+        """
+        Build a joke from an API payload.
+
+        Args:
+            data: Decoded JSON body of a joke response.
+
+        Returns:
+            The joke, or None if the payload has no joke text. Payloads without
+            an id are identified by their text.
+        """
+        if not isinstance(data, dict):
             return None
-        except Exception:
+        joke = data.get("joke")
+        if not isinstance(joke, str):
             return None
+        joke_id = data.get("id")
+        return DadJoke(id=joke_id if isinstance(joke_id, str) else joke, joke=joke)
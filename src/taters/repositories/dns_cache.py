@@ -0,0 +1,206 @@
+"""Cache of DNS resolutions shared by HTTP connections and CLI runs."""
+
+import asyncio
+import ipaddress
+import socket
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+from taters.repositories.sqlite_repository import SQLiteRepository
+from taters.tracing import span
+
+# getaddrinfo does not report record TTLs, so answers are kept this long.
+DEFAULT_DNS_TTL = 300.0
+
+
+def is_ip_address(host: str) -> bool:
+    """
+    Check whether a URL host is already an address.
+
+    Args:
+        host: Host name or IPv4/IPv6 literal.
+
+    Returns:
+        True if ``host`` needs no resolution.
+    """
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class DnsCache(SQLiteRepository):
+    """
+    Host to address list resolutions, kept in memory and in SQLite with a TTL.
+
+    Lookups are answered from memory, then from the database written by
+    earlier runs, and only then by the system resolver. Concurrent lookups
+    of the same host share one resolution.
+    """
+
+    # Addresses are stored space separated, in the order they are tried.
+    schema = """
+    CREATE TABLE IF NOT EXISTS dns_resolutions (
+        host TEXT NOT NULL,
+        port INTEGER NOT NULL,
+        addresses TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        PRIMARY KEY (host, port)
+    );
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_DNS_TTL,
+        path: Optional[Path] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the DNS cache.
+
+        Args:
+            ttl_seconds: How long a resolution is reused.
+            path: SQLite database file; defaults to the shared joke database.
+            clock: Wall-clock time source, so entries expire across runs.
+        """
+        super().__init__(path=path)
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: dict[tuple[str, int], tuple[tuple[str, ...], float]] = {}
+        self._pending: dict[tuple[str, int], asyncio.Task[tuple[str, ...]]] = {}
+
+    async def resolve(self, host: str, port: int) -> tuple[str, ...]:
+        """
+        Resolve a host name to its addresses.
+
+        Args:
+            host: The host name.
+            port: The port that will be connected to.
+
+        Returns:
+            The IPv4 and IPv6 addresses of ``host``, in the order to try them.
+
+        Raises:
+            OSError: If the name does not resolve.
+        """
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > self.clock():
+            return entry[0]
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.create_task(self._resolve(host, port))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def forget(self, host: str, port: int) -> None:
+        """
+        Drop a resolution, so the host is resolved afresh.
+
+        Args:
+            host: The host name.
+            port: The port.
+        """
+        self._entries.pop((host, port), None)
+        await self._run(lambda connection: self._delete(connection, host, port))
+
+    async def discard(self, host: str, port: int, address: str) -> None:
+        """
+        Drop one address of a resolution, such as one that refused connections.
+
+        The resolution is forgotten once it has no addresses left.
+
+        Args:
+            host: The host name.
+            port: The port.
+            address: The address to stop using.
+        """
+        entry = self._entries.get((host, port))
+        remaining = () if entry is None else tuple(a for a in entry[0] if a != address)
+        if entry is None or not remaining:
+            await self.forget(host, port)
+            return
+        kept = (remaining, entry[1])
+        self._entries[(host, port)] = kept
+        await self._run(lambda connection: self._save(connection, host, port, kept))
+
+    async def _resolve(self, host: str, port: int) -> tuple[str, ...]:
+        """Consult the database, then the system resolver."""
+        now = self.clock()
+        stored = await self._run(lambda connection: self._load(connection, host, port))
+        if stored is not None and stored[1] > now:
+            self._entries[(host, port)] = stored
+            return stored[0]
+
+        with span("dns.resolve", host=host):
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+        # getaddrinfo may list an address more than once; keep its first place.
+        addresses = tuple(dict.fromkeys(str(info[4][0]) for info in infos))
+        if not addresses:
+            raise OSError(f"No addresses found for {host}")
+        entry = (addresses, now + self.ttl_seconds)
+        self._entries[(host, port)] = entry
+        await self._run(lambda connection: self._save(connection, host, port, entry))
+        return addresses
+
+    def _load(
+        self, connection: sqlite3.Connection, host: str, port: int
+    ) -> Optional[tuple[tuple[str, ...], float]]:
+        """Select the stored resolution of ``host``."""
+        row = connection.execute(
+            "SELECT addresses, expires_at FROM dns_resolutions "
+            "WHERE host = ? AND port = ?",
+            (host, port),
+        ).fetchone()
+        return (tuple(row[0].split()), row[1]) if row is not None else None
+
+    def _save(
+        self,
+        connection: sqlite3.Connection,
+        host: str,
+        port: int,
+        entry: tuple[tuple[str, ...], float],
+    ) -> None:
+        """Upsert the resolution of ``host``."""
+        addresses, expires_at = entry
+        connection.execute(
+            "INSERT OR REPLACE INTO dns_resolutions "
+            "(host, port, addresses, expires_at) VALUES (?, ?, ?, ?)",
+            (host, port, " ".join(addresses), expires_at),
+        )
+
+    def _delete(self, connection: sqlite3.Connection, host: str, port: int) -> None:
+        """Delete the resolution of ``host``."""
+        connection.execute(
+            "DELETE FROM dns_resolutions WHERE host = ? AND port = ?", (host, port)
+        )
+
+
+def init_dns_cache(
+    ttl_seconds: float = DEFAULT_DNS_TTL,
+    path: Optional[Path] = None,
+) -> Iterator[Optional[DnsCache]]:
+    """
+    Provide the DNS cache for the lifetime of the container.
+
+    Args:
+        ttl_seconds: How long a resolution is reused; 0 disables the cache.
+        path: SQLite database file; defaults to the shared joke database.
+
+    Yields:
+        The shared ``DnsCache``, or None when disabled.
+    """
+    if ttl_seconds <= 0:
+        yield None
+        return
+    cache = DnsCache(ttl_seconds=ttl_seconds, path=path)
+    try:
+        yield cache
+    finally:
+        cache.close()
@@ -0,0 +1,149 @@
+"""Shared HTTP client used by repositories that talk to external APIs."""
+
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from taters.repositories.dns_cache import DnsCache, is_ip_address
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 5
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+
+class ResolvingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport connecting to addresses from a ``DnsCache``.
+
+    Each request's host is swapped for a cached address before it reaches
+    the connection pool, so new connections skip the name lookup. The
+    ``Host`` header and the TLS server name still carry the original host,
+    so virtual hosting and certificate checks are unaffected. An address
+    that refuses the connection is dropped and the next one is tried.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, resolver: DnsCache) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            transport: Transport sending the rewritten requests.
+            resolver: Cache resolving host names.
+        """
+        self.transport = transport
+        self.resolver = resolver
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """
+        Send a request to the cached address of its host.
+
+        Args:
+            request: The request to send.
+
+        Returns:
+            The response.
+        """
+        url = request.url
+        if is_ip_address(url.host):
+            return await self.transport.handle_async_request(request)
+
+        port = url.port or (443 if url.scheme == "https" else 80)
+        try:
+            addresses = await self.resolver.resolve(url.host, port)
+        except OSError as e:
+            raise httpx.ConnectError(str(e), request=request) from e
+        for address in addresses[:-1]:
+            try:
+                return await self._send(request, address)
+            except httpx.ConnectError:
+                await self.resolver.discard(url.host, port, address)
+        try:
+            return await self._send(request, addresses[-1])
+        except httpx.ConnectError:
+            # Every address failed and may be stale; the next attempt resolves
+            # afresh.
+            await self.resolver.forget(url.host, port)
+            raise
+
+    async def _send(self, request: httpx.Request, address: str) -> httpx.Response:
+        """Send ``request`` to ``address`` under its original host name."""
+        resolved = httpx.Request(
+            request.method,
+            request.url.copy_with(host=address),
+            headers=request.headers,
+            stream=request.stream,
+            extensions={**request.extensions, "sni_hostname": request.url.host},
+        )
+        return await self.transport.handle_async_request(resolved)
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport."""
+        await self.transport.aclose()
+
+
+def create_http_client(
+    timeout: float = DEFAULT_TIMEOUT,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool = False,
+    resolver: Optional[DnsCache] = None,
+) -> httpx.AsyncClient:
+    """
+    Create a pooled async HTTP client.
+
+    Args:
+        timeout: Default timeout in seconds for every request.
+        max_connections: Maximum number of concurrent connections in the pool.
+        max_keepalive_connections: Maximum number of idle connections kept open.
+        keepalive_expiry: Seconds an idle connection is kept before closing.
+        http2: Whether to negotiate HTTP/2 (requires the ``h2`` package).
+        resolver: Optional cache answering the name lookups of new
+            connections. Requests sent through a proxy are left alone.
+
+    Returns:
+        An ``httpx.AsyncClient`` whose connection pool is reused across requests.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    if resolver is None:
+        return httpx.AsyncClient(timeout=timeout, limits=limits, http2=http2)
+    transport = ResolvingTransport(
+        httpx.AsyncHTTPTransport(limits=limits, http2=http2), resolver
+    )
+    return httpx.AsyncClient(timeout=timeout, transport=transport)
+
+
+async def init_http_client(
+    timeout: float = DEFAULT_TIMEOUT,
+    max_connections: int = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool = False,
+    resolver: Optional[DnsCache] = None,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Provide a pooled HTTP client for the lifetime of the container.
+
+    Used as a ``providers.Resource`` initializer: the client is created on
+    ``init_resources()`` and closed on ``shutdown_resources()``.
+
+    Yields:
+        The shared ``httpx.AsyncClient``.
+    """
+    client = create_http_client(
+        timeout=timeout,
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+        http2=http2,
+        resolver=resolver,
+    )
+    try:
+        yield client
+    finally:
+        await client.aclose()
@@ -0,0 +1,171 @@
+"""Streaming codecs for joke corpus archives (NDJSON and length-prefixed binary)."""
+
+import json
+import mmap
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Union
+
+from taters.repositories.dad_joke_repository import DadJoke
+
+NDJSON = "ndjson"
+BINARY = "binary"
+FORMATS = (NDJSON, BINARY)
+
+# Binary archives start with this magic, followed by one record per joke: a
+# big-endian u32 byte length and UTF-8 bytes for the id, then the same for the
+# joke text.
+BINARY_MAGIC = b"TJOKES\x00\x01"
+_LENGTH = struct.Struct(">I")
+# Encoded records are written in chunks of about this many bytes.
+WRITE_CHUNK_SIZE = 64 * 1024
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+class JokeArchiveError(Exception):
+    """Raised when an archive cannot be decoded."""
+
+
+def encode(jokes: Iterable[DadJoke], format: str) -> Iterator[bytes]:
+    """
+    Encode jokes lazily into chunks of archive bytes.
+
+    Args:
+        jokes: The jokes to encode; consumed one at a time.
+        format: ``"ndjson"`` or ``"binary"``.
+
+    Yields:
+        Chunks of roughly ``WRITE_CHUNK_SIZE`` bytes.
+    """
+    encode_record = _encode_binary if format == BINARY else _encode_ndjson
+    chunk = bytearray(BINARY_MAGIC if format == BINARY else b"")
+    for joke in jokes:
+        chunk += encode_record(joke)
+        if len(chunk) >= WRITE_CHUNK_SIZE:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+
+def write_archive(jokes: Iterable[DadJoke], stream: BinaryIO, format: str) -> int:
+    """
+    Stream jokes into an archive.
+
+    Args:
+        jokes: The jokes to write; consumed one at a time.
+        stream: Binary output, such as an open file or ``sys.stdout.buffer``.
+        format: ``"ndjson"`` or ``"binary"``.
+
+    Returns:
+        The number of jokes written.
+    """
+    written = 0
+
+    def counted() -> Iterator[DadJoke]:
+        nonlocal written
+        for joke in jokes:
+            written += 1
+            yield joke
+
+    for chunk in encode(counted(), format):
+        stream.write(chunk)
+    stream.flush()
+    return written
+
+
+def decode(buffer: Buffer) -> Iterator[DadJoke]:
+    """
+    Decode an archive, detecting its format from the binary magic.
+
+    Args:
+        buffer: The whole archive, typically a memory map.
+
+    Yields:
+        The archived jokes in order.
+    """
+    if buffer[: len(BINARY_MAGIC)] == BINARY_MAGIC:
+        return _decode_binary(buffer)
+    return _decode_ndjson(buffer)
+
+
+@contextmanager
+def open_archive(path: Path) -> Iterator[Iterator[DadJoke]]:
+    """
+    Memory-map an archive file and decode it lazily.
+
+    Only the pages being decoded need to be resident, so memory use does not
+    grow with the archive size.
+
+    Args:
+        path: The archive file.
+
+    Yields:
+        An iterator over the archived jokes, valid inside the ``with`` block.
+    """
+    with path.open("rb") as archive:
+        if path.stat().st_size == 0:
+            yield iter(())
+            return
+        with mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield decode(buffer)
+
+
+def _encode_ndjson(joke: DadJoke) -> bytes:
+    """Encode one joke as a JSON line."""
+    record = {"id": joke.id, "joke": joke.joke}
+    return json.dumps(record, ensure_ascii=False).encode() + b"\n"
+
+
+def _encode_binary(joke: DadJoke) -> bytes:
+    """Encode one joke as two length-prefixed UTF-8 strings."""
+    joke_id = joke.id.encode()
+    text = joke.joke.encode()
+    return _LENGTH.pack(len(joke_id)) + joke_id + _LENGTH.pack(len(text)) + text
+
+
+def _decode_ndjson(buffer: Buffer) -> Iterator[DadJoke]:
+    """Decode JSON lines, skipping blank ones."""
+    position = 0
+    size = len(buffer)
+    line_number = 0
+    while position < size:
+        end = buffer.find(b"\n", position)
+        if end == -1:
+            end = size
+        line = buffer[position:end]
+        position = end + 1
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            yield DadJoke(id=str(record["id"]), joke=str(record["joke"]))
+        except (ValueError, KeyError, TypeError) as e:
+            raise JokeArchiveError(f"Invalid record on line {line_number}") from e
+
+
+def _decode_binary(buffer: Buffer) -> Iterator[DadJoke]:
+    """Decode length-prefixed records following the magic."""
+    position = len(BINARY_MAGIC)
+    size = len(buffer)
+    while position < size:
+        joke_id, position = _read_string(buffer, position, size)
+        text, position = _read_string(buffer, position, size)
+        yield DadJoke(id=joke_id, joke=text)
+
+
+def _read_string(buffer: Buffer, position: int, size: int) -> tuple[str, int]:
+    """Read one length-prefixed UTF-8 string starting at ``position``."""
+    end = position + _LENGTH.size
+    if end > size:
+        raise JokeArchiveError(f"Truncated record at byte {position}")
+    (length,) = _LENGTH.unpack_from(buffer, position)
+    if end + length > size:
+        raise JokeArchiveError(f"Truncated record at byte {position}")
+    try:
+        return buffer[end : end + length].decode(), end + length
+    except UnicodeDecodeError as e:
+        raise JokeArchiveError(f"Invalid UTF-8 at byte {end}") from e
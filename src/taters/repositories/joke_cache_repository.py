@@ -0,0 +1,235 @@
+"""Repository for the persistent on-disk dad joke cache."""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable, Iterator, Optional
+
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.sqlite_repository import SQLiteRepository
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+class JokeCacheRepository(SQLiteRepository):
+    """
+    SQLite-backed joke cache with TTL expiry and LRU eviction.
+
+    Jokes loaded from an archive are recorded in ``imported_jokes`` and do not
+    count towards the size bound, so an import is served offline in full.
+    """
+
+    schema = """
+    CREATE TABLE IF NOT EXISTS jokes (
+        id TEXT PRIMARY KEY,
+        joke TEXT NOT NULL,
+        fetched_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS jokes_accessed_at ON jokes (accessed_at);
+    CREATE TABLE IF NOT EXISTS imported_jokes (
+        id TEXT PRIMARY KEY
+    );
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the joke cache repository.
+
+        Args:
+            path: SQLite database file. Defaults to ``jokes.sqlite3`` in the
+                XDG cache directory.
+            max_entries: Maximum number of fetched jokes kept; the least
+                recently used ones are evicted beyond this. Imported jokes are
+                not counted.
+            ttl_seconds: Age after which a cached joke is no longer served.
+            clock: Source of the current time, in seconds since the epoch.
+        """
+        super().__init__(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+
+    async def put(self, joke: DadJoke) -> None:
+        """
+        Store a freshly fetched joke.
+
+        Args:
+            joke: The joke to cache.
+        """
+        await self.put_many([joke])
+
+    async def put_many(self, jokes: Iterable[DadJoke]) -> None:
+        """
+        Store several jokes in one transaction, then evict old entries.
+
+        Args:
+            jokes: The jokes to cache.
+        """
+        rows = list(jokes)
+        await self._run(lambda connection: self._put_many(connection, rows))
+
+    async def bulk_load(self, jokes: Iterable[DadJoke]) -> None:
+        """
+        Store a lazily produced stream of imported jokes in one transaction.
+
+        ``jokes`` is consumed on the database worker thread, one joke at a
+        time.
+
+        Args:
+            jokes: The jokes to cache.
+        """
+        await self._run(lambda connection: self.load(connection, jokes))
+
+    def load(self, connection: sqlite3.Connection, jokes: Iterable[DadJoke]) -> None:
+        """
+        Store imported jokes within a transaction the caller has open.
+
+        Imported jokes are exempt from the size bound but still expire.
+
+        Args:
+            connection: A connection to this cache's database.
+            jokes: The jokes to cache.
+        """
+        self._put_many(connection, jokes, imported=True)
+
+    async def get_random(self) -> Optional[DadJoke]:
+        """
+        Get a random unexpired joke from the cache.
+
+        Returns:
+            A cached joke, or None if the cache has none.
+        """
+        jokes = await self.get_random_many(1)
+        return jokes[0] if jokes else None
+
+    async def get_random_many(self, count: int) -> list[DadJoke]:
+        """
+        Get up to ``count`` distinct random unexpired jokes from the cache.
+
+        Args:
+            count: Maximum number of jokes to return.
+
+        Returns:
+            The cached jokes; each one is marked as recently used.
+        """
+        return await self._run(
+            lambda connection: self._get_random_many(connection, count)
+        )
+
+    async def get_random_joke(self) -> Optional[str]:
+        """
+        Get the text of a random cached joke, as a ``JokeSource``.
+
+        Returns:
+            The joke text, or None if the cache has none.
+        """
+        joke = await self.get_random()
+        return joke.joke if joke is not None else None
+
+    async def fetch_random_joke(self) -> Optional[DadJoke]:
+        """
+        Get a random cached joke, as a ``JokeSource``.
+
+        Returns:
+            A cached joke, or None if the cache has none.
+        """
+        return await self.get_random()
+
+    async def get_random_jokes(
+        self, count: int, concurrency: int = 1
+    ) -> AsyncIterator[DadJoke]:
+        """
+        Stream up to ``count`` distinct cached jokes, as a ``JokeSource``.
+
+        Args:
+            count: Number of distinct jokes wanted.
+            concurrency: Ignored; one query reads them all.
+
+        Yields:
+            Distinct cached jokes.
+        """
+        for joke in await self.get_random_many(count):
+            yield joke
+
+    def _put_many(
+        self,
+        connection: sqlite3.Connection,
+        jokes: Iterable[DadJoke],
+        imported: bool = False,
+    ) -> None:
+        """Insert or refresh jokes and enforce the TTL and size bound."""
+        now = self.clock()
+        connection.executemany(
+            "INSERT INTO jokes (id, joke, fetched_at, accessed_at) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET joke = excluded.joke, "
+            "fetched_at = excluded.fetched_at, accessed_at = excluded.accessed_at",
+            ((joke.id, joke.joke, now, now) for joke in jokes),
+        )
+        if imported:
+            # Every row written above, and only those, was stamped with ``now``.
+            connection.execute(
+                "INSERT OR IGNORE INTO imported_jokes (id) "
+                "SELECT id FROM jokes WHERE fetched_at = ?",
+                (now,),
+            )
+        expired_before = now - self.ttl_seconds
+        connection.execute(
+            "DELETE FROM imported_jokes WHERE id IN ("
+            "SELECT id FROM jokes WHERE fetched_at < ?)",
+            (expired_before,),
+        )
+        connection.execute("DELETE FROM jokes WHERE fetched_at < ?", (expired_before,))
+        connection.execute(
+            "DELETE FROM jokes WHERE id IN ("
+            "SELECT id FROM jokes WHERE id NOT IN (SELECT id FROM imported_jokes) "
+            "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def _get_random_many(
+        self, connection: sqlite3.Connection, count: int
+    ) -> list[DadJoke]:
+        """Select random unexpired jokes and bump their access time."""
+        now = self.clock()
+        rows = connection.execute(
+            "SELECT id, joke FROM jokes WHERE fetched_at >= ? "
+            "ORDER BY RANDOM() LIMIT ?",
+            (now - self.ttl_seconds, count),
+        ).fetchall()
+        connection.executemany(
+            "UPDATE jokes SET accessed_at = ? WHERE id = ?",
+            [(now, row[0]) for row in rows],
+        )
+        return [DadJoke(id=row[0], joke=row[1]) for row in rows]
+
+
+def init_joke_cache(
+    path: Optional[Path] = None,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    ttl_seconds: float = DEFAULT_TTL_SECONDS,
+) -> Iterator[JokeCacheRepository]:
+    """
+    Provide the joke cache for the lifetime of the container.
+
+    Used as a ``providers.Resource`` initializer so the database connection is
+    closed on ``shutdown_resources()``.
+
+    Yields:
+        The shared ``JokeCacheRepository``.
+    """
+    cache = JokeCacheRepository(
+        path=path, max_entries=max_entries, ttl_seconds=ttl_seconds
+    )
+    try:
+        yield cache
+    finally:
+        cache.close()
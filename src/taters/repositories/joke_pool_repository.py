@@ -0,0 +1,92 @@
+"""Repository for the persisted pool of prefetched, not yet shown jokes."""
+
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.sqlite_repository import SQLiteRepository
+
+
+class JokePoolRepository(SQLiteRepository):
+    """First-in, first-out queue of prefetched jokes stored in SQLite."""
+
+    schema = """
+    CREATE TABLE IF NOT EXISTS prefetch_pool (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        id TEXT NOT NULL UNIQUE,
+        joke TEXT NOT NULL
+    );
+    """
+
+    async def pop(self) -> Optional[DadJoke]:
+        """
+        Remove and return the oldest joke in the pool.
+
+        Returns:
+            The joke, or None if the pool is empty.
+        """
+        return await self._run(self._pop)
+
+    async def push_many(self, jokes: Iterable[DadJoke]) -> int:
+        """
+        Append jokes to the pool, skipping ones already queued.
+
+        Args:
+            jokes: The jokes to queue.
+
+        Returns:
+            The number of jokes actually added.
+        """
+        rows = [(joke.id, joke.joke) for joke in jokes]
+        return await self._run(lambda connection: self._push_many(connection, rows))
+
+    async def size(self) -> int:
+        """
+        Count the jokes currently in the pool.
+
+        Returns:
+            The pool size.
+        """
+        return await self._run(self._size)
+
+    def _pop(self, connection: sqlite3.Connection) -> Optional[DadJoke]:
+        """Delete the oldest row and return it."""
+        row = connection.execute(
+            "SELECT seq, id, joke FROM prefetch_pool ORDER BY seq LIMIT 1"
+        ).fetchone()
+        if row is None:
+            return None
+        connection.execute("DELETE FROM prefetch_pool WHERE seq = ?", (row[0],))
+        return DadJoke(id=row[1], joke=row[2])
+
+    def _push_many(
+        self, connection: sqlite3.Connection, rows: list[tuple[str, str]]
+    ) -> int:
+        """Insert rows, ignoring ids already in the pool."""
+        before = connection.total_changes
+        connection.executemany(
+            "INSERT OR IGNORE INTO prefetch_pool (id, joke) VALUES (?, ?)", rows
+        )
+        return connection.total_changes - before
+
+    def _size(self, connection: sqlite3.Connection) -> int:
+        """Count rows in the pool."""
+        row = connection.execute("SELECT COUNT(*) FROM prefetch_pool").fetchone()
+        return int(row[0])
+
+
+def init_joke_pool_repository(
+    path: Optional[Path] = None,
+) -> Iterator[JokePoolRepository]:
+    """
+    Provide the prefetch pool store for the lifetime of the container.
+
+    Yields:
+        The shared ``JokePoolRepository``.
+    """
+    repository = JokePoolRepository(path=path)
+    try:
+        yield repository
+    finally:
+        repository.close()
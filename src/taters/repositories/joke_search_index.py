@@ -0,0 +1,238 @@
+"""Repository for the on-disk inverted index used by ``dad-joke search``."""
+
+import collections
+import re
+import sqlite3
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.joke_cache_repository import JokeCacheRepository
+from taters.repositories.sqlite_repository import SQLiteRepository
+
+T = TypeVar("T")
+
+DEFAULT_SEARCH_LIMIT = 20
+# Postings are inserted in batches of this size, bounding memory on bulk loads.
+POSTINGS_BATCH_SIZE = 10_000
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+_APOSTROPHES = str.maketrans("", "", "'’")
+# Sorts after every character, so ``prefix + _MAX_CHAR`` bounds a prefix range.
+_MAX_CHAR = "\U0010ffff"
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into distinct, case-folded search tokens.
+
+    Apostrophes are dropped rather than split on, so "don't" becomes "dont".
+
+    Args:
+        text: The text to tokenize.
+
+    Returns:
+        The distinct tokens in order of first appearance.
+    """
+    tokens = _TOKEN_PATTERN.findall(text.casefold().translate(_APOSTROPHES))
+    return list(dict.fromkeys(tokens))
+
+
+class JokeSearchIndex(SQLiteRepository):
+    """Inverted index from tokens to jokes, kept in SQLite and never evicted."""
+
+    # Postings are clustered on (token, joke_id), so matching a token prefix is
+    # one range scan; the (joke_id, token) index checks further tokens per joke.
+    schema = """
+    CREATE TABLE IF NOT EXISTS search_jokes (
+        id TEXT PRIMARY KEY,
+        joke TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS search_postings (
+        token TEXT NOT NULL,
+        joke_id TEXT NOT NULL,
+        PRIMARY KEY (token, joke_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS search_postings_joke
+        ON search_postings (joke_id, token);
+    """
+
+    async def add_many(self, jokes: Iterable[DadJoke]) -> int:
+        """
+        Index jokes in one transaction, skipping ones already indexed.
+
+        Args:
+            jokes: The jokes to index.
+
+        Returns:
+            The number of jokes newly indexed.
+        """
+        rows = list(jokes)
+        if not rows:
+            return 0
+        return await self._run(lambda connection: self._add_many(connection, rows))
+
+    async def bulk_load(
+        self, jokes: Iterable[DadJoke], cache: Optional[JokeCacheRepository] = None
+    ) -> int:
+        """
+        Index a lazily produced stream of jokes in one transaction.
+
+        ``jokes`` is consumed on the database worker thread, one joke at a
+        time, so a generator over a large file is never held in memory.
+
+        Args:
+            jokes: The jokes to index.
+            cache: A joke cache in the same database to load the jokes into as
+                well, in the same transaction and the same pass over ``jokes``.
+
+        Returns:
+            The number of jokes newly indexed.
+        """
+        if cache is None:
+            return await self._run(lambda connection: self._add_many(connection, jokes))
+        return await self._run_with(
+            [cache], lambda connection: self._add_many(connection, jokes, cache.load)
+        )
+
+    async def dump(self, consumer: Callable[[Iterator[DadJoke]], T]) -> T:
+        """
+        Stream every indexed joke, in indexing order, through ``consumer``.
+
+        The consumer runs on the database worker thread while rows are read
+        lazily from a cursor.
+
+        Args:
+            consumer: Receives an iterator over all indexed jokes.
+
+        Returns:
+            Whatever the consumer returns.
+        """
+        return await self._run(
+            lambda connection: consumer(self._iter_jokes(connection))
+        )
+
+    async def search(
+        self, term: str, limit: int = DEFAULT_SEARCH_LIMIT
+    ) -> list[DadJoke]:
+        """
+        Find jokes containing every token of ``term``.
+
+        Each query token matches indexed tokens it is a prefix of, so "pizza"
+        also finds "pizzas".
+
+        Args:
+            term: The search text.
+            limit: Maximum number of jokes to return.
+
+        Returns:
+            Matching jokes, in no particular order.
+        """
+        tokens = tokenize(term)
+        if not tokens:
+            return []
+        return await self._run(
+            lambda connection: self._search(connection, tokens, limit)
+        )
+
+    async def size(self) -> int:
+        """
+        Count the indexed jokes.
+
+        Returns:
+            The number of jokes in the index.
+        """
+        return await self._run(self._size)
+
+    def _add_many(
+        self,
+        connection: sqlite3.Connection,
+        jokes: Iterable[DadJoke],
+        then: Optional[Callable[[sqlite3.Connection, Iterable[DadJoke]], None]] = None,
+    ) -> int:
+        """Insert new jokes and their postings, passing each joke on to ``then``."""
+        added = 0
+        postings: list[tuple[str, str]] = []
+
+        def indexed() -> Iterator[DadJoke]:
+            nonlocal added
+            for joke in jokes:
+                cursor = connection.execute(
+                    "INSERT OR IGNORE INTO search_jokes (id, joke) VALUES (?, ?)",
+                    (joke.id, joke.joke),
+                )
+                if cursor.rowcount:
+                    added += 1
+                    postings.extend((token, joke.id) for token in tokenize(joke.joke))
+                if len(postings) >= POSTINGS_BATCH_SIZE:
+                    self._insert_postings(connection, postings)
+                    postings.clear()
+                yield joke
+
+        if then is None:
+            collections.deque(indexed(), maxlen=0)
+        else:
+            then(connection, indexed())
+        self._insert_postings(connection, postings)
+        return added
+
+    def _insert_postings(
+        self, connection: sqlite3.Connection, postings: list[tuple[str, str]]
+    ) -> None:
+        """Insert (token, joke_id) pairs."""
+        connection.executemany(
+            "INSERT OR IGNORE INTO search_postings (token, joke_id) VALUES (?, ?)",
+            postings,
+        )
+
+    def _iter_jokes(self, connection: sqlite3.Connection) -> Iterator[DadJoke]:
+        """Read all indexed jokes lazily, oldest first."""
+        cursor = connection.execute("SELECT id, joke FROM search_jokes ORDER BY rowid")
+        for row in cursor:
+            yield DadJoke(id=row[0], joke=row[1])
+
+    def _search(
+        self, connection: sqlite3.Connection, tokens: list[str], limit: int
+    ) -> list[DadJoke]:
+        """
+        Walk the postings of one token and keep jokes having all the others.
+
+        The longest token is assumed to be the most selective and drives the
+        scan, which stops as soon as ``limit`` jokes are found.
+        """
+        tokens = sorted(tokens, key=len, reverse=True)
+        others = "".join(
+            " AND EXISTS (SELECT 1 FROM search_postings other"
+            " WHERE other.joke_id = posting.joke_id"
+            " AND other.token >= ? AND other.token < ?)"
+            for _ in tokens[1:]
+        )
+        bounds = [bound for token in tokens for bound in (token, token + _MAX_CHAR)]
+        rows = connection.execute(
+            "SELECT DISTINCT jokes.id, jokes.joke FROM search_postings posting "
+            "JOIN search_jokes jokes ON jokes.id = posting.joke_id "
+            f"WHERE posting.token >= ? AND posting.token < ?{others} LIMIT ?",
+            (*bounds, limit),
+        ).fetchall()
+        return [DadJoke(id=row[0], joke=row[1]) for row in rows]
+
+    def _size(self, connection: sqlite3.Connection) -> int:
+        """Count indexed jokes."""
+        row = connection.execute("SELECT COUNT(*) FROM search_jokes").fetchone()
+        return int(row[0])
+
+
+def init_joke_search_index(
+    path: Optional[Path] = None,
+) -> Iterator[JokeSearchIndex]:
+    """
+    Provide the search index for the lifetime of the container.
+
+    Yields:
+        The shared ``JokeSearchIndex``.
+    """
+    index = JokeSearchIndex(path=path)
+    try:
+        yield index
+    finally:
+        index.close()
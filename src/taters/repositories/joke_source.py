@@ -0,0 +1,21 @@
+"""Interface shared by every repository that can supply dad jokes."""
+
+from typing import AsyncIterator, Optional, Protocol
+
+from taters.repositories.dad_joke_repository import DadJoke
+
+
+class JokeSource(Protocol):
+    """Anything the dad joke service can fetch jokes from."""
+
+    async def get_random_joke(self) -> Optional[str]:
+        """Fetch the text of a random joke, or None if unavailable."""
+        ...
+
+    async def fetch_random_joke(self) -> Optional[DadJoke]:
+        """Fetch a random joke with its id, or None if unavailable."""
+        ...
+
+    def get_random_jokes(self, count: int, concurrency: int) -> AsyncIterator[DadJoke]:
+        """Stream up to ``count`` distinct jokes."""
+        ...
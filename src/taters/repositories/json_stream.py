@@ -0,0 +1,170 @@
+"""Incremental parser for JSON objects received in chunks."""
+
+import codecs
+import json
+from typing import Any, Optional
+
+# Whitespace allowed between JSON tokens.
+_WHITESPACE = " \t\n\r"
+# Characters that may follow a complete value inside an object or array.
+_DELIMITERS = _WHITESPACE + ",:]}"
+
+
+class JsonStreamError(ValueError):
+    """Raised when a streamed document is not the expected JSON object."""
+
+
+class JsonObjectStream:
+    """
+    Parses one JSON object as its bytes arrive.
+
+    The items of the array under ``array_key`` are handed out one by one as
+    soon as each is complete, and never stored; every other member is kept
+    in ``fields`` once parsed. Only the unparsed tail of the input is
+    buffered, so memory stays proportional to the largest single item.
+    """
+
+    def __init__(self, array_key: str) -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            array_key: Top-level key whose array items are streamed.
+        """
+        self.array_key = array_key
+        self.fields: dict[str, Any] = {}
+        self.array_found = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._state = "start"
+        self._key = ""
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing brace of the object has been parsed."""
+        return self._state == "done"
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """
+        Parse the next chunk of the document.
+
+        Args:
+            chunk: Bytes following those already fed; may split characters,
+                tokens and items anywhere.
+
+        Returns:
+            The array items completed by this chunk, in document order.
+
+        Raises:
+            JsonStreamError: If the document is not a JSON object.
+        """
+        self._buffer = self._buffer[self._position :] + self._decoder.decode(chunk)
+        self._position = 0
+        items: list[Any] = []
+        while self._step(items):
+            pass
+        return items
+
+    def close(self) -> None:
+        """
+        Check that the whole object was received.
+
+        Raises:
+            JsonStreamError: If the document ended early.
+        """
+        self.feed(b"")
+        self._decoder.decode(b"", final=True)
+        if not self.done:
+            raise JsonStreamError("Truncated or invalid JSON object")
+
+    def _step(self, items: list[Any]) -> bool:
+        """Advance one token; False when more input is needed."""
+        char = self._next_char()
+        if char is None:
+            return False
+        state = self._state
+        if state == "done":
+            raise JsonStreamError(f"Unexpected {char!r} after the object")
+        if state == "start":
+            self._expect(char, "{")
+            self._state = "first_key"
+        elif state in ("first_key", "key"):
+            if char == "}" and state == "first_key":
+                self._position += 1
+                self._state = "done"
+                return True
+            self._expect(char, '"', consume=False)
+            complete, key = self._value()
+            if not complete:
+                return False
+            self._key = key
+            self._state = "colon"
+        elif state == "colon":
+            self._expect(char, ":")
+            self._state = "value"
+        elif state == "value":
+            if self._key == self.array_key and char == "[":
+                self._position += 1
+                self.array_found = True
+                self._state = "first_item"
+                return True
+            complete, value = self._value()
+            if not complete:
+                return False
+            self.fields[self._key] = value
+            self._state = "after_member"
+        elif state == "after_member":
+            self._expect(char, ",}")
+            self._state = "key" if char == "," else "done"
+        elif state in ("first_item", "item"):
+            if char == "]" and state == "first_item":
+                self._position += 1
+                self._state = "after_member"
+                return True
+            complete, item = self._value()
+            if not complete:
+                return False
+            items.append(item)
+            self._state = "after_item"
+        elif state == "after_item":
+            self._expect(char, ",]")
+            self._state = "item" if char == "," else "after_member"
+        return True
+
+    def _next_char(self) -> Optional[str]:
+        """Skip whitespace and peek at the next character, if any."""
+        buffer = self._buffer
+        position = self._position
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        self._position = position
+        return buffer[position] if position < len(buffer) else None
+
+    def _expect(self, char: str, allowed: str, consume: bool = True) -> None:
+        """Check the next character is one of ``allowed``."""
+        if char not in allowed:
+            raise JsonStreamError(
+                f"Expected {' or '.join(map(repr, allowed))}, got {char!r}"
+            )
+        if consume:
+            self._position += 1
+
+    def _value(self) -> tuple[bool, Any]:
+        """
+        Decode the value at the current position, if it is complete.
+
+        A value is only accepted once a delimiter after it has arrived, so a
+        number split across chunks, such as ``1`` then ``.5``, is never read
+        short.
+        """
+        try:
+            value, end = self._json.raw_decode(self._buffer, self._position)
+        except json.JSONDecodeError:
+            # Either a value still arriving or garbage; ``close`` tells which.
+            return False, None
+        if end >= len(self._buffer) or self._buffer[end] not in _DELIMITERS:
+            return False, None
+        self._position = end
+        return True, value
@@ -0,0 +1,64 @@
+"""Repository persisting recent joke API latencies between CLI runs."""
+
+import sqlite3
+from typing import Sequence
+
+from taters.repositories.sqlite_repository import SQLiteRepository
+
+
+class LatencySampleRepository(SQLiteRepository):
+    """Sliding window of latency samples stored in SQLite, oldest first."""
+
+    schema = """
+    CREATE TABLE IF NOT EXISTS latency_samples (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        seconds REAL NOT NULL
+    );
+    """
+
+    async def load(self, limit: int) -> list[float]:
+        """
+        Load the most recent samples.
+
+        Args:
+            limit: Maximum number of samples to load.
+
+        Returns:
+            Up to ``limit`` samples, oldest first.
+        """
+        return await self._run(lambda connection: self._load(connection, limit))
+
+    async def save(self, samples: Sequence[float], keep: int) -> None:
+        """
+        Append samples, then drop all but the ``keep`` most recent ones.
+
+        Samples saved meanwhile by another process are kept alongside.
+
+        Args:
+            samples: New samples, oldest first.
+            keep: Number of samples the window holds.
+        """
+        if samples:
+            await self._run(lambda connection: self._save(connection, samples, keep))
+
+    def _load(self, connection: sqlite3.Connection, limit: int) -> list[float]:
+        """Select the newest ``limit`` samples in recording order."""
+        rows = connection.execute(
+            "SELECT seconds FROM latency_samples ORDER BY seq DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [row[0] for row in reversed(rows)]
+
+    def _save(
+        self, connection: sqlite3.Connection, samples: Sequence[float], keep: int
+    ) -> None:
+        """Insert samples and trim the table to the window."""
+        connection.executemany(
+            "INSERT INTO latency_samples (seconds) VALUES (?)",
+            [(seconds,) for seconds in samples],
+        )
+        connection.execute(
+            "DELETE FROM latency_samples WHERE seq IN ("
+            "SELECT seq FROM latency_samples ORDER BY seq DESC LIMIT -1 OFFSET ?)",
+            (keep,),
+        )
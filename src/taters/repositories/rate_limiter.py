@@ -0,0 +1,83 @@
+"""Client-side rate limiting for calls to external APIs."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 10.0
+
+
+class TokenBucket:
+    """Token-bucket limiter shared by every repository calling one upstream."""
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: float = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second, i.e. the sustained request rate.
+            burst: Maximum number of tokens, i.e. the largest burst allowed.
+            clock: Monotonic time source in seconds.
+            sleep: Coroutine used to wait for tokens.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = burst
+        self._updated_at = clock()
+        self._paused_until = 0.0
+
+    async def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a request may be sent, then consume one token.
+
+        Args:
+            timeout: Most seconds to wait in total, such as what is left of a
+                retry deadline; None waits as long as it takes.
+
+        Returns:
+            True once a token is consumed, or False, without waiting, as soon
+            as no token will be free before ``timeout`` runs out.
+        """
+        give_up_at = None if timeout is None else self.clock() + timeout
+        while True:
+            # Nothing here awaits, so callers cannot interleave; waiting is
+            # done outside, where a pause taken meanwhile is seen on waking.
+            now = self._refill()
+            wait = self._paused_until - now
+            if wait <= 0:
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if give_up_at is not None and now + wait > give_up_at:
+                return False
+            await self.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out tokens for ``seconds``, e.g. after a 429 Retry-After.
+
+        Args:
+            seconds: How long every caller should hold off.
+        """
+        now = self._refill()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0
+
+    def _refill(self) -> float:
+        """Add the tokens earned since the last update and return the time."""
+        now = self.clock()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        return now
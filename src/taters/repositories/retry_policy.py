@@ -0,0 +1,64 @@
+"""Retry policy for transient failures of external API calls."""
+
+import random
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Jittered exponential backoff bounded by attempts and a total deadline."""
+
+    max_attempts: int = 4
+    base_delay: float = 0.25
+    max_delay: float = 5.0
+    deadline: float = 20.0
+    jitter: Callable[[float, float], float] = field(
+        default=random.uniform, compare=False
+    )
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Get the delay before retrying after the given failed attempt.
+
+        Uses "full jitter": a random delay between zero and the capped
+        exponential backoff, so concurrent clients do not retry in lockstep.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed.
+
+        Returns:
+            Seconds to wait.
+        """
+        return self.jitter(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
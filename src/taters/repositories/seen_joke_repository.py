@@ -0,0 +1,124 @@
+"""Repository persisting the ids of jokes already shown."""
+
+import sqlite3
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from taters.repositories.bloom_filter import (
+    DEFAULT_ERROR_RATE,
+    DEFAULT_INITIAL_CAPACITY,
+    BloomFilter,
+    ScalableBloomFilter,
+)
+from taters.repositories.sqlite_repository import SQLiteRepository
+
+
+class SeenJokeRepository(SQLiteRepository):
+    """Slices of the seen-joke Bloom filter stored in SQLite."""
+
+    schema = """
+    CREATE TABLE IF NOT EXISTS seen_joke_filters (
+        slice INTEGER PRIMARY KEY,
+        capacity INTEGER NOT NULL,
+        error_rate REAL NOT NULL,
+        count INTEGER NOT NULL,
+        bits BLOB NOT NULL
+    );
+    """
+
+    async def load(
+        self,
+        initial_capacity: int = DEFAULT_INITIAL_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ) -> ScalableBloomFilter:
+        """
+        Load the saved filter.
+
+        Args:
+            initial_capacity: First slice size, if nothing was saved yet.
+            error_rate: Bound on the false-positive rate of a new filter.
+                Saved slices keep the rate they were created with.
+
+        Returns:
+            The saved filter, or an empty one.
+        """
+        slices = await self._run(self._load)
+        return ScalableBloomFilter(initial_capacity, error_rate, slices)
+
+    async def save(self, seen: ScalableBloomFilter) -> None:
+        """
+        Save the slices changed since the filter was loaded or last saved.
+
+        Bits saved meanwhile by another process are merged in, not lost.
+
+        Args:
+            seen: The filter to save.
+        """
+        dirty = [
+            (index, piece) for index, piece in enumerate(seen.slices) if piece.dirty
+        ]
+        if dirty:
+            await self._run(lambda connection: self._save(connection, dirty))
+            for _, piece in dirty:
+                piece.dirty = False
+
+    def _load(self, connection: sqlite3.Connection) -> list[BloomFilter]:
+        """Select every slice, oldest first."""
+        rows = connection.execute(
+            "SELECT capacity, error_rate, count, bits "
+            "FROM seen_joke_filters ORDER BY slice"
+        ).fetchall()
+        return [
+            BloomFilter(capacity, error_rate, bytearray(bits), count)
+            for capacity, error_rate, count, bits in rows
+        ]
+
+    def _save(
+        self, connection: sqlite3.Connection, dirty: list[tuple[int, BloomFilter]]
+    ) -> None:
+        """Upsert each slice, OR-ing in a stored slice of the same shape."""
+        for index, piece in dirty:
+            bits = bytes(piece.bits)
+            count = piece.count
+            row = connection.execute(
+                "SELECT capacity, error_rate, count, bits "
+                "FROM seen_joke_filters WHERE slice = ?",
+                (index,),
+            ).fetchone()
+            if row is not None and (row[0], row[1], len(row[3])) == (
+                piece.capacity,
+                piece.error_rate,
+                len(bits),
+            ):
+                merged = int.from_bytes(bits, "little") | int.from_bytes(
+                    row[3], "little"
+                )
+                bits = merged.to_bytes(len(bits), "little")
+                count = max(count, row[2])
+            connection.execute(
+                "INSERT OR REPLACE INTO seen_joke_filters "
+                "(slice, capacity, error_rate, count, bits) VALUES (?, ?, ?, ?, ?)",
+                (index, piece.capacity, piece.error_rate, count, bits),
+            )
+
+
+async def init_seen_jokes(
+    path: Optional[Path] = None,
+    initial_capacity: int = DEFAULT_INITIAL_CAPACITY,
+    error_rate: float = DEFAULT_ERROR_RATE,
+) -> AsyncIterator[ScalableBloomFilter]:
+    """
+    Provide the seen-joke filter for the lifetime of the container.
+
+    The filter is loaded on startup and saved again on shutdown.
+
+    Yields:
+        The shared ``ScalableBloomFilter`` of joke ids already shown.
+    """
+    repository = SeenJokeRepository(path=path)
+    try:
+        seen = await repository.load(initial_capacity, error_rate)
+        yield seen
+        await repository.save(seen)
+    finally:
+        repository.close()
@@ -0,0 +1,109 @@
+"""Base class for repositories persisted in the local SQLite database."""
+
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Sequence, TypeVar
+
+from taters.repositories.storage import cache_dir
+
+T = TypeVar("T")
+
+DATABASE_FILENAME = "jokes.sqlite3"
+
+
+class SQLiteRepository:
+    """Repository backed by a lazily opened, thread-safe SQLite connection."""
+
+    schema = ""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """
+        Initialize the SQLite repository.
+
+        Args:
+            path: SQLite database file. Defaults to ``jokes.sqlite3`` in the
+                XDG cache directory, which is shared by all Taters repositories.
+        """
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    async def _run(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """
+        Run a database operation in a worker thread inside one transaction.
+
+        Args:
+            operation: Callable receiving the open connection.
+
+        Returns:
+            Whatever the operation returns.
+        """
+        return await asyncio.to_thread(self._run_sync, operation)
+
+    async def _run_with(
+        self,
+        others: Sequence["SQLiteRepository"],
+        operation: Callable[[sqlite3.Connection], T],
+    ) -> T:
+        """
+        Run an operation spanning other repositories' tables in one transaction.
+
+        The operation gets this repository's connection, on which the other
+        repositories' schemas are created first.
+
+        Args:
+            others: Repositories whose tables the operation also writes; they
+                must use the same database file.
+            operation: Callable receiving the open connection.
+
+        Returns:
+            Whatever the operation returns.
+
+        Raises:
+            ValueError: If another repository uses a different database file.
+        """
+        for other in others:
+            if other._database() != self._database():
+                raise ValueError(
+                    f"{type(other).__name__} uses {other._database()}, "
+                    f"not {self._database()}"
+                )
+        return await asyncio.to_thread(
+            self._run_sync, operation, [other.schema for other in others]
+        )
+
+    def _run_sync(
+        self,
+        operation: Callable[[sqlite3.Connection], T],
+        schemas: Sequence[str] = (),
+    ) -> T:
+        """Run a database operation on the calling thread inside one transaction."""
+        with self._lock:
+            connection = self._connect()
+            for schema in schemas:
+                connection.executescript(schema)
+            with connection:
+                return operation(connection)
+
+    def _database(self) -> Path:
+        """Path of the database file."""
+        return self.path or cache_dir() / DATABASE_FILENAME
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and make sure the schema exists."""
+        if self._connection is None:
+            connection = sqlite3.connect(self._database(), check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(self.schema)
+            self._connection = connection
+        return self._connection
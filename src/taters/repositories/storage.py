@@ -0,0 +1,38 @@
+"""Filesystem locations for data persisted between CLI runs."""
+
+import os
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """
+    Get the directory used for Taters cache files.
+
+    Follows the XDG base directory spec: ``$XDG_CACHE_HOME/taters``, falling
+    back to ``~/.cache/taters``. The directory is created if it does not exist.
+
+    Returns:
+        Path to the cache directory.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    path = Path(base) / "taters"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def config_dir() -> Path:
+    """
+    Get the directory holding the Taters configuration file.
+
+    Follows the XDG base directory spec: ``$XDG_CONFIG_HOME/taters``, falling
+    back to ``~/.config/taters``. Unlike the cache directory, it is not created.
+
+    Returns:
+        Path to the config directory.
+    """
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+        os.path.expanduser("~"), ".config"
+    )
+    return Path(base) / "taters"
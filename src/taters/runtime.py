@@ -0,0 +1,130 @@
+"""Event loop selection and the loop runner shared by async commands.
+
+Every async command runs its coroutine through ``run``, which reuses one
+``asyncio.Runner`` for the life of the process instead of creating and
+tearing down a loop per command. Commands invoked repeatedly in one process,
+as by the benchmarks or an embedding application, keep their loop and its
+worker threads warm. The loop is uvloop's when it is installed, unless the
+``runtime.loop`` setting says otherwise.
+"""
+
+import asyncio
+import atexit
+from typing import Any, Callable, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+AUTO = "auto"
+ASYNCIO = "asyncio"
+UVLOOP = "uvloop"
+LOOPS = (AUTO, ASYNCIO, UVLOOP)
+
+_runner: Optional[asyncio.Runner] = None
+_runner_loop = ""
+
+
+class RuntimeConfigError(ValueError):
+    """Raised when the requested event loop is unknown or not installed."""
+
+
+def loop_factory(
+    loop: str = AUTO,
+) -> tuple[str, Callable[[], asyncio.AbstractEventLoop]]:
+    """
+    Choose how new event loops are created.
+
+    Args:
+        loop: ``"auto"`` for uvloop when installed, else asyncio's default
+            loop; ``"asyncio"``; or ``"uvloop"``, which must be installed.
+
+    Returns:
+        The name of the loop chosen and a factory creating one.
+
+    Raises:
+        RuntimeConfigError: If ``loop`` is unknown, or is ``"uvloop"`` and
+            uvloop is not installed.
+    """
+    if loop not in LOOPS:
+        raise RuntimeConfigError(
+            f"Unknown event loop '{loop}': expected one of {', '.join(LOOPS)}"
+        )
+    if loop != ASYNCIO:
+        try:
+            import uvloop
+        except ImportError:
+            if loop == UVLOOP:
+                raise RuntimeConfigError(
+                    'uvloop is not installed; pip install -e ".[uvloop]"'
+                ) from None
+        else:
+            factory: Callable[[], asyncio.AbstractEventLoop] = uvloop.new_event_loop
+            return UVLOOP, factory
+    return ASYNCIO, asyncio.new_event_loop
+
+
+def run(main: Coroutine[Any, Any, T], loop: str = AUTO) -> T:
+    """
+    Run a coroutine to completion on the process's shared event loop.
+
+    Like ``asyncio.run``, this must not be called from a running loop.
+
+    Args:
+        main: The coroutine to run.
+        loop: Event loop to create on first use, as for ``loop_factory``.
+            Later calls reuse the loop already created, whatever they ask for.
+
+    Returns:
+        The coroutine's result.
+
+    Raises:
+        RuntimeConfigError: If ``loop`` is unknown, or the first call asks for
+            a loop that is not installed.
+    """
+    return get_runner(loop).run(main)
+
+
+def get_runner(loop: str = AUTO) -> asyncio.Runner:
+    """
+    Get the runner shared by everything in this process.
+
+    Args:
+        loop: Event loop to create if there is no runner yet.
+
+    Returns:
+        The same ``asyncio.Runner`` on every call, closed at exit.
+
+    Raises:
+        RuntimeConfigError: If ``loop`` is unknown, or the runner has to be
+            created with a loop that is not installed.
+    """
+    global _runner, _runner_loop
+    if loop not in LOOPS:
+        raise RuntimeConfigError(
+            f"Unknown event loop '{loop}': expected one of {', '.join(LOOPS)}"
+        )
+    if _runner is None:
+        _runner_loop, factory = loop_factory(loop)
+        # A loop factory also keeps the runner from replacing the policy's
+        # current loop, which embedding applications may rely on.
+        _runner = asyncio.Runner(loop_factory=factory)
+        atexit.register(close)
+    return _runner
+
+
+def current_loop() -> str:
+    """
+    Name the loop the shared runner uses.
+
+    Returns:
+        ``"asyncio"`` or ``"uvloop"``, or an empty string before first use.
+    """
+    return _runner_loop
+
+
+def close() -> None:
+    """Close the shared runner and its loop; the next ``run`` starts afresh."""
+    global _runner, _runner_loop
+    if _runner is not None:
+        runner, _runner, _runner_loop = _runner, None, ""
+        atexit.unregister(close)
+        runner.close()
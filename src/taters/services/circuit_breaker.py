@@ -0,0 +1,261 @@
+"""Service failing fast while the upstream joke API is known to be down."""
+
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+from taters.repositories.circuit_state_repository import (
+    CircuitState,
+    CircuitStateRepository,
+)
+from taters.repositories.dad_joke_repository import DEFAULT_CONCURRENCY, DadJoke
+from taters.repositories.joke_source import JokeSource
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+DEFAULT_PROBE_DRAIN_TIMEOUT = 2.0
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker whose state survives restarts."""
+
+    def __init__(
+        self,
+        store: CircuitStateRepository,
+        name: str = "icanhazdadjoke",
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            store: Persistent storage for the breaker state, shared between
+                CLI runs.
+            name: Key the state is stored under.
+            failure_threshold: Consecutive failures that open the circuit.
+            reset_timeout: Seconds the circuit stays open before a background
+                probe is allowed through.
+            clock: Source of the current time, in seconds since the epoch; wall
+                clock time so it stays meaningful across processes.
+        """
+        self.store = store
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._state = CircuitState(state=CLOSED, failures=0, opened_at=0.0)
+        self._loaded = False
+        self._probe_task: Optional[asyncio.Task[None]] = None
+
+    async def state(self) -> str:
+        """
+        Get the current state.
+
+        Returns:
+            ``"closed"``, ``"open"`` or ``"half-open"``.
+        """
+        await self._load()
+        return self._state.state
+
+    async def call(
+        self, operation: Callable[[], Awaitable[Optional[T]]]
+    ) -> Optional[T]:
+        """
+        Run ``operation`` unless the circuit is open.
+
+        A None result counts as a failure, anything else as a success.
+
+        Args:
+            operation: The guarded upstream call.
+
+        Returns:
+            The operation's result, or None immediately while the circuit is
+            open.
+        """
+        if not await self.allow_request(operation):
+            return None
+        result = await operation()
+        await self.record(result is not None)
+        return result
+
+    async def allow_request(self, probe: Callable[[], Awaitable[object]]) -> bool:
+        """
+        Decide whether a call may go upstream.
+
+        Once an open circuit has cooled down, ``probe`` is started in the
+        background to test recovery; the caller is still turned away so it never
+        waits on a possibly dead upstream.
+
+        Args:
+            probe: Upstream call used to test recovery; a None result counts as
+                a failure.
+
+        Returns:
+            True if the circuit is closed.
+        """
+        await self._load()
+        if self._state.state == CLOSED:
+            return True
+        if (
+            self._state.state == OPEN
+            and self.clock() - self._state.opened_at >= self.reset_timeout
+        ):
+            self._state = CircuitState(
+                HALF_OPEN, self._state.failures, self._state.opened_at
+            )
+            self._probe_task = asyncio.create_task(self._probe(probe))
+        return False
+
+    async def record(self, success: bool) -> None:
+        """
+        Record the outcome of an upstream call.
+
+        Args:
+            success: Whether the call succeeded.
+        """
+        await self._load()
+        if success:
+            if self._state.state != CLOSED or self._state.failures:
+                await self._transition(CircuitState(CLOSED, 0, 0.0))
+            return
+
+        failures = self._state.failures + 1
+        if self._state.state == HALF_OPEN or failures >= self.failure_threshold:
+            await self._transition(CircuitState(OPEN, failures, self.clock()))
+        else:
+            await self._transition(
+                CircuitState(self._state.state, failures, self._state.opened_at)
+            )
+
+    async def aclose(self, timeout: float = DEFAULT_PROBE_DRAIN_TIMEOUT) -> None:
+        """
+        Wait for a running probe to finish, cancelling it after ``timeout``.
+
+        A cancelled probe leaves the persisted state open, so the next run
+        probes again.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+        """
+        task = self._probe_task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(task, timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _probe(self, probe: Callable[[], Awaitable[object]]) -> None:
+        """Run the recovery probe and record its outcome."""
+        try:
+            result = await probe()
+        except Exception:
+            result = None
+        await self.record(result is not None)
+
+    async def _transition(self, state: CircuitState) -> None:
+        """Switch to ``state`` and persist it."""
+        self._state = state
+        await self.store.save(self.name, state)
+
+    async def _load(self) -> None:
+        """Restore the state saved by a previous run, once."""
+        if self._loaded:
+            return
+        saved = await self.store.load(self.name)
+        if not self._loaded:
+            self._loaded = True
+            if saved is not None:
+                self._state = saved
+
+
+class CircuitBreakerJokeSource:
+    """Joke source that stops calling its upstream while the circuit is open."""
+
+    def __init__(self, source: JokeSource, breaker: CircuitBreaker) -> None:
+        """
+        Initialize the guarded joke source.
+
+        Args:
+            source: The upstream joke source.
+            breaker: The circuit breaker guarding it.
+        """
+        self.source = source
+        self.breaker = breaker
+
+    async def get_random_joke(self) -> Optional[str]:
+        """
+        Fetch a random dad joke unless the circuit is open.
+
+        Returns:
+            The joke text, or None on failure or while the circuit is open.
+        """
+        joke = await self.fetch_random_joke()
+        return joke.joke if joke is not None else None
+
+    async def fetch_random_joke(self) -> Optional[DadJoke]:
+        """
+        Fetch a random dad joke with its id unless the circuit is open.
+
+        Returns:
+            The joke, or None on failure or while the circuit is open.
+        """
+        return await self.breaker.call(self.source.fetch_random_joke)
+
+    async def get_random_jokes(
+        self, count: int, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> AsyncIterator[DadJoke]:
+        """
+        Stream up to ``count`` distinct jokes unless the circuit is open.
+
+        A batch that yields no jokes at all counts as one failure.
+
+        Args:
+            count: Number of distinct jokes wanted.
+            concurrency: Maximum number of upstream requests in flight.
+
+        Yields:
+            Distinct jokes; none while the circuit is open.
+        """
+        if not await self.breaker.allow_request(self.source.fetch_random_joke):
+            return
+        delivered = 0
+        async for joke in self.source.get_random_jokes(count, concurrency):
+            delivered += 1
+            yield joke
+        await self.breaker.record(delivered > 0 or count <= 0)
+
+
+async def init_circuit_breaker(
+    store: CircuitStateRepository,
+    name: str = "icanhazdadjoke",
+    failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+    reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+) -> AsyncIterator[CircuitBreaker]:
+    """
+    Provide the circuit breaker for the lifetime of the container.
+
+    On shutdown, a running recovery probe is given a chance to record its
+    outcome.
+
+    Yields:
+        The shared ``CircuitBreaker``.
+    """
+    breaker = CircuitBreaker(
+        store=store,
+        name=name,
+        failure_threshold=failure_threshold,
+        reset_timeout=reset_timeout,
+    )
+    try:
+        yield breaker
+    finally:
+        await breaker.aclose()
@@ -1,35 +1,117 @@
 """Service for handling dad joke business logic."""
 
-from typing import Optional
+from typing import AsyncIterator, Optional
 
-from taters.repositories.dad_joke_repository import DadJokeRepository
+from taters.repositories.bloom_filter import ScalableBloomFilter
+from taters.repositories.dad_joke_repository import DEFAULT_CONCURRENCY, DadJoke
+from taters.repositories.joke_source import JokeSource
+from taters.services.joke_prefetch_pool import JokePrefetchPool
+from taters.services.single_flight import SingleFlight
+from taters.tracing import span
+
+# Extra random fetches allowed to find a joke not shown before.
+DEFAULT_MAX_REFETCHES = 3
 
 
 class DadJokeService:
     """Service for handling dad joke business logic."""
 
-    def __init__(self, repository: DadJokeRepository) -> None:
+    def __init__(
+        self,
+        repository: JokeSource,
+        prefetch_pool: Optional[JokePrefetchPool] = None,
+        single_flight: Optional[SingleFlight[Optional[str]]] = None,
+        seen: Optional[ScalableBloomFilter] = None,
+        max_refetches: int = DEFAULT_MAX_REFETCHES,
+    ) -> None:
         """
         Initialize the dad joke service.
 
         Args:
             repository: The dad joke repository for data access.
+            prefetch_pool: Optional pool of prefetched jokes served before
+                falling back to the repository.
+            single_flight: Optional coalescer so concurrent callers share one
+                in-flight repository request.
+            seen: Optional filter of joke ids already shown; jokes in it are
+                skipped in favour of unseen ones.
+            max_refetches: Extra random fetches allowed to find an unseen
+                joke before a seen one is shown again.
         """
         self.repository = repository
+        self.prefetch_pool = prefetch_pool
+        self.single_flight = single_flight
+        self.seen = seen
+        self.max_refetches = max_refetches
 
     async def get_joke(self) -> str:
         """
         Get a dad joke, with fallback handling.
 
+        Jokes already shown are skipped while unseen ones can be found.
+
         Returns:
             A dad joke string. If the API fails, returns a fallback joke.
         """
-        joke = await self.repository.get_random_joke()
+        with span("service.get_joke"):
+            if self.prefetch_pool is not None:
+                with span("prefetch_pool.take"):
+                    pooled = await self._take_unseen(self.prefetch_pool)
+                if pooled is not None:
+                    return pooled.joke
+
+            if self.single_flight is not None:
+                joke = await self.single_flight.do("random", self._fetch_unseen)
+            else:
+                joke = await self._fetch_unseen()
+
+            if joke is None:
+                return self._get_fallback_joke()
+
+            return joke
+
+    async def get_jokes(
+        self, count: int, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> AsyncIterator[str]:
+        """
+        Get a batch of distinct dad jokes, streamed as they arrive.
+
+        Args:
+            count: Number of distinct jokes wanted.
+            concurrency: Maximum number of upstream requests in flight.
+
+        Yields:
+            Joke strings in completion order. If the API returns nothing at all,
+            a single fallback joke is yielded instead.
+        """
+        delivered = 0
+        async for joke in self.repository.get_random_jokes(count, concurrency):
+            delivered += 1
+            self._first_sighting(joke)
+            yield joke.joke
+
+        if delivered == 0 and count > 0:
+            yield self._get_fallback_joke()
+
+    async def _take_unseen(self, pool: JokePrefetchPool) -> Optional[DadJoke]:
+        """Take pooled jokes until one not shown before turns up."""
+        while (pooled := await pool.take()) is not None:
+            if self._first_sighting(pooled):
+                return pooled
+        return None
 
-        if joke is None:
-            return self._get_fallback_joke()
+    async def _fetch_unseen(self) -> Optional[str]:
+        """Fetch random jokes until an unseen one turns up or refetches run out."""
+        joke: Optional[DadJoke] = None
+        for _ in range(self.max_refetches + 1):
+            joke = await self.repository.fetch_random_joke()
+            if joke is None or self._first_sighting(joke):
+                break
+        return joke.joke if joke is not None else None
 
-        return joke
+    def _first_sighting(self, joke: DadJoke) -> bool:
+        """Record a joke as shown; True unless it had been shown before."""
+        return self.seen is None or self.seen.add(joke.id)
 
     def _get_fallback_joke(self) -> str:
         """
@@ -0,0 +1,245 @@
+"""Service racing several joke sources with hedged requests."""
+
+import asyncio
+import math
+import time
+from collections import deque
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable, Optional, Sequence
+
+from taters.repositories.bloom_filter import ScalableBloomFilter
+from taters.repositories.dad_joke_repository import DEFAULT_CONCURRENCY, DadJoke
+from taters.repositories.joke_source import JokeSource
+from taters.repositories.latency_sample_repository import LatencySampleRepository
+from taters.tracing import span
+
+DEFAULT_WINDOW = 200
+DEFAULT_MIN_SAMPLES = 10
+DEFAULT_HEDGE_DELAY = 1.0
+MIN_HEDGE_DELAY = 0.01
+HEDGE_PERCENTILE = 95.0
+
+
+class LatencyTracker:
+    """Sliding window of recent latencies of the primary source."""
+
+    def __init__(
+        self,
+        window: int = DEFAULT_WINDOW,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        default_delay: float = DEFAULT_HEDGE_DELAY,
+        samples: Iterable[float] = (),
+    ) -> None:
+        """
+        Initialize the latency tracker.
+
+        Args:
+            window: Number of most recent samples kept.
+            min_samples: Samples needed before the percentile is trusted.
+            default_delay: Hedge delay used until then, in seconds.
+            samples: Samples recorded earlier, such as by previous runs,
+                oldest first.
+        """
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+        self._samples: deque[float] = deque(samples, maxlen=window)
+        self._unsaved: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        """
+        Add a latency sample.
+
+        Args:
+            seconds: How long a request took, or a lower bound for one that
+                was cancelled.
+        """
+        self._samples.append(seconds)
+        self._unsaved.append(seconds)
+
+    def take_unsaved(self) -> list[float]:
+        """
+        Take the samples recorded since the last call, for saving.
+
+        Returns:
+            The new samples, oldest first.
+        """
+        samples = list(self._unsaved)
+        self._unsaved.clear()
+        return samples
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Compute a nearest-rank percentile of the window.
+
+        Args:
+            q: Percentile between 0 and 100.
+
+        Returns:
+            The percentile in seconds, or None without enough samples.
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(math.ceil(q / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def hedge_delay(self) -> float:
+        """
+        Work out how long to wait for a source before trying the next one.
+
+        Returns:
+            The p95 latency, or ``default_delay`` while warming up, in seconds.
+        """
+        p95 = self.percentile(HEDGE_PERCENTILE)
+        if p95 is None:
+            return self.default_delay
+        return max(p95, MIN_HEDGE_DELAY)
+
+
+class HedgedJokeSource:
+    """Joke source asking backups when the primary is slower than its p95."""
+
+    def __init__(
+        self,
+        sources: Sequence[JokeSource],
+        latency: Optional[LatencyTracker] = None,
+        seen: Optional[ScalableBloomFilter] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Initialize the hedged joke source.
+
+        Args:
+            sources: Sources in order of preference; the first is the primary.
+            latency: Latency history of the primary, shared between instances
+                so long-lived processes learn its p95.
+            seen: Optional filter of joke ids already shown. A joke in it only
+                wins once no other request is left, so a quick backup
+                answering with a seen joke does not cancel the primary.
+            clock: Monotonic source of the current time, in seconds.
+        """
+        if not sources:
+            raise ValueError("HedgedJokeSource needs at least one source")
+        self.sources = list(sources)
+        self.latency = latency or LatencyTracker()
+        self.seen = seen
+        self.clock = clock
+
+    async def get_random_joke(self) -> Optional[str]:
+        """
+        Fetch the text of a random joke from the fastest healthy source.
+
+        Returns:
+            The joke text if any source has one, None otherwise.
+        """
+        joke = await self.fetch_random_joke()
+        return joke.joke if joke is not None else None
+
+    async def fetch_random_joke(self) -> Optional[DadJoke]:
+        """
+        Fetch a random joke from the fastest healthy source.
+
+        The primary is asked first. Each time the hedge delay passes without
+        an answer, or the newest source fails, the next source is asked too.
+        The first unseen joke returned wins and the other requests are
+        cancelled; a seen joke counts as a failure unless nothing better
+        turns up.
+
+        Returns:
+            The joke if any source has one, None otherwise.
+        """
+        with span("hedge.fetch_random_joke"):
+            return await self._race()
+
+    async def get_random_jokes(
+        self, count: int, concurrency: int = DEFAULT_CONCURRENCY
+    ) -> AsyncIterator[DadJoke]:
+        """
+        Stream up to ``count`` distinct jokes from the primary source.
+
+        Batches are not hedged: they are already concurrent, and backups such
+        as the cache would fill them with jokes the user has seen.
+
+        Args:
+            count: Number of distinct jokes wanted.
+            concurrency: Maximum number of upstream requests in flight.
+
+        Yields:
+            Distinct jokes in completion order.
+        """
+        async for joke in self.sources[0].get_random_jokes(count, concurrency):
+            yield joke
+
+    async def _race(self) -> Optional[DadJoke]:
+        """Run the hedged race described in ``fetch_random_joke``."""
+        delay = self.latency.hedge_delay()
+        started = self.clock()
+        waiting = iter(enumerate(self.sources))
+        tasks: dict[asyncio.Task[Optional[DadJoke]], int] = {}
+        seen_joke: Optional[DadJoke] = None
+
+        def launch_next() -> None:
+            entry = next(waiting, None)
+            if entry is not None:
+                index, source = entry
+                tasks[asyncio.create_task(source.fetch_random_joke())] = index
+
+        launch_next()
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    with span("hedge.launch", after=delay):
+                        launch_next()
+                    continue
+                for task in done:
+                    index = tasks.pop(task)
+                    joke = None if task.exception() else task.result()
+                    if joke is not None and index == 0:
+                        self.latency.record(self.clock() - started)
+                    if joke is not None and self._unseen(joke):
+                        return joke
+                    seen_joke = seen_joke or joke
+                    # A failed or seen answer frees its slot for the next source.
+                    launch_next()
+            return seen_joke
+        finally:
+            if 0 in tasks.values():
+                # The primary lost the race; its latency is at least this long.
+                # Dropping the sample instead would bias the p95 downwards.
+                self.latency.record(self.clock() - started)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _unseen(self, joke: DadJoke) -> bool:
+        """Check that a joke has not been shown before."""
+        return self.seen is None or joke.id not in self.seen
+
+
+async def init_latency_tracker(
+    path: Optional[Path] = None,
+    window: int = DEFAULT_WINDOW,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    default_delay: float = DEFAULT_HEDGE_DELAY,
+) -> AsyncIterator[LatencyTracker]:
+    """
+    Provide the API latency tracker for the lifetime of the container.
+
+    Samples are loaded on startup and saved again on shutdown, so one-shot
+    CLI runs learn the p95 together.
+
+    Yields:
+        The shared ``LatencyTracker``.
+    """
+    store = LatencySampleRepository(path=path)
+    try:
+        tracker = LatencyTracker(
+            window, min_samples, default_delay, await store.load(window)
+        )
+        yield tracker
+        await store.save(tracker.take_unsaved(), keep=window)
+    finally:
+        store.close()
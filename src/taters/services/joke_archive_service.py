@@ -0,0 +1,76 @@
+"""Service exporting and importing the local joke corpus."""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.joke_archive import open_archive, write_archive
+from taters.repositories.joke_cache_repository import JokeCacheRepository
+from taters.repositories.joke_search_index import JokeSearchIndex
+from taters.tracing import span
+
+
+@dataclass(frozen=True)
+class ImportResult:
+    """Outcome of importing an archive."""
+
+    read: int
+    added: int
+
+
+class JokeArchiveService:
+    """Streams the corpus of every joke seen to and from archive files."""
+
+    def __init__(self, index: JokeSearchIndex, cache: JokeCacheRepository) -> None:
+        """
+        Initialize the joke archive service.
+
+        Args:
+            index: The search index, which holds every joke ever fetched.
+            cache: The joke cache that offline requests are answered from.
+        """
+        self.index = index
+        self.cache = cache
+
+    async def export(self, stream: BinaryIO, format: str) -> int:
+        """
+        Write the whole corpus to ``stream``.
+
+        Args:
+            stream: Binary output.
+            format: ``"ndjson"`` or ``"binary"``.
+
+        Returns:
+            The number of jokes exported.
+        """
+        with span("service.export"):
+            return await self.index.dump(
+                lambda jokes: write_archive(jokes, stream, format)
+            )
+
+    async def import_archive(self, path: Path) -> ImportResult:
+        """
+        Load an archive into the search index and the joke cache.
+
+        The archive is memory-mapped and decoded lazily in a single pass, and
+        both stores are loaded in one transaction.
+
+        Args:
+            path: The archive file, in either format.
+
+        Returns:
+            How many jokes were read, and how many were new to the index.
+        """
+        with span("service.import"):
+            read = 0
+
+            def counted(jokes: Iterable[DadJoke]) -> Iterator[DadJoke]:
+                nonlocal read
+                for joke in jokes:
+                    read += 1
+                    yield joke
+
+            with open_archive(path) as jokes:
+                added = await self.index.bulk_load(counted(jokes), cache=self.cache)
+            return ImportResult(read=read, added=added)
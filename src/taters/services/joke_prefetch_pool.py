@@ -0,0 +1,136 @@
+"""Service keeping a persisted buffer of prefetched jokes ready to serve."""
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.joke_pool_repository import JokePoolRepository
+from taters.repositories.joke_source import JokeSource
+
+DEFAULT_CAPACITY = 10
+DEFAULT_LOW_WATER_MARK = 3
+DEFAULT_REFILL_CONCURRENCY = 4
+# Refills still running at exit get this long; what arrived by then is kept.
+DEFAULT_DRAIN_TIMEOUT = 0.25
+
+
+class JokePrefetchPool:
+    """Stale-while-revalidate pool of unseen jokes, refilled in the background."""
+
+    def __init__(
+        self,
+        source: JokeSource,
+        store: JokePoolRepository,
+        capacity: int = DEFAULT_CAPACITY,
+        low_water_mark: int = DEFAULT_LOW_WATER_MARK,
+        concurrency: int = DEFAULT_REFILL_CONCURRENCY,
+        offline: bool = False,
+    ) -> None:
+        """
+        Initialize the prefetch pool.
+
+        Args:
+            source: Repository used to fetch replacement jokes; it should
+                return fresh jokes only, never cached ones.
+            store: Persistent storage for the pool, shared between CLI runs.
+            capacity: Number of jokes a refill tops the pool up to.
+            low_water_mark: Pool size below which a refill is triggered.
+            concurrency: Maximum upstream requests in flight during a refill.
+            offline: When True, the pool is served from but never refilled.
+        """
+        self.source = source
+        self.store = store
+        self.capacity = capacity
+        self.low_water_mark = low_water_mark
+        self.concurrency = concurrency
+        self.offline = offline
+        self._refill_task: Optional[asyncio.Task[None]] = None
+
+    async def take(self) -> Optional[DadJoke]:
+        """
+        Take the next joke from the pool, refilling it in the background if low.
+
+        Returns:
+            A prefetched joke, or None if the pool is empty.
+        """
+        joke = await self.store.pop()
+        if await self.store.size() < self.low_water_mark:
+            self.schedule_refill()
+        return joke
+
+    def schedule_refill(self) -> None:
+        """Start a background refill unless one is running or the pool is offline."""
+        if self.offline:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill_quietly())
+
+    async def refill(self) -> int:
+        """
+        Top the pool up to capacity, storing each joke as it arrives.
+
+        Returns:
+            The number of jokes added; none when offline.
+        """
+        if self.offline:
+            return 0
+        missing = self.capacity - await self.store.size()
+        if missing <= 0:
+            return 0
+        added = 0
+        async for joke in self.source.get_random_jokes(missing, self.concurrency):
+            added += await self.store.push_many([joke])
+        return added
+
+    async def aclose(self, timeout: float = DEFAULT_DRAIN_TIMEOUT) -> None:
+        """
+        Wait for a running refill to finish, cancelling it after ``timeout``.
+
+        Args:
+            timeout: Maximum number of seconds to wait.
+        """
+        task = self._refill_task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(task, timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _refill_quietly(self) -> None:
+        """Refill the pool, ignoring failures since nobody awaits the result."""
+        try:
+            await self.refill()
+        except Exception:
+            pass
+
+
+async def init_prefetch_pool(
+    source: JokeSource,
+    store: JokePoolRepository,
+    capacity: int = DEFAULT_CAPACITY,
+    low_water_mark: int = DEFAULT_LOW_WATER_MARK,
+    concurrency: int = DEFAULT_REFILL_CONCURRENCY,
+    offline: bool = False,
+) -> AsyncIterator[JokePrefetchPool]:
+    """
+    Provide the prefetch pool for the lifetime of the container.
+
+    On shutdown, a background refill is given a short while to finish, and
+    the jokes it fetched by then are kept for the next CLI run.
+
+    Yields:
+        The shared ``JokePrefetchPool``.
+    """
+    pool = JokePrefetchPool(
+        source=source,
+        store=store,
+        capacity=capacity,
+        low_water_mark=low_water_mark,
+        concurrency=concurrency,
+        offline=offline,
+    )
+    try:
+        yield pool
+    finally:
+        await pool.aclose()
@@ -0,0 +1,82 @@
+"""Service answering joke searches from the local index."""
+
+from taters.repositories.dad_joke_repository import (
+    DEFAULT_CONCURRENCY,
+    DadJoke,
+    DadJokeRepository,
+)
+from taters.repositories.joke_search_index import DEFAULT_SEARCH_LIMIT, JokeSearchIndex
+from taters.tracing import span
+
+
+class JokeSearchService:
+    """Searches the local inverted index, harvesting from the API when needed."""
+
+    def __init__(
+        self,
+        repository: DadJokeRepository,
+        index: JokeSearchIndex,
+        offline: bool = False,
+    ) -> None:
+        """
+        Initialize the joke search service.
+
+        Args:
+            repository: API repository; it adds every joke it fetches, search
+                results included, to ``index``.
+            index: The local search index.
+            offline: When True, never contact the API and answer only from
+                jokes indexed so far.
+        """
+        self.repository = repository
+        self.index = index
+        self.offline = offline
+
+    async def search(
+        self,
+        term: str,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        refresh: bool = False,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> list[DadJoke]:
+        """
+        Find jokes matching ``term``.
+
+        The local index answers on its own when it has matches. Otherwise, or
+        when ``refresh`` is set, the API's search results are harvested into
+        the index first.
+
+        Args:
+            term: The search text.
+            limit: Maximum number of jokes to return.
+            refresh: Harvest the API's results before answering.
+            concurrency: Maximum page requests in flight while harvesting.
+
+        Returns:
+            Matching jokes.
+        """
+        with span("service.search"):
+            if not refresh:
+                jokes = await self.index.search(term, limit)
+                if jokes or self.offline:
+                    return jokes
+            if not self.offline:
+                await self.harvest(term, concurrency)
+            return await self.index.search(term, limit)
+
+    async def harvest(self, term: str, concurrency: int = DEFAULT_CONCURRENCY) -> int:
+        """
+        Pull every API search result for ``term`` into the index.
+
+        Args:
+            term: The search term.
+            concurrency: Maximum page requests in flight.
+
+        Returns:
+            The number of results received.
+        """
+        with span("service.harvest"):
+            received = 0
+            async for _joke in self.repository.search_jokes(term, concurrency):
+                received += 1
+            return received
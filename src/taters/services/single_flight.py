@@ -0,0 +1,62 @@
+"""Service for collapsing concurrent identical calls into one upstream call."""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters describing how much work single-flight saved."""
+
+    calls: int = 0
+    upstream_calls: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Number of calls that were answered by another caller's request."""
+        return self.calls - self.upstream_calls
+
+
+class SingleFlight(Generic[T]):
+    """Shares one in-flight call per key between all concurrent callers."""
+
+    def __init__(self, enabled: bool = True) -> None:
+        """
+        Initialize single-flight.
+
+        Args:
+            enabled: When False every call goes upstream; stats are still kept.
+        """
+        self.enabled = enabled
+        self.stats = SingleFlightStats()
+        self._in_flight: dict[Hashable, asyncio.Future[T]] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``call``, or join the identical call already running for ``key``.
+
+        The shared call is shielded, so a cancelled waiter does not cancel it
+        for the others. Its result or exception is delivered to every waiter.
+
+        Args:
+            key: Identifies which calls are interchangeable.
+            call: Starts the upstream call.
+
+        Returns:
+            The result of the shared call.
+        """
+        self.stats.calls += 1
+        if not self.enabled:
+            self.stats.upstream_calls += 1
+            return await call()
+
+        future = self._in_flight.get(key)
+        if future is None:
+            self.stats.upstream_calls += 1
+            future = asyncio.ensure_future(call())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(future)
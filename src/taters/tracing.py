@@ -0,0 +1,225 @@
+"""Lightweight span tracing for the ``--timings`` and ``--trace-file`` options.
+
+Tracing is off unless ``enable()`` has been called; ``span()`` then returns a
+shared no-op context manager, so instrumented hot paths pay one global lookup.
+Only the standard library is imported here to keep ``taters hello`` fast.
+"""
+
+import itertools
+import json
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, ContextManager, Iterator, Optional
+
+_NULL_SPAN: ContextManager[None] = nullcontext()
+_current_span: ContextVar[Optional[int]] = ContextVar(
+    "taters_current_span", default=None
+)
+_tracer: Optional["Tracer"] = None
+
+
+@dataclass(frozen=True)
+class Span:
+    """A finished, timed unit of work."""
+
+    span_id: int
+    parent_id: Optional[int]
+    name: str
+    start: float
+    end: float
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        """Elapsed time in seconds."""
+        return self.end - self.start
+
+
+class Tracer:
+    """Collects spans with monotonic timestamps for one CLI invocation."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        """
+        Initialize the tracer.
+
+        Args:
+            clock: Monotonic source of the current time, in seconds.
+        """
+        self.clock = clock
+        self.trace_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self.origin = clock()
+        self.spans: list[Span] = []
+        self._ids = itertools.count(1)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[None]:
+        """
+        Time the enclosed block as a child of the current span.
+
+        Args:
+            name: Dotted span name, such as ``service.get_joke``.
+            **attributes: Extra values recorded with the span.
+        """
+        span_id = next(self._ids)
+        parent_id = _current_span.get()
+        token = _current_span.set(span_id)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            _current_span.reset(token)
+            self.spans.append(
+                Span(span_id, parent_id, name, start, self.clock(), attributes)
+            )
+
+    def record(self, name: str, start: float, **attributes: Any) -> None:
+        """
+        Record a span that started at ``start`` and ends now.
+
+        Args:
+            name: Dotted span name.
+            start: Start time taken from ``clock``.
+            **attributes: Extra values recorded with the span.
+        """
+        self.spans.append(
+            Span(
+                next(self._ids),
+                _current_span.get(),
+                name,
+                start,
+                self.clock(),
+                attributes,
+            )
+        )
+
+    def summary(self) -> str:
+        """
+        Render the spans as an indented tree of durations.
+
+        Sibling spans sharing a name, such as the requests of a batch, are
+        folded into one line with their count, total and maximum, and their
+        children are folded the same way.
+
+        Returns:
+            The human-readable timing summary.
+        """
+        children: dict[Optional[int], list[Span]] = {}
+        for span in sorted(self.spans, key=lambda s: s.start):
+            children.setdefault(span.parent_id, []).append(span)
+
+        lines = ["⏱️  Timings"]
+
+        def render(parent_ids: list[Optional[int]], depth: int) -> None:
+            groups: dict[str, list[Span]] = {}
+            for parent_id in parent_ids:
+                for span in children.get(parent_id, []):
+                    groups.setdefault(span.name, []).append(span)
+            for name, spans in groups.items():
+                label = "  " * (depth + 1) + name
+                if len(spans) == 1:
+                    lines.append(f"{label:<48}{spans[0].duration * 1000:>10.1f} ms")
+                else:
+                    total = sum(span.duration for span in spans) * 1000
+                    longest = max(span.duration for span in spans) * 1000
+                    lines.append(
+                        f"{label + f' ×{len(spans)}':<48}{total:>10.1f} ms"
+                        f"  (max {longest:.1f} ms)"
+                    )
+                render([span.span_id for span in spans], depth + 1)
+
+        render([None], 0)
+        return "\n".join(lines)
+
+    def write_jsonl(self, path: Path) -> None:
+        """
+        Append one JSON object per span to ``path``.
+
+        Args:
+            path: The trace file; created if missing.
+        """
+        with path.open("a", encoding="utf-8") as trace_file:
+            for span in self.spans:
+                record = {
+                    "trace_id": self.trace_id,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "name": span.name,
+                    "timestamp": self.started_at + (span.start - self.origin),
+                    "start_ms": (span.start - self.origin) * 1000,
+                    "duration_ms": span.duration * 1000,
+                    "attributes": span.attributes,
+                }
+                trace_file.write(json.dumps(record, default=str) + "\n")
+
+
+def enable(tracer: Optional[Tracer] = None) -> Tracer:
+    """
+    Start collecting spans for this process.
+
+    Args:
+        tracer: The tracer to install; a new one by default.
+
+    Returns:
+        The active tracer.
+    """
+    global _tracer
+    _tracer = tracer or Tracer()
+    return _tracer
+
+
+def disable() -> None:
+    """Stop collecting spans."""
+    global _tracer
+    _tracer = None
+
+
+def span(name: str, **attributes: Any) -> ContextManager[None]:
+    """
+    Time the enclosed block if tracing is enabled.
+
+    Args:
+        name: Dotted span name, such as ``repository.fetch``.
+        **attributes: Extra values recorded with the span.
+
+    Returns:
+        A context manager; a shared no-op one while tracing is disabled.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, **attributes)
+
+
+def httpx_trace_extensions() -> Optional[dict[str, Any]]:
+    """
+    Build httpx request extensions that time connection phases.
+
+    httpcore reports ``<phase>.started`` and ``<phase>.complete`` (or
+    ``.failed``) events for TCP connect (including DNS), TLS, sending the
+    request and receiving the response; each pair becomes an ``http.<phase>``
+    span under the current span.
+
+    Returns:
+        ``{"trace": callback}``, or None while tracing is disabled.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return None
+    started: dict[str, float] = {}
+
+    async def trace(event: str, info: dict[str, Any]) -> None:
+        phase, _, status = event.rpartition(".")
+        if status == "started":
+            started[phase] = tracer.clock()
+        elif phase in started:
+            tracer.record(
+                f"http.{phase}", started.pop(phase), failed=status == "failed"
+            )
+
+    callback: Callable[[str, dict[str, Any]], Awaitable[None]] = trace
+    return {"trace": callback}
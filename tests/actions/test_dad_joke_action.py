@@ -1,7 +1,9 @@
 """Tests for the dad joke action."""
 
+from typing import AsyncIterator
+
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 from taters.actions.dad_joke_action import DadJokeAction
 from taters.services.dad_joke_service import DadJokeService
@@ -45,3 +47,20 @@ class TestDadJokeAction:
 
         assert result.startswith("🃏 Dad Joke: ")
         assert joke in result
+
+    @pytest.mark.asyncio
+    async def test_execute_batch_formats_each_joke(
+        self, action: DadJokeAction, mock_service: DadJokeService
+    ) -> None:
+        """Test that each streamed joke gets the emoji prefix."""
+
+        async def jokes() -> AsyncIterator[str]:
+            yield "First"
+            yield "Second"
+
+        mock_service.get_jokes = MagicMock(return_value=jokes())
+
+        result = [joke async for joke in action.execute_batch(2, 3)]
+
+        assert result == ["🃏 Dad Joke: First", "🃏 Dad Joke: Second"]
+        mock_service.get_jokes.assert_called_once_with(2, 3)
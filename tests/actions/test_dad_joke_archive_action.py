@@ -0,0 +1,46 @@
+"""Tests for the dad joke archive action."""
+
+import io
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from taters.actions.dad_joke_archive_action import DadJokeArchiveAction
+from taters.services.joke_archive_service import ImportResult, JokeArchiveService
+
+
+class TestDadJokeArchiveAction:
+    """Test cases for DadJokeArchiveAction."""
+
+    @pytest.fixture
+    def mock_service(self) -> AsyncMock:
+        """Create a mock archive service."""
+        return AsyncMock(spec=JokeArchiveService)
+
+    @pytest.fixture
+    def action(self, mock_service: AsyncMock) -> DadJokeArchiveAction:
+        """Create an action instance with mock service."""
+        return DadJokeArchiveAction(mock_service)
+
+    @pytest.mark.asyncio
+    async def test_export(
+        self, action: DadJokeArchiveAction, mock_service: AsyncMock
+    ) -> None:
+        """Test the export summary."""
+        mock_service.export.return_value = 3
+        stream = io.BytesIO()
+
+        assert await action.export(stream, "binary") == "📤 Exported 3 jokes (binary)"
+        mock_service.export.assert_awaited_once_with(stream, "binary")
+
+    @pytest.mark.asyncio
+    async def test_import(
+        self, action: DadJokeArchiveAction, mock_service: AsyncMock
+    ) -> None:
+        """Test the import summary."""
+        mock_service.import_archive.return_value = ImportResult(read=3, added=1)
+
+        result = await action.import_archive(Path("jokes.ndjson"))
+
+        assert result == "📥 Imported 3 jokes from jokes.ndjson (1 new)"
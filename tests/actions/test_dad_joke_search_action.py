@@ -0,0 +1,49 @@
+"""Tests for the dad joke search action."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from taters.actions.dad_joke_search_action import DadJokeSearchAction
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.services.joke_search_service import JokeSearchService
+
+
+class TestDadJokeSearchAction:
+    """Test cases for DadJokeSearchAction."""
+
+    @pytest.fixture
+    def mock_service(self) -> AsyncMock:
+        """Create a mock search service."""
+        return AsyncMock(spec=JokeSearchService)
+
+    @pytest.fixture
+    def action(self, mock_service: AsyncMock) -> DadJokeSearchAction:
+        """Create an action instance with mock service."""
+        return DadJokeSearchAction(mock_service)
+
+    @pytest.mark.asyncio
+    async def test_formats_each_match(
+        self, action: DadJokeSearchAction, mock_service: AsyncMock
+    ) -> None:
+        """Test that every match becomes one output line."""
+        mock_service.search.return_value = [
+            DadJoke(id="1", joke="Pizza one"),
+            DadJoke(id="2", joke="Pizza two"),
+        ]
+
+        result = await action.execute("pizza", 10, refresh=True)
+
+        assert result == ["🔎 Pizza one", "🔎 Pizza two"]
+        mock_service.search.assert_awaited_once_with("pizza", 10, True)
+
+    @pytest.mark.asyncio
+    async def test_reports_no_matches(
+        self, action: DadJokeSearchAction, mock_service: AsyncMock
+    ) -> None:
+        """Test the message shown when nothing matches."""
+        mock_service.search.return_value = []
+
+        assert await action.execute("pizza", 10) == [
+            "🤷 No dad jokes found for 'pizza'"
+        ]
@@ -0,0 +1,107 @@
+"""Tests for bulk hello input and output."""
+
+import csv
+import io
+import json
+
+import pytest
+
+from taters.actions.greeting_io import (
+    CSV,
+    NDJSON,
+    PLAIN,
+    GreetingWriter,
+    read_name_batches,
+)
+
+
+class _CountingStream(io.BytesIO):
+    """Binary stream counting its write calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self.writes += 1
+        return super().write(data)
+
+
+class TestReadNameBatches:
+    """Test cases for read_name_batches."""
+
+    def test_batches_by_chunk_size(self) -> None:
+        """Test that names come in bounded batches without line endings."""
+        stream = io.StringIO("Ada\r\nBob\n\nEve")
+
+        batches = list(read_name_batches(stream, chunk_size=6))
+
+        assert [name for batch in batches for name in batch] == [
+            "Ada",
+            "Bob",
+            "",
+            "Eve",
+        ]
+        assert len(batches) > 1
+
+    def test_empty_input(self) -> None:
+        """Test that empty input yields no batches."""
+        assert list(read_name_batches(io.StringIO(""))) == []
+
+
+class TestGreetingWriter:
+    """Test cases for GreetingWriter."""
+
+    def test_plain(self) -> None:
+        """Test that plain output has one greeting per line."""
+        stream = io.BytesIO()
+
+        with GreetingWriter(stream, PLAIN) as writer:
+            writer.write(["Ada"], ["👋 Hello, Ada!"])
+            writer.write([], [])
+            writer.write(["Bob"], ["👋 Hello, Bob!"])
+
+        assert stream.getvalue().decode() == "👋 Hello, Ada!\n👋 Hello, Bob!\n"
+        assert writer.written == 2
+
+    def test_ndjson(self) -> None:
+        """Test that NDJSON output has one object per name."""
+        stream = io.BytesIO()
+
+        with GreetingWriter(stream, NDJSON) as writer:
+            writer.write(['"Q"', ""], ['👋 Hello, "Q"!', "👋 Hello there!"])
+
+        lines = stream.getvalue().decode().splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"name": '"Q"', "greeting": '👋 Hello, "Q"!'},
+            {"name": "", "greeting": "👋 Hello there!"},
+        ]
+
+    def test_csv(self) -> None:
+        """Test that CSV output has a header and quotes where needed."""
+        stream = io.BytesIO()
+
+        with GreetingWriter(stream, CSV) as writer:
+            writer.write(["Lovelace, Ada"], ["👋 Hello, Lovelace, Ada!"])
+
+        rows = list(csv.reader(io.StringIO(stream.getvalue().decode())))
+        assert rows == [
+            ["name", "greeting"],
+            ["Lovelace, Ada", "👋 Hello, Lovelace, Ada!"],
+        ]
+
+    def test_writes_in_large_chunks(self) -> None:
+        """Test that greetings are buffered rather than written one by one."""
+        stream = _CountingStream()
+
+        with GreetingWriter(stream, PLAIN, buffer_size=100) as writer:
+            for i in range(50):
+                writer.write([str(i)], [f"👋 Hello, {i}!"])
+
+        assert stream.getvalue().decode().count("\n") == 50
+        assert 1 < stream.writes < 10
+
+    def test_unknown_format(self) -> None:
+        """Test that an unknown format is rejected."""
+        with pytest.raises(ValueError, match="Unknown greeting format"):
+            GreetingWriter(io.BytesIO(), "xml")
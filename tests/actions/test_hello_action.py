@@ -32,3 +32,11 @@ class TestHelloAction:
 
         # Empty string is falsy, so it should use the generic greeting
         assert result == "👋 Hello there!"
+
+    def test_execute_batch(self, action: HelloAction) -> None:
+        """Test that a batch gets the same greetings as single calls, in order."""
+        names = ["Alice", "", "Bob"]
+
+        result = action.execute_batch(names)
+
+        assert result == [action.execute(name) for name in names]
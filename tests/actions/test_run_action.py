@@ -0,0 +1,290 @@
+"""Tests for the batch run action."""
+
+import asyncio
+import io
+from typing import AsyncIterator, Iterable
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from taters.actions.dad_joke_action import DadJokeAction
+from taters.actions.hello_action import HelloAction
+from taters.actions.run_action import (
+    Command,
+    CommandError,
+    CommandResult,
+    RunAction,
+    parse_command,
+    read_lines,
+)
+
+
+async def _lines(lines: Iterable[str]) -> AsyncIterator[str]:
+    """Feed lines to the action as an async iterator."""
+    for line in lines:
+        yield line
+
+
+class TestParseCommand:
+    """Test cases for parse_command."""
+
+    @pytest.mark.parametrize(
+        "line, expected",
+        [
+            ("hello", Command("hello", {"name": None})),
+            ('hello "Ada Lovelace"', Command("hello", {"name": "Ada Lovelace"})),
+            ("taters hello Bob", Command("hello", {"name": "Bob"})),
+            ("dad-joke", Command("dad-joke", {})),
+            (
+                "dad-joke --count 3 -c 2",
+                Command("dad-joke", {"count": 3, "concurrency": 2}),
+            ),
+            ("dad-joke -n=4", Command("dad-joke", {"count": 4})),
+            (
+                '{"action": "hello", "params": {"name": "Eve"}}',
+                Command("hello", {"name": "Eve"}),
+            ),
+            ('{"action": "dad-joke"}', Command("dad-joke", {})),
+            (
+                '{"action": "dad-joke", "params": {"count": "3", "concurrency": null}}',
+                Command("dad-joke", {"count": 3, "concurrency": None}),
+            ),
+        ],
+    )
+    def test_valid_commands(self, line: str, expected: Command) -> None:
+        """Test that shell-style and JSON lines are parsed."""
+        assert parse_command(line) == expected
+
+    @pytest.mark.parametrize(
+        "line, message",
+        [
+            ("taters", "Empty command"),
+            ("serve", "Unknown command: serve"),
+            ("hello a b", "at most one NAME"),
+            ("dad-joke --count", "expects a number"),
+            ("dad-joke --count 0", "at least 1"),
+            ("dad-joke --offline", "Unknown dad-joke option"),
+            ('hello "unterminated', "quotation"),
+            ("{not json", "Malformed JSON"),
+            ('{"params": {}}', "'action' string"),
+            ('{"action": "hello", "params": []}', "must be an object"),
+            ('{"action": "stats"}', "Unknown command: stats"),
+            (
+                '{"action": "dad-joke", "params": {"count": "many"}}',
+                "JSON command 'count' expects a number, got 'many'",
+            ),
+            (
+                '{"action": "dad-joke", "params": {"count": 2.5}}',
+                "'count' expects a number",
+            ),
+            (
+                '{"action": "dad-joke", "params": {"count": true}}',
+                "'count' expects a number",
+            ),
+            (
+                '{"action": "dad-joke", "params": {"count": 0}}',
+                "JSON command 'count' must be at least 1",
+            ),
+            (
+                '{"action": "dad-joke", "params": {"count": 2, "concurrency": -1}}',
+                "JSON command 'concurrency' must be at least 1",
+            ),
+        ],
+    )
+    def test_invalid_commands(self, line: str, message: str) -> None:
+        """Test that malformed lines raise CommandError."""
+        with pytest.raises(CommandError, match=message):
+            parse_command(line)
+
+
+class TestReadLines:
+    """Test cases for read_lines."""
+
+    @pytest.mark.asyncio
+    async def test_strips_newlines(self) -> None:
+        """Test that lines are read from a blocking stream without newlines."""
+        stream = io.StringIO("hello\r\ndad-joke\nlast")
+
+        lines = [line async for line in read_lines(stream)]
+
+        assert lines == ["hello", "dad-joke", "last"]
+
+
+class TestRunAction:
+    """Test cases for RunAction."""
+
+    @pytest.fixture
+    def dad_joke_action(self) -> AsyncMock:
+        """Create a mock dad joke action."""
+        action = AsyncMock(spec=DadJokeAction)
+        action.execute.return_value = "🃏 Dad Joke: Single"
+        return action
+
+    @pytest.fixture
+    def action(self, dad_joke_action: AsyncMock) -> RunAction:
+        """Create a run action with a real hello action."""
+        return RunAction(HelloAction(), dad_joke_action, concurrency=7)
+
+    @pytest.mark.asyncio
+    async def test_runs_commands_in_order(
+        self, action: RunAction, dad_joke_action: AsyncMock
+    ) -> None:
+        """Test that results follow input order and skip blanks and comments."""
+        lines = ["hello Ada", "", "# a comment", "dad-joke", "bogus"]
+
+        results = [result async for result in action.execute(_lines(lines))]
+
+        assert results == [
+            CommandResult(1, "hello Ada", ["👋 Hello, Ada!"]),
+            CommandResult(4, "dad-joke", ["🃏 Dad Joke: Single"]),
+            CommandResult(5, "bogus", [], "Unknown command: bogus"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_default_concurrency(
+        self, action: RunAction, dad_joke_action: AsyncMock
+    ) -> None:
+        """Test that dad-joke --count streams a batch from the action."""
+
+        async def execute_batch(count: int, concurrency: int) -> AsyncIterator[str]:
+            for i in range(count):
+                yield f"Joke {i}"
+
+        dad_joke_action.execute_batch = MagicMock(side_effect=execute_batch)
+
+        results = [r async for r in action.execute(_lines(["dad-joke -n 2"]))]
+
+        assert results[0].results == ["Joke 0", "Joke 1"]
+        dad_joke_action.execute_batch.assert_called_once_with(2, 7)
+
+    @pytest.mark.asyncio
+    async def test_failing_command_does_not_stop_batch(
+        self, action: RunAction, dad_joke_action: AsyncMock
+    ) -> None:
+        """Test that an action error is reported on its own line's result."""
+        dad_joke_action.execute.side_effect = RuntimeError("API down")
+
+        results = [r async for r in action.execute(_lines(["dad-joke", "hello"]))]
+
+        assert results[0].error == "API down"
+        assert results[1].results == ["👋 Hello there!"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_json_count_is_reported_per_line(
+        self, action: RunAction, dad_joke_action: AsyncMock
+    ) -> None:
+        """Test that a bad JSON count fails its line without reaching the action."""
+        lines = [
+            '{"action": "dad-joke", "params": {"count": "x"}}',
+            '{"action": "dad-joke", "params": {"count": -3}}',
+            '{"action": "dad-joke", "params": {"count": 1}}',
+        ]
+
+        results = [r async for r in action.execute(_lines(lines))]
+
+        assert [result.error for result in results] == [
+            "JSON command 'count' expects a number, got 'x'",
+            "JSON command 'count' must be at least 1",
+            None,
+        ]
+        dad_joke_action.execute.assert_awaited_once_with()
+        dad_joke_action.execute_batch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ordered_waits_for_slow_head(
+        self, action: RunAction, dad_joke_action: AsyncMock
+    ) -> None:
+        """Test that ordered mode holds later results until earlier ones finish."""
+        release = asyncio.Event()
+
+        async def slow() -> str:
+            await release.wait()
+            return "🃏 Dad Joke: Slow"
+
+        dad_joke_action.execute.side_effect = slow
+        lines = ["dad-joke", "hello"]
+        results = action.execute(_lines(lines), parallelism=2, ordered=True)
+
+        first = asyncio.create_task(anext(results))
+        await asyncio.sleep(0.01)
+        assert not first.done()
+        release.set()
+
+        assert (await first).line_number == 1
+        assert (await anext(results)).line_number == 2
+
+    @pytest.mark.asyncio
+    async def test_unordered_yields_as_commands_finish(
+        self, action: RunAction, dad_joke_action: AsyncMock
+    ) -> None:
+        """Test that unordered mode does not wait for a slow earlier command."""
+        release = asyncio.Event()
+
+        async def slow() -> str:
+            await release.wait()
+            return "🃏 Dad Joke: Slow"
+
+        dad_joke_action.execute.side_effect = slow
+        lines = ["dad-joke", "hello"]
+        results = action.execute(_lines(lines), parallelism=2, ordered=False)
+
+        assert (await anext(results)).line_number == 2
+        release.set()
+        assert (await anext(results)).line_number == 1
+
+    @pytest.mark.asyncio
+    async def test_parallelism_limit(
+        self, action: RunAction, dad_joke_action: AsyncMock
+    ) -> None:
+        """Test that no more than the limit of commands run at once."""
+        in_flight = 0
+        peak = 0
+        full = asyncio.Event()
+
+        async def execute() -> str:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            if in_flight == 5:
+                full.set()
+            # Hold the first commands until the limit is reached.
+            await full.wait()
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return "🃏 Dad Joke: Test"
+
+        dad_joke_action.execute.side_effect = execute
+        lines = ["dad-joke"] * 50
+
+        results = [
+            r async for r in action.execute(_lines(lines), parallelism=5, ordered=False)
+        ]
+
+        assert len(results) == 50
+        assert peak == 5
+
+    @pytest.mark.asyncio
+    async def test_closing_early_cancels_outstanding_commands(
+        self, action: RunAction, dad_joke_action: AsyncMock
+    ) -> None:
+        """Test that commands still running are cancelled when the consumer stops."""
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def stuck() -> str:
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "🃏 Dad Joke: Never"
+
+        dad_joke_action.execute.side_effect = stuck
+        results = action.execute(_lines(["hello", "dad-joke"]), ordered=True)
+
+        assert (await anext(results)).line_number == 1
+        await started.wait()
+        await results.aclose()  # type: ignore[attr-defined]
+
+        assert cancelled.is_set()
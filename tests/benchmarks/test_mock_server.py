@@ -0,0 +1,59 @@
+"""Tests for the mock joke server used by the benchmarks."""
+
+from typing import Iterator
+
+import httpx
+import pytest
+
+from benchmarks.mock_server import MockJokeServer, ServerConfig
+
+
+class TestMockJokeServer:
+    """Test cases for MockJokeServer."""
+
+    @pytest.fixture
+    def server(self) -> Iterator[MockJokeServer]:
+        """Run a server that rate limits every third request."""
+        with MockJokeServer(
+            ServerConfig(latency=0, rate_limit_every=3, retry_after=1)
+        ) as server:
+            yield server
+
+    def test_serves_distinct_jokes_over_keep_alive(
+        self, server: MockJokeServer
+    ) -> None:
+        """Test that successive requests on one connection get new jokes."""
+        with httpx.Client(base_url=server.url) as client:
+            first = client.get("/").json()
+            second = client.get("/").json()
+
+        assert first["id"] != second["id"]
+        assert first["joke"].startswith("Benchmark joke")
+
+    def test_injects_rate_limits(self, server: MockJokeServer) -> None:
+        """Test that every Nth request is answered with 429 and Retry-After."""
+        with httpx.Client(base_url=server.url) as client:
+            responses = [client.get("/") for _ in range(3)]
+
+        assert [response.status_code for response in responses] == [200, 200, 429]
+        assert responses[2].headers["Retry-After"] == "1"
+        assert server.statuses == {200: 2, 429: 1}
+
+    def test_injects_errors(self) -> None:
+        """Test that an error rate of 1 fails every request."""
+        with MockJokeServer(ServerConfig(latency=0, error_rate=1.0)) as server:
+            with httpx.Client(base_url=server.url) as client:
+                assert client.get("/").status_code == 500
+
+    def test_serves_paginated_search(self) -> None:
+        """Test that /search pages through the synthetic results."""
+        config = ServerConfig(latency=0, search_results=45)
+        with MockJokeServer(config) as server:
+            with httpx.Client(base_url=server.url) as client:
+                page = client.get(
+                    "/search", params={"term": "cat", "page": 2, "limit": 30}
+                ).json()
+
+        assert page["total_pages"] == 2
+        assert len(page["results"]) == 15
+        assert page["results"][0]["joke"] == "Benchmark cat joke #30"
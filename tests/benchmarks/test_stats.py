@@ -0,0 +1,62 @@
+"""Tests for benchmark statistics and regression comparison."""
+
+from typing import Any, Optional
+
+from benchmarks.stats import ScenarioResult, compare, percentile
+
+
+def _results(
+    jokes_per_second: float, p99: float, memory: Optional[float] = 100.0
+) -> dict[str, Any]:
+    """Build a minimal results document with one scenario."""
+    return {
+        "scenarios": {
+            "single": {
+                "jokes_per_second": jokes_per_second,
+                "latency_ms": {"p50": 1.0, "p99": p99},
+                "peak_memory_kib": memory,
+            }
+        }
+    }
+
+
+class TestStats:
+    """Test cases for benchmark statistics."""
+
+    def test_percentile_nearest_rank(self) -> None:
+        """Test nearest-rank percentiles."""
+        values = [float(value) for value in range(1, 101)]
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([3.0], 99) == 3.0
+
+    def test_scenario_summary(self) -> None:
+        """Test throughput and latency summary in milliseconds."""
+        result = ScenarioResult("single", 4, 2.0, [0.001, 0.002, 0.003, 0.010])
+
+        summary = result.to_dict()
+
+        assert summary["operations"] == 4
+        assert summary["jokes_per_second"] == 2.0
+        assert summary["latency_ms"] == {"p50": 2.0, "p99": 10.0, "mean": 4.0}
+        assert summary["peak_memory_kib"] is None
+
+    def test_compare_within_threshold(self) -> None:
+        """Test that small changes are not regressions."""
+        assert compare(_results(95, 10.5), _results(100, 10.0), 0.1) == []
+
+    def test_compare_flags_slower_throughput_and_latency(self) -> None:
+        """Test that drops in jokes/s and rises in p99 are flagged."""
+        regressions = compare(_results(50, 20.0), _results(100, 10.0), 0.1)
+
+        assert len(regressions) == 2
+        assert regressions[0].startswith("single: jokes/s")
+        assert "p99 ms" in regressions[1]
+
+    def test_compare_ignores_improvements_and_missing_data(self) -> None:
+        """Test that faster runs and unmeasured memory pass."""
+        current = _results(200, 5.0, memory=None)
+
+        assert compare(current, _results(100, 10.0), 0.1) == []
+        assert compare(current, {"scenarios": {}}, 0.1) == []
@@ -0,0 +1,94 @@
+"""Shared pytest fixtures and test helpers."""
+
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Iterator, TypeVar
+
+import pytest
+
+T = TypeVar("T")
+
+
+class FakeClock:
+    """Wall clock advanced by hand through ``now``."""
+
+    def __init__(self, now: float = 1_000.0) -> None:
+        """Start at an arbitrary fixed time."""
+        self.now = now
+
+    def __call__(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+async def async_iter(items: Iterable[T]) -> AsyncIterator[T]:
+    """Yield ``items`` from an async iterator, as a repository stream would."""
+    for item in items:
+        yield item
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Create a fake clock."""
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Point the XDG cache directory at a temporary path for every test."""
+    cache_home = tmp_path / "xdg-cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home
+
+
+@pytest.fixture(autouse=True)
+def isolated_runtime_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep tests from talking to a real daemon socket."""
+    runtime_dir = tmp_path / "xdg-runtime"
+    runtime_dir.mkdir()
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(runtime_dir))
+    monkeypatch.delenv("TATERS_SOCKET", raising=False)
+    return runtime_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_config(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Ignore the user's config file and settings, and re-merge per test."""
+    from taters import config
+
+    config_home = tmp_path / "xdg-config"
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(config_home))
+    for name in ("TATERS_CONFIG", "TATERS_PROFILE"):
+        monkeypatch.delenv(name, raising=False)
+    for section, keys in config.DEFAULTS.items():
+        for key in keys:
+            monkeypatch.delenv(f"TATERS_{section}_{key}".upper(), raising=False)
+    config._merged.cache_clear()
+    yield config_home / "taters"
+    config._merged.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_process_container(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Give every test its own process-wide container."""
+    monkeypatch.setattr("taters.container._process_container", None)
+
+
+@pytest.fixture(autouse=True)
+def default_api_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ignore any API override, such as a benchmark server, from the shell."""
+    monkeypatch.delenv("TATERS_API_URL", raising=False)
+
+
+@pytest.fixture(autouse=True)
+def no_corpus(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ignore any local joke corpus configured in the shell."""
+    monkeypatch.delenv("TATERS_CORPUS", raising=False)
+
+
+@pytest.fixture(autouse=True)
+def isolated_runtime() -> Iterator[None]:
+    """Give each test's commands a fresh shared event loop."""
+    from taters import runtime
+
+    yield
+    runtime.close()
@@ -0,0 +1 @@
+"""Init files for test daemon package."""
@@ -0,0 +1,94 @@
+"""Tests for the daemon client."""
+
+import os
+import shutil
+import socketserver
+import tempfile
+import threading
+from typing import Iterator
+
+import pytest
+
+from taters.daemon.client import DaemonClient
+from taters.daemon.protocol import DaemonError, DaemonUnavailableError, decode, encode
+
+
+class _ScriptedHandler(socketserver.StreamRequestHandler):
+    """Replies to one request with the server's scripted lines."""
+
+    def handle(self) -> None:
+        """Record the request and send the scripted reply."""
+        server = self.server
+        server.requests.append(decode(self.rfile.readline()))  # type: ignore[attr-defined]
+        for line in server.replies:  # type: ignore[attr-defined]
+            self.wfile.write(line)
+
+
+@pytest.fixture
+def scripted_server() -> Iterator[socketserver.UnixStreamServer]:
+    """Run a fake daemon that answers with a scripted list of lines."""
+    directory = tempfile.mkdtemp(prefix="tt", dir="/tmp")
+    server = socketserver.UnixStreamServer(
+        os.path.join(directory, "d.sock"), _ScriptedHandler
+    )
+    server.requests = []  # type: ignore[attr-defined]
+    server.replies = []  # type: ignore[attr-defined]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+class TestDaemonClient:
+    """Test cases for DaemonClient."""
+
+    def test_request_streams_results(
+        self, scripted_server: socketserver.UnixStreamServer
+    ) -> None:
+        """Test that results are yielded until the done line."""
+        scripted_server.replies = [  # type: ignore[attr-defined]
+            encode({"id": 1, "result": "one"}),
+            encode({"id": 1, "result": "two"}),
+            encode({"id": 1, "done": True}),
+        ]
+        client = DaemonClient(str(scripted_server.server_address))
+
+        results = list(client.request("dad-joke", {"count": 2}))
+
+        assert results == ["one", "two"]
+        assert scripted_server.requests == [  # type: ignore[attr-defined]
+            {"id": 1, "action": "dad-joke", "params": {"count": 2}}
+        ]
+
+    def test_request_raises_reported_error(
+        self, scripted_server: socketserver.UnixStreamServer
+    ) -> None:
+        """Test that error lines become DaemonError."""
+        scripted_server.replies = [  # type: ignore[attr-defined]
+            encode({"id": 1, "error": "boom"})
+        ]
+        client = DaemonClient(str(scripted_server.server_address))
+
+        with pytest.raises(DaemonError, match="boom"):
+            list(client.request("hello"))
+
+    def test_request_raises_on_early_disconnect(
+        self, scripted_server: socketserver.UnixStreamServer
+    ) -> None:
+        """Test that a connection closed before done is an error."""
+        scripted_server.replies = [  # type: ignore[attr-defined]
+            encode({"id": 1, "result": "partial"})
+        ]
+        client = DaemonClient(str(scripted_server.server_address))
+
+        with pytest.raises(DaemonError, match="before finishing"):
+            list(client.request("hello"))
+
+    def test_request_without_daemon(self, tmp_path: os.PathLike[str]) -> None:
+        """Test that a missing daemon raises DaemonUnavailableError."""
+        client = DaemonClient(os.path.join(tmp_path, "missing.sock"))
+
+        with pytest.raises(DaemonUnavailableError):
+            list(client.request("hello"))
@@ -0,0 +1,85 @@
+"""Tests for the daemon wire protocol."""
+
+from pathlib import Path
+
+import pytest
+
+from taters.daemon.protocol import (
+    DaemonError,
+    decode,
+    default_socket_path,
+    encode,
+    positive_int,
+)
+
+
+class TestProtocol:
+    """Test cases for protocol helpers."""
+
+    def test_encode_decode_round_trip(self) -> None:
+        """Test that a message survives encoding as a single line."""
+        message = {"id": 7, "result": "🃏 Dad Joke: Multi\nline"}
+
+        line = encode(message)
+
+        assert line.endswith(b"\n")
+        assert line.count(b"\n") == 1
+        assert decode(line) == message
+
+    def test_decode_rejects_invalid_json(self) -> None:
+        """Test that malformed lines raise DaemonError."""
+        with pytest.raises(DaemonError, match="Malformed"):
+            decode(b"not json\n")
+
+    def test_decode_rejects_non_objects(self) -> None:
+        """Test that JSON values other than objects are rejected."""
+        with pytest.raises(DaemonError, match="expected a JSON object"):
+            decode(b"[1, 2]\n")
+
+    @pytest.mark.parametrize("value, expected", [(3, 3), ("12", 12)])
+    def test_positive_int_accepts_whole_numbers(
+        self, value: object, expected: int
+    ) -> None:
+        """Test that counts may arrive as ints or numeric strings."""
+        assert positive_int("count", value) == expected
+
+    @pytest.mark.parametrize(
+        "value, message",
+        [
+            ("x", "count expects a number, got 'x'"),
+            (1.5, "expects a number"),
+            (True, "expects a number"),
+            (None, "expects a number"),
+            (0, "count must be at least 1"),
+            (-3, "count must be at least 1"),
+        ],
+    )
+    def test_positive_int_rejects_other_values(
+        self, value: object, message: str
+    ) -> None:
+        """Test that non-numbers and numbers below 1 are rejected."""
+        with pytest.raises(ValueError, match=message):
+            positive_int("count", value)
+
+    def test_default_socket_path_prefers_env_var(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that TATERS_SOCKET overrides every other location."""
+        monkeypatch.setenv("TATERS_SOCKET", "/run/custom.sock")
+
+        assert default_socket_path() == "/run/custom.sock"
+
+    def test_default_socket_path_uses_runtime_dir(
+        self, isolated_runtime_dir: Path
+    ) -> None:
+        """Test that XDG_RUNTIME_DIR is used when set."""
+        assert default_socket_path() == str(isolated_runtime_dir / "taters.sock")
+
+    def test_default_socket_path_falls_back_to_tempdir(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the per-user temp file fallback."""
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+
+        assert default_socket_path().endswith(".sock")
+        assert "taters-" in default_socket_path()
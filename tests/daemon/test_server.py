@@ -0,0 +1,240 @@
+"""Tests for the daemon server."""
+
+import asyncio
+import json
+import os
+import shutil
+import socket
+import tempfile
+from typing import AsyncIterator, Iterator
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from taters.daemon.protocol import DaemonError, decode, encode
+from taters.daemon.server import DaemonServer
+from taters.services.single_flight import SingleFlightStats
+
+
+@pytest.fixture
+def socket_path() -> Iterator[str]:
+    """Create a short socket path (Unix socket paths are length-limited)."""
+    directory = tempfile.mkdtemp(prefix="tt", dir="/tmp")
+    yield os.path.join(directory, "d.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def mock_container() -> MagicMock:
+    """Create a container mock exposing both actions."""
+    container = MagicMock()
+    container.hello_action.return_value.execute.return_value = "👋 Hello, Al!"
+    container.config.dad_joke.concurrency.return_value = 10
+    dad_joke_action = MagicMock()
+    dad_joke_action.execute = AsyncMock(return_value="🃏 Dad Joke: One")
+
+    async def batch(count: int, concurrency: int) -> AsyncIterator[str]:
+        for index in range(count):
+            yield f"🃏 Dad Joke: {index}/{concurrency}"
+
+    dad_joke_action.execute_batch.side_effect = batch
+    container.dad_joke_action.async_ = AsyncMock(return_value=dad_joke_action)
+    return container
+
+
+class TestDaemonServer:
+    """Test cases for DaemonServer."""
+
+    async def _exchange(self, socket_path: str, *requests: bytes) -> list[dict]:
+        """Send raw request lines and collect every response line."""
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        for request in requests:
+            writer.write(request)
+        writer.write_eof()
+        responses = [decode(line) async for line in reader]
+        writer.close()
+        await writer.wait_closed()
+        return responses
+
+    async def _with_server(self, server: DaemonServer, *requests: bytes) -> list[dict]:
+        """Run the server, exchange requests, then stop it."""
+        stop = asyncio.Event()
+        ready = asyncio.Event()
+        task = asyncio.create_task(server.serve(stop, on_ready=ready.set))
+        await ready.wait()
+        try:
+            return await self._exchange(server.socket_path, *requests)
+        finally:
+            stop.set()
+            await task
+
+    @pytest.mark.asyncio
+    async def test_hello_request(
+        self, mock_container: MagicMock, socket_path: str
+    ) -> None:
+        """Test that hello requests run HelloAction."""
+        server = DaemonServer(mock_container, socket_path)
+
+        responses = await self._with_server(
+            server, encode({"id": 1, "action": "hello", "params": {"name": "Al"}})
+        )
+
+        assert responses == [
+            {"id": 1, "result": "👋 Hello, Al!"},
+            {"id": 1, "done": True},
+        ]
+        mock_container.hello_action.return_value.execute.assert_called_once_with("Al")
+
+    @pytest.mark.asyncio
+    async def test_dad_joke_batch_streams_results(
+        self, mock_container: MagicMock, socket_path: str
+    ) -> None:
+        """Test that batch requests stream one line per joke."""
+        server = DaemonServer(mock_container, socket_path)
+
+        responses = await self._with_server(
+            server,
+            encode({"id": 2, "action": "dad-joke", "params": {"count": 2}}),
+            encode({"id": 3, "action": "dad-joke"}),
+        )
+
+        assert responses == [
+            {"id": 2, "result": "🃏 Dad Joke: 0/10"},
+            {"id": 2, "result": "🃏 Dad Joke: 1/10"},
+            {"id": 2, "done": True},
+            {"id": 3, "result": "🃏 Dad Joke: One"},
+            {"id": 3, "done": True},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stats_reports_coalesced_calls(
+        self, mock_container: MagicMock, socket_path: str
+    ) -> None:
+        """Test that the stats action exposes single-flight counters."""
+        mock_container.dad_joke_single_flight.return_value.stats = SingleFlightStats(
+            calls=5, upstream_calls=2
+        )
+        server = DaemonServer(mock_container, socket_path)
+
+        responses = await self._with_server(
+            server, encode({"id": 1, "action": "stats"})
+        )
+
+        assert json.loads(responses[0]["result"]) == {
+            "calls": 5,
+            "upstream_calls": 2,
+            "coalesced": 3,
+        }
+
+    @pytest.mark.asyncio
+    async def test_errors_are_reported_per_request(
+        self, mock_container: MagicMock, socket_path: str
+    ) -> None:
+        """Test that bad requests get error lines without dropping the connection."""
+        server = DaemonServer(mock_container, socket_path)
+
+        responses = await self._with_server(
+            server,
+            b"garbage\n",
+            encode({"id": 4, "action": "nope"}),
+            encode({"id": 5, "action": "hello"}),
+        )
+
+        assert responses[0]["id"] is None
+        assert "Malformed" in responses[0]["error"]
+        assert responses[1] == {"id": 4, "error": "Unknown action: nope"}
+        assert responses[2] == {"id": 5, "result": "👋 Hello, Al!"}
+
+    @pytest.mark.asyncio
+    async def test_invalid_dad_joke_params_are_reported(
+        self, mock_container: MagicMock, socket_path: str
+    ) -> None:
+        """Test that a bad count or concurrency gets an error, not a joke."""
+        server = DaemonServer(mock_container, socket_path)
+
+        responses = await self._with_server(
+            server,
+            encode({"id": 1, "action": "dad-joke", "params": {"count": 0}}),
+            encode(
+                {
+                    "id": 2,
+                    "action": "dad-joke",
+                    "params": {"count": 2, "concurrency": -3},
+                }
+            ),
+            encode({"id": 3, "action": "dad-joke", "params": {"count": "many"}}),
+        )
+
+        assert responses == [
+            {"id": 1, "error": "count must be at least 1"},
+            {"id": 2, "error": "concurrency must be at least 1"},
+            {"id": 3, "error": "count expects a number, got 'many'"},
+        ]
+        mock_container.dad_joke_action.async_.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_socket_removed_on_stop(
+        self, mock_container: MagicMock, socket_path: str
+    ) -> None:
+        """Test that the socket file is cleaned up when the server stops."""
+        server = DaemonServer(mock_container, socket_path)
+
+        await self._with_server(server)
+
+        assert not os.path.exists(socket_path)
+
+    @pytest.mark.asyncio
+    async def test_stop_closes_idle_connections(
+        self, mock_container: MagicMock, socket_path: str
+    ) -> None:
+        """Test that a client holding its connection open does not block stop."""
+        server = DaemonServer(mock_container, socket_path)
+        stop = asyncio.Event()
+        ready = asyncio.Event()
+        task = asyncio.create_task(server.serve(stop, on_ready=ready.set))
+        await ready.wait()
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        try:
+            writer.write(encode({"id": 1, "action": "hello"}))
+            assert decode(await reader.readline())["id"] == 1
+            assert decode(await reader.readline()) == {"id": 1, "done": True}
+
+            stop.set()
+            await asyncio.wait_for(task, 1.0)
+
+            assert await asyncio.wait_for(reader.read(), 1.0) == b""
+        finally:
+            writer.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_socket_is_replaced(
+        self, mock_container: MagicMock, socket_path: str
+    ) -> None:
+        """Test that a leftover socket file with no listener is reclaimed."""
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(socket_path)
+        stale.close()
+        server = DaemonServer(mock_container, socket_path)
+
+        responses = await self._with_server(
+            server, encode({"id": 1, "action": "hello"})
+        )
+
+        assert responses[-1] == {"id": 1, "done": True}
+
+    @pytest.mark.asyncio
+    async def test_refuses_to_start_twice(
+        self, mock_container: MagicMock, socket_path: str
+    ) -> None:
+        """Test that a second daemon on the same socket fails fast."""
+        first = DaemonServer(mock_container, socket_path)
+        stop = asyncio.Event()
+        ready = asyncio.Event()
+        task = asyncio.create_task(first.serve(stop, on_ready=ready.set))
+        await ready.wait()
+        try:
+            with pytest.raises(DaemonError, match="already listening"):
+                await DaemonServer(mock_container, socket_path).serve(asyncio.Event())
+        finally:
+            stop.set()
+            await task
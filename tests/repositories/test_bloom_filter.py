@@ -0,0 +1,64 @@
+"""Tests for the seen-joke Bloom filters."""
+
+import pytest
+
+from taters.repositories.bloom_filter import BloomFilter, ScalableBloomFilter
+
+
+class TestBloomFilter:
+    """Test cases for BloomFilter."""
+
+    def test_sized_for_capacity_and_error_rate(self) -> None:
+        """Test that the bit and hash counts follow the standard formulas."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+
+        assert bloom.num_bits == 9586
+        assert bloom.num_hashes == 7
+        assert len(bloom.bits) == 1199
+
+    def test_restored_filter_is_clean(self) -> None:
+        """Test that a filter built from saved bits is not marked dirty."""
+        saved = BloomFilter(capacity=10, error_rate=0.01, bits=bytearray(12), count=3)
+
+        assert not saved.dirty
+        assert saved.count == 3
+        assert BloomFilter(capacity=10, error_rate=0.01).dirty
+
+
+class TestScalableBloomFilter:
+    """Test cases for ScalableBloomFilter."""
+
+    def test_add_reports_new_keys(self) -> None:
+        """Test that add is True only the first time a key is seen."""
+        seen = ScalableBloomFilter()
+
+        assert seen.add("abc")
+        assert not seen.add("abc")
+        assert "abc" in seen
+        assert "xyz" not in seen
+        assert 42 not in seen
+        assert len(seen) == 1
+
+    def test_grows_by_doubling_slices(self) -> None:
+        """Test that new slices are added as earlier ones fill up."""
+        seen = ScalableBloomFilter(initial_capacity=10, error_rate=0.01)
+
+        for i in range(100):
+            seen.add(f"joke-{i}")
+
+        assert [piece.capacity for piece in seen.slices] == [10, 20, 40, 80]
+        assert [piece.error_rate for piece in seen.slices] == pytest.approx(
+            [0.005, 0.0025, 0.00125, 0.000625]
+        )
+        assert all(f"joke-{i}" in seen for i in range(100))
+
+    def test_false_positive_rate_is_bounded(self) -> None:
+        """Test that keys never added are rarely reported as seen."""
+        seen = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+        for i in range(5000):
+            seen.add(f"seen-{i}")
+
+        false_positives = sum(f"unseen-{i}" in seen for i in range(20000))
+
+        # The slice rates sum to just under 1%; allow for sampling noise.
+        assert false_positives / 20000 < 0.015
@@ -0,0 +1,133 @@
+"""Tests for the caching dad joke repository decorator."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from taters.repositories.cached_dad_joke_repository import CachedDadJokeRepository
+from taters.repositories.dad_joke_repository import DadJoke, DadJokeRepository
+from taters.repositories.joke_cache_repository import JokeCacheRepository
+from tests.conftest import async_iter
+
+
+class TestCachedDadJokeRepository:
+    """Test cases for CachedDadJokeRepository."""
+
+    @pytest.fixture
+    def mock_repository(self) -> AsyncMock:
+        """Create a mock upstream repository."""
+        return AsyncMock(spec=DadJokeRepository)
+
+    @pytest.fixture
+    def mock_cache(self) -> AsyncMock:
+        """Create a mock joke cache."""
+        return AsyncMock(spec=JokeCacheRepository)
+
+    @pytest.fixture
+    def repository(
+        self, mock_repository: AsyncMock, mock_cache: AsyncMock
+    ) -> CachedDadJokeRepository:
+        """Create an online cached repository."""
+        return CachedDadJokeRepository(mock_repository, mock_cache)
+
+    @pytest.mark.asyncio
+    async def test_fetch_stores_fresh_joke(
+        self,
+        repository: CachedDadJokeRepository,
+        mock_repository: AsyncMock,
+        mock_cache: AsyncMock,
+    ) -> None:
+        """Test that a successful upstream fetch is written to the cache."""
+        joke = DadJoke(id="1", joke="Fresh")
+        mock_repository.fetch_random_joke.return_value = joke
+
+        result = await repository.get_random_joke()
+
+        assert result == "Fresh"
+        mock_cache.put.assert_awaited_once_with(joke)
+        mock_cache.get_random.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fetch_falls_back_to_cache_on_failure(
+        self,
+        repository: CachedDadJokeRepository,
+        mock_repository: AsyncMock,
+        mock_cache: AsyncMock,
+    ) -> None:
+        """Test that an upstream failure is answered from the cache."""
+        mock_repository.fetch_random_joke.return_value = None
+        mock_cache.get_random.return_value = DadJoke(id="2", joke="Cached")
+
+        result = await repository.get_random_joke()
+
+        assert result == "Cached"
+        mock_cache.put.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fetch_without_fallback_skips_cache(
+        self, mock_repository: AsyncMock, mock_cache: AsyncMock
+    ) -> None:
+        """Test that a live-only repository never answers from the cache."""
+        repository = CachedDadJokeRepository(
+            mock_repository, mock_cache, fallback=False
+        )
+        mock_repository.fetch_random_joke.return_value = None
+
+        assert await repository.fetch_random_joke() is None
+        mock_cache.get_random.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_random_joke_when_nothing_available(
+        self,
+        repository: CachedDadJokeRepository,
+        mock_repository: AsyncMock,
+        mock_cache: AsyncMock,
+    ) -> None:
+        """Test that None is returned when neither upstream nor cache has a joke."""
+        mock_repository.fetch_random_joke.return_value = None
+        mock_cache.get_random.return_value = None
+
+        assert await repository.get_random_joke() is None
+
+    @pytest.mark.asyncio
+    async def test_offline_never_calls_upstream(
+        self, mock_repository: AsyncMock, mock_cache: AsyncMock
+    ) -> None:
+        """Test that offline mode only reads from the cache."""
+        repository = CachedDadJokeRepository(mock_repository, mock_cache, offline=True)
+        mock_cache.get_random.return_value = DadJoke(id="3", joke="Offline")
+
+        result = await repository.get_random_joke()
+
+        assert result == "Offline"
+        mock_repository.fetch_random_joke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_random_jokes_caches_each_joke(
+        self,
+        repository: CachedDadJokeRepository,
+        mock_repository: AsyncMock,
+        mock_cache: AsyncMock,
+    ) -> None:
+        """Test that batch results are streamed through and cached."""
+        jokes = [DadJoke(id="1", joke="One"), DadJoke(id="2", joke="Two")]
+        mock_repository.get_random_jokes = MagicMock(return_value=async_iter(jokes))
+
+        result = [joke async for joke in repository.get_random_jokes(2, 3)]
+
+        assert result == jokes
+        mock_repository.get_random_jokes.assert_called_once_with(2, 3)
+        assert mock_cache.put.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_random_jokes_offline_reads_cache(
+        self, mock_repository: AsyncMock, mock_cache: AsyncMock
+    ) -> None:
+        """Test that offline batches come from the cache."""
+        repository = CachedDadJokeRepository(mock_repository, mock_cache, offline=True)
+        jokes = [DadJoke(id="1", joke="One")]
+        mock_cache.get_random_many.return_value = jokes
+
+        result = [joke async for joke in repository.get_random_jokes(5)]
+
+        assert result == jokes
+        mock_cache.get_random_many.assert_awaited_once_with(5)
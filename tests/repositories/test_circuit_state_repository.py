@@ -0,0 +1,48 @@
+"""Tests for the circuit breaker state repository."""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from taters.repositories.circuit_state_repository import (
+    CircuitState,
+    CircuitStateRepository,
+    init_circuit_state_repository,
+)
+
+
+class TestCircuitStateRepository:
+    """Test cases for CircuitStateRepository."""
+
+    @pytest.fixture
+    def store(self, tmp_path: Path) -> Iterator[CircuitStateRepository]:
+        """Create a state store backed by a temporary database."""
+        store = CircuitStateRepository(path=tmp_path / "jokes.sqlite3")
+        yield store
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_load_unknown_breaker(self, store: CircuitStateRepository) -> None:
+        """Test that a breaker never saved has no state."""
+        assert await store.load("api") is None
+
+    @pytest.mark.asyncio
+    async def test_save_replaces_previous_state(
+        self, store: CircuitStateRepository
+    ) -> None:
+        """Test that the latest saved state wins."""
+        await store.save("api", CircuitState("closed", 2, 0.0))
+        await store.save("api", CircuitState("open", 5, 123.0))
+
+        assert await store.load("api") == CircuitState("open", 5, 123.0)
+
+    @pytest.mark.asyncio
+    async def test_state_survives_reopening(self, tmp_path: Path) -> None:
+        """Test that state is visible to the next run."""
+        path = tmp_path / "jokes.sqlite3"
+        for store in init_circuit_state_repository(path):
+            await store.save("api", CircuitState("open", 5, 1.0))
+
+        for store in init_circuit_state_repository(path):
+            assert await store.load("api") == CircuitState("open", 5, 1.0)
@@ -0,0 +1,67 @@
+"""Tests for the local corpus joke repository."""
+
+from pathlib import Path
+
+import pytest
+
+from taters.repositories.corpus_joke_repository import (
+    CORPUS_ENV_VAR,
+    CorpusJokeRepository,
+)
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.joke_archive import BINARY, write_archive
+
+JOKES = [DadJoke(id="1", joke="One"), DadJoke(id="2", joke="Two")]
+
+
+class TestCorpusJokeRepository:
+    """Test cases for CorpusJokeRepository."""
+
+    @pytest.fixture
+    def corpus(self, tmp_path: Path) -> Path:
+        """Write a small binary archive."""
+        path = tmp_path / "corpus.bin"
+        with path.open("wb") as stream:
+            write_archive(JOKES, stream, BINARY)
+        return path
+
+    @pytest.mark.asyncio
+    async def test_serves_jokes_from_the_archive(self, corpus: Path) -> None:
+        """Test that random jokes come from the corpus file."""
+        repository = CorpusJokeRepository(corpus)
+
+        assert await repository.fetch_random_joke() in JOKES
+        assert await repository.get_random_joke() in {"One", "Two"}
+        batch = [joke async for joke in repository.get_random_jokes(5)]
+        assert sorted(batch, key=lambda joke: joke.id) == JOKES
+
+    @pytest.mark.asyncio
+    async def test_reads_the_file_once(self, corpus: Path) -> None:
+        """Test that the corpus is loaded on first use only."""
+        repository = CorpusJokeRepository(corpus)
+        await repository.fetch_random_joke()
+        corpus.unlink()
+
+        assert await repository.fetch_random_joke() in JOKES
+
+    def test_path_from_environment(
+        self, corpus: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that $TATERS_CORPUS selects the archive by default."""
+        monkeypatch.setenv(CORPUS_ENV_VAR, str(corpus))
+
+        assert CorpusJokeRepository().path == corpus
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_or_unreadable_corpus_is_empty(
+        self, tmp_path: Path
+    ) -> None:
+        """Test that a missing corpus answers None instead of raising."""
+        bad = tmp_path / "bad.ndjson"
+        bad.write_text("not json\n")
+
+        assert await CorpusJokeRepository().fetch_random_joke() is None
+        assert await CorpusJokeRepository(bad).get_random_joke() is None
+        assert (
+            await CorpusJokeRepository(tmp_path / "missing").get_random_joke() is None
+        )
@@ -1,112 +1,602 @@
 """Tests for the dad joke repository."""
 
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Optional
+
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 import httpx
 
-from taters.repositories.dad_joke_repository import DadJokeRepository
+from taters.repositories.dad_joke_repository import (
+    MAX_ATTEMPTS_PER_JOKE,
+    DadJoke,
+    DadJokeRepository,
+)
+from taters.repositories.joke_search_index import JokeSearchIndex
+from taters.repositories.rate_limiter import TokenBucket
+from taters.repositories.retry_policy import RetryPolicy
+
+
+def _client(handler: Mock) -> httpx.AsyncClient:
+    """Create a real client whose requests are answered by ``handler``."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _request(handler: Mock, index: int = 0) -> httpx.Request:
+    """Get a request the handler received."""
+    request: httpx.Request = handler.call_args_list[index].args[0]
+    return request
+
+
+class _Chunks(httpx.AsyncByteStream):
+    """Response body delivered in separate chunks, optionally failing after."""
+
+    def __init__(self, chunks: list[bytes], error: Optional[Exception] = None) -> None:
+        """Initialize the stream."""
+        self.chunks = chunks
+        self.error = error
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield the chunks, then raise the error if there is one."""
+        for chunk in self.chunks:
+            yield chunk
+        if self.error is not None:
+            raise self.error
 
 
 class TestDadJokeRepository:
     """Test cases for DadJokeRepository."""
 
     @pytest.fixture
-    def repository(self) -> DadJokeRepository:
-        """Create a repository instance for testing."""
-        return DadJokeRepository()
+    def handler(self) -> Mock:
+        """Create a mock API answering each request."""
+        return Mock()
+
+    @pytest.fixture
+    def repository(self, handler: Mock) -> DadJokeRepository:
+        """Create a repository instance whose client talks to the mock API."""
+        return DadJokeRepository(_client(handler))
 
     @pytest.mark.asyncio
-    async def test_get_random_joke_success(self, repository: DadJokeRepository) -> None:
+    async def test_get_random_joke_success(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
         """Test successful joke retrieval."""
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "joke": "Why did the chicken cross the road?"
-        }
-        mock_response.raise_for_status.return_value = None
+        handler.return_value = httpx.Response(
+            200, json={"joke": "Why did the chicken cross the road?"}
+        )
 
-        mock_client = AsyncMock()
-        mock_client.get.return_value = mock_response
+        result = await repository.get_random_joke()
 
-        with patch("httpx.AsyncClient") as mock_async_client:
-            mock_async_client.return_value.__aenter__.return_value = mock_client
+        assert result == "Why did the chicken cross the road?"
+        handler.assert_called_once()
+        request = _request(handler)
+        assert request.url == "https://icanhazdadjoke.com"
+        assert request.headers["Accept"] == "application/json"
+        assert request.headers["User-Agent"] == (
+            "Taters CLI (https://github.com/tristanl-slalom/accelertater)"
+        )
 
-            result = await repository.get_random_joke()
+    @pytest.mark.asyncio
+    async def test_get_random_joke_reuses_client(self, handler: Mock) -> None:
+        """Test that repeated calls go through the same injected client."""
+        client = _client(handler)
+        repository = DadJokeRepository(client)
+        handler.side_effect = lambda request: httpx.Response(
+            200, json={"joke": "Reused"}
+        )
+
+        await repository.get_random_joke()
+        await repository.get_random_joke()
 
-            assert result == "Why did the chicken cross the road?"
-            mock_client.get.assert_called_once_with(
-                "https://icanhazdadjoke.com",
-                headers={
-                    "Accept": "application/json",
-                    "User-Agent": "Taters CLI (https://github.com/tristanl-slalom/accelertater)",
-                },
-                timeout=10.0,
-            )
+        assert handler.call_count == 2
+        assert not client.is_closed
 
     @pytest.mark.asyncio
     async def test_get_random_joke_request_error(
-        self, repository: DadJokeRepository
+        self, repository: DadJokeRepository, handler: Mock
     ) -> None:
         """Test handling of request errors."""
-        mock_client = AsyncMock()
-        mock_client.get.side_effect = httpx.RequestError("Connection failed")
-
-        with patch("httpx.AsyncClient") as mock_async_client:
-            mock_async_client.return_value.__aenter__.return_value = mock_client
+        handler.side_effect = httpx.ConnectError("Connection failed")
 
-            result = await repository.get_random_joke()
+        result = await repository.get_random_joke()
 
-            assert result is None
+        assert result is None
 
     @pytest.mark.asyncio
     async def test_get_random_joke_http_error(
-        self, repository: DadJokeRepository
+        self, repository: DadJokeRepository, handler: Mock
     ) -> None:
         """Test handling of HTTP status errors."""
-        mock_response = Mock()
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "404 Not Found", request=Mock(), response=Mock()
+        handler.return_value = httpx.Response(404)
+
+        result = await repository.get_random_joke()
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_get_random_joke_json_missing_joke(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test handling when response JSON doesn't contain joke."""
+        handler.return_value = httpx.Response(200, json={"id": "123", "status": 200})
+
+        result = await repository.get_random_joke()
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_get_random_joke_invalid_json(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test handling of a body that is not JSON."""
+        handler.return_value = httpx.Response(200, text="<html>oops</html>")
+
+        assert await repository.get_random_joke() is None
+
+    @pytest.mark.asyncio
+    async def test_get_random_joke_unexpected_error(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test handling of unexpected errors."""
+        handler.side_effect = Exception("Unexpected error")
+
+        result = await repository.get_random_joke()
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_fetch_random_joke_includes_id(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test that the joke id is returned alongside the text."""
+        handler.return_value = httpx.Response(
+            200, json={"id": "abc", "joke": "Knock knock"}
         )
 
-        mock_client = AsyncMock()
-        mock_client.get.return_value = mock_response
+        result = await repository.fetch_random_joke()
 
-        with patch("httpx.AsyncClient") as mock_async_client:
-            mock_async_client.return_value.__aenter__.return_value = mock_client
+        assert result == DadJoke(id="abc", joke="Knock knock")
 
-            result = await repository.get_random_joke()
+    @pytest.mark.asyncio
+    async def test_oversized_content_length_is_refused(self, handler: Mock) -> None:
+        """Test that a declared body over the limit is not read."""
+        repository = DadJokeRepository(_client(handler), max_body_size=10)
+        stream = _Chunks([b'{"joke": "never read"}'])
+        handler.return_value = httpx.Response(
+            200, headers={"Content-Length": "1000000"}, stream=stream
+        )
 
-            assert result is None
+        assert await repository.fetch_random_joke() is None
+        handler.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_get_random_joke_json_missing_joke(
+    async def test_oversized_streamed_body_is_abandoned(self, handler: Mock) -> None:
+        """Test that a body without a length is cut off at the limit."""
+        repository = DadJokeRepository(_client(handler), max_body_size=16)
+        handler.return_value = httpx.Response(
+            200, stream=_Chunks([b'{"joke": "', b"x" * 64, b'"}'])
+        )
+
+        assert await repository.fetch_random_joke() is None
+        handler.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_chunked_body_is_reassembled(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test that a joke split across chunks and characters is decoded."""
+        body = json.dumps({"id": "1", "joke": "Café"}, ensure_ascii=False).encode()
+        handler.return_value = httpx.Response(
+            200, stream=_Chunks([body[i : i + 3] for i in range(0, len(body), 3)])
+        )
+
+        assert await repository.fetch_random_joke() == DadJoke(id="1", joke="Café")
+
+    def test_base_url_can_be_overridden(
+        self, handler: Mock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that TATERS_API_URL or an explicit URL replaces the real API."""
+        monkeypatch.setenv("TATERS_API_URL", "http://127.0.0.1:8000")
+        client = _client(handler)
+
+        assert DadJokeRepository(client).base_url == "http://127.0.0.1:8000"
+        assert (
+            DadJokeRepository(client, base_url="http://other").base_url
+            == "http://other"
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_random_jokes_deduplicates_by_id(
         self, repository: DadJokeRepository
     ) -> None:
-        """Test handling when response JSON doesn't contain joke."""
-        mock_response = Mock()
-        mock_response.json.return_value = {"id": "123", "status": 200}
-        mock_response.raise_for_status.return_value = None
+        """Test that duplicate ids are dropped and re-fetched."""
+        jokes = [
+            DadJoke(id="1", joke="One"),
+            DadJoke(id="1", joke="One"),
+            None,
+            DadJoke(id="2", joke="Two"),
+        ]
+        with patch.object(repository, "fetch_random_joke", side_effect=jokes):
+            result = [
+                joke async for joke in repository.get_random_jokes(2, concurrency=1)
+            ]
 
-        mock_client = AsyncMock()
-        mock_client.get.return_value = mock_response
+        assert result == [DadJoke(id="1", joke="One"), DadJoke(id="2", joke="Two")]
 
-        with patch("httpx.AsyncClient") as mock_async_client:
-            mock_async_client.return_value.__aenter__.return_value = mock_client
+    @pytest.mark.asyncio
+    async def test_get_random_jokes_respects_concurrency_limit(
+        self, repository: DadJokeRepository
+    ) -> None:
+        """Test that no more than `concurrency` requests are in flight."""
+        in_flight = 0
+        peak = 0
+        counter = 0
 
-            result = await repository.get_random_joke()
+        async def fake_fetch() -> DadJoke:
+            nonlocal in_flight, peak, counter
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            counter += 1
+            return DadJoke(id=str(counter), joke=f"Joke {counter}")
 
-            assert result is None
+        with patch.object(repository, "fetch_random_joke", side_effect=fake_fetch):
+            result = [
+                joke async for joke in repository.get_random_jokes(20, concurrency=4)
+            ]
+
+        assert len(result) == 20
+        assert peak == 4
 
     @pytest.mark.asyncio
-    async def test_get_random_joke_unexpected_error(
+    async def test_get_random_jokes_stops_after_attempt_budget(
         self, repository: DadJokeRepository
     ) -> None:
-        """Test handling of unexpected errors."""
-        mock_client = AsyncMock()
-        mock_client.get.side_effect = Exception("Unexpected error")
+        """Test that a failing API does not cause endless retries."""
+        with patch.object(
+            repository, "fetch_random_joke", return_value=None
+        ) as mock_fetch:
+            result = [
+                joke async for joke in repository.get_random_jokes(2, concurrency=2)
+            ]
+
+        assert result == []
+        assert mock_fetch.call_count == 2 * MAX_ATTEMPTS_PER_JOKE
+
+    @pytest.mark.asyncio
+    async def test_get_random_jokes_with_zero_count(
+        self, repository: DadJokeRepository
+    ) -> None:
+        """Test that a zero count yields nothing."""
+        result = [joke async for joke in repository.get_random_jokes(0)]
+
+        assert result == []
+
+
+class TestDadJokeRepositoryRetries:
+    """Test cases for rate limiting and retries in DadJokeRepository."""
 
-        with patch("httpx.AsyncClient") as mock_async_client:
-            mock_async_client.return_value.__aenter__.return_value = mock_client
+    @pytest.fixture
+    def handler(self) -> Mock:
+        """Create a mock API answering each request."""
+        return Mock()
+
+    @pytest.fixture
+    def mock_limiter(self) -> AsyncMock:
+        """Create a mock shared rate limiter."""
+        limiter = AsyncMock(spec=TokenBucket)
+        limiter.pause = Mock()
+        return limiter
+
+    @pytest.fixture
+    def repository(self, handler: Mock, mock_limiter: AsyncMock) -> DadJokeRepository:
+        """Create a repository that retries up to three times."""
+        policy = RetryPolicy(max_attempts=3, deadline=30.0, jitter=lambda a, b: b)
+        return DadJokeRepository(
+            _client(handler), rate_limiter=mock_limiter, retry_policy=policy
+        )
+
+    @staticmethod
+    def _response(
+        status: int, headers: Optional[dict[str, str]] = None
+    ) -> httpx.Response:
+        """Build a response carrying a joke."""
+        return httpx.Response(
+            status, headers=headers, json={"id": "1", "joke": "Retried"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_connection_error_is_retried(
+        self,
+        repository: DadJokeRepository,
+        handler: Mock,
+        mock_limiter: AsyncMock,
+    ) -> None:
+        """Test that transport errors are retried after a backoff."""
+        handler.side_effect = [
+            httpx.ConnectError("refused"),
+            self._response(200),
+        ]
 
+        with patch("asyncio.sleep", new=AsyncMock()) as mock_sleep:
             result = await repository.get_random_joke()
 
-            assert result is None
+        assert result == "Retried"
+        mock_sleep.assert_awaited_once_with(0.25)
+        assert mock_limiter.acquire.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_429_honours_retry_after_and_pauses_limiter(
+        self,
+        repository: DadJokeRepository,
+        handler: Mock,
+        mock_limiter: AsyncMock,
+    ) -> None:
+        """Test that Retry-After delays the retry and throttles other callers."""
+        handler.side_effect = [
+            self._response(429, {"Retry-After": "2"}),
+            self._response(200),
+        ]
+
+        with patch("asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            result = await repository.get_random_joke()
+
+        assert result == "Retried"
+        mock_sleep.assert_awaited_once_with(2.0)
+        mock_limiter.pause.assert_called_once_with(2.0)
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test that a 404 fails immediately."""
+        handler.return_value = self._response(404)
+
+        assert await repository.get_random_joke() is None
+        handler.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_connection_lost_mid_body_is_retried(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test that a body cut off by the network is fetched again."""
+        handler.side_effect = [
+            httpx.Response(
+                200, stream=_Chunks([b'{"joke": "Re'], httpx.ReadError("reset"))
+            ),
+            self._response(200),
+        ]
+
+        with patch("asyncio.sleep", new=AsyncMock()):
+            assert await repository.get_random_joke() == "Retried"
+
+        assert handler.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test that retries stop at the attempt limit."""
+        handler.side_effect = lambda request: self._response(503)
+
+        with patch("asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            assert await repository.get_random_joke() is None
+
+        assert handler.call_count == 3
+        assert mock_sleep.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_when_retry_would_pass_deadline(self, handler: Mock) -> None:
+        """Test that a Retry-After beyond the deadline is not waited for."""
+        policy = RetryPolicy(max_attempts=5, deadline=1.0)
+        repository = DadJokeRepository(_client(handler), retry_policy=policy)
+        handler.return_value = self._response(429, {"Retry-After": "60"})
+
+        with patch("asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            assert await repository.get_random_joke() is None
+
+        mock_sleep.assert_not_called()
+        handler.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_deadline_caps_limiter_pause(
+        self, handler: Mock, mock_limiter: AsyncMock
+    ) -> None:
+        """Test that a long Retry-After pauses others only for the deadline."""
+        policy = RetryPolicy(max_attempts=5, deadline=5.0)
+        repository = DadJokeRepository(
+            _client(handler), rate_limiter=mock_limiter, retry_policy=policy
+        )
+        handler.return_value = self._response(429, {"Retry-After": "60"})
+
+        with patch("asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            assert await repository.get_random_joke() is None
+
+        mock_sleep.assert_not_called()
+        (pause,) = mock_limiter.pause.call_args.args
+        assert 0 < pause <= 5.0
+        assert mock_limiter.acquire.await_args.kwargs["timeout"] <= 5.0
+
+    @pytest.mark.asyncio
+    async def test_gives_up_when_limiter_wait_would_pass_deadline(
+        self, repository: DadJokeRepository, handler: Mock, mock_limiter: AsyncMock
+    ) -> None:
+        """Test that no request is sent once the rate limit outlasts the deadline."""
+        mock_limiter.acquire.return_value = False
+
+        assert await repository.get_random_joke() is None
+        handler.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_paused_limiter_does_not_outlast_deadline(
+        self, handler: Mock
+    ) -> None:
+        """Test that requests after a long Retry-After fail within the deadline."""
+        limiter = TokenBucket()
+        policy = RetryPolicy(max_attempts=5, deadline=0.2)
+        repository = DadJokeRepository(
+            _client(handler), rate_limiter=limiter, retry_policy=policy
+        )
+        handler.return_value = self._response(429, {"Retry-After": "60"})
+
+        started = time.monotonic()
+        results = [await repository.get_random_joke() for _ in range(3)]
+
+        assert results == [None, None, None]
+        assert time.monotonic() - started < 1.0
+
+
+class TestDadJokeRepositorySearch:
+    """Test cases for search harvesting and indexing in DadJokeRepository."""
+
+    @pytest.fixture
+    def handler(self) -> Mock:
+        """Create a mock API answering each request."""
+        return Mock()
+
+    @pytest.fixture
+    def mock_index(self) -> AsyncMock:
+        """Create a mock search index."""
+        return AsyncMock(spec=JokeSearchIndex)
+
+    @pytest.fixture
+    def repository(self, handler: Mock, mock_index: AsyncMock) -> DadJokeRepository:
+        """Create a repository that indexes what it fetches."""
+        return DadJokeRepository(_client(handler), search_index=mock_index)
+
+    @staticmethod
+    def _page(page: int, total_pages: int) -> httpx.Response:
+        """Build a search response with one joke on the given page."""
+        return httpx.Response(
+            200,
+            json={
+                "current_page": page,
+                "results": [{"id": f"p{page}", "joke": f"Pizza joke {page}"}],
+                "total_pages": total_pages,
+            },
+        )
+
+    @pytest.mark.asyncio
+    async def test_random_jokes_are_indexed(
+        self,
+        repository: DadJokeRepository,
+        handler: Mock,
+        mock_index: AsyncMock,
+    ) -> None:
+        """Test that every fetched joke is added to the search index."""
+        handler.return_value = httpx.Response(
+            200, json={"id": "abc", "joke": "Knock knock"}
+        )
+
+        await repository.fetch_random_joke()
+
+        mock_index.add_many.assert_awaited_once_with(
+            [DadJoke(id="abc", joke="Knock knock")]
+        )
+
+    @pytest.mark.asyncio
+    async def test_search_harvests_every_page(
+        self,
+        repository: DadJokeRepository,
+        handler: Mock,
+        mock_index: AsyncMock,
+    ) -> None:
+        """Test that all pages are fetched, yielded and indexed."""
+        handler.side_effect = lambda request: self._page(
+            int(request.url.params["page"]), 3
+        )
+
+        jokes = [joke async for joke in repository.search_jokes("pizza")]
+
+        assert sorted(joke.id for joke in jokes) == ["p1", "p2", "p3"]
+        first = _request(handler)
+        assert first.url.path == "/search"
+        assert dict(first.url.params) == {"term": "pizza", "page": "1", "limit": "30"}
+        assert mock_index.add_many.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_search_pages_are_fetched_concurrently(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test that no more than ``concurrency`` pages are in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def get(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return self._page(int(request.url.params["page"]), 10)
+
+        handler.side_effect = get
+
+        jokes = [joke async for joke in repository.search_jokes("x", concurrency=3)]
+
+        assert len(jokes) == 10
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_search_streams_jokes_before_page_ends(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test that a joke is yielded while the rest of its page is pending."""
+        more = asyncio.Event()
+
+        class Slow(httpx.AsyncByteStream):
+            async def __aiter__(self) -> AsyncIterator[bytes]:
+                yield b'{"results": [{"id": "1", "joke": "First"}, '
+                await more.wait()
+                yield b'{"id": "2", "joke": "Second"}], "total_pages": 1}'
+
+        handler.return_value = httpx.Response(200, stream=Slow())
+        jokes = repository.search_jokes("x")
+
+        assert await anext(jokes) == DadJoke(id="1", joke="First")
+        more.set()
+        assert [joke async for joke in jokes] == [DadJoke(id="2", joke="Second")]
+
+    @pytest.mark.asyncio
+    async def test_search_retry_does_not_repeat_jokes(self, handler: Mock) -> None:
+        """Test that jokes delivered before a dropped connection are skipped."""
+        policy = RetryPolicy(max_attempts=2, jitter=lambda a, b: 0)
+        repository = DadJokeRepository(_client(handler), retry_policy=policy)
+        body = json.dumps(
+            {
+                "results": [{"id": "1", "joke": "One"}, {"id": "2", "joke": "Two"}],
+                "total_pages": 1,
+            }
+        ).encode()
+        cut = body.index(b"}, ") + 3
+        handler.side_effect = [
+            httpx.Response(200, stream=_Chunks([body[:cut]], httpx.ReadError("reset"))),
+            httpx.Response(200, content=body),
+        ]
+
+        jokes = [joke async for joke in repository.search_jokes("x")]
+
+        assert [joke.id for joke in jokes] == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_search_malformed_page_yields_nothing(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test that a page without a results array counts as failed."""
+        handler.return_value = httpx.Response(200, json={"total_pages": 5})
+
+        assert [joke async for joke in repository.search_jokes("x")] == []
+        handler.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_search_failure_yields_nothing(
+        self, repository: DadJokeRepository, handler: Mock
+    ) -> None:
+        """Test that a failed first page ends the harvest quietly."""
+        handler.side_effect = httpx.ConnectError("offline")
+
+        assert [joke async for joke in repository.search_jokes("pizza")] == []
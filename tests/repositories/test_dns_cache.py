@@ -0,0 +1,158 @@
+"""Tests for the DNS resolution cache."""
+
+import asyncio
+import socket
+from pathlib import Path
+from typing import Any, Iterator
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from taters.repositories.dns_cache import DnsCache, init_dns_cache, is_ip_address
+from tests.conftest import FakeClock
+
+
+def _addrinfo(*addresses: str) -> list[Any]:
+    """Build a getaddrinfo answer with TCP addresses."""
+    return [
+        (socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, 443))
+        for address in addresses
+    ]
+
+
+class TestDnsCache:
+    """Test cases for DnsCache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path: Path, clock: FakeClock) -> Iterator[DnsCache]:
+        """Create a cache backed by a temporary database."""
+        cache = DnsCache(ttl_seconds=60, path=tmp_path / "jokes.sqlite3", clock=clock)
+        yield cache
+        cache.close()
+
+    @pytest.fixture
+    def getaddrinfo(self) -> Iterator[AsyncMock]:
+        """Stub out the system resolver on the running loop."""
+        lookup = AsyncMock(return_value=_addrinfo("192.0.2.1"))
+        with patch("asyncio.base_events.BaseEventLoop.getaddrinfo", new=lookup):
+            yield lookup
+
+    @pytest.mark.asyncio
+    async def test_resolution_is_reused_until_expiry(
+        self, cache: DnsCache, clock: FakeClock, getaddrinfo: AsyncMock
+    ) -> None:
+        """Test that repeated lookups within the TTL skip the resolver."""
+        assert await cache.resolve("example.com", 443) == ("192.0.2.1",)
+        assert await cache.resolve("example.com", 443) == ("192.0.2.1",)
+        assert getaddrinfo.await_count == 1
+
+        clock.now += 61
+        getaddrinfo.return_value = _addrinfo("192.0.2.2")
+
+        assert await cache.resolve("example.com", 443) == ("192.0.2.2",)
+        assert getaddrinfo.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_resolution_persists_across_runs(
+        self, tmp_path: Path, cache: DnsCache, clock: FakeClock, getaddrinfo: AsyncMock
+    ) -> None:
+        """Test that a later process reuses a stored, unexpired resolution."""
+        await cache.resolve("example.com", 443)
+
+        later = DnsCache(ttl_seconds=60, path=tmp_path / "jokes.sqlite3", clock=clock)
+        try:
+            assert await later.resolve("example.com", 443) == ("192.0.2.1",)
+        finally:
+            later.close()
+        assert getaddrinfo.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_are_shared(
+        self, cache: DnsCache, getaddrinfo: AsyncMock
+    ) -> None:
+        """Test that simultaneous lookups of one host resolve it once."""
+        results = await asyncio.gather(
+            *(cache.resolve("example.com", 443) for _ in range(10))
+        )
+
+        assert results == [("192.0.2.1",)] * 10
+        assert getaddrinfo.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_forget_drops_resolution(
+        self, cache: DnsCache, getaddrinfo: AsyncMock
+    ) -> None:
+        """Test that a forgotten host is resolved again."""
+        await cache.resolve("example.com", 443)
+        await cache.forget("example.com", 443)
+        await cache.resolve("example.com", 443)
+
+        assert getaddrinfo.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_every_address_is_kept(
+        self, tmp_path: Path, cache: DnsCache, clock: FakeClock, getaddrinfo: AsyncMock
+    ) -> None:
+        """Test that all distinct addresses are cached, in resolver order."""
+        getaddrinfo.return_value = _addrinfo("192.0.2.1", "2001:db8::1", "192.0.2.1")
+
+        assert await cache.resolve("example.com", 443) == ("192.0.2.1", "2001:db8::1")
+
+        later = DnsCache(ttl_seconds=60, path=tmp_path / "jokes.sqlite3", clock=clock)
+        try:
+            assert await later.resolve("example.com", 443) == (
+                "192.0.2.1",
+                "2001:db8::1",
+            )
+        finally:
+            later.close()
+
+    @pytest.mark.asyncio
+    async def test_discard_drops_one_address_then_the_resolution(
+        self, cache: DnsCache, getaddrinfo: AsyncMock
+    ) -> None:
+        """Test that discarded addresses stop being offered."""
+        getaddrinfo.return_value = _addrinfo("192.0.2.1", "192.0.2.2")
+        await cache.resolve("example.com", 443)
+
+        await cache.discard("example.com", 443, "192.0.2.1")
+        assert await cache.resolve("example.com", 443) == ("192.0.2.2",)
+        assert getaddrinfo.await_count == 1
+
+        await cache.discard("example.com", 443, "192.0.2.2")
+        assert await cache.resolve("example.com", 443) == ("192.0.2.1", "192.0.2.2")
+        assert getaddrinfo.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_no_addresses(self, cache: DnsCache, getaddrinfo: AsyncMock) -> None:
+        """Test that an empty answer is an error."""
+        getaddrinfo.return_value = []
+
+        with pytest.raises(OSError, match="No addresses"):
+            await cache.resolve("example.com", 443)
+
+
+class TestInitDnsCache:
+    """Test cases for init_dns_cache."""
+
+    def test_zero_ttl_disables_cache(self) -> None:
+        """Test that a TTL of 0 provides no cache."""
+        assert list(init_dns_cache(ttl_seconds=0)) == [None]
+
+    def test_provides_cache(self, tmp_path: Path) -> None:
+        """Test that the resource yields a cache with the configured TTL."""
+        resource = init_dns_cache(ttl_seconds=5, path=tmp_path / "jokes.sqlite3")
+        cache = next(resource)
+
+        assert isinstance(cache, DnsCache)
+        assert cache.ttl_seconds == 5
+        resource.close()
+
+
+@pytest.mark.parametrize(
+    "host, expected",
+    [("127.0.0.1", True), ("::1", True), ("icanhazdadjoke.com", False)],
+)
+def test_is_ip_address(host: str, expected: bool) -> None:
+    """Test that address literals are told apart from host names."""
+    assert is_ip_address(host) is expected
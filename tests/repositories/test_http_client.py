@@ -0,0 +1,147 @@
+"""Tests for the shared HTTP client helpers."""
+
+import pytest
+import httpx
+from unittest.mock import AsyncMock
+
+from taters.repositories.dns_cache import DnsCache
+from taters.repositories.http_client import (
+    ResolvingTransport,
+    create_http_client,
+    init_http_client,
+)
+
+
+class TestHttpClient:
+    """Test cases for the pooled HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_create_http_client_applies_settings(self) -> None:
+        """Test that timeout and pool limits are applied to the client."""
+        client = create_http_client(
+            timeout=2.5,
+            max_connections=3,
+            max_keepalive_connections=2,
+            keepalive_expiry=7.0,
+        )
+        try:
+            assert isinstance(client, httpx.AsyncClient)
+            assert client.timeout.connect == 2.5
+            assert client.timeout.read == 2.5
+        finally:
+            await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_init_http_client_closes_on_shutdown(self) -> None:
+        """Test that the resource initializer closes the client afterwards."""
+        resource = init_http_client()
+
+        client = await resource.__anext__()
+        assert not client.is_closed
+
+        with pytest.raises(StopAsyncIteration):
+            await resource.__anext__()
+        assert client.is_closed
+
+
+class TestResolvingTransport:
+    """Test cases for ResolvingTransport."""
+
+    @pytest.fixture
+    def resolver(self) -> AsyncMock:
+        """Create a resolver that always answers one address."""
+        resolver = AsyncMock(spec=DnsCache)
+        resolver.resolve.return_value = ("192.0.2.7",)
+        return resolver
+
+    @pytest.mark.asyncio
+    async def test_connects_to_cached_address(self, resolver: AsyncMock) -> None:
+        """Test that the host is swapped while Host and SNI keep the name."""
+        sent: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            return httpx.Response(200, text="ok")
+
+        transport = ResolvingTransport(httpx.MockTransport(handler), resolver)
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("https://example.com/joke?x=1")
+
+        assert response.text == "ok"
+        assert response.request.url == "https://example.com/joke?x=1"
+        assert sent[0].url == "https://192.0.2.7/joke?x=1"
+        assert sent[0].headers["Host"] == "example.com"
+        assert sent[0].extensions["sni_hostname"] == "example.com"
+        resolver.resolve.assert_awaited_once_with("example.com", 443)
+
+    @pytest.mark.asyncio
+    async def test_address_hosts_are_not_resolved(self, resolver: AsyncMock) -> None:
+        """Test that requests to IP literals pass straight through."""
+        transport = ResolvingTransport(
+            httpx.MockTransport(lambda request: httpx.Response(204)), resolver
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("http://127.0.0.1:8080/")
+
+        assert response.status_code == 204
+        resolver.resolve.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connect_error_forgets_address(self, resolver: AsyncMock) -> None:
+        """Test that a failed connection drops the cached address."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("refused", request=request)
+
+        transport = ResolvingTransport(httpx.MockTransport(handler), resolver)
+        async with httpx.AsyncClient(transport=transport) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("http://example.com/")
+
+        resolver.forget.assert_awaited_once_with("example.com", 80)
+
+    @pytest.mark.asyncio
+    async def test_refused_address_falls_back_to_the_next(
+        self, resolver: AsyncMock
+    ) -> None:
+        """Test that the next address is tried when the first one refuses."""
+        resolver.resolve.return_value = ("192.0.2.7", "2001:db8::7")
+        sent: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            if request.url.host == "192.0.2.7":
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, text="ok")
+
+        transport = ResolvingTransport(httpx.MockTransport(handler), resolver)
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("https://example.com/")
+
+        assert response.text == "ok"
+        assert [request.url.host for request in sent] == ["192.0.2.7", "2001:db8::7"]
+        assert sent[1].extensions["sni_hostname"] == "example.com"
+        resolver.discard.assert_awaited_once_with("example.com", 443, "192.0.2.7")
+        resolver.forget.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_resolution_failure_is_a_connect_error(
+        self, resolver: AsyncMock
+    ) -> None:
+        """Test that an unknown host fails like any other connection error."""
+        resolver.resolve.side_effect = OSError("Name or service not known")
+        transport = ResolvingTransport(
+            httpx.MockTransport(lambda request: httpx.Response(200)), resolver
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            with pytest.raises(httpx.ConnectError, match="not known"):
+                await client.get("http://nowhere.invalid/")
+
+    @pytest.mark.asyncio
+    async def test_client_with_resolver(self, resolver: AsyncMock) -> None:
+        """Test that create_http_client routes through the resolver."""
+        client = create_http_client(resolver=resolver)
+        try:
+            assert isinstance(client._transport, ResolvingTransport)
+        finally:
+            await client.aclose()
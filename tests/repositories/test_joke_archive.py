@@ -0,0 +1,103 @@
+"""Tests for the joke archive codecs."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from taters.repositories import joke_archive
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.joke_archive import (
+    BINARY,
+    BINARY_MAGIC,
+    NDJSON,
+    JokeArchiveError,
+    decode,
+    encode,
+    open_archive,
+    write_archive,
+)
+
+JOKES = [
+    DadJoke(id="a1", joke="Never trust an atom."),
+    DadJoke(id="b2", joke="Ünïcödé\nwith a newline 🥔"),
+]
+
+
+class TestJokeArchive:
+    """Test cases for the archive codecs."""
+
+    @pytest.mark.parametrize("format", [NDJSON, BINARY])
+    def test_round_trip(self, format: str) -> None:
+        """Test that decoding an encoded archive returns the same jokes."""
+        data = b"".join(encode(JOKES, format))
+
+        assert list(decode(data)) == JOKES
+
+    @pytest.mark.parametrize("format", [NDJSON, BINARY])
+    def test_round_trip_through_memory_map(self, tmp_path: Path, format: str) -> None:
+        """Test that files written with write_archive can be opened."""
+        path = tmp_path / "jokes.archive"
+        with path.open("wb") as stream:
+            assert write_archive(iter(JOKES), stream, format) == 2
+
+        with open_archive(path) as jokes:
+            assert list(jokes) == JOKES
+
+    def test_binary_archives_start_with_magic(self) -> None:
+        """Test that the binary format is self-identifying."""
+        data = b"".join(encode(JOKES, BINARY))
+
+        assert data.startswith(BINARY_MAGIC)
+
+    def test_ndjson_is_one_object_per_line(self) -> None:
+        """Test that NDJSON output keeps newlines inside jokes escaped."""
+        data = b"".join(encode(JOKES, NDJSON))
+
+        assert data.count(b"\n") == 2
+        assert data.splitlines()[0] == b'{"id": "a1", "joke": "Never trust an atom."}'
+
+    def test_encode_writes_in_chunks(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that large archives are produced incrementally."""
+        monkeypatch.setattr(joke_archive, "WRITE_CHUNK_SIZE", 64)
+        jokes = (DadJoke(id=str(n), joke="x" * 40) for n in range(10))
+
+        chunks = list(encode(jokes, NDJSON))
+
+        assert len(chunks) > 1
+        assert len(list(decode(b"".join(chunks)))) == 10
+
+    def test_empty_archive(self, tmp_path: Path) -> None:
+        """Test that an empty file holds no jokes."""
+        path = tmp_path / "empty"
+        path.touch()
+
+        with open_archive(path) as jokes:
+            assert list(jokes) == []
+
+    def test_ndjson_skips_blank_lines(self) -> None:
+        """Test that blank lines between records are ignored."""
+        data = b'\n{"id": "1", "joke": "One"}\n\n'
+
+        assert list(decode(data)) == [DadJoke(id="1", joke="One")]
+
+    def test_invalid_ndjson_reports_line(self) -> None:
+        """Test that malformed records name the offending line."""
+        data = b'{"id": "1", "joke": "One"}\n{"id": "2"}\n'
+
+        with pytest.raises(JokeArchiveError, match="line 2"):
+            list(decode(data))
+
+    def test_truncated_binary(self) -> None:
+        """Test that a cut-off binary archive is rejected."""
+        data = b"".join(encode(JOKES, BINARY))[:-3]
+
+        with pytest.raises(JokeArchiveError, match="Truncated"):
+            list(decode(data))
+
+    def test_write_archive_to_stream(self) -> None:
+        """Test that write_archive accepts any binary stream."""
+        stream = io.BytesIO()
+
+        assert write_archive([], stream, BINARY) == 0
+        assert stream.getvalue() == BINARY_MAGIC
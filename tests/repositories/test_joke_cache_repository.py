@@ -0,0 +1,139 @@
+"""Tests for the on-disk joke cache repository."""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.joke_cache_repository import (
+    JokeCacheRepository,
+    init_joke_cache,
+)
+from tests.conftest import FakeClock
+
+
+class TestJokeCacheRepository:
+    """Test cases for JokeCacheRepository."""
+
+    @pytest.fixture
+    def cache(self, tmp_path: Path, clock: FakeClock) -> Iterator[JokeCacheRepository]:
+        """Create a small cache backed by a temporary database."""
+        cache = JokeCacheRepository(
+            path=tmp_path / "jokes.sqlite3",
+            max_entries=2,
+            ttl_seconds=60,
+            clock=clock,
+        )
+        yield cache
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_get_random_from_empty_cache(
+        self, cache: JokeCacheRepository
+    ) -> None:
+        """Test that an empty cache returns None."""
+        assert await cache.get_random() is None
+
+    @pytest.mark.asyncio
+    async def test_put_then_get_random(self, cache: JokeCacheRepository) -> None:
+        """Test that a stored joke can be read back."""
+        joke = DadJoke(id="1", joke="Cached")
+
+        await cache.put(joke)
+
+        assert await cache.get_random() == joke
+
+    @pytest.mark.asyncio
+    async def test_expired_jokes_are_not_served(
+        self, cache: JokeCacheRepository, clock: FakeClock
+    ) -> None:
+        """Test that jokes older than the TTL are ignored."""
+        await cache.put(DadJoke(id="1", joke="Old"))
+        clock.now += 61
+
+        assert await cache.get_random() is None
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_joke_is_evicted(
+        self, cache: JokeCacheRepository, clock: FakeClock
+    ) -> None:
+        """Test LRU eviction once max_entries is exceeded."""
+        await cache.put(DadJoke(id="1", joke="One"))
+        clock.now += 1
+        await cache.put(DadJoke(id="2", joke="Two"))
+        clock.now += 1
+        await cache.get_random_many(2)  # touches both
+        clock.now += 1
+        await cache.put(DadJoke(id="2", joke="Two again"))
+        clock.now += 1
+        await cache.put(DadJoke(id="3", joke="Three"))
+
+        remaining = {joke.id for joke in await cache.get_random_many(10)}
+
+        assert remaining == {"2", "3"}
+
+    @pytest.mark.asyncio
+    async def test_get_random_many_is_distinct(
+        self, cache: JokeCacheRepository
+    ) -> None:
+        """Test that batch reads return distinct jokes up to the count."""
+        await cache.put_many([DadJoke(id="1", joke="One"), DadJoke(id="2", joke="Two")])
+
+        jokes = await cache.get_random_many(5)
+
+        assert sorted(joke.id for joke in jokes) == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_load_is_exempt_from_the_size_bound(
+        self, cache: JokeCacheRepository, clock: FakeClock
+    ) -> None:
+        """Test that imported jokes neither count nor get evicted, but expire."""
+        await cache.put(DadJoke(id="fetched", joke="Fetched"))
+        clock.now += 1
+
+        await cache.bulk_load(DadJoke(id=str(n), joke=f"Joke {n}") for n in range(5))
+        clock.now += 1
+        await cache.put_many([DadJoke(id="a", joke="A"), DadJoke(id="b", joke="B")])
+
+        ids = {joke.id for joke in await cache.get_random_many(10)}
+        assert ids == {"0", "1", "2", "3", "4", "a", "b"}
+
+        clock.now += 61
+        await cache.put(DadJoke(id="late", joke="Late"))
+        assert [joke.id for joke in await cache.get_random_many(10)] == ["late"]
+
+    @pytest.mark.asyncio
+    async def test_cache_is_a_joke_source(self, cache: JokeCacheRepository) -> None:
+        """Test that the cache can stand in for a repository."""
+        assert await cache.get_random_joke() is None
+
+        await cache.put(DadJoke(id="1", joke="Cached"))
+
+        assert await cache.get_random_joke() == "Cached"
+        assert await cache.fetch_random_joke() == DadJoke(id="1", joke="Cached")
+        assert [joke.id async for joke in cache.get_random_jokes(3)] == ["1"]
+
+    @pytest.mark.asyncio
+    async def test_cache_persists_across_instances(self, tmp_path: Path) -> None:
+        """Test that jokes survive closing and reopening the database."""
+        path = tmp_path / "jokes.sqlite3"
+        first = JokeCacheRepository(path=path)
+        await first.put(DadJoke(id="1", joke="Persistent"))
+        first.close()
+
+        second = JokeCacheRepository(path=path)
+        try:
+            assert await second.get_random() == DadJoke(id="1", joke="Persistent")
+        finally:
+            second.close()
+
+    @pytest.mark.asyncio
+    async def test_default_path_is_in_cache_dir(self, isolated_cache_dir: Path) -> None:
+        """Test that the database defaults to the XDG cache directory."""
+        resource = init_joke_cache()
+        cache = next(resource)
+        await cache.put(DadJoke(id="1", joke="Default"))
+        resource.close()
+
+        assert (isolated_cache_dir / "taters" / "jokes.sqlite3").exists()
@@ -0,0 +1,65 @@
+"""Tests for the prefetched joke pool repository."""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.joke_pool_repository import (
+    JokePoolRepository,
+    init_joke_pool_repository,
+)
+
+
+class TestJokePoolRepository:
+    """Test cases for JokePoolRepository."""
+
+    @pytest.fixture
+    def store(self, tmp_path: Path) -> Iterator[JokePoolRepository]:
+        """Create a pool store backed by a temporary database."""
+        store = JokePoolRepository(path=tmp_path / "jokes.sqlite3")
+        yield store
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_pop_from_empty_pool(self, store: JokePoolRepository) -> None:
+        """Test that popping an empty pool returns None."""
+        assert await store.pop() is None
+
+    @pytest.mark.asyncio
+    async def test_pop_is_first_in_first_out(self, store: JokePoolRepository) -> None:
+        """Test that jokes come out in the order they were queued."""
+        await store.push_many(
+            [DadJoke(id="1", joke="One"), DadJoke(id="2", joke="Two")]
+        )
+
+        assert await store.pop() == DadJoke(id="1", joke="One")
+        assert await store.pop() == DadJoke(id="2", joke="Two")
+        assert await store.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_push_many_skips_queued_ids(self, store: JokePoolRepository) -> None:
+        """Test that a joke already in the pool is not queued twice."""
+        added_first = await store.push_many([DadJoke(id="1", joke="One")])
+        added_second = await store.push_many(
+            [DadJoke(id="1", joke="One"), DadJoke(id="2", joke="Two")]
+        )
+
+        assert (added_first, added_second) == (1, 1)
+        assert await store.size() == 2
+
+    @pytest.mark.asyncio
+    async def test_pool_persists_across_instances(self, tmp_path: Path) -> None:
+        """Test that the pool survives between runs."""
+        path = tmp_path / "jokes.sqlite3"
+        resource = init_joke_pool_repository(path)
+        first = next(resource)
+        await first.push_many([DadJoke(id="1", joke="Saved")])
+        resource.close()
+
+        second = JokePoolRepository(path=path)
+        try:
+            assert await second.pop() == DadJoke(id="1", joke="Saved")
+        finally:
+            second.close()
@@ -0,0 +1,143 @@
+"""Tests for the joke search index repository."""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.joke_cache_repository import JokeCacheRepository
+from taters.repositories.joke_search_index import (
+    POSTINGS_BATCH_SIZE,
+    JokeSearchIndex,
+    init_joke_search_index,
+    tokenize,
+)
+
+PIZZA = DadJoke(id="1", joke="I'd tell you a pizza joke, but it's too cheesy.")
+PIZZAS = DadJoke(id="2", joke="Pizzas are round but come in square boxes.")
+ATOM = DadJoke(id="3", joke="Never trust an atom. They make up everything!")
+
+
+class TestTokenize:
+    """Test cases for tokenize."""
+
+    def test_case_folds_and_drops_punctuation(self) -> None:
+        """Test that tokens are lower case words without punctuation."""
+        assert tokenize("Never TRUST an atom!") == ["never", "trust", "an", "atom"]
+
+    def test_joins_contractions(self) -> None:
+        """Test that apostrophes do not split words."""
+        assert tokenize("Don’t won't") == ["dont", "wont"]
+
+    def test_deduplicates(self) -> None:
+        """Test that repeated words yield one token."""
+        assert tokenize("ha ha HA") == ["ha"]
+
+
+class TestJokeSearchIndex:
+    """Test cases for JokeSearchIndex."""
+
+    @pytest.fixture
+    def index(self, tmp_path: Path) -> Iterator[JokeSearchIndex]:
+        """Create an index backed by a temporary database."""
+        index = JokeSearchIndex(path=tmp_path / "jokes.sqlite3")
+        yield index
+        index.close()
+
+    @pytest.mark.asyncio
+    async def test_add_many_skips_known_jokes(self, index: JokeSearchIndex) -> None:
+        """Test that re-indexing a joke is a no-op."""
+        assert await index.add_many([PIZZA, ATOM]) == 2
+        assert await index.add_many([PIZZA, PIZZAS]) == 1
+        assert await index.add_many([]) == 0
+        assert await index.size() == 3
+
+    @pytest.mark.asyncio
+    async def test_search_matches_prefixes_case_insensitively(
+        self, index: JokeSearchIndex
+    ) -> None:
+        """Test that a query token matches words it starts."""
+        await index.add_many([PIZZA, PIZZAS, ATOM])
+
+        results = await index.search("PIZZA")
+
+        assert sorted(joke.id for joke in results) == ["1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_search_requires_every_token(self, index: JokeSearchIndex) -> None:
+        """Test that multi-word queries are intersections."""
+        await index.add_many([PIZZA, PIZZAS, ATOM])
+
+        assert await index.search("pizza cheesy") == [PIZZA]
+        assert await index.search("pizza atom") == []
+
+    @pytest.mark.asyncio
+    async def test_search_respects_limit(self, index: JokeSearchIndex) -> None:
+        """Test that at most ``limit`` jokes are returned."""
+        await index.add_many([PIZZA, PIZZAS])
+
+        assert len(await index.search("pizza", limit=1)) == 1
+
+    @pytest.mark.asyncio
+    async def test_search_without_tokens(self, index: JokeSearchIndex) -> None:
+        """Test that punctuation-only queries match nothing."""
+        await index.add_many([PIZZA])
+
+        assert await index.search("?!") == []
+
+    @pytest.mark.asyncio
+    async def test_bulk_load_consumes_a_generator(self, index: JokeSearchIndex) -> None:
+        """Test that bulk loads index streams larger than one postings batch."""
+        count = POSTINGS_BATCH_SIZE // 2
+        jokes = (DadJoke(id=str(n), joke=f"joke number {n} x") for n in range(count))
+
+        assert await index.bulk_load(jokes) == count
+        assert await index.bulk_load(iter([DadJoke(id="0", joke="dup")])) == 0
+        assert await index.search("number 42 x", limit=1) == [
+            DadJoke(id="42", joke="joke number 42 x")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_bulk_load_fills_a_cache_in_the_same_pass(
+        self, index: JokeSearchIndex, tmp_path: Path
+    ) -> None:
+        """Test that a cache in the same database is loaded alongside."""
+        cache = JokeCacheRepository(path=tmp_path / "jokes.sqlite3")
+        try:
+            assert await index.bulk_load(iter([PIZZA, ATOM]), cache=cache) == 2
+            assert await index.search("atom") == [ATOM]
+            assert len(await cache.get_random_many(5)) == 2
+        finally:
+            cache.close()
+
+    @pytest.mark.asyncio
+    async def test_bulk_load_rejects_a_cache_in_another_database(
+        self, index: JokeSearchIndex, tmp_path: Path
+    ) -> None:
+        """Test that a cache elsewhere cannot share the transaction."""
+        cache = JokeCacheRepository(path=tmp_path / "other.sqlite3")
+
+        with pytest.raises(ValueError, match="other.sqlite3"):
+            await index.bulk_load(iter([PIZZA]), cache=cache)
+        assert await index.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_dump_streams_jokes_in_indexing_order(
+        self, index: JokeSearchIndex
+    ) -> None:
+        """Test that dump hands every joke to the consumer, oldest first."""
+        await index.add_many([ATOM, PIZZA])
+        await index.add_many([PIZZAS])
+
+        assert await index.dump(list) == [ATOM, PIZZA, PIZZAS]
+
+    @pytest.mark.asyncio
+    async def test_index_survives_reopening(self, tmp_path: Path) -> None:
+        """Test that the index is persisted on disk."""
+        path = tmp_path / "jokes.sqlite3"
+        for index in init_joke_search_index(path):
+            await index.add_many([ATOM])
+
+        for index in init_joke_search_index(path):
+            assert await index.search("atom") == [ATOM]
@@ -0,0 +1,94 @@
+"""Tests for the incremental JSON object parser."""
+
+import json
+
+import pytest
+
+from taters.repositories.json_stream import JsonObjectStream, JsonStreamError
+
+PAGE = json.dumps(
+    {
+        "current_page": 1,
+        "results": [
+            {"id": "a", "joke": 'Café "quoted" [not] {json}'},
+            {"id": "b", "joke": None},
+            -1.5e3,
+            None,
+        ],
+        "total_pages": 12,
+        "next_page": None,
+    },
+    ensure_ascii=False,
+).encode()
+
+
+class TestJsonObjectStream:
+    """Test cases for JsonObjectStream."""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, len(PAGE)])
+    def test_any_chunking_gives_the_same_result(self, size: int) -> None:
+        """Test that chunks may split characters, tokens and items anywhere."""
+        parser = JsonObjectStream("results")
+        items = []
+        for start in range(0, len(PAGE), size):
+            items.extend(parser.feed(PAGE[start : start + size]))
+        parser.close()
+
+        assert items == json.loads(PAGE)["results"]
+        assert parser.fields == {
+            "current_page": 1,
+            "total_pages": 12,
+            "next_page": None,
+        }
+        assert parser.array_found
+        assert parser.done
+
+    def test_items_are_handed_out_as_they_complete(self) -> None:
+        """Test that an item is returned before the array is closed."""
+        parser = JsonObjectStream("results")
+
+        assert parser.feed(b'{"results": [{"id": 1}, {"id"') == [{"id": 1}]
+        assert parser.feed(b": 2}]}") == [{"id": 2}]
+
+    def test_number_split_across_chunks_is_not_read_short(self) -> None:
+        """Test that a number is only accepted once its delimiter arrives."""
+        parser = JsonObjectStream("results")
+
+        assert parser.feed(b'{"results": [12') == []
+        assert parser.feed(b".5]}") == [12.5]
+
+    def test_empty_object_and_array(self) -> None:
+        """Test that empty containers parse."""
+        parser = JsonObjectStream("results")
+
+        assert parser.feed(b' {"results": [ ]} ') == []
+        parser.close()
+        assert parser.array_found
+
+    def test_non_array_member_is_kept_as_a_field(self) -> None:
+        """Test that the streamed key holding another type is stored instead."""
+        parser = JsonObjectStream("results")
+        parser.feed(b'{"results": null}')
+        parser.close()
+
+        assert parser.fields == {"results": None}
+        assert not parser.array_found
+
+    @pytest.mark.parametrize(
+        "document", [b"[1, 2]", b'{"a" 1}', b'{"a": 1 "b": 2}', b'{"results": [1 2]}']
+    )
+    def test_malformed_documents_raise(self, document: bytes) -> None:
+        """Test that structural errors are reported as soon as they are seen."""
+        with pytest.raises(JsonStreamError):
+            JsonObjectStream("results").feed(document)
+
+    @pytest.mark.parametrize(
+        "document", [b'{"results": [1, 2', b'{"a": tru', b'{"a": 1} x']
+    )
+    def test_truncated_or_trailing_input_fails_on_close(self, document: bytes) -> None:
+        """Test that incomplete documents are caught by close."""
+        parser = JsonObjectStream("results")
+
+        with pytest.raises(JsonStreamError):
+            parser.feed(document)
+            parser.close()
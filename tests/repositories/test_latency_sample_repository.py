@@ -0,0 +1,45 @@
+"""Tests for the latency sample store."""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from taters.repositories.latency_sample_repository import LatencySampleRepository
+
+
+class TestLatencySampleRepository:
+    """Test cases for LatencySampleRepository."""
+
+    @pytest.fixture
+    def store(self, tmp_path: Path) -> Iterator[LatencySampleRepository]:
+        """Create a store backed by a temporary database."""
+        store = LatencySampleRepository(path=tmp_path / "jokes.sqlite3")
+        yield store
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_load_empty_store(self, store: LatencySampleRepository) -> None:
+        """Test that nothing is loaded before anything is saved."""
+        assert await store.load(10) == []
+
+    @pytest.mark.asyncio
+    async def test_save_keeps_the_newest_window(
+        self, store: LatencySampleRepository
+    ) -> None:
+        """Test that saves append in order and trim the oldest samples."""
+        await store.save([0.1, 0.2], keep=3)
+        await store.save([0.3, 0.4], keep=3)
+
+        assert await store.load(10) == [0.2, 0.3, 0.4]
+        assert await store.load(2) == [0.3, 0.4]
+
+    @pytest.mark.asyncio
+    async def test_saving_nothing_keeps_samples(
+        self, store: LatencySampleRepository
+    ) -> None:
+        """Test that an empty save leaves the stored window alone."""
+        await store.save([0.1], keep=3)
+        await store.save([], keep=1)
+
+        assert await store.load(10) == [0.1]
@@ -0,0 +1,100 @@
+"""Tests for the token-bucket rate limiter."""
+
+import pytest
+
+from taters.repositories.rate_limiter import TokenBucket
+
+
+class FakeTime:
+    """Clock and sleep that advance together without real waiting."""
+
+    def __init__(self) -> None:
+        """Start at time zero with no recorded sleeps."""
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def clock(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        """Advance the fake time instead of sleeping."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    @pytest.fixture
+    def fake_time(self) -> FakeTime:
+        """Create a fake time source."""
+        return FakeTime()
+
+    @pytest.fixture
+    def bucket(self, fake_time: FakeTime) -> TokenBucket:
+        """Create a bucket allowing 2 requests/second with bursts of 2."""
+        return TokenBucket(
+            rate=2.0, burst=2.0, clock=fake_time.clock, sleep=fake_time.sleep
+        )
+
+    @pytest.mark.asyncio
+    async def test_burst_is_served_immediately(
+        self, bucket: TokenBucket, fake_time: FakeTime
+    ) -> None:
+        """Test that a full bucket allows a burst without waiting."""
+        await bucket.acquire()
+        await bucket.acquire()
+
+        assert fake_time.sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_waits_for_next_token_when_empty(
+        self, bucket: TokenBucket, fake_time: FakeTime
+    ) -> None:
+        """Test that an empty bucket waits exactly one token interval."""
+        for _ in range(3):
+            await bucket.acquire()
+
+        assert fake_time.sleeps == [pytest.approx(0.5)]
+
+    @pytest.mark.asyncio
+    async def test_sustained_rate_matches_configuration(
+        self, bucket: TokenBucket, fake_time: FakeTime
+    ) -> None:
+        """Test that ten requests after the burst take rate-bound time."""
+        for _ in range(12):
+            await bucket.acquire()
+
+        assert fake_time.now == pytest.approx(5.0)
+
+    @pytest.mark.asyncio
+    async def test_pause_holds_every_caller(
+        self, bucket: TokenBucket, fake_time: FakeTime
+    ) -> None:
+        """Test that a Retry-After pause delays the next acquire."""
+        bucket.pause(3.0)
+
+        await bucket.acquire()
+
+        assert fake_time.now >= 3.0
+
+    @pytest.mark.asyncio
+    async def test_acquire_gives_up_past_timeout(
+        self, bucket: TokenBucket, fake_time: FakeTime
+    ) -> None:
+        """Test that a pause longer than the timeout is not waited out."""
+        bucket.pause(60.0)
+
+        assert await bucket.acquire(timeout=5.0) is False
+        assert fake_time.sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_within_timeout(
+        self, bucket: TokenBucket, fake_time: FakeTime
+    ) -> None:
+        """Test that a wait shorter than the timeout still succeeds."""
+        bucket.pause(3.0)
+
+        assert await bucket.acquire(timeout=5.0) is True
+        assert fake_time.now == pytest.approx(3.0)
@@ -0,0 +1,53 @@
+"""Tests for the retry policy helpers."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from taters.repositories.retry_policy import RetryPolicy, parse_retry_after
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy and Retry-After parsing."""
+
+    def test_backoff_grows_exponentially_up_to_cap(self) -> None:
+        """Test the upper bound of the jittered delay."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=lambda a, b: b)
+
+        assert [policy.backoff(attempt) for attempt in range(4)] == [1, 2, 4, 5]
+
+    def test_backoff_is_jittered_from_zero(self) -> None:
+        """Test that full jitter draws between zero and the cap."""
+        bounds: list[tuple[float, float]] = []
+
+        def record(low: float, high: float) -> float:
+            bounds.append((low, high))
+            return low
+
+        policy = RetryPolicy(base_delay=0.5, jitter=record)
+
+        assert policy.backoff(1) == 0
+        assert bounds == [(0, 1.0)]
+
+    @pytest.mark.parametrize("value", [None, "", "soon"])
+    def test_parse_retry_after_invalid(self, value: str) -> None:
+        """Test that missing or invalid headers are ignored."""
+        assert parse_retry_after(value) is None
+
+    def test_parse_retry_after_seconds(self) -> None:
+        """Test the delay-seconds form."""
+        assert parse_retry_after(" 7 ") == 7.0
+
+    def test_parse_retry_after_http_date(self) -> None:
+        """Test the HTTP-date form."""
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+        result = parse_retry_after(format_datetime(retry_at, usegmt=True))
+
+        assert result is not None
+        assert 25 <= result <= 30
+
+    def test_parse_retry_after_past_date(self) -> None:
+        """Test that dates in the past mean no wait."""
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
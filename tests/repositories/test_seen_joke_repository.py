@@ -0,0 +1,77 @@
+"""Tests for the seen-joke filter store."""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from taters.repositories.bloom_filter import ScalableBloomFilter
+from taters.repositories.seen_joke_repository import (
+    SeenJokeRepository,
+    init_seen_jokes,
+)
+
+
+class TestSeenJokeRepository:
+    """Test cases for SeenJokeRepository."""
+
+    @pytest.fixture
+    def store(self, tmp_path: Path) -> Iterator[SeenJokeRepository]:
+        """Create a store backed by a temporary database."""
+        store = SeenJokeRepository(path=tmp_path / "jokes.sqlite3")
+        yield store
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_load_empty_store(self, store: SeenJokeRepository) -> None:
+        """Test that an empty store gives an empty filter with the given sizing."""
+        seen = await store.load(initial_capacity=50, error_rate=0.02)
+
+        assert len(seen) == 0
+        assert (seen.initial_capacity, seen.error_rate) == (50, 0.02)
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, store: SeenJokeRepository) -> None:
+        """Test that saved ids are found after loading again."""
+        seen = ScalableBloomFilter(initial_capacity=4)
+        for i in range(10):
+            seen.add(str(i))
+
+        await store.save(seen)
+        loaded = await store.load()
+
+        assert all(str(i) in loaded for i in range(10))
+        assert len(loaded) == 10
+        assert not any(piece.dirty for piece in seen.slices)
+
+    @pytest.mark.asyncio
+    async def test_save_merges_concurrent_writers(
+        self, store: SeenJokeRepository
+    ) -> None:
+        """Test that two filters saving the same slice keep both sets of ids."""
+        first = await store.load()
+        second = await store.load()
+        first.add("a")
+        second.add("b")
+
+        await store.save(first)
+        await store.save(second)
+        loaded = await store.load()
+
+        assert "a" in loaded and "b" in loaded
+
+    @pytest.mark.asyncio
+    async def test_resource_saves_on_shutdown(self, tmp_path: Path) -> None:
+        """Test that the container resource persists the filter between runs."""
+        path = tmp_path / "jokes.sqlite3"
+        resource = init_seen_jokes(path)
+        seen = await anext(resource)
+        seen.add("shown")
+        with pytest.raises(StopAsyncIteration):
+            await anext(resource)
+
+        store = SeenJokeRepository(path=path)
+        try:
+            assert "shown" in await store.load()
+        finally:
+            store.close()
@@ -0,0 +1,45 @@
+"""Tests for persisted data locations."""
+
+from pathlib import Path
+
+import pytest
+
+from taters.repositories.storage import cache_dir, config_dir
+
+
+class TestStorage:
+    """Test cases for storage paths."""
+
+    def test_cache_dir_uses_xdg_cache_home(self, isolated_cache_dir: Path) -> None:
+        """Test that XDG_CACHE_HOME is honoured and the directory is created."""
+        path = cache_dir()
+
+        assert path == isolated_cache_dir / "taters"
+        assert path.is_dir()
+
+    def test_cache_dir_defaults_to_home(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the ~/.cache fallback when XDG_CACHE_HOME is unset."""
+        monkeypatch.delenv("XDG_CACHE_HOME")
+        monkeypatch.setenv("HOME", str(tmp_path))
+
+        assert cache_dir() == tmp_path / ".cache" / "taters"
+
+    def test_config_dir_uses_xdg_config_home(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that XDG_CONFIG_HOME is honoured without creating anything."""
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+
+        assert config_dir() == tmp_path / "config" / "taters"
+        assert not (tmp_path / "config").exists()
+
+    def test_config_dir_defaults_to_home(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test the ~/.config fallback when XDG_CONFIG_HOME is unset."""
+        monkeypatch.delenv("XDG_CONFIG_HOME")
+        monkeypatch.setenv("HOME", str(tmp_path))
+
+        assert config_dir() == tmp_path / ".config" / "taters"
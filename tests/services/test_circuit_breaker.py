@@ -0,0 +1,212 @@
+"""Tests for the circuit breaker service."""
+
+import asyncio
+from pathlib import Path
+from typing import Iterator, Optional
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from taters.repositories.circuit_state_repository import (
+    CircuitState,
+    CircuitStateRepository,
+)
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerJokeSource,
+)
+from tests.conftest import FakeClock, async_iter
+
+JOKE = DadJoke(id="1", joke="Fresh")
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    @pytest.fixture
+    def store(self, tmp_path: Path) -> Iterator[CircuitStateRepository]:
+        """Create a state store backed by a temporary database."""
+        store = CircuitStateRepository(path=tmp_path / "jokes.sqlite3")
+        yield store
+        store.close()
+
+    @pytest.fixture
+    def breaker(
+        self, store: CircuitStateRepository, clock: FakeClock
+    ) -> CircuitBreaker:
+        """Create a breaker opening after two failures for ten seconds."""
+        return CircuitBreaker(
+            store, failure_threshold=2, reset_timeout=10.0, clock=clock
+        )
+
+    @pytest.mark.asyncio
+    async def test_closed_circuit_passes_calls_through(
+        self, breaker: CircuitBreaker
+    ) -> None:
+        """Test that calls go upstream while closed."""
+        operation = AsyncMock(return_value=JOKE)
+
+        assert await breaker.call(operation) == JOKE
+        assert await breaker.state() == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_opens_after_threshold_and_fails_fast(
+        self, breaker: CircuitBreaker
+    ) -> None:
+        """Test that consecutive failures open the circuit."""
+        failing = AsyncMock(return_value=None)
+        await breaker.call(failing)
+        await breaker.call(failing)
+
+        assert await breaker.state() == OPEN
+        assert await breaker.call(failing) is None
+        assert failing.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_success_resets_failure_count(self, breaker: CircuitBreaker) -> None:
+        """Test that only consecutive failures count."""
+        await breaker.call(AsyncMock(return_value=None))
+        await breaker.call(AsyncMock(return_value=JOKE))
+        await breaker.call(AsyncMock(return_value=None))
+
+        assert await breaker.state() == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_probes_in_background_after_cool_down(
+        self, breaker: CircuitBreaker, clock: FakeClock
+    ) -> None:
+        """Test that a cooled-down circuit probes without blocking the caller."""
+        await breaker.record(False)
+        await breaker.record(False)
+        clock.now += 10
+        release = asyncio.Event()
+
+        async def slow_probe() -> Optional[DadJoke]:
+            await release.wait()
+            return JOKE
+
+        assert await breaker.call(slow_probe) is None
+        assert await breaker.state() == HALF_OPEN
+        assert await breaker.call(slow_probe) is None
+
+        release.set()
+        await breaker.aclose()
+
+        assert await breaker.state() == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens(
+        self, breaker: CircuitBreaker, clock: FakeClock
+    ) -> None:
+        """Test that a failed probe restarts the cool-down."""
+        await breaker.record(False)
+        await breaker.record(False)
+        clock.now += 10
+
+        await breaker.call(AsyncMock(side_effect=RuntimeError("down")))
+        await breaker.aclose()
+
+        assert await breaker.state() == OPEN
+        assert await breaker.call(AsyncMock()) is None
+
+    @pytest.mark.asyncio
+    async def test_state_persists_across_runs(
+        self, store: CircuitStateRepository, clock: FakeClock
+    ) -> None:
+        """Test that a new breaker resumes an open circuit."""
+        await store.save("icanhazdadjoke", CircuitState(OPEN, 2, clock.now))
+        breaker = CircuitBreaker(store, reset_timeout=10.0, clock=clock)
+        operation = AsyncMock()
+
+        assert await breaker.call(operation) is None
+        operation.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_open_transition_is_saved(
+        self, breaker: CircuitBreaker, store: CircuitStateRepository, clock: FakeClock
+    ) -> None:
+        """Test that opening the circuit is persisted."""
+        await breaker.record(False)
+        await breaker.record(False)
+
+        assert await store.load("icanhazdadjoke") == CircuitState(OPEN, 2, clock.now)
+
+
+class TestCircuitBreakerJokeSource:
+    """Test cases for CircuitBreakerJokeSource."""
+
+    @pytest.fixture
+    def source(self) -> AsyncMock:
+        """Create a mock upstream joke source."""
+        return AsyncMock()
+
+    @pytest.fixture
+    def breaker(self) -> AsyncMock:
+        """Create a mock circuit breaker."""
+        return AsyncMock(spec=CircuitBreaker)
+
+    @pytest.fixture
+    def guarded(
+        self, source: AsyncMock, breaker: AsyncMock
+    ) -> CircuitBreakerJokeSource:
+        """Create the guarded source under test."""
+        return CircuitBreakerJokeSource(source, breaker)
+
+    @pytest.mark.asyncio
+    async def test_single_fetch_goes_through_breaker(
+        self,
+        guarded: CircuitBreakerJokeSource,
+        source: AsyncMock,
+        breaker: AsyncMock,
+    ) -> None:
+        """Test that single fetches are wrapped by the breaker."""
+        breaker.call.return_value = JOKE
+
+        assert await guarded.get_random_joke() == "Fresh"
+        breaker.call.assert_awaited_once_with(source.fetch_random_joke)
+
+    @pytest.mark.asyncio
+    async def test_batch_is_skipped_while_open(
+        self,
+        guarded: CircuitBreakerJokeSource,
+        source: AsyncMock,
+        breaker: AsyncMock,
+    ) -> None:
+        """Test that an open circuit yields nothing without calling upstream."""
+        breaker.allow_request.return_value = False
+        source.get_random_jokes = MagicMock()
+
+        assert [joke async for joke in guarded.get_random_jokes(3)] == []
+        source.get_random_jokes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_counts_as_failure(
+        self,
+        guarded: CircuitBreakerJokeSource,
+        source: AsyncMock,
+        breaker: AsyncMock,
+    ) -> None:
+        """Test that a batch with no jokes is recorded as a failure."""
+        breaker.allow_request.return_value = True
+        source.get_random_jokes = MagicMock(return_value=async_iter([]))
+
+        assert [joke async for joke in guarded.get_random_jokes(3)] == []
+        breaker.record.assert_awaited_once_with(False)
+
+    @pytest.mark.asyncio
+    async def test_batch_success_is_recorded(
+        self,
+        guarded: CircuitBreakerJokeSource,
+        source: AsyncMock,
+        breaker: AsyncMock,
+    ) -> None:
+        """Test that a batch with jokes is recorded as a success."""
+        breaker.allow_request.return_value = True
+        source.get_random_jokes = MagicMock(return_value=async_iter([JOKE]))
+
+        assert [joke async for joke in guarded.get_random_jokes(1)] == [JOKE]
+        breaker.record.assert_awaited_once_with(True)
@@ -1,10 +1,17 @@
 """Tests for the dad joke service."""
 
+import asyncio
+from typing import Optional
+
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 from taters.services.dad_joke_service import DadJokeService
-from taters.repositories.dad_joke_repository import DadJokeRepository
+from taters.repositories.bloom_filter import ScalableBloomFilter
+from taters.repositories.dad_joke_repository import DadJoke, DadJokeRepository
+from taters.services.joke_prefetch_pool import JokePrefetchPool
+from taters.services.single_flight import SingleFlight
+from tests.conftest import async_iter
 
 
 class TestDadJokeService:
@@ -26,19 +33,21 @@ class TestDadJokeService:
     ) -> None:
         """Test successful joke retrieval."""
         expected_joke = "Why don't eggs tell jokes? They'd crack each other up!"
-        mock_repository.get_random_joke.return_value = expected_joke
+        mock_repository.fetch_random_joke.return_value = DadJoke(
+            id="1", joke=expected_joke
+        )
 
         result = await service.get_joke()
 
         assert result == expected_joke
-        mock_repository.get_random_joke.assert_called_once()
+        mock_repository.fetch_random_joke.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_get_joke_api_failure_returns_fallback(
         self, service: DadJokeService, mock_repository: DadJokeRepository
     ) -> None:
         """Test fallback joke when API fails."""
-        mock_repository.get_random_joke.return_value = None
+        mock_repository.fetch_random_joke.return_value = None
 
         result = await service.get_joke()
 
@@ -46,7 +55,105 @@ class TestDadJokeService:
             result
             == "Why don't scientists trust atoms? Because they make up everything!"
         )
-        mock_repository.get_random_joke.assert_called_once()
+        mock_repository.fetch_random_joke.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_joke_serves_from_prefetch_pool(
+        self, mock_repository: DadJokeRepository
+    ) -> None:
+        """Test that a pooled joke is returned without calling the repository."""
+        mock_pool = AsyncMock(spec=JokePrefetchPool)
+        mock_pool.take.return_value = DadJoke(id="1", joke="Prefetched")
+        service = DadJokeService(mock_repository, prefetch_pool=mock_pool)
+
+        result = await service.get_joke()
+
+        assert result == "Prefetched"
+        mock_repository.fetch_random_joke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_joke_empty_pool_uses_repository(
+        self, mock_repository: DadJokeRepository
+    ) -> None:
+        """Test that an empty pool falls through to the repository."""
+        mock_pool = AsyncMock(spec=JokePrefetchPool)
+        mock_pool.take.return_value = None
+        mock_repository.fetch_random_joke.return_value = DadJoke(id="1", joke="Live")
+        service = DadJokeService(mock_repository, prefetch_pool=mock_pool)
+
+        result = await service.get_joke()
+
+        assert result == "Live"
+
+    @pytest.mark.asyncio
+    async def test_get_joke_coalesces_concurrent_callers(
+        self, mock_repository: DadJokeRepository
+    ) -> None:
+        """Test that concurrent callers share one repository request."""
+
+        async def slow_joke() -> DadJoke:
+            await asyncio.sleep(0.01)
+            return DadJoke(id="1", joke="Shared joke")
+
+        mock_repository.fetch_random_joke.side_effect = slow_joke
+        single_flight: SingleFlight[Optional[str]] = SingleFlight()
+        service = DadJokeService(mock_repository, single_flight=single_flight)
+
+        results = await asyncio.gather(*(service.get_joke() for _ in range(3)))
+
+        assert results == ["Shared joke"] * 3
+        mock_repository.fetch_random_joke.assert_called_once()
+        assert single_flight.stats.coalesced == 2
+
+    @pytest.mark.asyncio
+    async def test_get_joke_refetches_seen_jokes(
+        self, mock_repository: DadJokeRepository
+    ) -> None:
+        """Test that a joke already shown is replaced by an unseen one."""
+        seen = ScalableBloomFilter()
+        seen.add("1")
+        mock_repository.fetch_random_joke.side_effect = [
+            DadJoke(id="1", joke="Old"),
+            DadJoke(id="2", joke="New"),
+        ]
+        service = DadJokeService(mock_repository, seen=seen)
+
+        result = await service.get_joke()
+
+        assert result == "New"
+        assert "2" in seen
+
+    @pytest.mark.asyncio
+    async def test_get_joke_repeats_after_max_refetches(
+        self, mock_repository: DadJokeRepository
+    ) -> None:
+        """Test that a seen joke is shown once the refetch budget runs out."""
+        seen = ScalableBloomFilter()
+        seen.add("1")
+        mock_repository.fetch_random_joke.return_value = DadJoke(id="1", joke="Old")
+        service = DadJokeService(mock_repository, seen=seen, max_refetches=2)
+
+        result = await service.get_joke()
+
+        assert result == "Old"
+        assert mock_repository.fetch_random_joke.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_get_joke_skips_seen_pooled_jokes(
+        self, mock_repository: DadJokeRepository
+    ) -> None:
+        """Test that pooled jokes already shown are discarded."""
+        seen = ScalableBloomFilter()
+        seen.add("1")
+        mock_pool = AsyncMock(spec=JokePrefetchPool)
+        mock_pool.take.side_effect = [
+            DadJoke(id="1", joke="Old"),
+            DadJoke(id="2", joke="Pooled"),
+        ]
+        service = DadJokeService(mock_repository, prefetch_pool=mock_pool, seen=seen)
+
+        assert await service.get_joke() == "Pooled"
+        mock_repository.fetch_random_joke.assert_not_called()
 
     def test_fallback_joke(self, service: DadJokeService) -> None:
         """Test the fallback joke method directly."""
@@ -58,3 +165,49 @@ class TestDadJokeService:
         )
         assert isinstance(result, str)
         assert len(result) > 0
+
+    @pytest.mark.asyncio
+    async def test_get_jokes_streams_joke_text(
+        self, service: DadJokeService, mock_repository: DadJokeRepository
+    ) -> None:
+        """Test that batch jokes are streamed as plain text."""
+        mock_repository.get_random_jokes = MagicMock(
+            return_value=async_iter(
+                [DadJoke(id="1", joke="One"), DadJoke(id="2", joke="Two")]
+            )
+        )
+
+        result = [joke async for joke in service.get_jokes(2, concurrency=5)]
+
+        assert result == ["One", "Two"]
+        mock_repository.get_random_jokes.assert_called_once_with(2, 5)
+
+    @pytest.mark.asyncio
+    async def test_get_jokes_records_seen_jokes(
+        self, mock_repository: DadJokeRepository
+    ) -> None:
+        """Test that batch jokes are remembered but not filtered."""
+        seen = ScalableBloomFilter()
+        seen.add("1")
+        mock_repository.get_random_jokes = MagicMock(
+            return_value=async_iter(
+                [DadJoke(id="1", joke="One"), DadJoke(id="2", joke="Two")]
+            )
+        )
+        service = DadJokeService(mock_repository, seen=seen)
+
+        result = [joke async for joke in service.get_jokes(2)]
+
+        assert result == ["One", "Two"]
+        assert "2" in seen
+
+    @pytest.mark.asyncio
+    async def test_get_jokes_falls_back_when_nothing_returned(
+        self, service: DadJokeService, mock_repository: DadJokeRepository
+    ) -> None:
+        """Test that an empty batch yields the fallback joke once."""
+        mock_repository.get_random_jokes = MagicMock(return_value=async_iter([]))
+
+        result = [joke async for joke in service.get_jokes(3)]
+
+        assert result == [service._get_fallback_joke()]
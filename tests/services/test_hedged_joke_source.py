@@ -0,0 +1,265 @@
+"""Tests for the hedged joke source."""
+
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+import pytest
+
+from taters.repositories.bloom_filter import ScalableBloomFilter
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.services.dad_joke_service import DadJokeService
+from taters.services.hedged_joke_source import (
+    DEFAULT_HEDGE_DELAY,
+    MIN_HEDGE_DELAY,
+    HedgedJokeSource,
+    LatencyTracker,
+    init_latency_tracker,
+)
+
+API_JOKE = DadJoke(id="api", joke="From the API")
+CACHED_JOKE = DadJoke(id="cache", joke="From the cache")
+
+
+class FakeSource:
+    """Joke source answering after a delay, or never."""
+
+    def __init__(self, joke: Optional[DadJoke], delay: Optional[float] = 0.0) -> None:
+        """
+        Create a fake source.
+
+        Args:
+            joke: What the source answers.
+            delay: Seconds before answering; None to hang until cancelled.
+        """
+        self.joke = joke
+        self.delay = delay
+        self.calls = 0
+        self.cancelled = False
+
+    async def get_random_joke(self) -> Optional[str]:
+        """Return the text of the configured joke."""
+        joke = await self.fetch_random_joke()
+        return joke.joke if joke is not None else None
+
+    async def fetch_random_joke(self) -> Optional[DadJoke]:
+        """Return the configured joke after the configured delay."""
+        self.calls += 1
+        try:
+            if self.delay is None:
+                await asyncio.Event().wait()
+            await asyncio.sleep(self.delay or 0)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.joke
+
+    async def get_random_jokes(
+        self, count: int, concurrency: int = 1
+    ) -> AsyncIterator[DadJoke]:
+        """Yield the configured joke once."""
+        if self.joke is not None:
+            yield self.joke
+
+
+class TestLatencyTracker:
+    """Test cases for LatencyTracker."""
+
+    def test_default_delay_until_warmed_up(self) -> None:
+        """Test that too few samples fall back to the default delay."""
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record(0.1)
+
+        assert tracker.percentile(95) is None
+        assert tracker.hedge_delay() == DEFAULT_HEDGE_DELAY
+
+    def test_hedge_delay_is_p95(self) -> None:
+        """Test that the delay follows the nearest-rank 95th percentile."""
+        tracker = LatencyTracker(min_samples=1)
+        for n in range(1, 101):
+            tracker.record(n / 100)
+
+        assert tracker.hedge_delay() == 0.95
+
+    def test_window_forgets_old_samples(self) -> None:
+        """Test that only the most recent samples count."""
+        tracker = LatencyTracker(window=2, min_samples=1)
+        for seconds in (5.0, 0.2, 0.3):
+            tracker.record(seconds)
+
+        assert tracker.percentile(100) == 0.3
+
+    def test_starts_from_earlier_samples(self) -> None:
+        """Test that loaded samples count but are not saved again."""
+        tracker = LatencyTracker(window=2, min_samples=2, samples=[9.0, 0.2, 0.4])
+        tracker.record(0.3)
+
+        assert tracker.percentile(100) == 0.4
+        assert tracker.take_unsaved() == [0.3]
+        assert tracker.take_unsaved() == []
+
+    def test_hedge_delay_has_a_floor(self) -> None:
+        """Test that a very fast primary does not hedge every request."""
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record(0.0)
+
+        assert tracker.hedge_delay() == MIN_HEDGE_DELAY
+
+
+class TestInitLatencyTracker:
+    """Test cases for init_latency_tracker."""
+
+    @pytest.mark.asyncio
+    async def test_samples_are_saved_and_reloaded(self, tmp_path: Path) -> None:
+        """Test that the next tracker starts from the window saved on shutdown."""
+        path = tmp_path / "jokes.sqlite3"
+        resource = init_latency_tracker(path=path, window=3, min_samples=1)
+        tracker = await anext(resource)
+        for seconds in (0.1, 0.2, 0.3, 0.4):
+            tracker.record(seconds)
+        with pytest.raises(StopAsyncIteration):
+            await anext(resource)
+
+        resource = init_latency_tracker(path=path, window=3, min_samples=1)
+        tracker = await anext(resource)
+        try:
+            assert tracker.percentile(0) == 0.2
+            assert tracker.take_unsaved() == []
+        finally:
+            await resource.aclose()
+
+
+class TestHedgedJokeSource:
+    """Test cases for HedgedJokeSource."""
+
+    @pytest.fixture
+    def latency(self) -> LatencyTracker:
+        """Create a tracker that hedges after 20 ms."""
+        return LatencyTracker(default_delay=0.02)
+
+    def test_requires_a_source(self) -> None:
+        """Test that an empty source list is rejected."""
+        with pytest.raises(ValueError):
+            HedgedJokeSource([])
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self, latency: LatencyTracker) -> None:
+        """Test that backups are left alone when the primary is quick."""
+        primary = FakeSource(API_JOKE)
+        backup = FakeSource(CACHED_JOKE)
+        source = HedgedJokeSource([primary, backup], latency)
+
+        assert await source.get_random_joke() == "From the API"
+        assert backup.calls == 0
+        assert latency.percentile(100) is None  # one sample, not yet trusted
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(
+        self, latency: LatencyTracker
+    ) -> None:
+        """Test that a hung primary loses to the backup and is cancelled."""
+        primary = FakeSource(API_JOKE, delay=None)
+        backup = FakeSource(CACHED_JOKE)
+        source = HedgedJokeSource([primary, backup], latency)
+
+        assert await source.fetch_random_joke() == CACHED_JOKE
+        assert primary.cancelled
+
+    @pytest.mark.asyncio
+    async def test_primary_can_still_win_after_hedging(
+        self, latency: LatencyTracker
+    ) -> None:
+        """Test that the first answer wins, whichever source gives it."""
+        primary = FakeSource(API_JOKE, delay=0.03)
+        backup = FakeSource(CACHED_JOKE, delay=1.0)
+        source = HedgedJokeSource([primary, backup], latency)
+
+        assert await source.fetch_random_joke() == API_JOKE
+        assert backup.calls == 1
+        assert backup.cancelled
+
+    @pytest.mark.asyncio
+    async def test_failed_source_hands_over_at_once(self) -> None:
+        """Test that a failure launches the next source without waiting."""
+        latency = LatencyTracker(default_delay=60.0)
+        source = HedgedJokeSource(
+            [FakeSource(None), FakeSource(None), FakeSource(CACHED_JOKE)], latency
+        )
+
+        assert await asyncio.wait_for(source.fetch_random_joke(), 1.0) == CACHED_JOKE
+
+    @pytest.mark.asyncio
+    async def test_all_sources_failing(self, latency: LatencyTracker) -> None:
+        """Test that None is returned when nobody has a joke."""
+        source = HedgedJokeSource([FakeSource(None), FakeSource(None)], latency)
+
+        assert await source.get_random_joke() is None
+
+    @pytest.mark.asyncio
+    async def test_losing_primary_records_a_lower_bound(self) -> None:
+        """Test that a hedged-away primary still counts as slow."""
+        latency = LatencyTracker(min_samples=1, default_delay=0.02)
+        source = HedgedJokeSource(
+            [FakeSource(API_JOKE, delay=None), FakeSource(CACHED_JOKE)], latency
+        )
+
+        await source.fetch_random_joke()
+
+        p100 = latency.percentile(100)
+        assert p100 is not None and p100 >= 0.02
+
+    @pytest.mark.asyncio
+    async def test_seen_backup_answer_keeps_the_primary_running(
+        self, latency: LatencyTracker
+    ) -> None:
+        """Test that a quick backup's seen joke does not cancel the primary."""
+        seen = ScalableBloomFilter()
+        seen.add(CACHED_JOKE.id)
+        primary = FakeSource(API_JOKE, delay=0.1)
+        backup = FakeSource(CACHED_JOKE)
+        source = HedgedJokeSource([primary, backup], latency, seen=seen)
+
+        assert await source.fetch_random_joke() == API_JOKE
+        assert backup.calls == 1
+        assert not primary.cancelled
+
+    @pytest.mark.asyncio
+    async def test_seen_joke_is_returned_when_nothing_else_turns_up(
+        self, latency: LatencyTracker
+    ) -> None:
+        """Test that a seen joke still beats no joke at all."""
+        seen = ScalableBloomFilter()
+        seen.add(CACHED_JOKE.id)
+        source = HedgedJokeSource(
+            [FakeSource(None, delay=0.05), FakeSource(CACHED_JOKE)], latency, seen=seen
+        )
+
+        assert await source.fetch_random_joke() == CACHED_JOKE
+
+    @pytest.mark.asyncio
+    async def test_service_gets_an_unseen_joke_in_one_race(
+        self, latency: LatencyTracker
+    ) -> None:
+        """Test the seen filter over the hedge: one race, no repeated joke."""
+        seen = ScalableBloomFilter()
+        seen.add(CACHED_JOKE.id)
+        primary = FakeSource(API_JOKE, delay=0.1)
+        backup = FakeSource(CACHED_JOKE)
+        service = DadJokeService(
+            HedgedJokeSource([primary, backup], latency, seen=seen), seen=seen
+        )
+
+        assert await service.get_joke() == "From the API"
+        assert (primary.calls, backup.calls) == (1, 1)
+        assert API_JOKE.id in seen
+
+    @pytest.mark.asyncio
+    async def test_batches_use_the_primary_only(self, latency: LatencyTracker) -> None:
+        """Test that batches are not filled from backups."""
+        backup = FakeSource(CACHED_JOKE)
+        source = HedgedJokeSource([FakeSource(API_JOKE), backup], latency)
+
+        jokes = [joke async for joke in source.get_random_jokes(3, 2)]
+
+        assert jokes == [API_JOKE]
+        assert backup.calls == 0
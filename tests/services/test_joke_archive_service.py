@@ -0,0 +1,94 @@
+"""Tests for the joke archive service."""
+
+import io
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.repositories.joke_archive import (
+    BINARY,
+    NDJSON,
+    JokeArchiveError,
+    write_archive,
+)
+from taters.repositories.joke_cache_repository import JokeCacheRepository
+from taters.repositories.joke_search_index import JokeSearchIndex
+from taters.services.joke_archive_service import ImportResult, JokeArchiveService
+
+JOKES = [DadJoke(id="1", joke="Pizza one"), DadJoke(id="2", joke="Atom two")]
+
+
+class TestJokeArchiveService:
+    """Test cases for JokeArchiveService."""
+
+    @pytest.fixture
+    def index(self, tmp_path: Path) -> Iterator[JokeSearchIndex]:
+        """Create a search index backed by a temporary database."""
+        index = JokeSearchIndex(path=tmp_path / "jokes.sqlite3")
+        yield index
+        index.close()
+
+    @pytest.fixture
+    def cache(self, tmp_path: Path) -> Iterator[JokeCacheRepository]:
+        """Create a joke cache backed by the same temporary database."""
+        cache = JokeCacheRepository(path=tmp_path / "jokes.sqlite3")
+        yield cache
+        cache.close()
+
+    @pytest.fixture
+    def service(
+        self, index: JokeSearchIndex, cache: JokeCacheRepository
+    ) -> JokeArchiveService:
+        """Create a service over the real stores."""
+        return JokeArchiveService(index, cache)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("format", [NDJSON, BINARY])
+    async def test_import_loads_index_and_cache(
+        self,
+        service: JokeArchiveService,
+        index: JokeSearchIndex,
+        cache: JokeCacheRepository,
+        tmp_path: Path,
+        format: str,
+    ) -> None:
+        """Test that imported jokes become searchable and servable offline."""
+        path = tmp_path / "jokes.archive"
+        with path.open("wb") as stream:
+            write_archive(JOKES, stream, format)
+
+        assert await service.import_archive(path) == ImportResult(read=2, added=2)
+        assert await service.import_archive(path) == ImportResult(read=2, added=0)
+        assert await index.search("pizza") == [JOKES[0]]
+        assert sorted(await cache.get_random_many(5), key=lambda j: j.id) == JOKES
+
+    @pytest.mark.asyncio
+    async def test_import_loads_both_stores_in_one_transaction(
+        self,
+        service: JokeArchiveService,
+        index: JokeSearchIndex,
+        cache: JokeCacheRepository,
+        tmp_path: Path,
+    ) -> None:
+        """Test that a failing import leaves neither store half loaded."""
+        path = tmp_path / "jokes.ndjson"
+        path.write_text('{"id": "1", "joke": "One"}\nnot json\n', encoding="utf-8")
+
+        with pytest.raises(JokeArchiveError):
+            await service.import_archive(path)
+
+        assert await index.size() == 0
+        assert await cache.get_random() is None
+
+    @pytest.mark.asyncio
+    async def test_export_writes_the_index(
+        self, service: JokeArchiveService, index: JokeSearchIndex
+    ) -> None:
+        """Test that export streams every indexed joke."""
+        await index.add_many(JOKES)
+        stream = io.BytesIO()
+
+        assert await service.export(stream, NDJSON) == 2
+        assert stream.getvalue().count(b"\n") == 2
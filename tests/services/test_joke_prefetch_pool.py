@@ -0,0 +1,169 @@
+"""Tests for the joke prefetch pool service."""
+
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from taters.repositories.dad_joke_repository import DadJoke, DadJokeRepository
+from taters.repositories.joke_pool_repository import JokePoolRepository
+from taters.services.joke_prefetch_pool import JokePrefetchPool, init_prefetch_pool
+from tests.conftest import async_iter
+
+
+class TestJokePrefetchPool:
+    """Test cases for JokePrefetchPool."""
+
+    @pytest.fixture
+    def mock_source(self) -> AsyncMock:
+        """Create a mock joke source."""
+        source = AsyncMock(spec=DadJokeRepository)
+        source.get_random_jokes = MagicMock(
+            return_value=async_iter([DadJoke(id="9", joke="Fresh")])
+        )
+        return source
+
+    @pytest.fixture
+    def mock_store(self) -> AsyncMock:
+        """Create a mock pool store."""
+        return AsyncMock(spec=JokePoolRepository)
+
+    @pytest.fixture
+    def pool(self, mock_source: AsyncMock, mock_store: AsyncMock) -> JokePrefetchPool:
+        """Create a pool with capacity 5 and low-water mark 2."""
+        return JokePrefetchPool(
+            mock_source, mock_store, capacity=5, low_water_mark=2, concurrency=3
+        )
+
+    @pytest.mark.asyncio
+    async def test_take_serves_from_store_without_refill(
+        self, pool: JokePrefetchPool, mock_store: AsyncMock, mock_source: AsyncMock
+    ) -> None:
+        """Test that a well-stocked pool answers without touching the source."""
+        mock_store.pop.return_value = DadJoke(id="1", joke="Pooled")
+        mock_store.size.return_value = 4
+
+        result = await pool.take()
+
+        assert result == DadJoke(id="1", joke="Pooled")
+        mock_source.get_random_jokes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_take_below_low_water_mark_refills_in_background(
+        self, pool: JokePrefetchPool, mock_store: AsyncMock, mock_source: AsyncMock
+    ) -> None:
+        """Test that dropping below the low-water mark tops the pool up."""
+        mock_store.pop.return_value = DadJoke(id="1", joke="Pooled")
+        mock_store.size.return_value = 1
+
+        result = await pool.take()
+        await pool.aclose()
+
+        assert result == DadJoke(id="1", joke="Pooled")
+        mock_source.get_random_jokes.assert_called_once_with(4, 3)
+        mock_store.push_many.assert_awaited_once_with([DadJoke(id="9", joke="Fresh")])
+
+    @pytest.mark.asyncio
+    async def test_refill_skipped_when_full(
+        self, pool: JokePrefetchPool, mock_store: AsyncMock, mock_source: AsyncMock
+    ) -> None:
+        """Test that a full pool is not refilled."""
+        mock_store.size.return_value = 5
+
+        assert await pool.refill() == 0
+        mock_source.get_random_jokes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_offline_pool_is_not_refilled(
+        self, mock_source: AsyncMock, mock_store: AsyncMock
+    ) -> None:
+        """Test that an offline pool is drawn down without fetching."""
+        pool = JokePrefetchPool(mock_source, mock_store, offline=True)
+        mock_store.pop.return_value = DadJoke(id="1", joke="Pooled")
+        mock_store.size.return_value = 0
+
+        assert await pool.take() == DadJoke(id="1", joke="Pooled")
+        assert await pool.refill() == 0
+
+        assert pool._refill_task is None
+        mock_source.get_random_jokes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_refill_keeps_jokes_already_fetched(
+        self, pool: JokePrefetchPool, mock_store: AsyncMock, mock_source: AsyncMock
+    ) -> None:
+        """Test that jokes are stored as they arrive, not at the end."""
+
+        async def one_then_stall() -> AsyncIterator[DadJoke]:
+            yield DadJoke(id="9", joke="Fresh")
+            await asyncio.sleep(10)
+            yield DadJoke(id="10", joke="Late")
+
+        mock_source.get_random_jokes.return_value = one_then_stall()
+        mock_store.size.return_value = 0
+        pool.schedule_refill()
+
+        await pool.aclose(timeout=0.05)
+
+        mock_store.push_many.assert_awaited_once_with([DadJoke(id="9", joke="Fresh")])
+
+    @pytest.mark.asyncio
+    async def test_only_one_refill_runs_at_a_time(
+        self, pool: JokePrefetchPool, mock_store: AsyncMock
+    ) -> None:
+        """Test that repeated triggers share the running refill."""
+        mock_store.size.return_value = 0
+
+        pool.schedule_refill()
+        first = pool._refill_task
+        pool.schedule_refill()
+
+        assert pool._refill_task is first
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_background_refill_failure_is_ignored(
+        self, pool: JokePrefetchPool, mock_store: AsyncMock
+    ) -> None:
+        """Test that a failing refill does not surface to callers."""
+        mock_store.size.side_effect = RuntimeError("disk full")
+
+        pool.schedule_refill()
+        await pool.aclose()
+
+        assert pool._refill_task is not None
+        assert pool._refill_task.exception() is None
+
+    @pytest.mark.asyncio
+    async def test_aclose_cancels_slow_refill(
+        self, pool: JokePrefetchPool, mock_store: AsyncMock
+    ) -> None:
+        """Test that shutdown does not wait longer than the timeout."""
+
+        async def slow_size() -> int:
+            await asyncio.sleep(10)
+            return 0
+
+        mock_store.size.side_effect = slow_size
+        pool.schedule_refill()
+
+        await pool.aclose(timeout=0.01)
+
+        assert pool._refill_task is not None
+        assert pool._refill_task.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_init_prefetch_pool_drains_on_shutdown(
+        self, mock_source: AsyncMock, mock_store: AsyncMock
+    ) -> None:
+        """Test that the resource waits for a pending refill when closed."""
+        mock_store.size.return_value = 0
+        resource = init_prefetch_pool(mock_source, mock_store)
+        pool = await resource.__anext__()
+        pool.schedule_refill()
+
+        with pytest.raises(StopAsyncIteration):
+            await resource.__anext__()
+
+        mock_store.push_many.assert_awaited_once()
@@ -0,0 +1,93 @@
+"""Tests for the joke search service."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from taters.repositories.dad_joke_repository import DadJoke, DadJokeRepository
+from taters.repositories.joke_search_index import JokeSearchIndex
+from taters.services.joke_search_service import JokeSearchService
+from tests.conftest import async_iter
+
+PIZZA = DadJoke(id="1", joke="A pizza joke")
+
+
+class TestJokeSearchService:
+    """Test cases for JokeSearchService."""
+
+    @pytest.fixture
+    def mock_repository(self) -> AsyncMock:
+        """Create a mock API repository."""
+        repository = AsyncMock(spec=DadJokeRepository)
+        repository.search_jokes = MagicMock(return_value=async_iter([PIZZA]))
+        return repository
+
+    @pytest.fixture
+    def mock_index(self) -> AsyncMock:
+        """Create a mock search index."""
+        return AsyncMock(spec=JokeSearchIndex)
+
+    @pytest.fixture
+    def service(
+        self, mock_repository: AsyncMock, mock_index: AsyncMock
+    ) -> JokeSearchService:
+        """Create a service instance with mock dependencies."""
+        return JokeSearchService(mock_repository, mock_index)
+
+    @pytest.mark.asyncio
+    async def test_local_matches_skip_the_api(
+        self,
+        service: JokeSearchService,
+        mock_repository: AsyncMock,
+        mock_index: AsyncMock,
+    ) -> None:
+        """Test that indexed matches are returned without a network call."""
+        mock_index.search.return_value = [PIZZA]
+
+        assert await service.search("pizza", limit=5) == [PIZZA]
+        mock_index.search.assert_awaited_once_with("pizza", 5)
+        mock_repository.search_jokes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_harvests_when_nothing_matches_locally(
+        self,
+        service: JokeSearchService,
+        mock_repository: AsyncMock,
+        mock_index: AsyncMock,
+    ) -> None:
+        """Test that an empty local answer triggers a harvest and a re-query."""
+        mock_index.search.side_effect = [[], [PIZZA]]
+
+        assert await service.search("pizza") == [PIZZA]
+        mock_repository.search_jokes.assert_called_once_with("pizza", 10)
+
+    @pytest.mark.asyncio
+    async def test_refresh_always_harvests(
+        self,
+        service: JokeSearchService,
+        mock_repository: AsyncMock,
+        mock_index: AsyncMock,
+    ) -> None:
+        """Test that refresh harvests before the only local query."""
+        mock_index.search.return_value = [PIZZA]
+
+        await service.search("pizza", refresh=True, concurrency=2)
+
+        mock_repository.search_jokes.assert_called_once_with("pizza", 2)
+        mock_index.search.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_offline_never_harvests(
+        self, mock_repository: AsyncMock, mock_index: AsyncMock
+    ) -> None:
+        """Test that offline searches only consult the index."""
+        service = JokeSearchService(mock_repository, mock_index, offline=True)
+        mock_index.search.return_value = []
+
+        assert await service.search("pizza", refresh=True) == []
+        mock_repository.search_jokes.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_harvest_counts_results(self, service: JokeSearchService) -> None:
+        """Test that harvest reports how many results arrived."""
+        assert await service.harvest("pizza") == 1
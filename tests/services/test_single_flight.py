@@ -0,0 +1,123 @@
+"""Tests for the single-flight request coalescer."""
+
+import asyncio
+
+import pytest
+
+from taters.services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_upstream_call(self) -> None:
+        """Test that simultaneous callers receive one shared result."""
+        single_flight: SingleFlight[str] = SingleFlight()
+        upstream_calls = 0
+        release = asyncio.Event()
+
+        async def call() -> str:
+            nonlocal upstream_calls
+            upstream_calls += 1
+            await release.wait()
+            return "shared"
+
+        waiters = [
+            asyncio.create_task(single_flight.do("random", call)) for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["shared"] * 5
+        assert upstream_calls == 1
+        assert single_flight.stats.calls == 5
+        assert single_flight.stats.coalesced == 4
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_coalesced(self) -> None:
+        """Test that a finished call is not reused by later callers."""
+        single_flight: SingleFlight[int] = SingleFlight()
+        counter = 0
+
+        async def call() -> int:
+            nonlocal counter
+            counter += 1
+            return counter
+
+        assert await single_flight.do("random", call) == 1
+        assert await single_flight.do("random", call) == 2
+        assert single_flight.stats.coalesced == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self) -> None:
+        """Test that only identical keys are coalesced."""
+        single_flight: SingleFlight[str] = SingleFlight()
+
+        async def call_a() -> str:
+            await asyncio.sleep(0)
+            return "a"
+
+        async def call_b() -> str:
+            await asyncio.sleep(0)
+            return "b"
+
+        results = await asyncio.gather(
+            single_flight.do("a", call_a), single_flight.do("b", call_b)
+        )
+
+        assert results == ["a", "b"]
+        assert single_flight.stats.upstream_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_is_delivered_to_every_waiter(self) -> None:
+        """Test that a failing shared call fails all of its waiters."""
+        single_flight: SingleFlight[str] = SingleFlight()
+
+        async def call() -> str:
+            await asyncio.sleep(0)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(
+            single_flight.do("random", call),
+            single_flight.do("random", call),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert single_flight.stats.upstream_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self) -> None:
+        """Test that one waiter's cancellation leaves the others unaffected."""
+        single_flight: SingleFlight[str] = SingleFlight()
+        release = asyncio.Event()
+
+        async def call() -> str:
+            await release.wait()
+            return "survived"
+
+        first = asyncio.create_task(single_flight.do("random", call))
+        second = asyncio.create_task(single_flight.do("random", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        assert await second == "survived"
+
+    @pytest.mark.asyncio
+    async def test_disabled_always_calls_upstream(self) -> None:
+        """Test that a disabled coalescer passes every call through."""
+        single_flight: SingleFlight[str] = SingleFlight(enabled=False)
+        upstream_calls = 0
+
+        async def call() -> str:
+            nonlocal upstream_calls
+            upstream_calls += 1
+            await asyncio.sleep(0)
+            return "direct"
+
+        await asyncio.gather(*(single_flight.do("random", call) for _ in range(3)))
+
+        assert upstream_calls == 3
+        assert single_flight.stats.coalesced == 0
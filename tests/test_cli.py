@@ -0,0 +1,85 @@
+"""Tests for the console entry point."""
+
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+
+from taters import cli, manifest
+
+
+def _main(
+    monkeypatch: pytest.MonkeyPatch, *args: str, complete: Optional[str] = None
+) -> int:
+    """Run the entry point as ``taters ARGS``, completing ``complete`` if given."""
+    monkeypatch.setattr("sys.argv", ["/usr/bin/taters", *args])
+    if complete is not None:
+        monkeypatch.setenv("_TATERS_COMPLETE", "complete_bash")
+        monkeypatch.setenv("COMP_WORDS", complete)
+        monkeypatch.setenv("COMP_CWORD", str(len(complete.split(" ")) - 1))
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    code = exit_info.value.code
+    return code if isinstance(code, int) else 0
+
+
+class TestMain:
+    """Test cases for the taters entry point."""
+
+    def test_commands_run_the_app(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that ordinary commands never touch the manifest."""
+        with patch.object(manifest, "load") as load:
+            assert _main(monkeypatch, "hello", "Bob") == 0
+
+        assert capsys.readouterr().out == "👋 Hello, Bob!\n"
+        load.assert_not_called()
+
+    def test_completion_builds_then_uses_manifest(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that the app completes once, then the manifest answers."""
+        assert _main(monkeypatch, complete="taters dad-joke ") == 0
+        assert capsys.readouterr().out == "search\nexport\nimport\n"
+        assert manifest.load() is not None
+
+        with patch.object(cli, "_app", side_effect=AssertionError("imported")):
+            assert _main(monkeypatch, complete="taters dad-joke ") == 0
+        assert capsys.readouterr().out == "search\nexport\nimport\n"
+
+    def test_completion_manifest_cannot_answer(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that file name completion still goes to the app."""
+        _main(monkeypatch, complete="taters dad-joke ")
+        capsys.readouterr()
+
+        with patch.object(cli, "_app", wraps=cli._app) as app:
+            assert _main(monkeypatch, complete="taters hello -f ") == 0
+        app.assert_called_once()
+
+    def test_help_is_recorded_then_replayed(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that a help page is shown by the app once, then from the manifest."""
+        assert _main(monkeypatch, "dad-joke", "--help") == 0
+        page = capsys.readouterr().out
+        assert "Usage: taters dad-joke" in page
+
+        with patch.object(cli, "_app", side_effect=AssertionError("imported")):
+            assert _main(monkeypatch, "dad-joke", "--help") == 0
+        assert capsys.readouterr().out == page
+
+    def test_only_successful_help_is_recorded(
+        self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test that errors are never replayed as help pages."""
+        manifest.save(cli._build(cli._app()))
+
+        assert _main(monkeypatch, "nope", "--help") == 2
+        assert _main(monkeypatch, "hello", "--help") == 0
+
+        document = manifest.load()
+        assert document is not None
+        assert len(document["help"]) == 1
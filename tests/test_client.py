@@ -0,0 +1,227 @@
+"""Tests for the TatersClient library API."""
+
+import asyncio
+from typing import AsyncIterator, TypeVar
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+from dependency_injector import providers
+
+from taters.client import TatersClient
+from taters.container import Container
+from taters.repositories.dad_joke_repository import DadJoke
+from taters.services.dad_joke_service import DadJokeService
+from taters.services.joke_search_service import JokeSearchService
+
+T = TypeVar("T")
+
+
+async def _resolved(value: T) -> T:
+    """Stand in for a provider whose dependencies are async resources."""
+    return value
+
+
+class TestTatersClient:
+    """Test cases for TatersClient."""
+
+    @pytest.fixture
+    def service(self) -> MagicMock:
+        """Create a mock DadJokeService."""
+        service = MagicMock(spec=DadJokeService)
+        service.get_joke = AsyncMock(return_value="Test joke")
+        return service
+
+    @pytest.fixture
+    def search_service(self) -> AsyncMock:
+        """Create a mock JokeSearchService."""
+        return AsyncMock(spec=JokeSearchService)
+
+    @pytest.fixture
+    def container(self, service: MagicMock, search_service: AsyncMock) -> Container:
+        """Create a Container serving the mock services."""
+        container = Container()
+        container.http_client.override(
+            providers.Object(AsyncMock(spec=httpx.AsyncClient))
+        )
+        container.dad_joke_service.override(providers.Coroutine(_resolved, service))
+        container.joke_search_service.override(
+            providers.Coroutine(_resolved, search_service)
+        )
+        return container
+
+    @pytest.mark.asyncio
+    async def test_get_joke(self, container: Container, service: MagicMock) -> None:
+        """Test that a joke is fetched through the service."""
+        async with TatersClient(container) as taters:
+            joke = await taters.get_joke()
+
+        assert joke == "Test joke"
+        service.get_joke.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_not_started(self, container: Container) -> None:
+        """Test that calls outside 'async with' fail clearly."""
+        taters = TatersClient(container)
+
+        with pytest.raises(RuntimeError, match="not started"):
+            await taters.get_joke()
+
+        async with taters:
+            pass
+
+        with pytest.raises(RuntimeError, match="not started"):
+            await taters.search("cow")
+
+    @pytest.mark.asyncio
+    async def test_start_runs_lifecycle_hooks(self, container: Container) -> None:
+        """Test that entering and leaving the client starts and stops it."""
+        lifecycle = container.lifecycle()
+        calls: list[str] = []
+
+        @lifecycle.on_startup
+        async def opened() -> None:
+            calls.append("startup")
+
+        @lifecycle.on_shutdown
+        async def closed() -> None:
+            calls.append("shutdown")
+
+        async with TatersClient(container):
+            assert lifecycle.running
+
+        assert calls == ["startup", "shutdown"]
+
+    @pytest.mark.asyncio
+    async def test_settings_override_config(self, container: Container) -> None:
+        """Test that settings passed in win over the loaded configuration."""
+        settings = {"dad_joke": {"concurrency": 3}}
+
+        async with TatersClient(container, settings=settings):
+            assert container.config.dad_joke.concurrency() == 3
+            assert container.config.cache.offline() is False
+
+    @pytest.mark.asyncio
+    async def test_deadline(self, container: Container, service: MagicMock) -> None:
+        """Test that a slow call raises TimeoutError and is cancelled."""
+        cancelled = asyncio.Event()
+
+        async def slow() -> str:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "Too late"
+
+        service.get_joke = slow
+
+        async with TatersClient(container, timeout=10) as taters:
+            with pytest.raises(TimeoutError):
+                await taters.get_joke(timeout=0.01)
+
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_cancellation(self, container: Container, service: MagicMock) -> None:
+        """Test that cancelling a caller leaves the client usable."""
+        started = asyncio.Event()
+
+        async def get_joke() -> str:
+            if not started.is_set():
+                started.set()
+                await asyncio.sleep(10)
+            return "Test joke"
+
+        service.get_joke = get_joke
+
+        async with TatersClient(container, max_concurrency=1) as taters:
+            task = asyncio.create_task(taters.get_joke())
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            assert await taters.get_joke(timeout=1) == "Test joke"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers(
+        self, container: Container, service: MagicMock
+    ) -> None:
+        """Test that thousands of tasks share one client within its limit."""
+        in_flight = 0
+        peak = 0
+
+        async def get_joke() -> str:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return "Test joke"
+
+        service.get_joke = get_joke
+
+        async with TatersClient(container, max_concurrency=50) as taters:
+            jokes = await asyncio.gather(*(taters.get_joke() for _ in range(2000)))
+
+        assert jokes == ["Test joke"] * 2000
+        assert peak == 50
+
+    @pytest.mark.asyncio
+    async def test_get_jokes(self, container: Container, service: MagicMock) -> None:
+        """Test that a batch uses the configured concurrency by default."""
+
+        async def get_jokes(count: int, concurrency: int) -> AsyncIterator[str]:
+            for i in range(count):
+                yield f"Joke {i}"
+
+        service.get_jokes = MagicMock(side_effect=get_jokes)
+
+        async with TatersClient(container) as taters:
+            jokes = await taters.get_jokes(3)
+
+        assert jokes == ["Joke 0", "Joke 1", "Joke 2"]
+        service.get_jokes.assert_called_once_with(
+            3, container.config.dad_joke.concurrency()
+        )
+
+    @pytest.mark.asyncio
+    async def test_stream_deadline_covers_whole_stream(
+        self, container: Container, service: MagicMock
+    ) -> None:
+        """Test that a stream stalling past its deadline is closed."""
+        closed = asyncio.Event()
+
+        async def get_jokes(count: int, concurrency: int) -> AsyncIterator[str]:
+            try:
+                yield "Joke 0"
+                await asyncio.sleep(10)
+                yield "Joke 1"
+            finally:
+                closed.set()
+
+        service.get_jokes = get_jokes
+        received: list[str] = []
+
+        async with TatersClient(container) as taters:
+            with pytest.raises(TimeoutError):
+                async for joke in taters.stream_jokes(2, timeout=0.05):
+                    received.append(joke)
+
+        assert received == ["Joke 0"]
+        assert closed.is_set()
+
+    @pytest.mark.asyncio
+    async def test_search(
+        self, container: Container, search_service: AsyncMock
+    ) -> None:
+        """Test that search is delegated to the search service."""
+        search_service.search.return_value = [DadJoke(id="1", joke="Moo")]
+
+        async with TatersClient(container) as taters:
+            jokes = await taters.search("cow", limit=5, refresh=True)
+
+        assert jokes == [DadJoke(id="1", joke="Moo")]
+        search_service.search.assert_awaited_once_with("cow", 5, True)
@@ -0,0 +1,169 @@
+"""Tests for the layered configuration loader."""
+
+from pathlib import Path
+
+import pytest
+
+from taters import config
+from taters.config import DEFAULTS, ConfigError, default_config_path, load_config
+
+CONFIG = """
+[api]
+timeout = 3
+base_url = "http://file.example"
+
+[cache]
+max_entries = 50
+
+[profiles.ci.api]
+timeout = 1.5
+
+[profiles.ci.retry]
+max_attempts = 1
+"""
+
+
+class TestLoadConfig:
+    """Test cases for load_config."""
+
+    @pytest.fixture
+    def config_file(self, isolated_config: Path) -> Path:
+        """Write a config file to the default location."""
+        isolated_config.mkdir(parents=True)
+        path = isolated_config / "config.toml"
+        path.write_text(CONFIG, encoding="utf-8")
+        return path
+
+    def test_defaults_without_a_file(self) -> None:
+        """Test that a missing default file leaves the defaults."""
+        assert load_config() == DEFAULTS
+
+    def test_default_path_is_in_xdg_config_home(self, isolated_config: Path) -> None:
+        """Test where the config file is looked for."""
+        assert default_config_path() == isolated_config / "config.toml"
+
+    def test_file_overrides_defaults(self, config_file: Path) -> None:
+        """Test that file values replace defaults, with ints widened to floats."""
+        settings = load_config()
+
+        assert settings["api"]["timeout"] == 3.0
+        assert isinstance(settings["api"]["timeout"], float)
+        assert settings["api"]["base_url"] == "http://file.example"
+        assert settings["cache"]["max_entries"] == 50
+        assert settings["retry"] == DEFAULTS["retry"]
+
+    def test_profile_overrides_file(self, config_file: Path) -> None:
+        """Test that a selected profile is applied over the base tables."""
+        settings = load_config(profile="ci")
+
+        assert settings["api"]["timeout"] == 1.5
+        assert settings["retry"]["max_attempts"] == 1
+        assert settings["cache"]["max_entries"] == 50
+
+    def test_environment_overrides_profile(
+        self, config_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that TATERS_<SECTION>_<KEY> variables beat the file."""
+        monkeypatch.setenv("TATERS_API_TIMEOUT", "7")
+        monkeypatch.setenv("TATERS_CACHE_OFFLINE", "yes")
+        monkeypatch.setenv("TATERS_API_URL", "http://alias.example")
+
+        settings = load_config(profile="ci")
+
+        assert settings["api"]["timeout"] == 7.0
+        assert settings["cache"]["offline"] is True
+        assert settings["api"]["base_url"] == "http://alias.example"
+
+    def test_cli_overrides_win(
+        self, config_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that --set values are applied last."""
+        monkeypatch.setenv("TATERS_API_TIMEOUT", "7")
+
+        settings = load_config(overrides=("api.timeout=0.5", "dad_joke.concurrency=3"))
+
+        assert settings["api"]["timeout"] == 0.5
+        assert settings["dad_joke"]["concurrency"] == 3
+
+    def test_merged_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the merge is cached and callers get independent copies."""
+        first = load_config()
+        first["api"]["timeout"] = 99.0
+        monkeypatch.setenv("TATERS_API_TIMEOUT", "7")
+
+        assert load_config() == DEFAULTS
+        config._merged.cache_clear()
+        assert load_config()["api"]["timeout"] == 7.0
+
+    def test_explicit_file_must_exist(self, tmp_path: Path) -> None:
+        """Test that --config pointing nowhere is an error."""
+        with pytest.raises(ConfigError, match="does not exist"):
+            load_config(tmp_path / "missing.toml")
+
+    @pytest.mark.parametrize(
+        "document, message",
+        [
+            ("[nope]\nx = 1\n", "Unknown section 'nope'"),
+            ("[api]\ntimeot = 1\n", "Unknown setting 'api.timeot'"),
+            ('[api]\ntimeout = "fast"\n', "Invalid value 'fast' for 'api.timeout'"),
+            ("[cache]\noffline = 1\n", "expected bool"),
+            ("[api\n", "Cannot read"),
+        ],
+    )
+    def test_invalid_files(self, tmp_path: Path, document: str, message: str) -> None:
+        """Test that typos and bad values are reported with their location."""
+        path = tmp_path / "config.toml"
+        path.write_text(document, encoding="utf-8")
+
+        with pytest.raises(ConfigError, match=message):
+            load_config(path)
+
+    @pytest.mark.parametrize(
+        "override, message",
+        [
+            ("rate_limit.rate=0", "'rate_limit.rate' in --set: must be greater than 0"),
+            ("rate_limit.burst=0.5", "must be at least 1"),
+            ("dad_joke.concurrency=0", "'dad_joke.concurrency'.*greater than 0"),
+            ("cache.max_entries=-1", "'cache.max_entries'.*at least 0"),
+            ("prefetch.low_water_mark=-2", "'prefetch.low_water_mark'.*at least 0"),
+            ("retry.base_delay=-0.5", "'retry.base_delay'.*at least 0"),
+            ("seen.error_rate=1", "'seen.error_rate'.*between 0 and 1"),
+            ("hedge.min_samples=0", "'hedge.min_samples'.*greater than 0"),
+        ],
+    )
+    def test_out_of_range_values(self, override: str, message: str) -> None:
+        """Test that numbers outside a setting's range are rejected."""
+        with pytest.raises(ConfigError, match=message):
+            load_config(overrides=(override,))
+
+    def test_zero_may_turn_features_off(self) -> None:
+        """Test that a 0 meaning "disabled" is still accepted."""
+        settings = load_config(
+            overrides=(
+                "dns.ttl_seconds=0",
+                "prefetch.capacity=0",
+                "cache.max_entries=0",
+            )
+        )
+
+        assert settings["dns"]["ttl_seconds"] == 0.0
+        assert settings["prefetch"]["capacity"] == 0
+
+    def test_bounds_name_known_settings(self) -> None:
+        """Test that every bounded setting exists and defaults within range."""
+        for section, bounds in config.BOUNDS.items():
+            for key, (check, _) in bounds.items():
+                assert check(DEFAULTS[section][key]), f"{section}.{key}"
+
+    def test_unknown_profile(self) -> None:
+        """Test that selecting a missing profile is an error."""
+        with pytest.raises(ConfigError, match="Unknown profile 'prod'"):
+            load_config(profile="prod")
+
+    @pytest.mark.parametrize(
+        "override", ["timeout=1", "api.timeout", "api.http2=maybe"]
+    )
+    def test_invalid_overrides(self, override: str) -> None:
+        """Test that malformed --set values are rejected."""
+        with pytest.raises(ConfigError):
+            load_config(overrides=(override,))
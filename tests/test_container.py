@@ -1,12 +1,32 @@
 """Tests for the Container dependency injection configuration."""
 
 import pytest
+from unittest.mock import AsyncMock, MagicMock
 
-from taters.container import Container
+import httpx
+from dependency_injector import providers
+
+from taters.container import Container, get_container, lifespan, startup
+from taters.lifecycle import Lifecycle
+from taters.repositories.bloom_filter import ScalableBloomFilter
 from taters.repositories.dad_joke_repository import DadJokeRepository
+from taters.repositories.cached_dad_joke_repository import CachedDadJokeRepository
+from taters.repositories.corpus_joke_repository import CorpusJokeRepository
+from taters.repositories.joke_cache_repository import JokeCacheRepository
+from taters.repositories.joke_pool_repository import JokePoolRepository
+from taters.repositories.joke_search_index import JokeSearchIndex
+from taters.services.joke_prefetch_pool import JokePrefetchPool
+from taters.services.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerJokeSource,
+)
 from taters.services.dad_joke_service import DadJokeService
+from taters.services.hedged_joke_source import HedgedJokeSource, LatencyTracker
 from taters.actions.dad_joke_action import DadJokeAction
+from taters.actions.dad_joke_search_action import DadJokeSearchAction
+from taters.actions.dad_joke_archive_action import DadJokeArchiveAction
 from taters.actions.hello_action import HelloAction
+from taters.actions.run_action import RunAction
 
 
 class TestContainer:
@@ -14,8 +34,29 @@ class TestContainer:
 
     @pytest.fixture
     def container(self) -> Container:
-        """Create a Container instance for testing."""
-        return Container()
+        """Create a Container instance with stubbed resources."""
+        container = Container()
+        container.http_client.override(
+            providers.Object(AsyncMock(spec=httpx.AsyncClient))
+        )
+        container.joke_cache.override(
+            providers.Object(AsyncMock(spec=JokeCacheRepository))
+        )
+        container.joke_pool_repository.override(
+            providers.Object(AsyncMock(spec=JokePoolRepository))
+        )
+        container.prefetch_pool.override(
+            providers.Object(AsyncMock(spec=JokePrefetchPool))
+        )
+        container.joke_search_index.override(
+            providers.Object(AsyncMock(spec=JokeSearchIndex))
+        )
+        container.dad_joke_circuit_breaker.override(
+            providers.Object(AsyncMock(spec=CircuitBreaker))
+        )
+        container.seen_jokes.override(providers.Object(ScalableBloomFilter()))
+        container.dad_joke_latency.override(providers.Object(LatencyTracker()))
+        return container
 
     def test_dad_joke_repository_creation(self, container: Container) -> None:
         """Test that DadJokeRepository can be created."""
@@ -23,12 +64,95 @@ class TestContainer:
 
         assert isinstance(repository, DadJokeRepository)
 
+    def test_rate_limiter_is_shared_between_repositories(
+        self, container: Container
+    ) -> None:
+        """Test that every repository draws from one token bucket."""
+        first = container.dad_joke_repository()
+        second = container.dad_joke_repository()
+
+        assert first.rate_limiter is not None
+        assert first.rate_limiter is second.rate_limiter
+        assert first.retry_policy.max_attempts > 1
+
+    def test_search_action_shares_index_with_repository(
+        self, container: Container
+    ) -> None:
+        """Test that harvested jokes land in the index the service queries."""
+        action = container.dad_joke_search_action()
+
+        assert isinstance(action, DadJokeSearchAction)
+        assert action.service.repository.search_index is action.service.index
+        assert container.dad_joke_repository().search_index is action.service.index
+
+    def test_archive_action_uses_the_shared_stores(self, container: Container) -> None:
+        """Test that imports land in the index and cache the CLI reads."""
+        action = container.dad_joke_archive_action()
+
+        assert isinstance(action, DadJokeArchiveAction)
+        assert action.service.index is container.joke_search_index()
+        assert action.service.cache is container.joke_cache()
+
+    def test_config_reaches_providers(self, container: Container) -> None:
+        """Test that merged settings tune the objects the container builds."""
+        container.config.from_dict(
+            {
+                "api": {"base_url": "http://local.test", "user_agent": "tests"},
+                "retry": {"max_attempts": 2},
+                "rate_limit": {"rate": 3.0},
+                "hedge": {"default_delay": 0.25},
+            }
+        )
+
+        repository = container.dad_joke_repository()
+
+        assert repository.base_url == "http://local.test"
+        assert repository.headers["User-Agent"] == "tests"
+        assert repository.retry_policy.max_attempts == 2
+        assert repository.retry_policy.base_delay == 0.25
+        assert repository.rate_limiter is not None
+        assert repository.rate_limiter.rate == 3.0
+
     def test_dad_joke_service_creation(self, container: Container) -> None:
         """Test that DadJokeService can be created with repository dependency."""
         service = container.dad_joke_service()
 
         assert isinstance(service, DadJokeService)
-        assert isinstance(service.repository, DadJokeRepository)
+        assert isinstance(service.repository, HedgedJokeSource)
+        primary, corpus = service.repository.sources
+        assert isinstance(primary, CachedDadJokeRepository)
+        assert isinstance(primary.repository, CircuitBreakerJokeSource)
+        assert isinstance(primary.repository.source, DadJokeRepository)
+        assert isinstance(corpus, CorpusJokeRepository)
+        assert service.repository.seen is container.seen_jokes()
+        assert service.prefetch_pool is container.prefetch_pool()
+        assert service.seen is container.seen_jokes()
+
+    def test_hedge_latency_is_shared(self, container: Container) -> None:
+        """Test that hedged repositories learn from one latency history."""
+        first = container.hedged_dad_joke_repository()
+        second = container.hedged_dad_joke_repository()
+
+        assert first.latency is second.latency
+        assert first.sources[1] is second.sources[1]
+
+    def test_single_flight_is_shared_and_opt_in(self, container: Container) -> None:
+        """Test that services share one coalescer that is off by default."""
+        first = container.dad_joke_service()
+        second = container.dad_joke_service()
+
+        assert first.single_flight is second.single_flight
+        assert first.single_flight is not None
+        assert first.single_flight.enabled is False
+
+    def test_cached_repository_is_online_by_default(self, container: Container) -> None:
+        """Test that the cache decorator only goes offline when configured."""
+        assert container.cached_dad_joke_repository().offline is False
+
+        container.config.cache.offline.from_value(True)
+        container.cached_dad_joke_repository.reset()
+
+        assert container.cached_dad_joke_repository().offline is True
 
     def test_dad_joke_action_creation(self, container: Container) -> None:
         """Test that DadJokeAction can be created with service dependency."""
@@ -36,7 +160,7 @@ class TestContainer:
 
         assert isinstance(action, DadJokeAction)
         assert isinstance(action.service, DadJokeService)
-        assert isinstance(action.service.repository, DadJokeRepository)
+        assert isinstance(action.service.repository, HedgedJokeSource)
 
     def test_hello_action_creation(self, container: Container) -> None:
         """Test that HelloAction can be created."""
@@ -44,6 +168,17 @@ class TestContainer:
 
         assert isinstance(action, HelloAction)
 
+    def test_run_action_shares_the_command_actions(self, container: Container) -> None:
+        """Test that taters run dispatches to the container's own actions."""
+        container.config.dad_joke.concurrency.from_value(4)
+
+        action = container.run_action()
+
+        assert isinstance(action, RunAction)
+        assert action.hello_action is container.hello_action()
+        assert action.dad_joke_action is container.dad_joke_action()
+        assert action.concurrency == 4
+
     def test_dependency_injection_chain(self, container: Container) -> None:
         """Test that the full dependency chain is properly wired."""
         # Create the action which should have all dependencies injected
@@ -56,4 +191,147 @@ class TestContainer:
         # Verify types
         assert isinstance(action, DadJokeAction)
         assert isinstance(action.service, DadJokeService)
-        assert isinstance(action.service.repository, DadJokeRepository)
+        assert isinstance(action.service.repository, HedgedJokeSource)
+
+    @pytest.mark.asyncio
+    async def test_http_client_resource_is_shared(self) -> None:
+        """Test that repositories share one pooled client until shutdown."""
+        async with lifespan(Container()) as container:
+            first = await container.dad_joke_repository.async_()
+            second = await container.dad_joke_repository.async_()
+
+            assert isinstance(first.client, httpx.AsyncClient)
+            assert first.client is second.client
+
+        assert first.client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_prefetch_pool_is_wired_to_live_repository(self) -> None:
+        """Test that the real prefetch pool refills from the API alone."""
+        async with lifespan(Container()) as container:
+            pool = await container.prefetch_pool.async_()
+
+            assert isinstance(pool, JokePrefetchPool)
+            assert isinstance(pool.source, CachedDadJokeRepository)
+            assert not pool.source.fallback
+            assert not pool.source.offline
+            assert not pool.offline
+            assert isinstance(pool.store, JokePoolRepository)
+
+    @pytest.mark.asyncio
+    async def test_seen_jokes_are_loaded_and_sized_from_config(self) -> None:
+        """Test that the real seen-joke filter is built from its settings."""
+        container = Container()
+        container.config.seen.initial_capacity.from_value(64)
+        async with lifespan(container):
+            service = await container.dad_joke_service.async_()
+
+            assert isinstance(service.seen, ScalableBloomFilter)
+            assert service.seen.initial_capacity == 64
+            assert service.max_refetches == 3
+
+    @pytest.mark.asyncio
+    async def test_latency_samples_outlive_the_container(self) -> None:
+        """Test that hedge latencies recorded in one run tune the next."""
+        container = Container()
+        container.config.hedge.from_dict({"min_samples": 2, "default_delay": 0.25})
+        async with lifespan(container):
+            latency = await container.dad_joke_latency.async_()
+            assert latency.hedge_delay() == 0.25
+            latency.record(0.5)
+            latency.record(0.75)
+
+        async with lifespan(container):
+            latency = await container.dad_joke_latency.async_()
+            assert latency.hedge_delay() == 0.75
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_is_shared(self) -> None:
+        """Test that every guarded repository reports to one breaker."""
+        async with lifespan(Container()) as container:
+            first = await container.guarded_dad_joke_repository.async_()
+            second = await container.guarded_dad_joke_repository.async_()
+
+            assert isinstance(first.breaker, CircuitBreaker)
+            assert first.breaker is second.breaker
+
+    @pytest.mark.asyncio
+    async def test_lifespan_drains_background_work_before_other_resources(
+        self,
+    ) -> None:
+        """Test that refills and probes finish before shared resources close."""
+        container = MagicMock()
+        container.init_resources.return_value = None
+        container.lifecycle.return_value = Lifecycle()
+        container.traverse.return_value = []
+        calls: list[str] = []
+        container.prefetch_pool.shutdown.side_effect = lambda: calls.append("pool")
+        container.dad_joke_circuit_breaker.shutdown.side_effect = lambda: calls.append(
+            "breaker"
+        )
+        container.shutdown_resources.side_effect = lambda: calls.append("all")
+
+        async def hook() -> None:
+            calls.append("hook")
+
+        container.lifecycle().on_shutdown(hook)
+
+        async with lifespan(container):
+            pass
+
+        assert calls == ["hook", "pool", "breaker", "all"]
+
+    def test_object_graph_is_built_once(self, container: Container) -> None:
+        """Test that repeated resolutions share one repository/service graph."""
+        first = container.dad_joke_action()
+
+        assert container.dad_joke_action() is first
+        assert first.service is container.dad_joke_service()
+        assert container.hedged_dad_joke_repository().sources[0] is (
+            container.cached_dad_joke_repository()
+        )
+
+    def test_get_container_is_process_wide(self) -> None:
+        """Test that every caller in the process gets the same container."""
+        assert get_container() is get_container()
+
+    @pytest.mark.asyncio
+    async def test_container_can_be_restarted(self) -> None:
+        """Test that a restart rebuilds singletons on fresh resources."""
+        container = Container()
+        lifecycle = container.lifecycle()
+        started: list[bool] = []
+
+        async def record_start() -> None:
+            started.append(True)
+
+        lifecycle.on_startup(record_start)
+
+        async with lifespan(container):
+            first = await container.dad_joke_repository.async_()
+            assert lifecycle.running
+        assert not lifecycle.running
+
+        async with lifespan(container):
+            second = await container.dad_joke_repository.async_()
+            assert second is not first
+            assert not second.client.is_closed
+
+        assert container.lifecycle() is lifecycle
+        assert started == [True, True]
+
+    @pytest.mark.asyncio
+    async def test_failed_startup_hook_shuts_down(self) -> None:
+        """Test that resources are released when a startup hook fails."""
+        container = Container()
+
+        async def broken() -> None:
+            raise RuntimeError("boom")
+
+        container.lifecycle().on_startup(broken)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await startup(container)
+
+        assert not container.http_client.initialized
+        assert not container.joke_cache.initialized
@@ -0,0 +1,58 @@
+"""Tests for application lifecycle hooks."""
+
+import pytest
+
+from taters.lifecycle import Lifecycle
+
+
+class TestLifecycle:
+    """Test cases for Lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_hooks_run_in_order(self) -> None:
+        """Test that startup hooks run in order and shutdown hooks in reverse."""
+        lifecycle = Lifecycle()
+        calls: list[str] = []
+
+        @lifecycle.on_startup
+        async def open_first() -> None:
+            calls.append("open first")
+
+        @lifecycle.on_startup
+        async def open_second() -> None:
+            calls.append("open second")
+
+        @lifecycle.on_shutdown
+        async def close_first() -> None:
+            calls.append("close first")
+
+        @lifecycle.on_shutdown
+        async def close_second() -> None:
+            calls.append("close second")
+
+        await lifecycle.run_startup()
+        assert lifecycle.running
+        await lifecycle.run_shutdown()
+
+        assert calls == ["open first", "open second", "close second", "close first"]
+        assert not lifecycle.running
+
+    @pytest.mark.asyncio
+    async def test_failing_shutdown_hook_does_not_skip_others(self) -> None:
+        """Test that every shutdown hook runs and the first error is raised."""
+        lifecycle = Lifecycle()
+        calls: list[str] = []
+
+        async def close() -> None:
+            calls.append("close")
+
+        async def broken() -> None:
+            raise RuntimeError("boom")
+
+        lifecycle.on_shutdown(close)
+        lifecycle.on_shutdown(broken)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await lifecycle.run_shutdown()
+
+        assert calls == ["close"]
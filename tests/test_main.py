@@ -1,12 +1,28 @@
 """Tests for the main CLI module."""
 
+import json
+from pathlib import Path
+from typing import Any, AsyncIterator
+
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from typer.testing import CliRunner
 
+from taters.daemon.protocol import DaemonError
+from taters.lifecycle import Lifecycle
 from taters.main import app
 
 
+def _async_container() -> AsyncMock:
+    """Create a container mock whose providers and lifecycle are awaitable."""
+    container = AsyncMock()
+    container.config = MagicMock()
+    container.config.runtime.loop.return_value = "asyncio"
+    container.lifecycle = MagicMock(return_value=AsyncMock(spec=Lifecycle))
+    container.traverse = MagicMock(return_value=[])
+    return container
+
+
 class TestMainCLI:
     """Test cases for main CLI application."""
 
@@ -17,10 +33,10 @@ class TestMainCLI:
 
     def test_hello_command_without_name(self, runner: CliRunner) -> None:
         """Test hello command without providing a name."""
-        with patch("taters.main.Container") as mock_container:
+        with patch("taters.actions.hello_action.HelloAction") as mock_hello_action:
             mock_action = MagicMock()
             mock_action.execute.return_value = "👋 Hello there!"
-            mock_container.return_value.hello_action.return_value = mock_action
+            mock_hello_action.return_value = mock_action
 
             result = runner.invoke(app, ["hello"])
 
@@ -30,10 +46,10 @@ class TestMainCLI:
 
     def test_hello_command_with_name(self, runner: CliRunner) -> None:
         """Test hello command with a provided name."""
-        with patch("taters.main.Container") as mock_container:
+        with patch("taters.actions.hello_action.HelloAction") as mock_hello_action:
             mock_action = MagicMock()
             mock_action.execute.return_value = "👋 Hello, Alice!"
-            mock_container.return_value.hello_action.return_value = mock_action
+            mock_hello_action.return_value = mock_action
 
             result = runner.invoke(app, ["hello", "Alice"])
 
@@ -43,12 +59,15 @@ class TestMainCLI:
 
     def test_dad_joke_command_success(self, runner: CliRunner) -> None:
         """Test successful dad joke command."""
-        with patch("taters.main.Container") as mock_container:
+        with patch("taters.container.Container") as mock_container:
+            mock_container.return_value = _async_container()
             mock_action = AsyncMock()
             mock_action.execute.return_value = (
                 "🃏 Dad Joke: Why don't scientists trust atoms?"
             )
-            mock_container.return_value.dad_joke_action.return_value = mock_action
+            mock_container.return_value.dad_joke_action.async_.return_value = (
+                mock_action
+            )
 
             result = runner.invoke(app, ["dad-joke"])
 
@@ -57,20 +76,506 @@ class TestMainCLI:
 
     def test_dad_joke_command_failure(self, runner: CliRunner) -> None:
         """Test dad joke command when an exception occurs."""
-        with patch("taters.main.Container") as mock_container:
+        with patch("taters.container.Container") as mock_container:
+            mock_container.return_value = _async_container()
             mock_action = AsyncMock()
             mock_action.execute.side_effect = Exception("API Error")
-            mock_container.return_value.dad_joke_action.return_value = mock_action
+            mock_container.return_value.dad_joke_action.async_.return_value = (
+                mock_action
+            )
 
             result = runner.invoke(app, ["dad-joke"])
 
             assert result.exit_code == 1
+            mock_container.return_value.shutdown_resources.assert_awaited_once()
             # Error messages go to stderr when using typer.echo(err=True)
             assert (
                 "❌ Error getting dad joke: API Error" in result.stderr
                 or "❌ Error getting dad joke: API Error" in result.stdout
             )
 
+    def test_dad_joke_command_with_count_streams_batch(self, runner: CliRunner) -> None:
+        """Test that --count streams every joke from the batch action."""
+
+        async def jokes() -> AsyncIterator[str]:
+            yield "🃏 Dad Joke: One"
+            yield "🃏 Dad Joke: Two"
+
+        with patch("taters.container.Container") as mock_container:
+            mock_container.return_value = _async_container()
+            mock_action = MagicMock()
+            mock_action.execute_batch.return_value = jokes()
+            mock_container.return_value.dad_joke_action.async_.return_value = (
+                mock_action
+            )
+
+            result = runner.invoke(app, ["dad-joke", "--count", "2", "-c", "4"])
+
+            assert result.exit_code == 0
+            assert result.stdout.splitlines() == [
+                "🃏 Dad Joke: One",
+                "🃏 Dad Joke: Two",
+            ]
+            mock_action.execute_batch.assert_called_once_with(2, 4)
+
+    def test_dad_joke_command_offline_configures_cache(self, runner: CliRunner) -> None:
+        """Test that --offline switches the container to cache-only mode."""
+        with patch("taters.container.Container") as mock_container:
+            mock_container.return_value = _async_container()
+            mock_action = AsyncMock()
+            mock_action.execute.return_value = "🃏 Dad Joke: Cached"
+            mock_container.return_value.dad_joke_action.async_.return_value = (
+                mock_action
+            )
+
+            result = runner.invoke(app, ["dad-joke", "--offline"])
+
+            assert result.exit_code == 0
+            config = mock_container.return_value.config
+            config.cache.offline.from_value.assert_called_once_with(True)
+
+    def test_global_config_options_reach_the_container(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """Test that --config, --profile and --set are merged into the config."""
+        path = tmp_path / "taters.toml"
+        path.write_text(
+            "[dad_joke]\nconcurrency = 4\n[profiles.ci.api]\ntimeout = 2\n",
+            encoding="utf-8",
+        )
+        with patch("taters.container.Container") as mock_container:
+            mock_container.return_value = _async_container()
+            mock_action = AsyncMock()
+            mock_action.execute.return_value = "🃏 Dad Joke: Configured"
+            mock_container.return_value.dad_joke_action.async_.return_value = (
+                mock_action
+            )
+
+            result = runner.invoke(
+                app,
+                [
+                    "--config",
+                    str(path),
+                    "--profile",
+                    "ci",
+                    "--set",
+                    "retry.max_attempts=1",
+                    "dad-joke",
+                    "--offline",
+                ],
+            )
+
+            assert result.exit_code == 0
+            config = mock_container.return_value.config
+            (settings,) = config.from_dict.call_args.args
+            assert settings["dad_joke"]["concurrency"] == 4
+            assert settings["api"]["timeout"] == 2.0
+            assert settings["retry"]["max_attempts"] == 1
+
+    def test_invalid_config_is_reported(self, runner: CliRunner) -> None:
+        """Test that bad settings exit non-zero before any work is done."""
+        result = runner.invoke(
+            app, ["--set", "api.timeout=soon", "dad-joke", "-n", "2"]
+        )
+
+        assert result.exit_code == 1
+        assert "❌ Invalid configuration: Invalid value 'soon'" in result.output
+
+    def test_unknown_event_loop_is_reported(self, runner: CliRunner) -> None:
+        """Test that an unknown runtime.loop exits non-zero."""
+        result = runner.invoke(app, ["--set", "runtime.loop=trio", "dad-joke"])
+
+        assert result.exit_code == 1
+        assert "❌ Invalid configuration: Unknown event loop 'trio'" in result.output
+
+    def test_dad_joke_search_command(self, runner: CliRunner) -> None:
+        """Test that search joins its words and prints every line."""
+        with patch("taters.container.Container") as mock_container:
+            mock_container.return_value = _async_container()
+            mock_action = AsyncMock()
+            mock_action.execute.return_value = ["🔎 One", "🔎 Two"]
+            mock_container.return_value.dad_joke_search_action.async_.return_value = (
+                mock_action
+            )
+
+            result = runner.invoke(
+                app, ["dad-joke", "search", "pizza", "cheese", "--limit", "5"]
+            )
+
+            assert result.exit_code == 0
+            assert result.stdout.splitlines() == ["🔎 One", "🔎 Two"]
+            mock_action.execute.assert_awaited_once_with("pizza cheese", 5, False)
+            mock_container.return_value.dad_joke_action.async_.assert_not_called()
+
+    def test_dad_joke_search_offline_configures_cache(self, runner: CliRunner) -> None:
+        """Test that --offline keeps search off the network."""
+        with patch("taters.container.Container") as mock_container:
+            mock_container.return_value = _async_container()
+            mock_action = AsyncMock()
+            mock_action.execute.return_value = []
+            mock_container.return_value.dad_joke_search_action.async_.return_value = (
+                mock_action
+            )
+
+            result = runner.invoke(
+                app, ["dad-joke", "search", "pizza", "--offline", "--refresh"]
+            )
+
+            assert result.exit_code == 0
+            config = mock_container.return_value.config
+            config.cache.offline.from_value.assert_called_once_with(True)
+            mock_action.execute.assert_awaited_once_with("pizza", 20, True)
+
+    def test_dad_joke_search_reports_errors(self, runner: CliRunner) -> None:
+        """Test that search failures exit non-zero with a message."""
+        with patch("taters.container.Container") as mock_container:
+            mock_container.return_value = _async_container()
+            mock_action = AsyncMock()
+            mock_action.execute.side_effect = Exception("disk full")
+            mock_container.return_value.dad_joke_search_action.async_.return_value = (
+                mock_action
+            )
+
+            result = runner.invoke(app, ["dad-joke", "search", "pizza"])
+
+            assert result.exit_code == 1
+            assert "❌ Error searching dad jokes: disk full" in result.output
+
+    def test_dad_joke_import_then_export(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """Test that an imported archive can be exported again."""
+        archive = tmp_path / "jokes.ndjson"
+        archive.write_text(
+            '{"id": "1", "joke": "One"}\n{"id": "2", "joke": "Two"}\n',
+            encoding="utf-8",
+        )
+
+        imported = runner.invoke(app, ["dad-joke", "import", str(archive)])
+        exported = runner.invoke(app, ["dad-joke", "export", "-"])
+
+        assert imported.exit_code == 0
+        assert f"📥 Imported 2 jokes from {archive} (2 new)" in imported.stdout
+        assert exported.exit_code == 0
+        assert exported.stdout.splitlines() == archive.read_text().splitlines()
+        assert "📤 Exported 2 jokes (ndjson)" in exported.stderr
+
+    def test_dad_joke_import_is_served_offline_in_full(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """Test that an import larger than the cache bound is served offline."""
+        count = 1500
+        archive = tmp_path / "jokes.ndjson"
+        archive.write_text(
+            "".join(f'{{"id": "{n}", "joke": "Joke {n}"}}\n' for n in range(count)),
+            encoding="utf-8",
+        )
+
+        imported = runner.invoke(app, ["dad-joke", "import", str(archive)])
+        served = runner.invoke(app, ["dad-joke", "--offline", "--count", str(count)])
+
+        assert imported.exit_code == 0
+        assert served.exit_code == 0
+        assert served.stdout.count("Joke ") == count
+
+    def test_dad_joke_export_binary_to_file(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """Test that --format binary writes a self-identifying archive."""
+        path = tmp_path / "jokes.bin"
+
+        result = runner.invoke(
+            app, ["dad-joke", "export", str(path), "--format", "binary"]
+        )
+
+        assert result.exit_code == 0
+        assert path.read_bytes().startswith(b"TJOKES")
+
+    def test_dad_joke_import_reports_invalid_archives(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """Test that corrupt archives exit non-zero with a message."""
+        archive = tmp_path / "jokes.ndjson"
+        archive.write_text("not json\n", encoding="utf-8")
+
+        result = runner.invoke(app, ["dad-joke", "import", str(archive)])
+
+        assert result.exit_code == 1
+        assert "❌ Error importing dad jokes: Invalid record on line 1" in (
+            result.output
+        )
+
+    def test_hello_from_file(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Test that --from-file greets every name in the file."""
+        path = tmp_path / "names.txt"
+        path.write_text("Ada\n\nBob\n")
+
+        result = runner.invoke(app, ["hello", "--from-file", str(path)])
+
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [
+            "👋 Hello, Ada!",
+            "👋 Hello there!",
+            "👋 Hello, Bob!",
+        ]
+
+    def test_hello_from_stdin_as_csv(self, runner: CliRunner) -> None:
+        """Test that - reads names from stdin and --format selects the output."""
+        result = runner.invoke(
+            app, ["hello", "-f", "-", "--format", "csv"], input="Ada\n"
+        )
+
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [
+            "name,greeting",
+            'Ada,"👋 Hello, Ada!"',
+        ]
+
+    def test_hello_from_file_rejects_name(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """Test that a NAME and --from-file cannot be combined."""
+        path = tmp_path / "names.txt"
+        path.write_text("Ada\n")
+
+        result = runner.invoke(app, ["hello", "Bob", "--from-file", str(path)])
+
+        assert result.exit_code == 1
+        assert "either NAME or --from-file" in result.stderr
+
+    def test_hello_from_missing_file(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Test that an unreadable names file is reported."""
+        result = runner.invoke(app, ["hello", "-f", str(tmp_path / "missing.txt")])
+
+        assert result.exit_code == 1
+        assert "Error greeting names" in result.stderr
+
+    def test_run_command_reads_stdin(self, runner: CliRunner) -> None:
+        """Test that taters run answers each line and reports failures."""
+        commands = 'hello\n\ntaters hello "Ada Lovelace"\nbogus\n'
+
+        result = runner.invoke(app, ["run"], input=commands)
+
+        assert result.exit_code == 1
+        assert result.stdout.splitlines() == [
+            "👋 Hello there!",
+            "👋 Hello, Ada Lovelace!",
+        ]
+        assert "❌ Line 4: Unknown command: bogus" in result.stderr
+
+    def test_run_command_json_output_from_file(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """Test that --json prints one object per command read from a file."""
+        path = tmp_path / "commands.txt"
+        path.write_text('{"action": "hello", "params": {"name": "Bob"}}\n')
+
+        result = runner.invoke(app, ["run", str(path), "--json"])
+
+        assert result.exit_code == 0
+        assert json.loads(result.stdout) == {
+            "line_number": 1,
+            "command": '{"action": "hello", "params": {"name": "Bob"}}',
+            "results": ["👋 Hello, Bob!"],
+            "error": None,
+        }
+
+    def test_run_command_passes_options(self, runner: CliRunner) -> None:
+        """Test that --parallel, --unordered and --offline reach the action."""
+        with patch("taters.container.Container") as mock_container:
+            mock_container.return_value = _async_container()
+            mock_action = MagicMock()
+            seen: dict[str, Any] = {}
+
+            async def execute(
+                lines: AsyncIterator[str], parallelism: int, ordered: bool
+            ) -> AsyncIterator[Any]:
+                seen.update(
+                    lines=[line async for line in lines],
+                    parallelism=parallelism,
+                    ordered=ordered,
+                )
+                return
+                yield
+
+            mock_action.execute = execute
+            mock_container.return_value.run_action.async_.return_value = mock_action
+
+            result = runner.invoke(
+                app,
+                ["run", "-", "--parallel", "3", "--unordered", "--offline"],
+                input="dad-joke\n",
+            )
+
+            assert result.exit_code == 0
+            assert seen == {"lines": ["dad-joke"], "parallelism": 3, "ordered": False}
+            config = mock_container.return_value.config
+            config.cache.offline.from_value.assert_called_once_with(True)
+
+    def test_dad_joke_command_rejects_zero_count(self, runner: CliRunner) -> None:
+        """Test that --count must be at least one."""
+        result = runner.invoke(app, ["dad-joke", "--count", "0"])
+
+        assert result.exit_code != 0
+
+    def test_dad_joke_command_uses_running_daemon(self, runner: CliRunner) -> None:
+        """Test that a running daemon answers instead of an in-process container."""
+        with (
+            patch("taters.daemon.client.DaemonClient") as mock_client,
+            patch("taters.container.Container") as mock_container,
+        ):
+            mock_client.return_value.request.return_value = iter(
+                ["🃏 Dad Joke: From daemon"]
+            )
+
+            result = runner.invoke(app, ["dad-joke", "-n", "1", "-c", "3"])
+
+            assert result.exit_code == 0
+            assert "🃏 Dad Joke: From daemon" in result.stdout
+            mock_client.return_value.request.assert_called_once_with(
+                "dad-joke", {"count": 1, "concurrency": 3}
+            )
+            mock_container.assert_not_called()
+
+    def test_dad_joke_command_reports_daemon_errors(self, runner: CliRunner) -> None:
+        """Test that errors from the daemon are shown like local errors."""
+        with patch("taters.daemon.client.DaemonClient") as mock_client:
+            mock_client.return_value.request.side_effect = DaemonError("API Error")
+
+            result = runner.invoke(app, ["dad-joke"])
+
+            assert result.exit_code == 1
+            assert "❌ Error getting dad joke: API Error" in result.output
+
+    def test_dad_joke_command_offline_bypasses_daemon(self, runner: CliRunner) -> None:
+        """Test that --offline never consults the shared daemon."""
+        with (
+            patch("taters.daemon.client.DaemonClient") as mock_client,
+            patch("taters.container.Container") as mock_container,
+        ):
+            mock_container.return_value = _async_container()
+            mock_action = AsyncMock()
+            mock_action.execute.return_value = "🃏 Dad Joke: Cached"
+            mock_container.return_value.dad_joke_action.async_.return_value = (
+                mock_action
+            )
+
+            result = runner.invoke(app, ["dad-joke", "--offline"])
+
+            assert result.exit_code == 0
+            mock_client.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            ["--config", "{path}"],
+            ["--profile", "ci"],
+            ["--set", "retry.max_attempts=1"],
+        ],
+    )
+    def test_dad_joke_command_config_options_bypass_daemon(
+        self,
+        runner: CliRunner,
+        tmp_path: Path,
+        isolated_config: Path,
+        options: list[str],
+    ) -> None:
+        """Test that settings given for one run are not dropped by the daemon."""
+        path = tmp_path / "taters.toml"
+        isolated_config.mkdir(parents=True)
+        for config_file in (path, isolated_config / "config.toml"):
+            config_file.write_text("[profiles.ci.api]\ntimeout = 2\n", encoding="utf-8")
+        with (
+            patch("taters.daemon.client.DaemonClient") as mock_client,
+            patch("taters.container.Container") as mock_container,
+        ):
+            mock_container.return_value = _async_container()
+            mock_action = AsyncMock()
+            mock_action.execute.return_value = "🃏 Dad Joke: Configured"
+            mock_container.return_value.dad_joke_action.async_.return_value = (
+                mock_action
+            )
+
+            arguments = [option.format(path=path) for option in options]
+            result = runner.invoke(app, [*arguments, "dad-joke"])
+
+            assert result.exit_code == 0
+            assert "🃏 Dad Joke: Configured" in result.stdout
+            mock_client.assert_not_called()
+
+    def test_serve_command_runs_daemon(self, runner: CliRunner) -> None:
+        """Test that serve starts the daemon on the requested socket."""
+
+        async def fake_serve(stop: Any, on_ready: Any) -> None:
+            on_ready()
+
+        with (
+            patch("taters.container.Container") as mock_container,
+            patch("taters.daemon.server.DaemonServer") as mock_server,
+        ):
+            mock_container.return_value = _async_container()
+            mock_server.return_value.socket_path = "/tmp/t.sock"
+            mock_server.return_value.serve.side_effect = fake_serve
+
+            result = runner.invoke(
+                app, ["serve", "--socket", "/tmp/t.sock", "--coalesce"]
+            )
+
+            assert result.exit_code == 0
+            assert "listening on /tmp/t.sock" in result.stdout
+            assert mock_server.call_args.args[1] == "/tmp/t.sock"
+            config = mock_container.return_value.config
+            config.dad_joke.single_flight.from_value.assert_called_once_with(True)
+
+    def test_serve_command_reports_running_daemon(self, runner: CliRunner) -> None:
+        """Test that serve exits with an error if a daemon already runs."""
+        with (
+            patch("taters.container.Container") as mock_container,
+            patch("taters.daemon.server.DaemonServer") as mock_server,
+        ):
+            mock_container.return_value = _async_container()
+            mock_server.return_value.serve.side_effect = DaemonError(
+                "A daemon is already listening on /tmp/t.sock"
+            )
+
+            result = runner.invoke(app, ["serve"])
+
+            assert result.exit_code == 1
+            assert "already listening" in result.output
+
+    def test_timings_prints_span_summary(self, runner: CliRunner) -> None:
+        """Test that --timings reports command spans on exit."""
+        result = runner.invoke(app, ["--timings", "hello", "Alice"])
+
+        assert result.exit_code == 0
+        assert "👋 Hello, Alice!" in result.stdout
+        assert "Timings" in result.output
+        assert "cli.hello" in result.output
+        assert "action.hello.execute" in result.output
+
+    def test_trace_file_appends_json_lines(
+        self, runner: CliRunner, tmp_path: Path
+    ) -> None:
+        """Test that --trace-file writes one JSON object per span."""
+        trace_file = tmp_path / "trace.jsonl"
+
+        result = runner.invoke(app, ["--trace-file", str(trace_file), "hello"])
+
+        assert result.exit_code == 0
+        assert "Timings" not in result.output
+        records = [json.loads(line) for line in trace_file.read_text().splitlines()]
+        names = {record["name"] for record in records}
+        assert {"cli.hello", "import.actions", "action.hello.execute"} <= names
+        assert len({record["trace_id"] for record in records}) == 1
+
+    def test_tracing_is_disabled_after_command(self, runner: CliRunner) -> None:
+        """Test that tracing does not leak into later invocations."""
+        from taters import tracing
+
+        runner.invoke(app, ["--timings", "hello"])
+
+        assert tracing.span("after") is tracing.span("other")
+
     def test_app_help(self, runner: CliRunner) -> None:
         """Test CLI help output."""
         result = runner.invoke(app, ["--help"])
@@ -0,0 +1,257 @@
+"""Tests for the precomputed completion and help manifest."""
+
+import io
+import json
+from pathlib import Path
+from typing import Any, Optional
+from unittest.mock import patch
+
+import pytest
+import typer
+
+from taters import manifest, plugins
+from taters.main import app
+
+COMPLETION_CASES = [
+    "taters ",
+    "taters -",
+    "taters --timings -",
+    "taters --config x hello -",
+    "taters dad-joke ",
+    "taters dad-joke -n 3 -",
+    "taters dad-joke search ",
+    "taters hello Bob -",
+    "taters hello --format ",
+    "taters hello --format n",
+    "taters hello --format=c",
+]
+
+
+@pytest.fixture
+def command() -> Any:
+    """Build the Click command for the CLI."""
+    return typer.main.get_command(app)
+
+
+@pytest.fixture
+def document(command: Any) -> manifest.Manifest:
+    """Record the CLI's command tree."""
+    return manifest.build(command)
+
+
+def _environ(shell: str, line: str, fish_action: str = "") -> dict[str, str]:
+    """Describe a completion request the way Typer's shell scripts do."""
+    words = line.split() + ([""] if line.endswith(" ") else [])
+    return {
+        "_TATERS_COMPLETE": f"complete_{shell}",
+        "COMP_WORDS": line,
+        "COMP_CWORD": str(len(words) - 1),
+        "_TYPER_COMPLETE_ARGS": line,
+        "_TYPER_COMPLETE_FISH_ACTION": fish_action,
+        "_TYPER_COMPLETE_WORD_TO_COMPLETE": words[-1],
+    }
+
+
+def _complete_with_app(
+    command: Any,
+    environ: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> tuple[str, int]:
+    """Have Typer answer a completion request."""
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+    with pytest.raises(SystemExit) as exit_info:
+        command.main([], prog_name="taters")
+    code = exit_info.value.code
+    return capsys.readouterr().out, code if isinstance(code, int) else 0
+
+
+class TestComplete:
+    """Test cases for complete."""
+
+    @pytest.mark.parametrize("line", COMPLETION_CASES)
+    @pytest.mark.parametrize(
+        "shell, fish_action",
+        [
+            ("bash", ""),
+            ("zsh", ""),
+            ("fish", "get-args"),
+            ("fish", "is-args"),
+            ("powershell", ""),
+        ],
+    )
+    def test_matches_typer(
+        self,
+        command: Any,
+        document: manifest.Manifest,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+        shell: str,
+        fish_action: str,
+        line: str,
+    ) -> None:
+        """Test that answers are exactly what Typer would print."""
+        environ = _environ(shell, line, fish_action)
+
+        answer = manifest.complete(document, f"complete_{shell}", environ)
+
+        assert answer == _complete_with_app(command, environ, monkeypatch, capsys)
+
+    def test_commands(self, document: manifest.Manifest) -> None:
+        """Test that subcommands are offered in order."""
+        answer = manifest.complete(
+            document, "complete_bash", _environ("bash", "taters dad-joke ")
+        )
+
+        assert answer == ("search\nexport\nimport\n", 0)
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            "taters hello -f ",  # File names come from the shell.
+            "taters nope ",
+            "taters -- ",
+            "taters dad-joke -n3 -",
+        ],
+    )
+    def test_defers_to_the_app(self, document: manifest.Manifest, line: str) -> None:
+        """Test that requests the manifest cannot answer exactly are declined."""
+        environ = _environ("bash", line)
+
+        assert manifest.complete(document, "complete_bash", environ) is None
+
+    def test_other_instructions_are_declined(self, document: manifest.Manifest) -> None:
+        """Test that printing the completion script is left to the app."""
+        environ = _environ("bash", "taters ")
+
+        assert manifest.complete(document, "source_bash", environ) is None
+        assert manifest.complete(document, "complete_tcsh", environ) is None
+
+
+class TestLoadAndSave:
+    """Test cases for load and save."""
+
+    def test_round_trip(self, document: manifest.Manifest, tmp_path: Path) -> None:
+        """Test that a saved manifest loads while nothing changed."""
+        path = tmp_path / "cli-manifest.json"
+        manifest.save(document, path)
+
+        assert manifest.load(path) == document
+
+    def test_default_path(self, document: manifest.Manifest) -> None:
+        """Test that the manifest lives in the cache directory."""
+        manifest.save(document)
+
+        assert manifest.default_path().name == manifest.MANIFEST_FILENAME
+        assert manifest.load() == document
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"fingerprint": ["another python"]},
+            {"version": manifest.MANIFEST_VERSION + 1},
+            {"root": None},
+        ],
+    )
+    def test_stale_manifest_is_ignored(
+        self, document: manifest.Manifest, tmp_path: Path, change: dict[str, Any]
+    ) -> None:
+        """Test that a manifest built for other commands is not used."""
+        path = tmp_path / "cli-manifest.json"
+        manifest.save({**document, **change}, path)
+
+        assert manifest.load(path) is None
+
+    def test_unreadable_manifest(self, tmp_path: Path) -> None:
+        """Test that a missing or corrupt manifest is ignored."""
+        path = tmp_path / "cli-manifest.json"
+        assert manifest.load(path) is None
+
+        path.write_text("not json")
+        assert manifest.load(path) is None
+
+    def test_unwritable_directory_leaves_no_temporary_file(
+        self, tmp_path: Path
+    ) -> None:
+        """Test that a failed atomic write is ignored and cleaned up."""
+        path = tmp_path / "missing" / "cli-manifest.json"
+
+        manifest.write_json(path, {"version": 1})
+
+        assert not path.exists()
+        assert not path.parent.exists()
+
+    def test_main_module_change_invalidates(
+        self, document: manifest.Manifest, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that editing the built-in commands outdates the manifest."""
+        manifest.save(document)
+        real_fingerprint = manifest.fingerprint()
+        monkeypatch.setattr(
+            manifest, "fingerprint", lambda: [*real_fingerprint[:-1], ["main", 1]]
+        )
+
+        assert manifest.load() is None
+
+
+class TestHelp:
+    """Test cases for help_key and remember_help."""
+
+    @pytest.mark.parametrize(
+        "args, path",
+        [(["--help"], []), (["dad-joke", "search", "--help"], ["dad-joke", "search"])],
+    )
+    def test_help_requests(
+        self, document: manifest.Manifest, args: list[str], path: list[str]
+    ) -> None:
+        """Test that command names followed by --help are help requests."""
+        key = manifest.help_key(document, "taters", args, io.StringIO(), {})
+
+        assert key is not None
+        assert json.loads(key)[:2] == ["taters", path]
+
+    @pytest.mark.parametrize(
+        "args", [[], ["hello"], ["hello", "Bob", "--help"], ["nope", "--help"]]
+    )
+    def test_other_requests(self, document: manifest.Manifest, args: list[str]) -> None:
+        """Test that anything but a bare help request has no page."""
+        assert manifest.help_key(document, "taters", args, io.StringIO(), {}) is None
+
+    def test_terminal_is_part_of_the_key(self, document: manifest.Manifest) -> None:
+        """Test that pages rendered for other terminals are kept apart."""
+
+        def key(environ: dict[str, str]) -> Optional[str]:
+            return manifest.help_key(
+                document, "taters", ["--help"], io.StringIO(), environ
+            )
+
+        assert key({}) == key({"HOME": "/elsewhere"})
+        assert key({}) != key({"COLUMNS": "120"})
+        assert key({}) != key({"NO_COLOR": "1"})
+
+    def test_oldest_pages_are_dropped(
+        self, document: manifest.Manifest, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the manifest keeps a bounded number of pages."""
+        monkeypatch.setattr(manifest, "MAX_HELP_PAGES", 2)
+        for key in ("a", "b", "a", "c"):
+            manifest.remember_help(document, key, f"page {key}")
+
+        assert document["help"] == {"a": "page a", "c": "page c"}
+
+
+class TestBuild:
+    """Test cases for build."""
+
+    def test_records_plugins_without_importing_them(self) -> None:
+        """Test that a plugin is listed but completed by the app."""
+        spec = plugins.PluginSpec("shout", "missing_module:plugin", "demo")
+        with patch.object(plugins, "discover", return_value=[spec]):
+            document = manifest.build(typer.main.get_command(app))
+
+        shout = document["root"]["commands"]["shout"]
+        assert shout["opaque"] is True
+        assert shout["lines"]["bash"] == "shout"
+        environ = _environ("bash", "taters shout -")
+        assert manifest.complete(document, "complete_bash", environ) is None
@@ -0,0 +1,215 @@
+"""Tests for entry-point plugin discovery and loading."""
+
+import os
+import sys
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+from dependency_injector import providers
+from typer.testing import CliRunner
+
+from taters import container as container_module
+from taters import manifest, plugins
+from taters.container import Container
+from taters.main import app
+from taters.plugins import PluginError, PluginSpec, discover, load_command
+
+PLUGIN_MODULE = '''
+import typer
+from dependency_injector import providers
+
+from taters.plugins import TatersPlugin
+
+
+def shout(word: str) -> None:
+    """Shout a word."""
+    typer.echo(word.upper())
+
+
+weather = typer.Typer()
+
+
+@weather.command("today")
+def today() -> None:
+    """Report today's weather."""
+    typer.echo("Sunny")
+
+
+@weather.command("tomorrow")
+def tomorrow() -> None:
+    """Report tomorrow's weather."""
+    typer.echo("Rain")
+
+
+plugin = TatersPlugin(shout, providers={"shouter": providers.Object("loud")})
+clashing = TatersPlugin(shout, providers={"hello_action": providers.Object(None)})
+not_a_command = 42
+'''
+
+
+def _install(site: Path, module: str, entry_points: str) -> None:
+    """Write a module and a distribution declaring its entry points."""
+    (site / f"{module}.py").write_text(PLUGIN_MODULE)
+    dist_info = site / f"{module}-0.1.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(
+        f"Metadata-Version: 2.1\nName: {module.replace('_', '-')}\nVersion: 0.1\n"
+    )
+    (dist_info / "entry_points.txt").write_text(
+        f"[{plugins.ENTRY_POINT_GROUP}]\n{entry_points}"
+    )
+
+
+@pytest.fixture
+def site(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Create an import path directory with one plugin distribution."""
+    site = tmp_path / "site"
+    site.mkdir()
+    _install(site, "demo_plugin", "shout = demo_plugin:plugin\n")
+    monkeypatch.syspath_prepend(str(site))
+    yield site
+    for name in [name for name in sys.modules if name.startswith("demo_plugin")]:
+        del sys.modules[name]
+
+
+@pytest.fixture
+def container(monkeypatch: pytest.MonkeyPatch) -> Container:
+    """Give the process a fresh container for plugins to register into."""
+    container = Container()
+    monkeypatch.setattr(container_module, "_process_container", container)
+    return container
+
+
+class TestDiscover:
+    """Test cases for discover."""
+
+    def test_finds_installed_plugins(self, site: Path) -> None:
+        """Test that entry points of installed distributions are found."""
+        assert discover() == [PluginSpec("shout", "demo_plugin:plugin", "demo-plugin")]
+
+    def test_index_is_reused_while_current(self, site: Path) -> None:
+        """Test that a current index spares the entry point scan."""
+        discover()
+
+        with patch.object(plugins, "_scan") as scan:
+            assert discover()[0].name == "shout"
+            scan.assert_not_called()
+
+    def test_index_is_rebuilt_when_distributions_change(self, site: Path) -> None:
+        """Test that installing a distribution invalidates the index."""
+        discover()
+        _install(site, "other_plugin", "weather = other_plugin:weather\n")
+        # Keep the test independent of the filesystem's timestamp resolution.
+        stat = os.stat(site)
+        os.utime(site, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert [spec.name for spec in discover()] == ["shout", "weather"]
+
+    def test_refresh_and_corrupt_index(self, site: Path, tmp_path: Path) -> None:
+        """Test that --refresh rescans and an unreadable index is ignored."""
+        index = tmp_path / "plugins.json"
+        index.write_text("not json")
+
+        assert discover(index)[0].name == "shout"
+        with patch.object(plugins, "_scan", return_value=[]) as scan:
+            assert discover(index, refresh=True) == []
+            scan.assert_called_once()
+
+
+class TestLoadCommand:
+    """Test cases for load_command."""
+
+    def test_function_plugin_registers_providers(
+        self, site: Path, container: Container
+    ) -> None:
+        """Test that a TatersPlugin's providers are added to the container."""
+        command = load_command(PluginSpec("shout", "demo_plugin:plugin", ""))
+
+        assert command.name == "shout"
+        assert container.shouter() == "loud"
+
+    def test_typer_app_plugin(self, site: Path) -> None:
+        """Test that a bare Typer app becomes a command group."""
+        command = load_command(PluginSpec("weather", "demo_plugin:weather", ""))
+
+        subcommands = command.commands  # type: ignore[attr-defined]
+        assert command.name == "weather"
+        assert {"today", "tomorrow"} <= set(subcommands)
+
+    @pytest.mark.parametrize(
+        "value, message",
+        [
+            ("missing_module:plugin", "Cannot load plugin"),
+            ("demo_plugin:not_a_command", "must be a Typer app"),
+            ("demo_plugin:clashing", "cannot replace the 'hello_action' provider"),
+        ],
+    )
+    def test_bad_plugins(
+        self, site: Path, container: Container, value: str, message: str
+    ) -> None:
+        """Test that broken or clashing plugins raise PluginError."""
+        with pytest.raises(PluginError, match=message):
+            load_command(PluginSpec("bad", value, ""))
+
+
+class TestPluginCommands:
+    """Test cases for plugin commands in the CLI."""
+
+    @pytest.fixture
+    def runner(self) -> CliRunner:
+        """Create a CLI test runner."""
+        return CliRunner()
+
+    def test_plugin_command_runs(
+        self, runner: CliRunner, site: Path, container: Container
+    ) -> None:
+        """Test that a plugin command is loaded and run on use."""
+        result = runner.invoke(app, ["shout", "hi"])
+
+        assert result.exit_code == 0
+        assert result.stdout == "HI\n"
+
+    def test_help_lists_plugins_without_importing_them(
+        self, runner: CliRunner, site: Path
+    ) -> None:
+        """Test that --help lists plugins from the index alone."""
+        result = runner.invoke(app, ["--help"])
+
+        assert result.exit_code == 0
+        assert "Plugin from demo-plugin" in result.stdout
+        assert "demo_plugin" not in sys.modules
+
+    def test_builtin_commands_skip_discovery(self, runner: CliRunner) -> None:
+        """Test that built-in commands never read the plugin index."""
+        with patch.object(plugins, "discover", side_effect=AssertionError):
+            result = runner.invoke(app, ["hello"])
+
+        assert result.exit_code == 0
+
+    def test_broken_plugin_is_reported(self, runner: CliRunner) -> None:
+        """Test that a plugin failing to load exits with an error."""
+        spec = PluginSpec("broken", "missing_module:plugin", "broken")
+        with patch.object(plugins, "discover", return_value=[spec]):
+            result = runner.invoke(app, ["broken"])
+
+        assert result.exit_code == 1
+        assert "Cannot load plugin 'broken'" in result.stderr
+
+    def test_plugins_command(self, runner: CliRunner, site: Path) -> None:
+        """Test that taters plugins --refresh lists plugins and records them."""
+        result = runner.invoke(app, ["plugins", "--refresh"])
+
+        assert result.exit_code == 0
+        assert "🔌 shout (demo-plugin: demo_plugin:plugin)" in result.stdout
+        document = manifest.load()
+        assert document is not None
+        assert "shout" in document["root"]["commands"]
+
+    def test_plugins_command_without_plugins(self, runner: CliRunner) -> None:
+        """Test that taters plugins says when none are installed."""
+        with patch.object(plugins, "discover", return_value=[]):
+            result = runner.invoke(app, ["plugins"])
+
+        assert "No plugins installed." in result.stdout
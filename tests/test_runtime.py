@@ -0,0 +1,97 @@
+"""Tests for event loop selection and the shared loop runner."""
+
+import asyncio
+import sys
+from types import ModuleType
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from taters import runtime
+from taters.runtime import RuntimeConfigError
+
+
+@pytest.fixture
+def no_uvloop() -> Iterator[None]:
+    """Make uvloop unimportable whether or not it is installed."""
+    with patch.dict(sys.modules, {"uvloop": None}):
+        yield
+
+
+@pytest.fixture
+def fake_uvloop() -> Iterator[ModuleType]:
+    """Install a stand-in uvloop creating ordinary asyncio loops."""
+    module = ModuleType("uvloop")
+    module.new_event_loop = asyncio.new_event_loop  # type: ignore[attr-defined]
+    with patch.dict(sys.modules, {"uvloop": module}):
+        yield module
+
+
+class TestLoopFactory:
+    """Test cases for loop_factory."""
+
+    def test_auto_without_uvloop(self, no_uvloop: None) -> None:
+        """Test that auto falls back to asyncio's loop."""
+        assert runtime.loop_factory(runtime.AUTO) == (
+            runtime.ASYNCIO,
+            asyncio.new_event_loop,
+        )
+
+    def test_auto_with_uvloop(self, fake_uvloop: ModuleType) -> None:
+        """Test that auto prefers uvloop when installed."""
+        name, factory = runtime.loop_factory(runtime.AUTO)
+
+        assert name == runtime.UVLOOP
+        assert factory is fake_uvloop.new_event_loop
+
+    def test_asyncio_ignores_uvloop(self, fake_uvloop: ModuleType) -> None:
+        """Test that asyncio can be chosen even with uvloop installed."""
+        assert runtime.loop_factory(runtime.ASYNCIO)[0] == runtime.ASYNCIO
+
+    def test_missing_uvloop(self, no_uvloop: None) -> None:
+        """Test that asking for an absent uvloop is an error."""
+        with pytest.raises(RuntimeConfigError, match="uvloop is not installed"):
+            runtime.loop_factory(runtime.UVLOOP)
+
+    def test_unknown_loop(self) -> None:
+        """Test that an unknown loop name is an error."""
+        with pytest.raises(RuntimeConfigError, match="Unknown event loop 'trio'"):
+            runtime.loop_factory("trio")
+
+
+class TestRun:
+    """Test cases for run and the shared runner."""
+
+    def test_loop_is_reused(self, no_uvloop: None) -> None:
+        """Test that successive runs share one event loop."""
+
+        async def loop() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        first = runtime.run(loop())
+        second = runtime.run(loop())
+
+        assert first is second
+        assert not first.is_closed()
+        assert runtime.current_loop() == runtime.ASYNCIO
+
+    def test_close_starts_afresh(self, no_uvloop: None) -> None:
+        """Test that close shuts the loop and the next run makes a new one."""
+
+        async def loop() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+        first = runtime.run(loop())
+        runtime.close()
+
+        assert first.is_closed()
+        assert runtime.current_loop() == ""
+        assert runtime.run(loop()) is not first
+
+    def test_unknown_loop_after_first_use(self) -> None:
+        """Test that a bad loop name is rejected even once a loop exists."""
+        runtime.run(asyncio.sleep(0))
+
+        with pytest.raises(RuntimeConfigError):
+            runtime.get_runner("trio")
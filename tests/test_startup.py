@@ -0,0 +1,124 @@
+"""Startup-time budget tests for the taters entry point."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+import taters
+
+# Import time attributable to taters modules themselves (excluding typer, rich
+# and the interpreter), in milliseconds. Pulling httpx or dependency_injector
+# back into these commands costs well over 100ms.
+TATERS_IMPORT_BUDGET_MS = 50.0
+
+HEAVY_MODULES = ("httpx", "dependency_injector", "taters.container")
+
+_SCRIPT = """
+import json, sys
+import typer
+from taters.main import app
+try:
+    app(args=sys.argv[1:], prog_name="taters", standalone_mode=False)
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)))
+"""
+
+_LAUNCHER = """
+import json, sys
+sys.argv[0] = "taters"
+from taters.cli import main
+try:
+    main()
+except SystemExit:
+    pass
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def _run_with_importtime(*args: str) -> tuple[float, set[str]]:
+    """
+    Run the CLI in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        The import time spent in taters modules in milliseconds, and the set of
+        modules loaded once the command finished.
+    """
+    env = dict(os.environ, PYTHONPATH=str(Path(taters.__file__).parents[1]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _SCRIPT, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    taters_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Only top-level entries: nested imports are included in their parent.
+        if not name.startswith("  ") and name.strip().startswith("taters"):
+            taters_us += int(cumulative)
+    modules = set(json.loads(result.stdout.splitlines()[-1]))
+    return taters_us / 1000, modules
+
+
+class TestStartup:
+    """Startup regression tests for lightweight commands."""
+
+    @pytest.mark.parametrize(
+        "args",
+        [("hello",), ("hello", "Alice"), ("hello", "--help"), ("--help",)],
+    )
+    def test_light_commands_skip_heavy_imports(self, args: tuple[str, ...]) -> None:
+        """Test that commands without network needs never import the stack."""
+        _, modules = _run_with_importtime(*args)
+
+        assert not [m for m in modules if m.split(".")[0] in HEAVY_MODULES]
+        assert "taters.container" not in modules
+
+    @pytest.mark.parametrize("args", [("hello",), ("hello", "--help")])
+    def test_light_commands_stay_within_import_budget(
+        self, args: tuple[str, ...]
+    ) -> None:
+        """Test that taters' own import time stays within budget."""
+        taters_ms, _ = _run_with_importtime(*args)
+
+        assert taters_ms < TATERS_IMPORT_BUDGET_MS
+
+    @pytest.mark.parametrize(
+        "args, completing",
+        [((), "taters dad-joke "), (("dad-joke", "--help"), None)],
+    )
+    def test_manifest_answers_skip_typer(
+        self, args: tuple[str, ...], completing: Optional[str]
+    ) -> None:
+        """Test that completion and help import no app once recorded."""
+        env = dict(os.environ, PYTHONPATH=str(Path(taters.__file__).parents[1]))
+        if completing is not None:
+            env.update(
+                _TATERS_COMPLETE="complete_bash",
+                COMP_WORDS=completing,
+                COMP_CWORD=str(len(completing.split(" ")) - 1),
+            )
+        outputs = [
+            subprocess.run(
+                [sys.executable, "-c", _LAUNCHER, *args],
+                capture_output=True,
+                text=True,
+                env=env,
+                check=True,
+            ).stdout.splitlines()
+            for _ in range(2)
+        ]
+
+        modules = set(json.loads(outputs[1][-1]))
+        assert outputs[0][:-1] == outputs[1][:-1]
+        assert "typer" not in modules
+        assert "taters.main" not in modules
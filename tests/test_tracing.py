@@ -0,0 +1,114 @@
+"""Tests for span tracing."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from taters import tracing
+from taters.tracing import Tracer
+from tests.conftest import FakeClock
+
+
+class TestTracing:
+    """Test cases for the tracing module."""
+
+    @pytest.fixture
+    def tracer(self, clock: FakeClock) -> Iterator[Tracer]:
+        """Enable tracing for one test."""
+        tracer = tracing.enable(Tracer(clock=clock))
+        yield tracer
+        tracing.disable()
+
+    def test_disabled_span_is_shared_no_op(self) -> None:
+        """Test that disabled tracing allocates nothing per span."""
+        first = tracing.span("a")
+        second = tracing.span("b", attempt=1)
+
+        assert first is second
+        with first:
+            pass
+        assert tracing.httpx_trace_extensions() is None
+
+    def test_spans_nest_under_current_span(
+        self, tracer: Tracer, clock: FakeClock
+    ) -> None:
+        """Test that spans record parents and monotonic durations."""
+        with tracing.span("outer"):
+            clock.now += 1
+            with tracing.span("inner", attempt=2):
+                clock.now += 2
+
+        inner, outer = tracer.spans
+        assert (outer.name, outer.parent_id, outer.duration) == ("outer", None, 3)
+        assert (inner.name, inner.parent_id, inner.duration) == ("inner", 1, 2)
+        assert inner.attributes == {"attempt": 2}
+
+    @pytest.mark.asyncio
+    async def test_tasks_inherit_parent_span(self, tracer: Tracer) -> None:
+        """Test that concurrent tasks are parented to the span that started them."""
+
+        async def work() -> None:
+            with tracing.span("task"):
+                await asyncio.sleep(0)
+
+        with tracing.span("batch"):
+            await asyncio.gather(work(), work())
+
+        batch = next(span for span in tracer.spans if span.name == "batch")
+        tasks = [span for span in tracer.spans if span.name == "task"]
+        assert [span.parent_id for span in tasks] == [batch.span_id] * 2
+
+    def test_summary_folds_repeated_siblings(
+        self, tracer: Tracer, clock: FakeClock
+    ) -> None:
+        """Test that repeated spans are shown once with count, total and max."""
+        with tracing.span("batch"):
+            for seconds in (0.001, 0.003):
+                with tracing.span("fetch"):
+                    with tracing.span("connect"):
+                        clock.now += seconds
+
+        lines = tracer.summary().splitlines()
+
+        assert lines[1].split() == ["batch", "4.0", "ms"]
+        assert lines[2].split() == ["fetch", "×2", "4.0", "ms", "(max", "3.0", "ms)"]
+        assert lines[3].split()[:2] == ["connect", "×2"]
+
+    def test_write_jsonl_appends(self, tracer: Tracer, tmp_path: Path) -> None:
+        """Test that each span becomes one JSON line, appended per run."""
+        path = tmp_path / "trace.jsonl"
+        with tracing.span("run", command="hello"):
+            pass
+
+        tracer.write_jsonl(path)
+        tracer.write_jsonl(path)
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(records) == 2
+        assert records[0]["name"] == "run"
+        assert records[0]["trace_id"] == tracer.trace_id
+        assert records[0]["attributes"] == {"command": "hello"}
+
+    @pytest.mark.asyncio
+    async def test_httpx_trace_pairs_phase_events(
+        self, tracer: Tracer, clock: FakeClock
+    ) -> None:
+        """Test that httpcore started/complete events become phase spans."""
+        extensions = tracing.httpx_trace_extensions()
+        assert extensions is not None
+        trace = extensions["trace"]
+
+        with tracing.span("http.request"):
+            await trace("connection.connect_tcp.started", {})
+            clock.now += 0.5
+            await trace("connection.connect_tcp.complete", {})
+            await trace("connection.start_tls.started", {})
+            await trace("connection.start_tls.failed", {})
+
+        connect, tls, request = tracer.spans
+        assert (connect.name, connect.duration) == ("http.connection.connect_tcp", 0.5)
+        assert connect.parent_id == request.span_id
+        assert tls.attributes == {"failed": True}